@@ -3,9 +3,8 @@ from datetime import datetime
 from cerberus import Validator
 from dateutil import parser
 from django.db import connection
-from django.db.models import Case, FloatField, Value, When
-from django.db.models.fields.json import KeyTextTransform
-from django.db.models.functions import Cast, Trunc
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Trunc
 from django.utils import timezone
 from django.utils.functional import cached_property
 from rest_framework.exceptions import ValidationError
@@ -95,21 +94,21 @@ def validate_params(data):
 
 def annotate_commits_with_totals(queryset):
     """
-    Extract values from a commit's "totals" field and annotate the commit directly with those values.
+    Annotate the commits with values of their "totals", read from the typed columns mirroring them.
     This is necessary when using Django aggregation functions, and otherwise is generally more convenient than wrangling with the totals JSON field.
     See "CommitTotalsSerializer" for reference on what the values ("c", "N", etc) represent
     """
-    complexity = Cast(KeyTextTransform("C", "totals"), FloatField()) or 0
-    complexity_total = (
-        Cast(KeyTextTransform("N", "totals"), output_field=FloatField()) or 0
-    )
     return queryset.annotate(
-        coverage=Cast(KeyTextTransform("c", "totals"), output_field=FloatField()),
-        complexity=complexity,
-        complexity_total=complexity_total,
+        coverage=F("totals_coverage"),
+        complexity=F("totals_complexity"),
+        complexity_total=F("totals_complexity_total"),
         complexity_ratio=Case(
-            When(complexity_total__gt=0, then=complexity / complexity_total),
+            When(
+                totals_complexity_total__gt=0,
+                then=F("totals_complexity") / F("totals_complexity_total"),
+            ),
             default=Value(None),
+            output_field=FloatField(),
         ),
     )
 
@@ -328,7 +327,10 @@ class ChartQueryRunner:
                         ) AS commit_rank,
                         DATE_TRUNC('{self.grouping_unit}', c.timestamp) AS "truncated_date",
                         c.timestamp AS commit_timestamp,
-                        c.totals,
+                        c.totals_hits,
+                        c.totals_misses,
+                        c.totals_partials,
+                        c.totals_lines,
                         r.repoid
                     FROM
                         commits c
@@ -340,7 +342,10 @@ class ChartQueryRunner:
                         s.date AS spine_date,
                         trc.truncated_date AS truncated_commit_date,
                         trc.commit_timestamp,
-                        trc.totals AS totals,
+                        trc.totals_hits,
+                        trc.totals_misses,
+                        trc.totals_partials,
+                        trc.totals_lines,
                         s.repoid
                     FROM spine s
                     LEFT JOIN t_ranked_commits trc ON trc.truncated_date = s.date
@@ -350,45 +355,31 @@ class ChartQueryRunner:
                     SELECT
                         spine_date,
                         truncated_commit_date,
-                        totals,
+                        totals_hits,
+                        totals_misses,
+                        totals_partials,
+                        totals_lines,
                         repoid,
                         SUM(CASE
-                            WHEN totals IS NOT NULL THEN 1 END
+                            WHEN totals_lines IS NOT NULL THEN 1 END
                         ) OVER (
                             PARTITION BY repoid
                             ORDER BY spine_date
                         ) AS grp_commit
                     FROM commits_spine
-                ), corrected AS (
-                    SELECT
-                        spine_date,
-                        FIRST_VALUE(totals) OVER (
-                            PARTITION BY repoid, grp_commit
-                            ORDER BY spine_date
-                        ) AS corrected_totals
-                    FROM
-                        grouped
                 ), parsed_totals AS (
                     SELECT
                         spine_date,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'h')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as hits,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'m')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as misses,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'p')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as partials,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'n')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as lines
+                        COALESCE(FIRST_VALUE(totals_hits) OVER w, 0)::numeric AS hits,
+                        COALESCE(FIRST_VALUE(totals_misses) OVER w, 0)::numeric AS misses,
+                        COALESCE(FIRST_VALUE(totals_partials) OVER w, 0)::numeric AS partials,
+                        COALESCE(FIRST_VALUE(totals_lines) OVER w, 0)::numeric AS lines
                     FROM
-                        corrected
+                        grouped
+                    WINDOW w AS (
+                        PARTITION BY repoid, grp_commit
+                        ORDER BY spine_date
+                    )
                 ), summed_totals AS (
                     SELECT
                         spine_date::timestamp at time zone 'UTC' AS date,
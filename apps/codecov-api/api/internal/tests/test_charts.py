@@ -6,7 +6,9 @@ from unittest.mock import patch
 
 import pytest
 from dateutil.relativedelta import relativedelta
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from factory.faker import faker
 from pytz import UTC
@@ -374,6 +376,13 @@ class CoverageChartHelpersTest(TestCase):
         for commit in annotated_commits:
             assert commit.complexity_ratio is None
 
+    def test_annotate_commits_with_totals_query_plan(self):
+        plan = annotate_commits_with_totals(
+            apply_default_filters(Commit.objects.defer("_report"))
+        ).explain(verbose=True)
+        assert "->>" not in plan
+        assert "totals_coverage" in plan
+
     def test_apply_grouping(self):
         with self.subTest("min coverage"):
             setup_commits(self.repo1_org1, 20, start_date="-7d")
@@ -669,6 +678,27 @@ class TestChartQueryRunnerQuery(TestCase):
                 },
             ).run_query()
 
+    def test_query_plan_reads_typed_totals(self):
+        query_runner = ChartQueryRunner(
+            user=self.user,
+            request_params={
+                "owner_username": self.org.username,
+                "service": self.org.service,
+                "grouping_unit": "day",
+            },
+        )
+        with CaptureQueriesContext(connection) as queries:
+            query_runner.run_query()
+        chart_query = queries.captured_queries[-1]["sql"]
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (VERBOSE) {chart_query}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        # the totals are not extracted from the JSON of every commit
+        assert "->>" not in plan
+        assert "totals_hits" in plan
+
 
 class TestChartQueryRunnerHelperMethods(TestCase):
     """
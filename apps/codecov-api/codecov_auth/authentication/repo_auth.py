@@ -23,6 +23,7 @@ from codecov_auth.models import (
 )
 from core.models import Commit, Repository
 from shared.django_apps.codecov_auth.models import Owner
+from upload.context_cache import upload_context_cache
 from upload.helpers import get_global_tokens, get_repo_with_github_actions_oidc_token
 from upload.views.helpers import (
     get_repository_and_owner_from_string,
@@ -144,9 +145,8 @@ class RepositoryLegacyQueryTokenAuthentication(authentication.BaseAuthentication
             token_uuid = UUID(token)
         except ValueError:
             return None
-        try:
-            repository = Repository.objects.get(upload_token=token_uuid)
-        except Repository.DoesNotExist:
+        repository = upload_context_cache.get_repository_by_upload_token(token_uuid)
+        if repository is None:
             return None
         return (
             RepositoryAsUser(repository),
@@ -160,8 +160,10 @@ class RepositoryLegacyTokenAuthentication(authentication.TokenAuthentication):
     ) -> tuple[RepositoryAsUser, LegacyTokenRepositoryAuth] | None:
         try:
             token_uuid = UUID(token)
-            repository = Repository.objects.get(upload_token=token_uuid)
-        except (ValueError, TypeError, Repository.DoesNotExist):
+        except (ValueError, TypeError):
+            return None  # continue to next auth class
+        repository = upload_context_cache.get_repository_by_upload_token(token_uuid)
+        if repository is None:
             return None  # continue to next auth class
         return (
             RepositoryAsUser(repository),
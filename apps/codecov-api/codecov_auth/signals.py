@@ -1,9 +1,10 @@
 from typing import Any, cast
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from codecov_auth.models import OrganizationLevelToken, Owner, OwnerProfile
+from codecov_auth.models import OrganizationLevelToken, Owner, OwnerProfile, Plan
+from upload.context_cache import upload_context_cache
 from utils.shelter import ShelterPubsub
 
 
@@ -51,3 +52,17 @@ def update_owner(
             "id": instance.ownerid,
         }
         ShelterPubsub.get_instance().publish(data)
+
+
+@receiver([post_save, post_delete], sender=Owner, dispatch_uid="upload_context_owner")
+def invalidate_owner_upload_context(
+    sender: type[Owner], instance: Owner, **kwargs: dict[str, Any]
+) -> None:
+    upload_context_cache.invalidate_owner(instance)
+
+
+@receiver([post_save, post_delete], sender=Plan, dispatch_uid="upload_context_plan")
+def invalidate_plan_upload_context(
+    sender: type[Plan], instance: Plan, **kwargs: dict[str, Any]
+) -> None:
+    upload_context_cache.invalidate_plans()
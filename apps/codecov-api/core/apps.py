@@ -4,6 +4,7 @@ from django.apps import AppConfig
 from django.conf import settings
 
 from shared.helpers.cache import RedisBackend, cache
+from shared.helpers.diff_cache import diff_cache
 from shared.helpers.redis import get_redis_connection
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,10 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         import core.signals  # noqa: F401, PLC0415
+        from upload.context_cache import upload_context_cache  # noqa: PLC0415
 
         if settings.RUN_ENV not in ["DEV", "TESTING"]:
             cache_backend = RedisBackend(get_redis_connection())
             cache.configure(cache_backend)
+            diff_cache.configure(get_redis_connection())
+            upload_context_cache.configure(get_redis_connection())
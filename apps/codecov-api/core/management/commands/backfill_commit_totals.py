@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import FloatField, IntegerField, Max, Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, NullIf
+
+from core.models import Commit
+from shared.utils.totals import COMMIT_TOTALS_COLUMNS
+
+
+class Command(BaseCommand):
+    help = "Fills the typed totals columns of the commits which predate them, from their `totals`."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        # this can be used to retry if there's an error - restart the command
+        # from the last ID printed before failure
+        parser.add_argument("--starting-id", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_id = Commit.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+
+        columns = {
+            column: Cast(
+                NullIf(KeyTextTransform(key, "totals"), Value("")),
+                FloatField() if type_ is float else IntegerField(),
+            )
+            for column, (key, type_) in COMMIT_TOTALS_COLUMNS.items()
+        }
+
+        for start_id in range(options["starting_id"], max_id + 1, batch_size):
+            updated = Commit.objects.filter(
+                id__gte=start_id,
+                id__lt=start_id + batch_size,
+                totals__isnull=False,
+                totals_lines__isnull=True,
+            ).update(**columns)
+            print(f"Updated {updated} commits from id {start_id}")  # noqa: T201
@@ -1,11 +1,12 @@
 import logging
 from typing import Any, cast
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from core.models import Repository
 from shared.django_apps.core.models import Commit
+from upload.context_cache import upload_context_cache
 from utils.shelter import ShelterPubsub
 
 log = logging.getLogger(__name__)
@@ -29,6 +30,16 @@ def update_repository(
         ShelterPubsub.get_instance().publish(data)
 
 
+@receiver(
+    [post_save, post_delete], sender=Repository, dispatch_uid="upload_context_repo"
+)
+def invalidate_repository_upload_context(
+    sender: type[Repository], instance: Repository, **kwargs: dict[str, Any]
+) -> None:
+    old_upload_token = instance.tracker.changed().get("upload_token")
+    upload_context_cache.invalidate_repository(instance, old_upload_token)
+
+
 @receiver(post_save, sender=Commit, dispatch_uid="shelter_sync_commit")
 def update_commit(
     sender: type[Commit], instance: Commit, **kwargs: dict[str, Any]
@@ -9,7 +9,12 @@ from django.core.management import call_command
 
 from shared.config import ConfigHelper
 from shared.django_apps.codecov_auth.models import Plan, Tier
-from shared.django_apps.core.tests.factories import OwnerFactory, RepositoryFactory
+from shared.django_apps.core.models import Commit
+from shared.django_apps.core.tests.factories import (
+    CommitFactory,
+    OwnerFactory,
+    RepositoryFactory,
+)
 from shared.helpers.redis import get_redis_connection
 
 
@@ -168,3 +173,39 @@ def test_insert_data_to_db_from_csv_for_plans_and_tiers():
 
     # Clean up the temporary file
     os.remove(csv_path)
+
+
+@pytest.mark.django_db
+def test_backfill_commit_totals():
+    commit = CommitFactory(
+        totals={"c": "85.00000", "h": 17, "m": 3, "p": 0, "n": 20, "C": 2, "N": 4}
+    )
+    no_totals = CommitFactory(totals=None)
+    # commits which predate the typed columns
+    Commit.objects.update(
+        totals_coverage=None,
+        totals_hits=None,
+        totals_misses=None,
+        totals_partials=None,
+        totals_lines=None,
+        totals_complexity=None,
+        totals_complexity_total=None,
+    )
+
+    call_command(
+        "backfill_commit_totals",
+        stdout=StringIO(),
+        stderr=StringIO(),
+        batch_size=1,
+    )
+
+    commit.refresh_from_db()
+    assert commit.totals_coverage == 85.0
+    assert commit.totals_hits == 17
+    assert commit.totals_misses == 3
+    assert commit.totals_partials == 0
+    assert commit.totals_lines == 20
+    assert commit.totals_complexity == 2.0
+    assert commit.totals_complexity_total == 4.0
+    no_totals.refresh_from_db()
+    assert no_totals.totals_lines is None
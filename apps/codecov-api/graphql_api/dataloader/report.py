@@ -0,0 +1,109 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+
+import shared.reports.api_report_service as report_service
+from core.models import Commit
+from shared.api_archive.archive import ArchiveService
+from shared.reports.filtered import FilteredReport
+from shared.reports.resources import Report
+from shared.storage.exceptions import FileNotInStorageError
+
+from .loader import BaseLoader
+
+log = logging.getLogger(__name__)
+
+
+def _filter_signature(values: list[str] | None) -> tuple[str, ...] | None:
+    return tuple(sorted(set(values))) if values is not None else None
+
+
+class ReportLoader(BaseLoader):
+    """
+    Loads the full coverage report of commits, so that every resolver of a
+    GraphQL request shares one parsed report per commit.
+
+    The chunks of all the commits loaded in the same tick are read from storage
+    concurrently, and filtered views of the reports are memoized by their filters.
+    """
+
+    max_workers = 8
+
+    @classmethod
+    def key(cls, commit: Commit):
+        return commit.pk
+
+    def __init__(self, info, *args, **kwargs):
+        super().__init__(info, *args, cache_key_fn=self.key, **kwargs)
+        self._filtered_reports: dict[tuple, FilteredReport | Report] = {}
+
+    async def batch_load_fn(self, commits: list[Commit]) -> list[Report | None]:
+        return await self._load_reports(commits)
+
+    @sync_to_async
+    def _load_reports(self, commits: list[Commit]) -> list[Report | None]:
+        # `Commit.full_report` is a `cached_property`, so storing the reports there
+        # also shares them with the services using the commit directly
+        unloaded = [
+            commit for commit in commits if "full_report" not in commit.__dict__
+        ]
+        if len(unloaded) > 1:
+            chunks = self._read_chunks(unloaded)
+            for commit in unloaded:
+                if commit.pk in chunks:
+                    commit.__dict__["full_report"] = (
+                        report_service.build_report_from_commit(
+                            commit, chunks=chunks[commit.pk]
+                        )
+                    )
+
+        return [commit.full_report for commit in commits]
+
+    def _read_chunks(self, commits: list[Commit]) -> dict[int, str]:
+        """
+        Reads the chunks of the given commits from storage in parallel.
+        Commits without a report or whose chunks could not be read are left out.
+        """
+        # the `ArchiveService`s are created here as they need to query the DB
+        archives = [
+            (commit, ArchiveService(commit.repository))
+            for commit in commits
+            if commit.report
+        ]
+
+        def read_chunks(item: tuple[Commit, ArchiveService]) -> str | None:
+            commit, archive_service = item
+            try:
+                return archive_service.read_chunks(commit.commitid)
+            except FileNotInStorageError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(read_chunks, archives)
+
+        return {
+            commit.pk: chunks
+            for (commit, _), chunks in zip(archives, results)
+            if chunks is not None
+        }
+
+    def filtered(
+        self,
+        commit: Commit,
+        report: Report,
+        flags: list[str] | None = None,
+        paths: list[str] | None = None,
+    ) -> FilteredReport | Report:
+        """
+        Returns `report.filter(flags=flags, paths=paths)`, shared by all the
+        resolvers asking for the same filters of the same commit.
+        """
+        signature = (
+            self.key(commit),
+            _filter_signature(flags),
+            _filter_signature(paths),
+        )
+        if signature not in self._filtered_reports:
+            self._filtered_reports[signature] = report.filter(flags=flags, paths=paths)
+        return self._filtered_reports[signature]
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from graphql_api.dataloader.report import ReportLoader
+from shared.django_apps.core.tests.factories import (
+    CommitWithReportFactory,
+    RepositoryFactory,
+)
+from shared.reports.resources import Report
+
+
+class GraphQLResolveInfo:
+    def __init__(self):
+        self.context = {}
+
+
+class ReportLoaderTestCase(TestCase):
+    def setUp(self):
+        self.repository = RepositoryFactory()
+        self.commits = [
+            CommitWithReportFactory(repository=self.repository, commitid=commitid)
+            for commitid in ["123", "456"]
+        ]
+        self.info = GraphQLResolveInfo()
+
+    @patch("shared.reports.api_report_service.build_report_from_commit")
+    async def test_load_shares_report_per_commit(self, build_report_mock):
+        report = Report()
+        build_report_mock.return_value = report
+
+        loader = ReportLoader.loader(self.info)
+        assert await loader.load(self.commits[0]) is report
+        assert await ReportLoader.loader(self.info).load(self.commits[0]) is report
+
+        build_report_mock.assert_called_once()
+
+    @patch("shared.api_archive.archive.ArchiveService.read_chunks")
+    @patch("shared.reports.api_report_service.build_report_from_commit")
+    async def test_load_many_reads_chunks_in_one_batch(
+        self, build_report_mock, read_chunks_mock
+    ):
+        read_chunks_mock.side_effect = lambda commitid: f"chunks-{commitid}"
+        build_report_mock.side_effect = lambda commit, chunks: chunks
+
+        loader = ReportLoader.loader(self.info)
+        reports = await asyncio.gather(
+            loader.load(self.commits[0]), loader.load(self.commits[1])
+        )
+
+        assert reports == ["chunks-123", "chunks-456"]
+        assert read_chunks_mock.call_count == 2
+        # the reports are shared with `Commit.full_report`
+        assert self.commits[0].full_report == "chunks-123"
+
+    def test_filtered_is_memoized_by_filters(self):
+        loader = ReportLoader(self.info)
+        report = Report()
+
+        filtered = loader.filtered(self.commits[0], report, flags=["a", "b"], paths=[])
+        assert (
+            loader.filtered(self.commits[0], report, flags=["b", "a"], paths=[])
+            is filtered
+        )
+        assert loader.filtered(self.commits[0], report, flags=["a"]) is not filtered
+        other_commit = loader.filtered(
+            self.commits[1], report, flags=["a", "b"], paths=[]
+        )
+        assert other_commit is not filtered
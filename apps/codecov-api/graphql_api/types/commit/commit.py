@@ -9,7 +9,6 @@ from graphql import GraphQLResolveInfo
 
 import services.components as components_service
 import services.path as path_service
-import shared.reports.api_report_service as report_service
 from codecov_auth.constants import USE_SENTRY_APP_INDICATOR
 from codecov_auth.models import Owner
 from core.models import Commit
@@ -23,6 +22,7 @@ from graphql_api.dataloader.bundle_analysis import (
 from graphql_api.dataloader.commit import CommitLoader
 from graphql_api.dataloader.comparison import ComparisonLoader
 from graphql_api.dataloader.owner import OwnerLoader
+from graphql_api.dataloader.report import ReportLoader
 from graphql_api.helpers.connection import (
     queryset_to_connection,
     queryset_to_connection_sync,
@@ -43,9 +43,8 @@ from services.comparison import Comparison, ComparisonReport
 from services.components import Component
 from services.path import Dir, File, ReportPaths
 from services.yaml import YamlStates, get_yaml_state
-from shared.reports.api_report_service import ReadOnlyReport
 from shared.reports.filtered import FilteredReportFile
-from shared.reports.resources import ReportFile
+from shared.reports.resources import Report, ReportFile
 from shared.reports.types import ReportTotals
 
 commit_bindable = ObjectType("Commit")
@@ -158,16 +157,13 @@ async def resolve_compare_with_parent(
 def get_sorted_path_contents(
     current_owner: Owner,
     commit: Commit,
+    report: Report | None,
     path: str | None = None,
     filters: dict | None = None,
     should_use_sentry_app: bool = False,
 ) -> (
     list[File | Dir] | MissingHeadReport | MissingCoverage | UnknownFlags | UnknownPath
 ):
-    # TODO: Might need to add reports here filtered by flags in the future
-    report = report_service.build_report_from_commit(
-        commit, report_class=ReadOnlyReport
-    )
     if not report:
         return MissingHeadReport()
 
@@ -243,8 +239,7 @@ def get_sorted_path_contents(
 
 
 @commit_bindable.field("pathContents")
-@sync_to_async
-def resolve_path_contents(
+async def resolve_path_contents(
     commit: Commit,
     info: GraphQLResolveInfo,
     path: str | None = None,
@@ -261,9 +256,11 @@ def resolve_path_contents(
         info.context["request"], USE_SENTRY_APP_INDICATOR, False
     )
 
-    contents = get_sorted_path_contents(
+    report = await ReportLoader.loader(info).load(commit)
+    contents = await sync_to_async(get_sorted_path_contents)(
         current_owner,
         commit,
+        report,
         path,
         filters,
         should_use_sentry_app=should_use_sentry_app,
@@ -274,8 +271,7 @@ def resolve_path_contents(
 
 
 @commit_bindable.field("deprecatedPathContents")
-@sync_to_async
-def resolve_deprecated_path_contents(
+async def resolve_deprecated_path_contents(
     commit: Commit,
     info: GraphQLResolveInfo,
     path: str | None = None,
@@ -296,9 +292,11 @@ def resolve_deprecated_path_contents(
         info.context["request"], USE_SENTRY_APP_INDICATOR, False
     )
 
-    contents = get_sorted_path_contents(
+    report = await ReportLoader.loader(info).load(commit)
+    contents = await sync_to_async(get_sorted_path_contents)(
         current_owner,
         commit,
+        report,
         path,
         filters,
         should_use_sentry_app=should_use_sentry_app,
@@ -306,7 +304,7 @@ def resolve_deprecated_path_contents(
     if not isinstance(contents, list):
         return contents
 
-    return queryset_to_connection_sync(
+    return await sync_to_async(queryset_to_connection_sync)(
         contents,
         ordering_direction=OrderingDirection.ASC,
         first=first,
@@ -370,19 +368,18 @@ def resolve_coverage_totals(
 
 
 @commit_coverage_analytics_bindable.field("flagNames")
-@sync_to_async
 @sentry_sdk.trace
-def resolve_coverage_flags(commit: Commit, info: GraphQLResolveInfo) -> list[str]:
-    return commit.full_report.get_flag_names() if commit.full_report else []
+async def resolve_coverage_flags(commit: Commit, info: GraphQLResolveInfo) -> list[str]:
+    report = await ReportLoader.loader(info).load(commit)
+    return report.get_flag_names() if report else []
 
 
 @commit_coverage_analytics_bindable.field("coverageFile")
-@sync_to_async
 @sentry_sdk.trace
-def resolve_coverage_file(commit, info, path, flags=None, components=None):
+async def resolve_coverage_file(commit, info, path, flags=None, components=None):
     fallback_file, paths = None, []
     if components:
-        all_components = components_service.commit_components(
+        all_components = await sync_to_async(components_service.commit_components)(
             commit,
             info.context["request"].current_owner,
             should_use_sentry_app=getattr(
@@ -396,7 +393,9 @@ def resolve_coverage_file(commit, info, path, flags=None, components=None):
             paths.extend(fc.paths)
         fallback_file = FilteredReportFile(ReportFile(path), [])
 
-    commit_report = commit.full_report.filter(flags=flags, paths=paths)
+    report_loader = ReportLoader.loader(info)
+    report = await report_loader.load(commit)
+    commit_report = report_loader.filtered(commit, report, flags=flags, paths=paths)
     file_report = commit_report.get(path) or fallback_file
 
     return {
@@ -1,8 +1,8 @@
 from ariadne import ObjectType
-from asgiref.sync import sync_to_async
 
 from core.models import Commit
-from services.components import Component, component_filtered_report
+from graphql_api.dataloader.report import ReportLoader
+from services.components import Component, component_filters
 from shared.reports.types import ReportTotals
 
 component_bindable = ObjectType("Component")
@@ -19,9 +19,10 @@ def resolve_name(component: Component, info) -> str:
 
 
 @component_bindable.field("totals")
-@sync_to_async
-def resolve_totals(component: Component, info) -> ReportTotals | None:
+async def resolve_totals(component: Component, info) -> ReportTotals | None:
     commit: Commit = info.context["component_commit"]
-    report = commit.full_report
-    filtered_report = component_filtered_report(report, [component])
+    report_loader = ReportLoader.loader(info)
+    report = await report_loader.load(commit)
+    flags, paths = component_filters(report, [component])
+    filtered_report = report_loader.filtered(commit, report, flags=flags, paths=paths)
     return filtered_report.totals
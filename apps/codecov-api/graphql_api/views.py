@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+import shutil
 import socket
 import time
 from asyncio import iscoroutine
@@ -28,6 +29,7 @@ from codecov.commands.exceptions import BaseException
 from codecov.commands.executor import get_executor_from_request
 from codecov_auth.middleware import jwt_middleware
 from services import ServiceException
+from shared.bundle_analysis.sharded import local_shards_dir
 from shared.helpers.redis import get_redis_connection
 from shared.metrics import Counter, Histogram, inc_counter
 
@@ -182,6 +184,8 @@ class RequestFinalizer:
                     try:
                         if os.path.isfile(file_path) or os.path.islink(file_path):
                             os.unlink(file_path)
+                        # the bundles of sharded bundle analysis reports
+                        shutil.rmtree(local_shards_dir(file_path), ignore_errors=True)
                     except Exception as e:
                         log.info(
                             "Failed to delete temp file",
@@ -20,6 +20,7 @@ from reports.models import CommitReport
 from services import ServiceException
 from services.repo_providers import RepoProviderService
 from shared.api_archive.archive import ArchiveService
+from shared.helpers.diff_cache import COMPARE_DIFF, diff_cache
 from shared.helpers.redis import get_redis_connection
 from shared.helpers.yaml import walk
 from shared.reports.types import ReportTotals
@@ -710,8 +711,16 @@ class Comparison:
         """
         Fetches comparison, and caches the result.
         """
-        return async_to_sync(self._adapter.get_compare)(
-            self.base_commit.commitid, self.head_commit.commitid
+        base_commitid = self.base_commit.commitid
+        head_commitid = self.head_commit.commitid
+        return diff_cache.get_or_fetch(
+            self.head_commit.repository,
+            base_commitid,
+            head_commitid,
+            COMPARE_DIFF,
+            lambda: async_to_sync(self._adapter.get_compare)(
+                base_commitid, head_commitid
+            ),
         )
 
     @cached_property
@@ -28,17 +28,28 @@ def commit_components(
     return yaml.get_components()
 
 
-def component_filtered_report(
+def component_filters(
     report: Report, components: list[Component]
-) -> FilteredReport:
+) -> tuple[list[str], list[str]]:
     """
-    Filter a report such that the totals, etc. are only pertaining to the given component.
+    Returns the flags and path patterns a report has to be filtered by to only
+    pertain to the given components.
     """
     flags, paths = [], []
     report_flags = report.get_flag_names() if report else []
     for component in components:
         flags.extend(component.get_matching_flags(report_flags))
         paths.extend(component.paths)
+    return flags, paths
+
+
+def component_filtered_report(
+    report: Report, components: list[Component]
+) -> FilteredReport:
+    """
+    Filter a report such that the totals, etc. are only pertaining to the given component.
+    """
+    flags, paths = component_filters(report, components)
     filtered_report = report.filter(flags=flags, paths=paths)
     return filtered_report
 
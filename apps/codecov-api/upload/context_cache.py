@@ -0,0 +1,303 @@
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router
+from redis import Redis, RedisError
+
+from codecov_auth.models import Owner, Plan
+from core.models import Repository
+from shared.helpers.upload_context import repository_key, upload_token_key
+from shared.plan.service import PlanService
+
+log = logging.getLogger(__name__)
+
+# Entries are kept shortly in the memory of each process, which can't see the
+# invalidations happening in other processes, and a bit longer in Redis.
+LOCAL_TTL = 5
+REDIS_TTL = 60
+
+# Secrets are not copied to Redis, they are loaded from the database if ever accessed
+EXCLUDED_FIELDS = {
+    Repository: {"webhook_secret", "image_token", "upload_token"},
+    Owner: {
+        "oauth_token",
+        "email",
+        "business_email",
+        "stripe_customer_id",
+        "stripe_subscription_id",
+        "stripe_coupon_id",
+        "invoice_details",
+        "sentry_user_id",
+        "sentry_user_data",
+    },
+}
+# bounds the memory of the in-process entries
+MAX_LOCAL_ENTRIES = 10_000
+
+
+class _Encoder(DjangoJSONEncoder):
+    def default(self, o):
+        # `DjangoJSONEncoder` truncates datetimes to milliseconds
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _dump_instance(instance: models.Model) -> dict[str, Any]:
+    excluded = EXCLUDED_FIELDS.get(type(instance), set())
+    return {
+        field.attname: field.value_from_object(instance)
+        for field in instance._meta.concrete_fields
+        if field.attname not in excluded
+    }
+
+
+def _load_instance[M: models.Model](model: type[M], data: dict[str, Any]) -> M:
+    """
+    Builds a model instance as if it was loaded from the database,
+    with the fields missing from `data` deferred.
+    """
+    fields = [field for field in model._meta.concrete_fields if field.attname in data]
+    return model.from_db(
+        router.db_for_read(model),
+        [field.attname for field in fields],
+        [
+            None
+            if data[field.attname] is None
+            else field.to_python(data[field.attname])
+            for field in fields
+        ],
+    )
+
+
+class UploadContextCache:
+    """
+    Caches what every upload request needs to resolve before handling the upload:
+    the repository the upload token (or identity) points to, its owner, the owner
+    responsible for its billing, and the monthly uploads limit of that owner's plan.
+
+    The entries live for `LOCAL_TTL` in memory and `REDIS_TTL` in Redis, and are
+    invalidated when the repositories, owners or plans are saved. Cached entries are
+    only ever plain data, and new model instances are built for every request.
+    Upload tokens are only cached as hashes, and are checked against the database
+    on every lookup, as they can be revoked without saving the repository model.
+
+    Like `shared.helpers.diff_cache`, the cache is transparent until it is configured
+    with a Redis connection, which the API does at startup.
+    """
+
+    def __init__(self):
+        self._redis: Redis | None = None
+        self._local: dict[str, tuple[float, Any]] = {}
+
+    def configure(self, redis_connection: Redis | None):
+        self._redis = redis_connection
+        self._local.clear()
+
+    def get_repository_by_upload_token(self, upload_token) -> Repository | None:
+        def fetch() -> int | None:
+            repository = Repository.objects.filter(upload_token=upload_token).first()
+            return repository.repoid if repository else None
+
+        if self._redis is None:
+            return Repository.objects.filter(upload_token=upload_token).first()
+
+        key = upload_token_key(upload_token)
+        repoid = self._get_or_fetch(key, fetch)
+        if repoid is None:
+            return None
+        current = (
+            Repository.objects.filter(repoid=repoid)
+            .values_list("upload_token", "deleted")
+            .first()
+        )
+        if current is None or str(current[0]) != str(upload_token):
+            # the token was regenerated or revoked in the meantime
+            self.invalidate(key)
+            return Repository.objects.filter(upload_token=upload_token).first()
+        repository = self.get_repository(repoid)
+        if repository is not None:
+            repository.upload_token, repository.deleted = current
+        return repository
+
+    def get_repository_by_name(
+        self, service: str, owner_username: str, repo_name: str
+    ) -> Repository | None:
+        def query():
+            return Repository.objects.filter(
+                author__service=service,
+                author__username=owner_username,
+                name=repo_name,
+            ).first()
+
+        if self._redis is None:
+            return query()
+
+        def fetch() -> int | None:
+            repository = query()
+            return repository.repoid if repository else None
+
+        # the names are case insensitive
+        key = f"upload_context:name:{service}:{owner_username}:{repo_name}".lower()
+        repoid = self._get_or_fetch(key, fetch)
+        repository = self.get_repository(repoid) if repoid is not None else None
+        if repository is not None and (
+            repository.name.lower() != repo_name.lower()
+            or repository.author.username.lower() != owner_username.lower()
+            or repository.author.service != service
+        ):
+            # the repository or its owner were renamed in the meantime
+            self.invalidate(key)
+            return query()
+        return repository
+
+    def get_repository(self, repoid: int) -> Repository | None:
+        if self._redis is None:
+            return Repository.objects.filter(repoid=repoid).first()
+
+        def fetch() -> dict | None:
+            repository = Repository.objects.filter(repoid=repoid).first()
+            return _dump_instance(repository) if repository else None
+
+        data = self._get_or_fetch(repository_key(repoid), fetch)
+        if data is None:
+            return None
+        repository = _load_instance(Repository, data)
+        author = self.get_owner(repository.author_id)
+        if author is not None:
+            repository.author = author
+        return repository
+
+    def get_owner(self, ownerid: int) -> Owner | None:
+        data = self._get_owner_context(ownerid)
+        return _load_instance(Owner, data["owner"]) if data else None
+
+    def get_responsible_owner(self, repository: Repository) -> Owner:
+        """
+        Returns the owner the uploads to `repository` are billed to.
+        """
+        if self._redis is None:
+            return _find_responsible_owner(repository.author)
+        data = self._get_owner_context(repository.author_id)
+        if data is None:
+            return _find_responsible_owner(repository.author)
+        if data["responsible_ownerid"] == repository.author_id:
+            return repository.author
+        responsible_owner = self.get_owner(data["responsible_ownerid"])
+        if responsible_owner is None:
+            # the parent owner is gone, which fails the same way as without the cache
+            return _find_responsible_owner(repository.author)
+        return responsible_owner
+
+    def get_monthly_uploads_limit(self, owner: Owner) -> int | None:
+        if self._redis is None:
+            return PlanService(current_org=owner).monthly_uploads_limit
+        data = self._get_owner_context(owner.ownerid)
+        if data is None:
+            return PlanService(current_org=owner).monthly_uploads_limit
+        return data["monthly_uploads_limit"]
+
+    def get_plan_names(self) -> set[str]:
+        def fetch() -> list[str]:
+            return list(Plan.objects.values_list("name", flat=True))
+
+        if self._redis is None:
+            return set(fetch())
+        return set(self._get_or_fetch("upload_context:plans", fetch))
+
+    def invalidate(self, *keys: str):
+        for key in keys:
+            self._local.pop(key, None)
+        if self._redis is None:
+            return
+        try:
+            self._redis.delete(*keys)
+        except RedisError:
+            log.warning("Unable to invalidate the upload context cache", exc_info=True)
+
+    def invalidate_repository(self, repository: Repository, old_upload_token=None):
+        keys = [
+            repository_key(repository.repoid),
+            upload_token_key(repository.upload_token),
+        ]
+        if old_upload_token:
+            keys.append(upload_token_key(old_upload_token))
+        self.invalidate(*keys)
+
+    def invalidate_owner(self, owner: Owner):
+        self.invalidate(f"upload_context:owner:{owner.ownerid}")
+
+    def invalidate_plans(self):
+        """
+        The monthly uploads limits cached with the owners are only refreshed
+        when they expire.
+        """
+        self.invalidate("upload_context:plans")
+
+    def _get_owner_context(self, ownerid: int) -> dict | None:
+        def fetch() -> dict | None:
+            owner = Owner.objects.filter(ownerid=ownerid).first()
+            if owner is None:
+                return None
+            return {
+                "owner": _dump_instance(owner),
+                "responsible_ownerid": _find_responsible_owner(owner).ownerid,
+                # the limit of the plan of this owner, when it is the responsible owner
+                "monthly_uploads_limit": PlanService(
+                    current_org=owner
+                ).monthly_uploads_limit,
+            }
+
+        return self._get_or_fetch(f"upload_context:owner:{ownerid}", fetch)
+
+    def _get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        local = self._local.get(key)
+        if local is not None and local[0] > now:
+            return local[1]
+
+        value = self._read(key)
+        if value is None:
+            value = fetch()
+            if value is None:
+                # what wasn't found isn't cached, it might be created any time
+                return None
+            self._write(key, value)
+        if len(self._local) >= MAX_LOCAL_ENTRIES:
+            self._local = {k: v for k, v in self._local.items() if v[0] > now}
+            if len(self._local) >= MAX_LOCAL_ENTRIES:
+                self._local.clear()
+        self._local[key] = (now + LOCAL_TTL, value)
+        return value
+
+    def _read(self, key: str) -> Any:
+        try:
+            serialized = self._redis.get(key)
+        except RedisError:
+            log.warning("Unable to read the upload context cache", exc_info=True)
+            return None
+        return json.loads(serialized) if serialized is not None else None
+
+    def _write(self, key: str, value: Any):
+        try:
+            self._redis.set(key, json.dumps(value, cls=_Encoder), ex=REDIS_TTL)
+        except RedisError:
+            log.warning("Unable to write the upload context cache", exc_info=True)
+
+
+def _find_responsible_owner(owner: Owner) -> Owner:
+    if owner.service == "gitlab":
+        # Gitlab authors have a "subgroup" structure, so find the parent group before checking repo credits
+        while owner.parent_service_id is not None:
+            owner = Owner.objects.get(
+                service_id=owner.parent_service_id, service=owner.service
+            )
+    return owner
+
+
+upload_context_cache = UploadContextCache()
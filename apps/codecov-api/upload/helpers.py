@@ -25,7 +25,6 @@ from codecov_auth.models import (
     SERVICE_GITHUB_ENTERPRISE,
     GithubAppInstallation,
     Owner,
-    Plan,
 )
 from core.models import Commit, Repository
 from reports.models import CommitReport, ReportSession
@@ -45,7 +44,14 @@ from shared.reports.enums import UploadType
 from shared.torngit.base import TorngitBaseAdapter
 from shared.torngit.exceptions import TorngitClientError, TorngitObjectNotFoundError
 from shared.typings.oauth_token_types import OauthConsumerToken
+from shared.upload.counters import (
+    commit_sessions_key,
+    get_count,
+    owner_measurements_key,
+    verify_count,
+)
 from shared.upload.utils import query_monthly_coverage_measurements
+from upload.context_cache import upload_context_cache
 from upload.tokenless.tokenless import TokenlessUploadHandler
 from utils import is_uuid
 from utils.config import get_config
@@ -267,11 +273,11 @@ def get_repo_with_github_actions_oidc_token(token: str) -> Repository:
         audience=[settings.CODECOV_API_URL, settings.CODECOV_URL],
     )
     repo = str(data.get("repository")).split("/")[-1]
-    repository = Repository.objects.get(
-        author__service=service,
-        name=repo,
-        author__username=data.get("repository_owner"),
+    repository = upload_context_cache.get_repository_by_name(
+        service, str(data.get("repository_owner")), repo
     )
+    if repository is None:
+        raise Repository.DoesNotExist()
     return repository
 
 
@@ -282,9 +288,8 @@ def determine_repo_for_upload(upload_params: dict[str, Any]) -> Repository:
 
     if token and not using_global_token:
         if is_uuid(token):
-            try:
-                repository = Repository.objects.get(upload_token=token)
-            except ObjectDoesNotExist:
+            repository = upload_context_cache.get_repository_by_upload_token(token)
+            if repository is None:
                 raise NotFound(
                     f"Could not find a repository associated with upload token {token}"
                 )
@@ -551,29 +556,70 @@ def get_global_tokens() -> dict[str | None, Any]:
     return tokens
 
 
+def count_commit_sessions(commit: Commit) -> int:
+    return ReportSession.objects.filter(
+        ~Q(state="error"),
+        ~Q(upload_type=UploadType.CARRIEDFORWARD.db_name),
+        report__commit=commit,
+    ).count()
+
+
+def get_commit_session_count(commit: Commit, redis: Redis, limit: int) -> int:
+    """
+    Returns the number of sessions counting towards the upload limit of the `commit`.
+
+    This comes from an upload counter, which is only checked against the database
+    once it goes over the `limit`.
+    """
+    key = commit_sessions_key(commit.id)
+    session_count = get_count(redis, key, lambda: count_commit_sessions(commit))
+    if session_count > limit:
+        session_count = verify_count(redis, key, lambda: count_commit_sessions(commit))
+    return session_count
+
+
+def monthly_upload_limit_reached(commit: Commit, redis: Redis) -> bool:
+    """
+    Whether the owner of the `commit` used up the monthly uploads of its plan.
+    Only commits which don't have any uploads yet are affected by the limit.
+    """
+    owner = _determine_responsible_owner(commit.repository)
+    limit = upload_context_cache.get_monthly_uploads_limit(owner)
+    if limit is None:
+        return False
+
+    key = owner_measurements_key(owner.ownerid)
+
+    def count_measurements() -> int:
+        return query_monthly_coverage_measurements(
+            plan_service=PlanService(current_org=owner)
+        )
+
+    if get_count(redis, key, count_measurements) < limit:
+        return False
+    did_commit_uploads_start_already = ReportSession.objects.filter(
+        report__commit=commit
+    ).exists()
+    if did_commit_uploads_start_already:
+        return False
+    if verify_count(redis, key, count_measurements) < limit:
+        return False
+
+    log.warning(
+        "User exceeded its limits for usage",
+        extra={
+            "ownerid": owner.ownerid,
+            "repoid": commit.repository_id,
+        },
+    )
+    return True
+
+
 def check_commit_upload_constraints(commit: Commit) -> None:
     if settings.UPLOAD_THROTTLING_ENABLED and commit.repository.private:
-        owner = _determine_responsible_owner(commit.repository)
-        plan_service = PlanService(current_org=owner)
-        limit = plan_service.monthly_uploads_limit
-        if limit is not None:
-            did_commit_uploads_start_already = ReportSession.objects.filter(
-                report__commit=commit
-            ).exists()
-            if not did_commit_uploads_start_already:
-                if (
-                    query_monthly_coverage_measurements(plan_service=plan_service)
-                    >= limit
-                ):
-                    log.warning(
-                        "User exceeded its limits for usage",
-                        extra={
-                            "ownerid": owner.ownerid,
-                            "repoid": commit.repository_id,
-                        },
-                    )
-                    message = "Request was throttled. Throttled due to limit on private repository coverage uploads to Codecov on a free plan. Please upgrade your plan if you require additional uploads this month."
-                    raise Throttled(detail=message)
+        if monthly_upload_limit_reached(commit, get_redis_connection()):
+            message = "Request was throttled. Throttled due to limit on private repository coverage uploads to Codecov on a free plan. Please upgrade your plan if you require additional uploads this month."
+            raise Throttled(detail=message)
 
 
 def validate_upload(
@@ -619,13 +665,11 @@ def validate_upload(
         # Check if there are already too many sessions associated with this commit
         try:
             commit = Commit.objects.get(commitid=commitid, repository=repository)
-            new_session_count = ReportSession.objects.filter(
-                ~Q(state="error"),
-                ~Q(upload_type=UploadType.CARRIEDFORWARD.db_name),
-                report__commit=commit,
-            ).count()
             session_count = (commit.totals.get("s") if commit.totals else 0) or 0
             current_upload_limit = get_config("setup", "max_sessions") or 150
+            new_session_count = get_commit_session_count(
+                commit, redis, current_upload_limit
+            )
             if new_session_count > current_upload_limit:
                 if session_count <= current_upload_limit:
                     log.info(
@@ -687,7 +731,7 @@ def validate_upload(
 
             # If author is on per repo billing, check their repo credits
             if (
-                owner.plan not in Plan.objects.values_list("name", flat=True)
+                owner.plan not in upload_context_cache.get_plan_names()
                 and owner.repo_credits <= 0
             ):
                 raise ValidationError(
@@ -716,15 +760,7 @@ def validate_upload(
 
 
 def _determine_responsible_owner(repository: Repository) -> Owner:
-    owner = repository.author
-
-    if owner.service == "gitlab":
-        # Gitlab authors have a "subgroup" structure, so find the parent group before checking repo credits
-        while owner.parent_service_id is not None:
-            owner = Owner.objects.get(
-                service_id=owner.parent_service_id, service=owner.service
-            )
-    return owner
+    return upload_context_cache.get_responsible_owner(repository)
 
 
 def parse_headers(
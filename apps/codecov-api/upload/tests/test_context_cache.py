@@ -0,0 +1,186 @@
+import uuid
+
+import fakeredis
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from billing.tests.mocks import mock_all_plans_and_tiers
+from codecov_auth.models import Owner
+from core.models import Repository
+from shared.django_apps.core.tests.factories import (
+    CommitFactory,
+    OwnerFactory,
+    RepositoryFactory,
+)
+from shared.plan.constants import DEFAULT_FREE_PLAN
+from upload.context_cache import upload_context_cache
+from upload.helpers import check_commit_upload_constraints, determine_repo_for_upload
+
+
+class UploadContextCacheTests(TestCase):
+    def setUp(self):
+        mock_all_plans_and_tiers()
+        self.redis = fakeredis.FakeRedis()
+        upload_context_cache.configure(self.redis)
+        self.owner = OwnerFactory(
+            service="github", username="codecov", plan=DEFAULT_FREE_PLAN
+        )
+        self.repository = RepositoryFactory(author=self.owner, name="repo")
+
+    def tearDown(self):
+        upload_context_cache.configure(None)
+
+    def test_repository_by_upload_token(self):
+        token = self.repository.upload_token
+        repository = upload_context_cache.get_repository_by_upload_token(token)
+        assert repository == self.repository
+        assert repository.author == self.owner
+
+        # only the token itself is checked against the database
+        with self.assertNumQueries(1):
+            repository = upload_context_cache.get_repository_by_upload_token(token)
+            assert repository == self.repository
+            assert repository.upload_token == token
+            assert repository.author.username == "codecov"
+
+        # from Redis, as if from another process
+        upload_context_cache._local.clear()
+        with self.assertNumQueries(1):
+            repository = upload_context_cache.get_repository_by_upload_token(token)
+            assert repository.name == "repo"
+            assert repository.author_id == self.owner.ownerid
+
+    def test_secrets_are_not_cached(self):
+        self.owner.oauth_token = "secret"
+        self.owner.save()
+        upload_context_cache.get_repository_by_upload_token(
+            self.repository.upload_token
+        )
+        cached = b"".join(
+            [*self.redis.keys(), *(self.redis.get(key) for key in self.redis.keys())]
+        )
+        assert b"secret" not in cached
+        assert str(self.repository.upload_token).encode() not in cached
+
+        upload_context_cache._local.clear()
+        repository = upload_context_cache.get_repository_by_upload_token(
+            self.repository.upload_token
+        )
+        assert "oauth_token" in repository.author.get_deferred_fields()
+        assert repository.author.oauth_token == "secret"
+
+    def test_unknown_upload_token(self):
+        assert upload_context_cache.get_repository_by_upload_token(uuid.uuid4()) is None
+        assert self.redis.keys() == []
+
+    def test_regenerated_upload_token(self):
+        old_token = self.repository.upload_token
+        upload_context_cache.get_repository_by_upload_token(old_token)
+
+        self.repository.upload_token = uuid.uuid4()
+        self.repository.save()
+
+        assert upload_context_cache.get_repository_by_upload_token(old_token) is None
+        assert (
+            upload_context_cache.get_repository_by_upload_token(
+                self.repository.upload_token
+            )
+            == self.repository
+        )
+
+    def test_revoked_upload_token(self):
+        old_token = self.repository.upload_token
+        upload_context_cache.get_repository_by_upload_token(old_token)
+
+        # like the repository cleanup of the worker, without any signals
+        Repository.objects.filter(repoid=self.repository.repoid).update(
+            deleted=True, upload_token=uuid.uuid4()
+        )
+
+        assert upload_context_cache.get_repository_by_upload_token(old_token) is None
+
+    def test_repository_by_name(self):
+        repository = upload_context_cache.get_repository_by_name(
+            "github", "Codecov", "Repo"
+        )
+        assert repository == self.repository
+        with self.assertNumQueries(0):
+            assert (
+                upload_context_cache.get_repository_by_name("github", "codecov", "repo")
+                == self.repository
+            )
+
+        self.repository.name = "renamed"
+        self.repository.save()
+        assert (
+            upload_context_cache.get_repository_by_name("github", "codecov", "repo")
+            is None
+        )
+
+    def test_owner_saves_invalidate(self):
+        upload_context_cache.get_repository_by_upload_token(
+            self.repository.upload_token
+        )
+        self.owner.username = "renamed"
+        self.owner.save()
+
+        repository = upload_context_cache.get_repository_by_upload_token(
+            self.repository.upload_token
+        )
+        assert repository.author.username == "renamed"
+
+    def test_responsible_owner(self):
+        parent = OwnerFactory(service="gitlab", service_id="1", parent_service_id=None)
+        child = OwnerFactory(service="gitlab", service_id="2", parent_service_id="1")
+        repository = RepositoryFactory(author=child)
+
+        assert upload_context_cache.get_responsible_owner(repository) == parent
+        assert upload_context_cache.get_responsible_owner(self.repository) == self.owner
+        repository = upload_context_cache.get_repository(repository.repoid)
+        with self.assertNumQueries(0):
+            assert upload_context_cache.get_responsible_owner(repository) == parent
+            assert (
+                upload_context_cache.get_responsible_owner(self.repository)
+                == self.owner
+            )
+
+    def test_responsible_owner_missing_parent(self):
+        parent = OwnerFactory(service="gitlab", service_id="1", parent_service_id=None)
+        child = OwnerFactory(service="gitlab", service_id="2", parent_service_id="1")
+        repository = RepositoryFactory(author=child)
+        assert upload_context_cache.get_responsible_owner(repository) == parent
+
+        Owner.objects.filter(ownerid=parent.ownerid).delete()
+        upload_context_cache._local.clear()
+        with self.assertRaises(Owner.DoesNotExist):
+            upload_context_cache.get_responsible_owner(repository)
+
+    @override_settings(UPLOAD_THROTTLING_ENABLED=True)
+    def test_queries_per_upload(self):
+        """
+        The queries needed to resolve and throttle an upload, without and with the
+        cache.
+        """
+        self.repository.private = True
+        self.repository.save()
+        commit = CommitFactory(repository=self.repository)
+        upload_params = {"token": str(self.repository.upload_token)}
+
+        def resolve_upload():
+            repository = determine_repo_for_upload(upload_params)
+            commit.repository = repository
+            check_commit_upload_constraints(commit)
+
+        upload_context_cache.configure(None)
+        with CaptureQueriesContext(connection) as uncached:
+            resolve_upload()
+
+        upload_context_cache.configure(self.redis)
+        resolve_upload()
+        with CaptureQueriesContext(connection) as cached:
+            resolve_upload()
+
+        assert len(uncached.captured_queries) >= 2
+        # the upload token is always checked against the database
+        assert len(cached.captured_queries) == 1
@@ -13,6 +13,7 @@ from shared.django_apps.core.tests.factories import (
 from shared.django_apps.reports.models import ReportType
 from shared.helpers.redis import get_redis_connection
 from shared.plan.constants import DEFAULT_FREE_PLAN
+from shared.upload.counters import commit_sessions_key, increment_count
 from shared.upload.utils import UploaderType, insert_coverage_measurement
 from upload.throttles import UploadsPerCommitThrottle, UploadsPerWindowThrottle
 
@@ -200,3 +201,24 @@ class ThrottlesUnitTests(APITestCase):
         self.request_should_not_throttle(commit)
         assert redis.get(cache_key) == b"1"
         redis.delete(cache_key)
+
+    def test_uploads_per_commit_counter(self):
+        redis = get_redis_connection()
+        repo = RepositoryFactory.create(author=self.owner)
+        commit = CommitFactory.create(repository=repo)
+        redis.delete(commit_sessions_key(commit.id))
+        report = CommitReportFactory.create(commit=commit)
+        for i in range(150):
+            UploadFactory.create(report=report)
+
+        # seeds the counter from the database
+        self.uploads_per_commit_not_throttled(commit)
+        with self.assertNumQueries(0):
+            self.uploads_per_commit_not_throttled(commit)
+
+        UploadFactory.create(report=report)
+        increment_count(redis, commit_sessions_key(commit.id))
+        self.uploads_per_commit_throttled(commit)
+        redis.delete(
+            commit_sessions_key(commit.id), f"{commit_sessions_key(commit.id)}:verified"
+        )
@@ -1,5 +1,6 @@
 from codecov_auth.models import Owner, Service
 from core.models import Repository
+from upload.context_cache import upload_context_cache
 
 
 def get_repository_and_owner_from_string(
@@ -14,24 +15,15 @@ def get_repository_and_owner_from_string(
         return None, None
 
     owner_identifier, repo_name_identifier = repo_identifier.rsplit("::::", 1)
-    owner = _get_owner_from_string(service, owner_identifier)
-    if not owner:
-        return None, None
-    try:
-        repository = Repository.objects.get(author=owner, name=repo_name_identifier)
-    except Repository.DoesNotExist:
-        return None, None
-
-    return repository, owner
-
-
-def _get_owner_from_string(service: Service, owner_identifier: str) -> Owner | None:
     if ":::" in owner_identifier:
         owner_identifier = owner_identifier.replace(":::", ":")
-    try:
-        return Owner.objects.get(service=service, username=owner_identifier)
-    except Owner.DoesNotExist:
-        return None
+    repository = upload_context_cache.get_repository_by_name(
+        service.value, owner_identifier, repo_name_identifier
+    )
+    if repository is None:
+        return None, None
+
+    return repository, repository.author
 
 
 def get_repository_from_string(
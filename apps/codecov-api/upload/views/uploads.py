@@ -31,6 +31,7 @@ from shared.api_archive.archive import ArchiveService, MinioEndpoints
 from shared.events.amplitude import UNKNOWN_USER_OWNERID, AmplitudeEventPublisher
 from shared.helpers.redis import get_redis_connection
 from shared.metrics import inc_counter
+from shared.upload.counters import commit_sessions_key, increment_count
 from shared.upload.utils import UploaderType, insert_coverage_measurement
 from upload.helpers import (
     dispatch_upload_task,
@@ -79,6 +80,7 @@ def create_upload(
         upload_extras={"format_version": "v1"},
         state="started",
     )
+    increment_count(get_redis_connection(), commit_sessions_key(commit.id))
 
     # Inserts mirror upload record into measurements table. CLI hits this endpoint
     insert_coverage_measurement(
@@ -19,6 +19,7 @@ from shared.celery_config import (
 )
 from shared.config import get_config
 from shared.helpers.cache import RedisBackend, cache
+from shared.helpers.diff_cache import diff_cache
 from shared.helpers.redis import get_redis_connection
 
 log = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ def initialize_cache(**kwargs):
     log.info("Initialized cache")
     redis_cache_backend = RedisBackend(get_redis_connection())
     cache.configure(redis_cache_backend)
+    diff_cache.configure(get_redis_connection())
 
 
 hourly_check_task_name = "app.cron.hourly_check.HourlyCheckTask"
@@ -1,5 +1,6 @@
 import json
 import logging
+from collections.abc import Iterable
 
 from google.cloud import pubsub_v1
 from sqlalchemy import event, inspect
@@ -26,8 +27,8 @@ def _get_pubsub_publisher():
     return _pubsub_publisher
 
 
-def _sync_repo(repository: Repository):
-    log.info(f"Signal triggered for repository {repository.repoid}")
+def _sync_repo(repoid: int):
+    log.info(f"Signal triggered for repository {repoid}")
     try:
         pubsub_project_id = get_config("setup", "shelter", "pubsub_project_id")
         pubsub_topic_id = get_config("setup", "shelter", "sync_repo_topic_id")
@@ -41,13 +42,26 @@ def _sync_repo(repository: Repository):
                     {
                         "type": "repo",
                         "sync": "one",
-                        "id": repository.repoid,
+                        "id": repoid,
                     }
                 ).encode("utf-8"),
             )
-        log.info(f"Message published for repository {repository.repoid}")
+        log.info(f"Message published for repository {repoid}")
     except Exception as e:
-        log.warning(f"Failed to publish message for repo {repository.repoid}: {e}")
+        log.warning(f"Failed to publish message for repo {repoid}: {e}")
+
+
+def sync_repos_with_shelter(repoids: Iterable[int]):
+    """
+    Signals the repos that were inserted or updated with bulk statements,
+    which bypass the SQLAlchemy events below.
+    """
+    if not _is_shelter_enabled():
+        log.debug("Shelter is not enabled, skipping bulk upsert signal")
+        return
+
+    for repoid in repoids:
+        _sync_repo(repoid)
 
 
 @event.listens_for(Repository, "after_insert")
@@ -58,7 +72,7 @@ def after_insert_repo(mapper, connection, target: Repository):
 
     # Send to shelter service
     log.info("After insert signal", extra={"repoid": target.repoid})
-    _sync_repo(target)
+    _sync_repo(target.repoid)
 
 
 @event.listens_for(Repository, "after_update")
@@ -81,5 +95,5 @@ def after_update_repo(mapper, connection, target: Repository):
                 new_value = history.added[0]
                 if old_value != new_value:
                     log.info("After update signal", extra={"repoid": target.repoid})
-                    _sync_repo(target)
+                    _sync_repo(target.repoid)
                     break
@@ -16,6 +16,7 @@ from database.enums import Decoration, Notification, NotificationState, ReportTy
 from database.utils import ArchiveField
 from shared.django_apps.utils.config import should_write_data_to_storage_config_check
 from shared.plan.constants import DEFAULT_FREE_PLAN
+from shared.utils.totals import commit_totals_columns
 
 
 class AccountsUsers(CodecovBaseModel, MixinBaseClassNoExternalID):
@@ -351,6 +352,13 @@ class Commit(CodecovBaseModel):
     timestamp = Column(types.DateTime, nullable=False)
     updatestamp = Column(types.DateTime, nullable=True)
     totals = Column(postgresql.JSON)
+    totals_coverage = Column(types.Float)
+    totals_hits = Column(types.Integer)
+    totals_misses = Column(types.Integer)
+    totals_partials = Column(types.Integer)
+    totals_lines = Column(types.Integer)
+    totals_complexity = Column(types.Float)
+    totals_complexity_total = Column(types.Float)
 
     author = relationship(Owner)
     repository = relationship(Repository, backref=backref("commits", cascade="delete"))
@@ -370,6 +378,12 @@ class Commit(CodecovBaseModel):
     def __repr__(self):
         return f"Commit<{self.commitid}@repo<{self.repoid}>>"
 
+    @validates("totals")
+    def validate_totals(self, key, value):
+        for name, column_value in commit_totals_columns(value).items():
+            setattr(self, name, column_value)
+        return value
+
     def get_parent_commit(self):
         db_session = self.get_db_session()
         return (
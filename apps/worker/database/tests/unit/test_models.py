@@ -123,6 +123,21 @@ class TestReprModels:
         dbsession.refresh(commit)
         assert commit.notified is True
 
+    def test_commit_totals_columns(self, dbsession):
+        commit = CommitFactory.create(totals=None)
+        dbsession.add(commit)
+        dbsession.flush()
+        assert commit.totals_lines is None
+
+        commit.totals = {"c": "85.00000", "h": 17, "m": 3, "p": 0, "n": 20}
+        dbsession.flush()
+        dbsession.refresh(commit)
+        assert commit.totals_coverage == 85.0
+        assert commit.totals_hits == 17
+        assert commit.totals_misses == 3
+        assert commit.totals_lines == 20
+        assert commit.totals_complexity is None
+
 
 class TestPullModel:
     def test_updatestamp_update(self, dbsession):
@@ -1,6 +1,8 @@
 import re
 from dataclasses import dataclass
 
+from shared.utils.match import combine_patterns
+
 
 @dataclass
 class Component:
@@ -29,11 +31,12 @@ class Component:
         return self.name or self.component_id or "default_component"
 
     def get_matching_flags(self, current_flags: list[str]) -> list[str]:
-        ans = set()
-        compiled_regexes = (re.compile(flag_regex) for flag_regex in self.flag_regexes)
-        for regex_to_match in compiled_regexes:
-            matches_to_this_regex = filter(
-                lambda flag: regex_to_match.match(flag), current_flags
-            )
-            ans.update(matches_to_this_regex)
+        compiled_regexes = combine_patterns(
+            re.compile(flag_regex) for flag_regex in self.flag_regexes
+        )
+        ans = {
+            flag
+            for flag in current_flags
+            if any(regex.match(flag) for regex in compiled_regexes)
+        }
         return list(ans)
@@ -13,6 +13,12 @@ PARALLEL_COMPONENT_COMPARISON = Feature("parallel_component_comparison")
 
 TA_TIMESERIES = Feature("ta_timeseries")
 
+TA_TIMESERIES_COPY_INGESTION = Feature("ta_timeseries_copy_ingestion")
+
+UPLOAD_FINISHER_ELECTED_MERGER = Feature("upload_finisher_elected_merger")
+
 DISABLE_CROSS_POLLINATION_MESSAGE = Feature("disable_cross_pollination_message")
 
 ALLOW_VITEST_EVALS = Feature("vitest_evals")
+
+BUNDLE_ANALYSIS_SHARDED_STORAGE = Feature("bundle_analysis_sharded_storage")
@@ -5,16 +5,24 @@ from dataclasses import dataclass
 from typing import Any
 
 import sentry_sdk
-from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
 from database.enums import ReportType
 from database.models.core import Commit
 from database.models.reports import CommitReport, Upload, UploadError
-from database.models.timeseries import Measurement, MeasurementName
+from database.models.timeseries import MeasurementName
+from rollouts import BUNDLE_ANALYSIS_SHARDED_STORAGE
 from services.report import BaseReportService
-from services.timeseries import repository_datasets_query
-from shared.bundle_analysis import BundleAnalysisReport, BundleAnalysisReportLoader
+from services.timeseries import (
+    create_measurement_dict,
+    repository_datasets_query,
+    upsert_measurements,
+)
+from shared.bundle_analysis import (
+    BundleAnalysisReport,
+    BundleAnalysisReportLoader,
+    ShardedBundleAnalysisReport,
+)
 from shared.bundle_analysis.models import AssetType, MetadataKey
 from shared.bundle_analysis.storage import get_bucket_name
 from shared.django_apps.bundle_analysis.models import CacheConfig
@@ -195,7 +203,11 @@ class BundleAnalysisReportService(BaseReportService):
     ) -> BundleAnalysisReport:
         """Attempts to carry over parent bundle analysis report if current commit doesn't have a report.
         Fallback to creating a fresh bundle analysis report if there is no previous report to carry over.
+        New reports are sharded by bundle when the repository has sharded storage enabled.
         """
+        sharded = BUNDLE_ANALYSIS_SHARDED_STORAGE.check_value(
+            commit.repoid, default=False
+        )
         # load a new copy of the previous bundle report into temp file
         bundle_report = self._previous_bundle_analysis_report(
             bundle_loader, commit, head_bundle_report=None
@@ -211,15 +223,22 @@ class BundleAnalysisReportService(BaseReportService):
             # if caching is on then update bundle.is_cached property to true
             # if caching is off then delete that bundle from the report
             update_fields = {}
-            for bundle in bundle_report.bundle_reports():
-                if bundle.name in bundles_to_be_cached:
-                    update_fields[bundle.name] = True
+            for bundle_name in bundle_report.bundle_names():
+                if bundle_name in bundles_to_be_cached:
+                    update_fields[bundle_name] = True
                 else:
-                    bundle_report.delete_bundle_by_name(bundle.name)
+                    bundle_report.delete_bundle_by_name(bundle_name)
             if update_fields:
                 bundle_report.update_is_cached(update_fields)
+
+            if sharded and not isinstance(bundle_report, ShardedBundleAnalysisReport):
+                sharded_report = ShardedBundleAnalysisReport.from_report(bundle_report)
+                bundle_report.cleanup()
+                return sharded_report
             return bundle_report
         # fallback to create a fresh bundle analysis report if there is no previous report to carry over
+        if sharded:
+            return ShardedBundleAnalysisReport()
         return BundleAnalysisReport()
 
     @sentry_sdk.trace
@@ -263,9 +282,9 @@ class BundleAnalysisReportService(BaseReportService):
 
                 # Turn on caching option by default for all new bundles only for default branch
                 if commit.branch == commit.repository.branch:
-                    for bundle in bundle_report.bundle_reports():
+                    for name in bundle_report.bundle_names():
                         BundleAnalysisCacheConfigService.create_if_not_exists(
-                            commit.repoid, bundle.name
+                            commit.repoid, name
                         )
 
             # save the bundle report back to storage
@@ -343,41 +362,6 @@ class BundleAnalysisReportService(BaseReportService):
             bundle_name=bundle_name,
         )
 
-    def _save_to_timeseries(
-        self,
-        db_session: Session,
-        commit: Commit,
-        name: str,
-        measurable_id: str,
-        value: float,
-    ):
-        command = postgresql.insert(Measurement.__table__).values(
-            name=name,
-            owner_id=commit.repository.ownerid,
-            repo_id=commit.repoid,
-            measurable_id=measurable_id,
-            branch=commit.branch,
-            commit_sha=commit.commitid,
-            timestamp=commit.timestamp,
-            value=value,
-        )
-        command = command.on_conflict_do_update(
-            index_elements=[
-                Measurement.name,
-                Measurement.owner_id,
-                Measurement.repo_id,
-                Measurement.measurable_id,
-                Measurement.commit_sha,
-                Measurement.timestamp,
-            ],
-            set_={
-                "branch": command.excluded.branch,
-                "value": command.excluded.value,
-            },
-        )
-        db_session.execute(command)
-        db_session.flush()
-
     @sentry_sdk.trace
     def save_measurements(
         self, commit: Commit, upload: Upload, bundle_name: str
@@ -399,27 +383,33 @@ class BundleAnalysisReportService(BaseReportService):
             db_session = commit.get_db_session()
             bundle_report = bundle_analysis_report.bundle_report(bundle_name)
             if bundle_report:
+                asset_sizes = bundle_report.asset_sizes()
+                measurements = []
+
                 # For overall bundle size
                 if MeasurementName.bundle_analysis_report_size.value in dataset_names:
-                    self._save_to_timeseries(
-                        db_session,
-                        commit,
-                        MeasurementName.bundle_analysis_report_size.value,
-                        bundle_report.name,
-                        bundle_report.total_size(),
+                    measurements.append(
+                        create_measurement_dict(
+                            MeasurementName.bundle_analysis_report_size.value,
+                            commit,
+                            measurable_id=bundle_report.name,
+                            value=sum(
+                                sum(sizes.values()) for sizes in asset_sizes.values()
+                            ),
+                        )
                     )
 
                 # For individual javascript associated assets using UUID
                 if MeasurementName.bundle_analysis_asset_size.value in dataset_names:
-                    for asset in bundle_report.asset_reports():
-                        if asset.asset_type == AssetType.JAVASCRIPT:
-                            self._save_to_timeseries(
-                                db_session,
-                                commit,
+                    for uuid, size in asset_sizes.get(AssetType.JAVASCRIPT, {}).items():
+                        measurements.append(
+                            create_measurement_dict(
                                 MeasurementName.bundle_analysis_asset_size.value,
-                                asset.uuid,
-                                asset.size,
+                                commit,
+                                measurable_id=uuid,
+                                value=size,
                             )
+                        )
 
                 # For asset types sizes
                 asset_type_map = {
@@ -430,18 +420,18 @@ class BundleAnalysisReportService(BaseReportService):
                 }
                 for measurement_name, asset_type in asset_type_map.items():
                     if measurement_name.value in dataset_names:
-                        total_size = 0
-                        for asset in bundle_report.asset_reports():
-                            if asset.asset_type == asset_type:
-                                total_size += asset.size
-                        self._save_to_timeseries(
-                            db_session,
-                            commit,
-                            measurement_name.value,
-                            bundle_report.name,
-                            total_size,
+                        measurements.append(
+                            create_measurement_dict(
+                                measurement_name.value,
+                                commit,
+                                measurable_id=bundle_report.name,
+                                value=sum(asset_sizes.get(asset_type, {}).values()),
+                            )
                         )
 
+                if measurements:
+                    upsert_measurements(db_session, measurements)
+
             return ProcessingResult(
                 upload=upload,
                 commit=commit,
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from textwrap import dedent
 from unittest.mock import PropertyMock
 
@@ -108,6 +109,12 @@ async def test_bundle_analysis_save_measurements_report_size(
         def total_size(self):
             return self.size
 
+        def asset_sizes(self):
+            return {
+                AssetType.JAVASCRIPT: {"UUID1": 1000},
+                AssetType.IMAGE: {"UUID2": 111},
+            }
+
     class MockBundleAnalysisReport:
         def bundle_report(self, bundle_name):
             return MockBundleReport("BundleA", 1111)
@@ -218,6 +225,12 @@ async def test_bundle_analysis_save_measurements_asset_size(
                 MockAssetReport("UUID2", 321, AssetType.JAVASCRIPT),
             ]
 
+        def asset_sizes(self):
+            sizes = defaultdict(dict)
+            for asset in self.asset_reports():
+                sizes[asset.asset_type][asset.uuid] = asset.size
+            return sizes
+
     class MockBundleAnalysisReport:
         def bundle_report(self, bundle_name):
             return MockBundleReport("BundleA", 1111)
@@ -338,6 +351,12 @@ async def test_bundle_analysis_save_measurements_asset_type_sizes(
                 MockAssetReport("UUID4", 444, AssetType.STYLESHEET),
             ]
 
+        def asset_sizes(self):
+            sizes = defaultdict(dict)
+            for asset in self.asset_reports():
+                sizes[asset.asset_type][asset.uuid] = asset.size
+            return sizes
+
     class MockBundleAnalysisReport:
         def bundle_report(self, bundle_name):
             return MockBundleReport("BundleA", 1111)
@@ -1,4 +1,5 @@
 import dataclasses
+import json
 from collections import defaultdict
 from collections.abc import Callable
 from functools import partial
@@ -111,6 +112,7 @@ def cleanup_commitreport(context: CleanupContext, query: QuerySet):
             break
 
         buckets_paths: dict[str, list[str]] = defaultdict(list)
+        sharded_reports: list[tuple[str, str]] = []
         for (
             _pk,
             report_type,
@@ -130,12 +132,13 @@ def cleanup_commitreport(context: CleanupContext, query: QuerySet):
 
             # depending on the `report_type`, we have:
             # - a `chunks` file for coverage
-            # - a `bundle_report.sqlite` for BA
+            # - a `bundle_report.sqlite`, or a manifest and its shards for BA
             if report_type == "bundle_analysis":
                 path = StoragePaths.bundle_report.path(
                     repo_key=repo_hash, report_key=external_id
                 )
                 buckets_paths[context.bundleanalysis_bucket].append(path)
+                sharded_reports.append((repo_hash, external_id))
             elif report_type == "test_results":
                 # TA has cached rollups, but those are based on `Branch`
                 pass
@@ -149,6 +152,9 @@ def cleanup_commitreport(context: CleanupContext, query: QuerySet):
                 )
                 buckets_paths[context.default_bucket].append(path)
 
+        buckets_paths[context.bundleanalysis_bucket].extend(
+            sharded_bundle_report_paths(context, sharded_reports)
+        )
         cleaned_files = cleanup_files_batched(context, buckets_paths)
         context.add_progress(cleaned_files=cleaned_files)
 
@@ -158,6 +164,39 @@ def cleanup_commitreport(context: CleanupContext, query: QuerySet):
         context.add_progress(cleaned_models)
 
 
+def sharded_bundle_report_paths(
+    context: CleanupContext, reports: list[tuple[str, str]]
+) -> list[str]:
+    """
+    Returns the paths of the manifests and shards of the given bundle analysis
+    reports which are stored sharded by bundle.
+    """
+
+    def read_manifest(report: tuple[str, str]) -> list[str]:
+        repo_key, report_key = report
+        manifest_path = StoragePaths.bundle_report_manifest.path(
+            repo_key=repo_key, report_key=report_key
+        )
+        try:
+            manifest = json.loads(
+                context.storage.read_file(context.bundleanalysis_bucket, manifest_path)
+            )
+        except FileNotInStorageError:
+            return []
+        return [
+            StoragePaths.bundle_report_shard.path(
+                repo_key=repo_key, report_key=report_key, shard_key=bundle["shard"]
+            )
+            for bundle in manifest["bundles"].values()
+        ] + [manifest_path]
+
+    return [
+        path
+        for paths in context.threadpool.map(read_manifest, reports)
+        for path in paths
+    ]
+
+
 @sentry_sdk.trace
 def cleanup_upload(context: CleanupContext, query: QuerySet):
     # delete `None` `storage_path`s or carryforwarded right away,
@@ -196,6 +235,23 @@ def cleanup_repository(context: CleanupContext, query: QuerySet):
     # The equivalent of `SET NULL`:
     Repository.objects.filter(fork__in=query).update(fork=None)
 
+    # Cleans up the diffs cached in the archive, which no model refers to:
+    buckets_paths: dict[str, list[str]] = defaultdict(list)
+    for repoid, repo_service, repo_service_id in query.values_list(
+        "repoid", "author__service", "service_id"
+    ):
+        fake_repo = FakeRepository(
+            repoid=repoid, service=repo_service, service_id=repo_service_id
+        )
+        prefix = MinioEndpoints.diffs_folder.get_path(
+            version="v4", repo_hash=ArchiveService.get_archive_hash(fake_repo)
+        )
+        buckets_paths[context.default_bucket].extend(
+            context.storage.list_folder_contents(context.default_bucket, prefix)
+        )
+    cleaned_files = cleanup_files_batched(context, buckets_paths)
+    context.add_progress(cleaned_files=cleaned_files)
+
     # Cleans up all the `timeseries` stuff:
     if is_timeseries_enabled():
         by_owner: dict[int, list[int]] = defaultdict(list)
@@ -8,6 +8,8 @@ from services.cleanup.cleanup import cleanup_queryset
 from services.cleanup.utils import CleanupResult, CleanupSummary, cleanup_context
 from shared.django_apps.codecov_auth.models import Owner
 from shared.django_apps.core.models import Repository
+from shared.helpers.redis import get_redis_connection
+from shared.helpers.upload_context import invalidate_repository
 
 log = logging.getLogger(__name__)
 
@@ -70,6 +72,7 @@ def start_repo_cleanup(repo_id: int) -> tuple[bool, int]:
             owner_username,
             owner_service,
             owner_service_id,
+            upload_token,
         ) = (
             Repository.objects.select_for_update(nowait=True)
             .values_list(
@@ -79,6 +82,7 @@ def start_repo_cleanup(repo_id: int) -> tuple[bool, int]:
                 "author__username",
                 "author__service",
                 "author__service_id",
+                "upload_token",
             )
             .get(repoid=repo_id)
         )
@@ -102,5 +106,8 @@ def start_repo_cleanup(repo_id: int) -> tuple[bool, int]:
             upload_token=new_token,
             image_token=new_token,
         )
+        # `update` does not send any signals, so the API would keep accepting the
+        # revoked upload token from its cache
+        invalidate_repository(get_redis_connection(), repo_id, upload_token)
 
     return (True, shadow_owner.ownerid)
@@ -10,6 +10,7 @@ from database.models import CompareCommit
 from services.comparison.changes import get_changes
 from services.comparison.types import Comparison, FullCommit, ReportUploadedCount
 from services.repository import get_repo_provider_service
+from shared.helpers.diff_cache import COMPARE_DIFF, diff_cache
 from shared.reports.changes import run_comparison_using_rust
 from shared.reports.types import Change, ReportTotals
 from shared.torngit.base import TorngitBaseAdapter
@@ -130,20 +131,18 @@ class ComparisonProxy:
             if bases_match and self._adjusted_base_diff is not NOT_RESOLVED:
                 self._original_base_diff = self._adjusted_base_diff
             elif patch_coverage_base_commitid is not None:
-                pull_diff = async_to_sync(self.repository_service.get_compare)(
-                    patch_coverage_base_commitid, head.commitid, with_commits=False
+                self._original_base_diff = self._get_compare_diff(
+                    patch_coverage_base_commitid, head.commitid
                 )
-                self._original_base_diff = pull_diff["diff"]
             else:
                 return None
         elif populate_adjusted_base_diff:
             if bases_match and self._original_base_diff is not NOT_RESOLVED:
                 self._adjusted_base_diff = self._original_base_diff
             elif base is not None:
-                pull_diff = async_to_sync(self.repository_service.get_compare)(
-                    base.commitid, head.commitid, with_commits=False
+                self._adjusted_base_diff = self._get_compare_diff(
+                    base.commitid, head.commitid
                 )
-                self._adjusted_base_diff = pull_diff["diff"]
             else:
                 return None
 
@@ -152,6 +151,22 @@ class ComparisonProxy:
         else:
             return self._adjusted_base_diff
 
+    def _get_compare_diff(self, base_commitid: str, head_commitid: str) -> dict:
+        def fetch_compare() -> dict:
+            # with its commits, as the API caches the same comparisons
+            return async_to_sync(self.repository_service.get_compare)(
+                base_commitid, head_commitid
+            )
+
+        pull_diff = diff_cache.get_or_fetch(
+            self.comparison.head.commit.repository,
+            base_commitid,
+            head_commitid,
+            COMPARE_DIFF,
+            fetch_compare,
+        )
+        return pull_diff["diff"]
+
     def get_changes(self) -> list[Change] | None:
         if self._changes is NOT_RESOLVED:
             diff = self.get_diff()
@@ -7,6 +7,7 @@ from typing import Any
 import sentry_sdk
 
 from shared.helpers.numeric import ratio
+from shared.reports.diff import segment_runs
 from shared.reports.resources import Report
 from shared.reports.types import Change, ReportTotals
 from shared.utils.merge import line_type
@@ -55,8 +56,8 @@ def diff_totals(base, head, absolute=None) -> bool | None | ReportTotals:
 
 def get_segment_offsets(segments) -> tuple[dict[int, Any], list[int], list[int]]:
     offsets: dict[int, int] = defaultdict(int)
-    additions = []
-    removals = []
+    additions: list[int] = []
+    removals: list[int] = []
     # loop through the segments
     for seg in segments:
         # get the starting line number
@@ -68,18 +69,24 @@ def get_segment_offsets(segments) -> tuple[dict[int, Any], list[int], list[int]]
             or 1
         )
         starting_diff = start - base_start
-        # loop through all the lines
-        for ln, line in enumerate(seg["lines"], start=start):
-            l0 = line[0]
-            if l0 == "-":
-                removals.append(ln + offset_l - starting_diff)
-                offsets[ln + offset_r] += 1
-                offset_r -= 1
-
-            elif l0 == "+":
-                additions.append(ln + offset_r)
-                offsets[ln + offset_r] -= 1
-                offset_l -= 1
+        # loop through all the runs of lines, `ln` being the segment line number
+        # of the first line in the run
+        ln = start
+        for kind, count in segment_runs(seg):
+            if kind == "-":
+                # every removed line shifts the same head line
+                first = ln + offset_l - starting_diff
+                removals.extend(range(first, first + count))
+                offsets[ln + offset_r] += count
+                offset_r -= count
+
+            elif kind == "+":
+                first = ln + offset_r
+                additions.extend(range(first, first + count))
+                for line in range(first, first + count):
+                    offsets[line] -= 1
+                offset_l -= count
+            ln += count
     return {k: v for k, v in offsets.items() if v != 0}, additions, removals
 
 
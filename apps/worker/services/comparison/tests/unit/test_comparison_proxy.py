@@ -61,7 +61,6 @@ class TestComparisonProxy:
             call(
                 comparison.project_coverage_base.commit.commitid,
                 comparison.head.commit.commitid,
-                with_commits=False,
             ),
         ]
 
@@ -83,7 +82,6 @@ class TestComparisonProxy:
             call(
                 comparison.comparison.patch_coverage_base_commitid,
                 comparison.head.commit.commitid,
-                with_commits=False,
             ),
         ]
 
@@ -110,7 +108,6 @@ class TestComparisonProxy:
             call(
                 comparison.comparison.patch_coverage_base_commitid,
                 comparison.head.commit.commitid,
-                with_commits=False,
             ),
         ]
 
@@ -137,6 +134,5 @@ class TestComparisonProxy:
             call(
                 comparison.comparison.patch_coverage_base_commitid,
                 comparison.head.commit.commitid,
-                with_commits=False,
             ),
         ]
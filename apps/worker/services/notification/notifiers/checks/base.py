@@ -16,6 +16,7 @@ from services.urls import (
     get_pull_url,
 )
 from services.yaml.reader import get_paths_from_flags
+from shared.torngit.base import fetch_pages_concurrently
 from shared.torngit.exceptions import TorngitClientError, TorngitError
 
 log = logging.getLogger(__name__)
@@ -40,6 +41,8 @@ class ChecksNotifier(StatusNotifier):
         self._repository_service = None
 
     ANNOTATIONS_PER_REQUEST = 50
+    # how many pages of annotations are sent to the provider at once
+    ANNOTATION_REQUESTS_IN_FLIGHT = 4
 
     def is_enabled(self) -> bool:
         return True
@@ -304,12 +307,10 @@ class ChecksNotifier(StatusNotifier):
 
         lines_diff = []
         for segment in segments:
-            header = segment["header"].copy()
-            lines = segment["lines"].copy()
+            header = segment["header"]
             base_ln = int(header[0])
             head_ln = int(header[2])
-            while not len(lines) == 0:
-                line_value = lines.pop(0)
+            for line_value in segment["lines"]:
                 if line_value and line_value[0] == "+":
                     lines_diff.append({"head_line": head_ln})
                     head_ln += 1
@@ -325,40 +326,42 @@ class ChecksNotifier(StatusNotifier):
         return f"[View this Pull Request on Codecov]({get_pull_url(comparison.pull)}?dropdown=coverage&src=pr&el=h1)"
 
     def get_lines_to_annotate(self, comparison: ComparisonProxy, files_with_change):
-        lines_diff = []
+        """
+        Returns the ranges of consecutive added lines that are not covered by tests.
+        """
+        line_headers = []
         for _file in files_with_change:
             if _file is None:
                 continue
             head_file_report = comparison.head.report.get(_file["path"])
-            for head_line in head_file_report.lines:
-                line_addition = next(
-                    (
-                        line
-                        for line in _file["additions"]
-                        if head_line[0] == line["head_line"]
-                    ),
-                    None,
-                )
-                if line_addition and head_line[1].coverage == 0:
-                    lines_diff.append(
-                        {
-                            "type": "new_line",
-                            "line": head_line[0],
-                            "coverage": head_line[1].coverage,
-                            "path": _file["path"],
-                        }
-                    )
-        line_headers = []
-        previous_line = {}
-        for index, line in enumerate(lines_diff):
-            if index == 0:
-                line_headers.append(line)
-            elif line["line"] != previous_line["line"] + 1:
-                line_headers[len(line_headers) - 1]["end_line"] = previous_line["line"]
-                line_headers.append(line)
-            if index == len(lines_diff) - 1:
-                line_headers[len(line_headers) - 1]["end_line"] = line["line"]
-            previous_line = line
+            if head_file_report is None:
+                continue
+            added_lines = sorted(
+                {
+                    line["head_line"]
+                    for line in _file["additions"]
+                    if line["head_line"] > 0
+                }
+            )
+            previous_header = None
+            for ln in added_lines:
+                head_line = head_file_report.get(ln)
+                if head_line is None or head_line.coverage != 0:
+                    continue
+                if (
+                    previous_header is not None
+                    and previous_header["end_line"] == ln - 1
+                ):
+                    previous_header["end_line"] = ln
+                    continue
+                previous_header = {
+                    "type": "new_line",
+                    "line": ln,
+                    "coverage": head_line.coverage,
+                    "path": _file["path"],
+                    "end_line": ln,
+                }
+                line_headers.append(previous_header)
         return line_headers
 
     def create_annotations(
@@ -443,8 +446,9 @@ class ChecksNotifier(StatusNotifier):
                     "number_annotations": len(output.get("annotations")),
                 },
             )
-            for annotation_page in annotation_pages:
-                async_to_sync(repository_service.update_check_run)(
+
+            async def send_annotation_page(annotation_page):
+                return await repository_service.update_check_run(
                     check_id,
                     state,
                     output={
@@ -455,6 +459,16 @@ class ChecksNotifier(StatusNotifier):
                     url=payload.get("url"),
                 )
 
+            async def send_annotation_pages():
+                async for _ in fetch_pages_concurrently(
+                    send_annotation_page,
+                    annotation_pages,
+                    self.ANNOTATION_REQUESTS_IN_FLIGHT,
+                ):
+                    pass
+
+            async_to_sync(send_annotation_pages)()
+
         else:
             async_to_sync(repository_service.update_check_run)(
                 check_id, state, output=output, url=payload.get("url")
@@ -674,6 +674,49 @@ class TestBaseChecksNotifier:
         result = notifier.get_lines_to_annotate(sample_comparison, files_with_change)
         assert expected_result == result
 
+    def test_get_lines_to_annotate_multiple_files(self, sample_comparison):
+        notifier = ChecksNotifier(
+            repository=sample_comparison.head.commit.repository,
+            title="title",
+            notifier_yaml_settings={},
+            notifier_site_settings=True,
+            current_yaml=UserYaml({}),
+            repository_service=None,
+        )
+        report = Report()
+        for path, lines in [("file_1.go", [1, 2]), ("file_2.go", [3, 4, 7])]:
+            report_file = ReportFile(path)
+            for ln in lines:
+                report_file.append(ln, ReportLine.create(0))
+            report_file.append(5, ReportLine.create(1))
+            report.append(report_file)
+        sample_comparison.head.report = report
+        files_with_change = [
+            {
+                "type": "modified",
+                "path": "file_1.go",
+                "additions": [{"head_line": 2}, {"head_line": 1}],
+            },
+            None,
+            {
+                "type": "new",
+                "path": "file_2.go",
+                "additions": [{"head_line": ln} for ln in range(3, 8)],
+            },
+            {
+                "type": "new",
+                "path": "missing.go",
+                "additions": [{"head_line": 1}],
+            },
+        ]
+        result = notifier.get_lines_to_annotate(sample_comparison, files_with_change)
+        # the ranges don't span across files
+        assert [(r["path"], r["line"], r["end_line"]) for r in result] == [
+            ("file_1.go", 1, 2),
+            ("file_2.go", 3, 4),
+            ("file_2.go", 7, 7),
+        ]
+
 
 class TestPatchChecksNotifier:
     def test_paginate_annotations(
@@ -1,6 +1,7 @@
 import re
 
 from services.path_fixer.match import regexp_match_one
+from shared.utils.match import combine_patterns
 
 
 class UserPathIncludes:
@@ -29,6 +30,8 @@ class UserPathIncludes:
         self.include_all = False
         self.excludes = []
         self.exclude_all = False
+        # the same paths are usually checked over and over
+        self._results: dict[str, bool] = {}
 
         if not self.path_patterns:
             return
@@ -45,30 +48,36 @@ class UserPathIncludes:
             self.include_all = True
         else:
             self.include_all = False
-            self.includes = [re.compile(i) for i in includes]
+            self.includes = combine_patterns(re.compile(i) for i in includes)
 
         if "!.*" in self.path_patterns:
             self.exclude_all = False
         else:
-            self.excludes = [re.compile(e[1:]) for e in excludes]
+            self.excludes = combine_patterns(re.compile(e[1:]) for e in excludes)
 
     def __call__(self, value: str) -> bool:
         if not self.path_patterns:
             return True
         if value:
-            if self.include_all:
-                # everything is included
-                if self.excludes:
-                    # make sure it is not excluded
-                    return not regexp_match_one(self.excludes, value)
-                else:
-                    return True
-            # we have to match once
-            if regexp_match_one(self.includes, value) is True:
-                # make sure it's not excluded
-                if self.excludes and regexp_match_one(self.excludes, value):
-                    return False
-                else:
-                    return True
-            return False
+            result = self._results.get(value)
+            if result is None:
+                result = self._results[value] = self._includes(value)
+            return result
+        return False
+
+    def _includes(self, value: str) -> bool:
+        if self.include_all:
+            # everything is included
+            if self.excludes:
+                # make sure it is not excluded
+                return not regexp_match_one(self.excludes, value)
+            else:
+                return True
+        # we have to match once
+        if regexp_match_one(self.includes, value) is True:
+            # make sure it's not excluded
+            if self.excludes and regexp_match_one(self.excludes, value):
+                return False
+            else:
+                return True
         return False
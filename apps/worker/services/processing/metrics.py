@@ -27,3 +27,16 @@ INTERMEDIATE_REPORT_SIZE = Histogram(
     ["type", "compression"],
     buckets=BYTE_SIZE_BUCKETS,
 )
+
+REPORT_LOCK_WAIT_SECONDS = Histogram(
+    "worker_upload_finisher_report_lock_wait_seconds",
+    "Time (in seconds) spent waiting on the report lock of a commit before merging into it.",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5],
+)
+
+MERGE_BATCH_UPLOADS = Histogram(
+    "worker_upload_finisher_merge_batch_size",
+    'Number of uploads merged into the "master report" at once.',
+    ["merger"],
+    buckets=[1, 2, 5, 10, 20, 50, 100],
+)
@@ -19,15 +19,103 @@ meaning that:
 - (ideally in the future) an upload that has been processed into an "intermediate report"
   should be merged directly into the "master report" without doing a storage roundtrip for that
   "intermediate report".
+
+Merging can also be done by a single "elected merger" per commit:
+The finishing task stores the `ProcessingResult`s of its uploads, and then tries to
+become the merger of the commit. If another task already is the merger, it just exits,
+and that merger will pick up the stored results before it steps down. It schedules a
+delayed finisher though, which takes over in case that merger dies before doing so.
+The merger drains all the "processed" uploads in batches, moving them to a
+"merging" set in the meantime.
+All these state transitions are done atomically by Lua scripts.
 """
 
+import json
 from dataclasses import dataclass
+from uuid import uuid4
 
+from services.processing.types import ProcessingResult
 from shared.helpers.redis import get_redis_connection
 from shared.metrics import Counter
 
 MERGE_BATCH_SIZE = 10
 
+# The lease of the elected merger is renewed with every batch it takes, and right
+# before it saves a merged report. The finisher extends this to its hard time limit,
+# so a merger which is still running never loses its lease.
+MERGER_LEASE_TTL = 60 * 10
+# `ProcessingResult`s should be picked up by a merger right away,
+# this TTL only makes sure that they do not leak.
+PROCESSING_RESULTS_TTL = 60 * 60 * 24
+
+# KEYS: merger, processed, merging
+# ARGV: token, lease ttl (ms)
+ACQUIRE_MERGER_SCRIPT = """
+if not redis.call("SET", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return 0
+end
+-- uploads taken by a previous merger which never finished are merged again
+local stranded = redis.call("SMEMBERS", KEYS[3])
+if #stranded > 0 then
+    redis.call("SADD", KEYS[2], unpack(stranded))
+    redis.call("DEL", KEYS[3])
+end
+return 1
+"""
+
+# KEYS: merger, processed, merging, results
+# ARGV: token, lease ttl (ms), batch size
+TAKE_BATCH_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[1] then
+    return false
+end
+redis.call("PEXPIRE", KEYS[1], ARGV[2])
+local batch = {}
+for _, id in ipairs(redis.call("HKEYS", KEYS[4])) do
+    if redis.call("SMOVE", KEYS[2], KEYS[3], id) == 1 then
+        table.insert(batch, redis.call("HGET", KEYS[4], id))
+        if #batch >= tonumber(ARGV[3]) then
+            break
+        end
+    end
+end
+return batch
+"""
+
+# KEYS: merger
+# ARGV: token, lease ttl (ms)
+RENEW_MERGER_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call("PEXPIRE", KEYS[1], ARGV[2])
+return 1
+"""
+
+# KEYS: merger, processed, results
+# ARGV: token
+RELEASE_MERGER_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[1] then
+    return 1
+end
+for _, id in ipairs(redis.call("HKEYS", KEYS[3])) do
+    if redis.call("SISMEMBER", KEYS[2], id) == 1 then
+        return 0
+    end
+end
+redis.call("DEL", KEYS[1])
+return 1
+"""
+
+# KEYS: merger
+# ARGV: token
+ABANDON_MERGER_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    redis.call("DEL", KEYS[1])
+end
+return 1
+"""
+
 CLEARED_UPLOADS = Counter(
     "worker_processing_cleared_uploads",
     "Number of uploads cleared from queue because of errors",
@@ -77,7 +165,10 @@ class ProcessingState:
 
     def get_upload_numbers(self):
         processing = self._redis.scard(self._redis_key("processing"))
-        processed = self._redis.scard(self._redis_key("processed"))
+        # uploads currently being merged by the elected merger are not merged yet
+        processed = self._redis.scard(self._redis_key("processed")) + self._redis.scard(
+            self._redis_key("merging")
+        )
         return UploadNumbers(processing, processed)
 
     def mark_uploads_as_processing(self, upload_ids: list[int]):
@@ -104,7 +195,11 @@ class ProcessingState:
             self._redis.sadd(self._redis_key("processed"), upload_id)
 
     def mark_uploads_as_merged(self, upload_ids: list[int]):
-        self._redis.srem(self._redis_key("processed"), *upload_ids)
+        pipeline = self._redis.pipeline()
+        pipeline.srem(self._redis_key("processed"), *upload_ids)
+        pipeline.srem(self._redis_key("merging"), *upload_ids)
+        pipeline.hdel(self._redis_key("results"), *upload_ids)
+        pipeline.execute()
 
     def get_uploads_for_merging(self) -> set[int]:
         return {
@@ -114,5 +209,103 @@ class ProcessingState:
             )
         }
 
+    def store_processing_results(self, processing_results: list[ProcessingResult]):
+        """
+        Stores the `ProcessingResult`s of processed uploads,
+        so that they can be merged by the elected merger.
+        """
+        key = self._redis_key("results")
+        pipeline = self._redis.pipeline()
+        pipeline.hset(
+            key,
+            mapping={
+                result["upload_id"]: json.dumps(result) for result in processing_results
+            },
+        )
+        pipeline.expire(key, PROCESSING_RESULTS_TTL)
+        pipeline.execute()
+
+    def try_become_merger(self, lease_ttl: int = MERGER_LEASE_TTL) -> str | None:
+        """
+        Tries to become the single merger of this commit.
+
+        Returns the token identifying the merger, or `None` if another task
+        already is the merger. In that case, it is guaranteed that the other merger
+        will pick up all the previously stored `ProcessingResult`s.
+        """
+        token = uuid4().hex
+        acquired = self._redis.register_script(ACQUIRE_MERGER_SCRIPT)(
+            keys=[
+                self._redis_key("merger"),
+                self._redis_key("processed"),
+                self._redis_key("merging"),
+            ],
+            args=[token, lease_ttl * 1000],
+        )
+        return token if acquired else None
+
+    def take_uploads_for_merging(
+        self, token: str, lease_ttl: int = MERGER_LEASE_TTL
+    ) -> list[ProcessingResult] | None:
+        """
+        Takes a batch of processed uploads which have their `ProcessingResult` stored,
+        and renews the lease of the merger.
+
+        Returns `None` if the merger lost its lease in the meantime.
+        """
+        batch = self._redis.register_script(TAKE_BATCH_SCRIPT)(
+            keys=[
+                self._redis_key("merger"),
+                self._redis_key("processed"),
+                self._redis_key("merging"),
+                self._redis_key("results"),
+            ],
+            args=[token, lease_ttl * 1000, MERGE_BATCH_SIZE],
+        )
+        if batch is None:
+            return None
+        return [json.loads(result) for result in batch]
+
+    def renew_merger(self, token: str, lease_ttl: int = MERGER_LEASE_TTL) -> bool:
+        """
+        Renews the lease of the merger.
+
+        Returns `False` if the merger lost its lease in the meantime, in which case
+        another merger has taken over its uploads, and it must not save them.
+        """
+        return bool(
+            self._redis.register_script(RENEW_MERGER_SCRIPT)(
+                keys=[self._redis_key("merger")], args=[token, lease_ttl * 1000]
+            )
+        )
+
+    def release_merger(self, token: str) -> bool:
+        """
+        Steps down as the merger of this commit.
+
+        This fails if more uploads became ready for merging in the meantime,
+        in which case the merger has to continue merging those.
+        """
+        return bool(
+            self._redis.register_script(RELEASE_MERGER_SCRIPT)(
+                keys=[
+                    self._redis_key("merger"),
+                    self._redis_key("processed"),
+                    self._redis_key("results"),
+                ],
+                args=[token],
+            )
+        )
+
+    def abandon_merger(self, token: str):
+        """
+        Steps down as the merger of this commit unconditionally.
+
+        The uploads the merger has taken are merged again by the next merger.
+        """
+        self._redis.register_script(ABANDON_MERGER_SCRIPT)(
+            keys=[self._redis_key("merger")], args=[token]
+        )
+
     def _redis_key(self, state: str) -> str:
         return f"upload-processing-state/{self.repoid}/{self.commitsha}/{state}"
@@ -66,9 +66,11 @@ def from_xml(xml: Element, report_builder_session: ReportBuilderSession) -> None
         filename = _class.attrib["filename"]
         if not filename:
             continue
-        _file = report_builder_session.create_coverage_file(filename, do_fix_path=False)
+        _file = report_builder_session.create_coverage_file_builder(
+            filename, do_fix_path=False
+        )
         assert _file is not None, (
-            "`create_coverage_file` with pre-fixed path is infallible"
+            "`create_coverage_file_builder` with pre-fixed path is infallible"
         )
 
         for line in _class.iter("line"):
@@ -162,14 +164,7 @@ def from_xml(xml: Element, report_builder_session: ReportBuilderSession) -> None
                     coverage = 1
                     _type = CoverageType.line
 
-                _file.append(
-                    ln,
-                    report_builder_session.create_coverage_line(
-                        coverage,
-                        _type,
-                        missing_branches=missing_branches,
-                    ),
-                )
+                _file.add_line(ln, coverage, _type, missing_branches=missing_branches)
 
         # [scala] [scoverage]
         for stmt in _class.iter("statement"):
@@ -185,14 +180,8 @@ def from_xml(xml: Element, report_builder_session: ReportBuilderSession) -> None
             elif attr["method"]:
                 coverage_type = CoverageType.method
 
-            _file.append(
-                line_no,
-                report_builder_session.create_coverage_line(
-                    coverage,
-                    coverage_type,
-                ),
-            )
-        report_builder_session.append(_file)
+            _file.add_line(line_no, coverage, coverage_type)
+        report_builder_session.append(_file.build())
 
     # path rename
     path_fixer = report_builder_session.path_fixer
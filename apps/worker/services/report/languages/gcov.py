@@ -11,7 +11,11 @@ from services.yaml import read_yaml_field
 
 class GcovProcessor(BaseLanguageProcessor):
     def matches_content(self, content: bytes, first_line: str, name: str) -> bool:
-        return b"0:Source:" in content.split(b"\n", 1)[0]
+        # only look at the first line, without splitting (and copying) the whole report
+        first_line_end = content.find(b"\n")
+        if first_line_end < 0:
+            first_line_end = len(content)
+        return content.find(b"0:Source:", 0, first_line_end) >= 0
 
     @sentry_sdk.trace
     def process(
@@ -1,16 +1,18 @@
 from collections import defaultdict
-from io import BytesIO
-from itertools import groupby
+from collections.abc import Iterator
+from itertools import pairwise
 
 import sentry_sdk
 
 from helpers.exceptions import CorruptRawReportError
 from services.report.languages.base import BaseLanguageProcessor
-from services.report.languages.helpers import Region, SourceLocation
 from services.report.report_builder import ReportBuilderSession
 from shared.utils import merge
 from shared.utils.merge import LineType, line_type, partials_to_line
 
+# (start_line, start_column, end_line, end_column, hits)
+type Block = tuple[int, int, int, int, int]
+
 
 class GoProcessor(BaseLanguageProcessor):
     def matches_content(self, content: bytes, first_line: str, name: str) -> bool:
@@ -32,29 +34,16 @@ def from_txt(string: bytes, report_builder_session: ReportBuilderSession) -> Non
     # Process the bytes from uploaded report to intermediary representation
     files = process_bytes_into_files(string)
 
-    for filename, lines in files.items():
-        _file = report_builder_session.create_coverage_file(filename)
+    for filename, blocks in files.items():
+        _file = report_builder_session.create_coverage_file_builder(filename)
         if _file is None:
             continue
 
-        for ln, partials in lines.items():
-            best_in_partials = max(p[2] for p in partials)
-            partials = combine_partials(partials)
-            if partials:
-                cov = partials_to_line(partials)
-                cov_to_use = cov
-            else:
-                cov_to_use = best_in_partials
-            if partials_as_hits and line_type(cov_to_use) == LineType.partial:
-                cov_to_use = 1
-
-            _line = report_builder_session.create_coverage_line(cov_to_use)
-            _file.append(ln, _line)
-
-        report_builder_session.append(_file)
+        _file.add_lines(lines_coverage(blocks, partials_as_hits))
+        report_builder_session.append(_file.build())
 
 
-def process_bytes_into_files(string: bytes) -> dict[str, dict[int, set]]:
+def process_bytes_into_files(string: bytes) -> dict[str, list[Block]]:
     """
     mode: count
     github.com/codecov/sample_go/sample_go.go:7.14,9.2 1 1
@@ -80,21 +69,29 @@ def process_bytes_into_files(string: bytes) -> dict[str, dict[int, set]]:
         - `name.go:line.column,line.column numberOfStatements count`
     """
 
-    files: dict[str, dict[int, set]] = {}
+    files: dict[bytes, list[Block]] = {}
 
-    for encoded_line in BytesIO(string):
-        line = encoded_line.decode(errors="replace").rstrip("\n")
-        if not line or line.startswith("mode: "):
+    for line in string.split(b"\n"):
+        if not line or line.startswith(b"mode: "):
             continue
 
-        split = line.split(":", 1)
+        filename, _, coverage = line.partition(b":")
         # File outline e.g., "github.com/nfisher/rsqf/rsqf.go:19: calcP 100.0%"
-        if len(split) < 2 or not split[1] or split[1].endswith("%"):
+        if not coverage or coverage.endswith(b"%"):
             continue
 
-        filename = split[0]
         try:
-            region = parse_coverage(split[1])
+            region, _num_statements, hits = coverage.split(b" ", 2)
+            start, end = region.split(b",", 1)
+            start_line, start_column = start.split(b".", 1)
+            end_line, end_column = end.split(b".", 1)
+            block = (
+                int(start_line),
+                int(start_column),
+                int(end_line),
+                int(end_column),
+                int(hits),
+            )
         except ValueError:
             # FIXME: do we actually want to raise an error here?
             # Why not just skip over invalid lines, as the coverage file likely
@@ -104,35 +101,81 @@ def process_bytes_into_files(string: bytes) -> dict[str, dict[int, set]]:
                 "Go coverage line does not match expected format",
             )
 
-        lines = files.setdefault(filename, defaultdict(set))
+        blocks = files.get(filename)
+        if blocks is None:
+            files[filename] = [block]
+        else:
+            blocks.append(block)
 
-        # add start of line
-        if region.start.line == region.end.line:
-            lines[region.start.line].add(
-                (region.start.column, region.end.column, region.hits)
-            )
+    # only decode each filename once
+    decoded: dict[str, list[Block]] = {}
+    for filename, blocks in files.items():
+        decoded.setdefault(filename.decode(errors="replace"), []).extend(blocks)
+    return decoded
+
+
+def merge_hits(a: int, b: int) -> int:
+    """`merge.merge_all` of two hit counts"""
+    return -1 if a == -1 or b == -1 else max(a, b)
+
+
+def lines_coverage(
+    blocks: list[Block], partials_as_hits: bool = False
+) -> Iterator[tuple[int, int | str]]:
+    """
+    Resolves the coverage of every line covered by the `blocks` of a file.
+
+    Only the first and last line of a block get a partial. The lines in the middle of
+    a block are fully covered by it, and get the merged hits of all the blocks
+    spanning them, which is the same as combining their `(0, None, hits)` partials.
+    """
+    partials: dict[int, set] = defaultdict(set)
+    # the merged hits of the middle lines, by `(first_line, end_line)`
+    spans: dict[tuple[int, int], int] = {}
+
+    for start_line, start_column, end_line, end_column, hits in blocks:
+        if start_line == end_line:
+            partials[start_line].add((start_column, end_column, hits))
+            continue
+
+        partials[start_line].add((start_column, None, hits))
+        if end_line - start_line > 1:
+            span = (start_line + 1, end_line)
+            spans[span] = merge_hits(spans[span], hits) if span in spans else hits
+        if end_column > 2:
+            # add end of line
+            partials[end_line].add((None, end_column, hits))
+
+    middles: dict[int, int] = {}
+    covered_until = None
+    for (first_line, end_line), hits in sorted(spans.items()):
+        if covered_until is None or first_line >= covered_until:
+            # no overlap with the previous spans
+            middles.update(dict.fromkeys(range(first_line, end_line), hits))
         else:
-            lines[region.start.line].add((region.start.column, None, region.hits))
-            # add middles
-            for ln in range(region.start.line + 1, region.end.line):
-                lines[ln].add((0, None, region.hits))
-            if region.end.column > 2:
-                # add end of line
-                lines[region.end.line].add((None, region.end.column, region.hits))
-
-    return files
-
-
-def parse_coverage(line: str) -> Region:
-    region_str, _num_statements, hits = line.split(" ", 2)
-    start, end = region_str.split(",", 1)
-    start_line, start_column = start.split(".", 1)
-    end_line, end_column = end.split(".", 1)
-    return Region(
-        start=SourceLocation(line=int(start_line), column=int(start_column)),
-        end=SourceLocation(line=int(end_line), column=int(end_column)),
-        hits=int(hits),
-    )
+            for ln in range(first_line, end_line):
+                middles[ln] = merge_hits(middles[ln], hits) if ln in middles else hits
+        if covered_until is None or end_line > covered_until:
+            covered_until = end_line
+
+    for ln in sorted(partials.keys() | middles.keys()):
+        line_partials = partials.get(ln)
+        if line_partials is None:
+            yield ln, middles[ln]
+            continue
+        if ln in middles:
+            line_partials.add((0, None, middles[ln]))
+        if len(line_partials) == 1:
+            yield ln, next(iter(line_partials))[2]
+            continue
+
+        combined = combine_partials(line_partials)
+        cov = (
+            partials_to_line(combined) if combined else max(p[2] for p in line_partials)
+        )
+        if partials_as_hits and line_type(cov) == LineType.partial:
+            cov = 1
+        yield ln, cov
 
 
 def combine_partials(partials):
@@ -148,39 +191,41 @@ def combine_partials(partials):
     if len(partials) == 1:
         return list(partials)
 
-    columns = defaultdict(list)
-    # fill in the partials WITH end values: (_, X, _)
-    for sc, ec, cov in partials:
-        if ec is not None:
-            for c in range(sc or 0, ec):
-                columns[c].append(cov)
-
+    # the partials WITH end values: (_, X, _)
+    intervals = [
+        (sc or 0, ec, cov)
+        for sc, ec, cov in partials
+        if ec is not None and (sc or 0) < ec
+    ]
     # get the last column number (+1 for exclusiveness)
     lc = (
-        max(columns.keys()) if columns else max([sc or 0 for (sc, ec, cov) in partials])
-    ) + 1
+        max(ec for (_, ec, _) in intervals)
+        if intervals
+        else max([sc or 0 for (sc, ec, cov) in partials]) + 1
+    )
     # hits for (lc, None, eol)
     eol = []
 
-    # fill in the partials WITHOUT end values: (_, None, _)
+    # the partials WITHOUT end values: (_, None, _), until the last column
     for sc, ec, cov in partials:
         if ec is None:
-            for c in range(sc or 0, lc):
-                columns[c].append(cov)
+            if (sc or 0) < lc:
+                intervals.append((sc or 0, lc, cov))
             eol.append(cov)
 
-    columns = [(c, merge.merge_all(cov)) for c, cov in columns.items()]
-
-    # sum all the line hits && sort and group lines based on hits
-    columns = groupby(sorted(columns), lambda c: c[1])
-
+    # merge the hits of the segments between the boundaries of the intervals,
+    # and group the consecutive segments with the same hits
     results = []
-    for cov, cols in columns:
-        # unpack iter
-        cols = list(cols)
-        # sc from first column
-        # ec from last (or +1 if singular)
-        results.append([cols[0][0], (cols[-1] if cols else cols[0])[0] + 1, cov])
+    boundaries = sorted({c for (sc, ec, _) in intervals for c in (sc, ec)})
+    for start, end in pairwise(boundaries):
+        covs = [cov for (sc, ec, cov) in intervals if sc <= start and end <= ec]
+        if not covs:
+            continue
+        cov = merge.merge_all(covs)
+        if results and results[-1][2] == cov:
+            results[-1][1] = end
+        else:
+            results.append([start, end, cov])
 
     # remove duds
     if results:
@@ -98,11 +98,11 @@ def from_xml(xml: Element, report_builder_session: ReportBuilderSession) -> None
 
             method_complixity = file_method_complixity[source_name.split(".")[0]]
 
-            _file = report_builder_session.create_coverage_file(
+            _file = report_builder_session.create_coverage_file_builder(
                 filename, do_fix_path=False
             )
             assert _file is not None, (
-                "`create_coverage_file` with pre-fixed path is infallible"
+                "`create_coverage_file_builder` with pre-fixed path is infallible"
             )
 
             for line in source.iter("line"):
@@ -133,16 +133,11 @@ def from_xml(xml: Element, report_builder_session: ReportBuilderSession) -> None
                     if complexity:
                         coverage_type = CoverageType.method
                     # add line to file
-                    _file.append(
-                        ln,
-                        report_builder_session.create_coverage_line(
-                            cov, coverage_type, complexity=complexity
-                        ),
-                    )
+                    _file.add_line(ln, cov, coverage_type, complexity=complexity)
                 else:
                     log.warning(
                         f"Jacoco report has an invalid coverage line: nr={ln}. Skipping processing line."
                     )
 
             # append file to report
-            report_builder_session.append(_file)
+            report_builder_session.append(_file.build())
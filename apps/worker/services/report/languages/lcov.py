@@ -6,8 +6,11 @@ from io import BytesIO
 import sentry_sdk
 
 from services.report.languages.base import BaseLanguageProcessor
-from services.report.report_builder import CoverageType, ReportBuilderSession
-from shared.reports.resources import ReportFile
+from services.report.report_builder import (
+    CoverageFileBuilder,
+    CoverageType,
+    ReportBuilderSession,
+)
 
 log = logging.getLogger(__name__)
 
@@ -28,19 +31,19 @@ def from_txt(reports: bytes, report_builder_session: ReportBuilderSession) -> No
     # merge same files
     for string in reports.split(b"\nend_of_record"):
         if (_file := _process_file(string, report_builder_session)) is not None:
-            report_builder_session.append(_file)
+            report_builder_session.append(_file.build())
 
 
 def _process_file(
     doc: bytes, report_builder_session: ReportBuilderSession
-) -> ReportFile | None:
+) -> CoverageFileBuilder | None:
     branches: dict[str, dict[str, int]] = defaultdict(dict)
     fn_lines: set[str] = set()  # lines of function definitions
 
     JS = False
     CPP = False
     skip_lines: list[str] = []
-    _file: ReportFile | None = None
+    _file: CoverageFileBuilder | None = None
 
     for encoded_line in BytesIO(doc):
         line = encoded_line.decode(errors="replace").rstrip("\n")
@@ -68,7 +71,7 @@ def _process_file(
             SF:<absolute path to the source file>
             """
             # file name
-            _file = report_builder_session.create_coverage_file(content)
+            _file = report_builder_session.create_coverage_file_builder(content)
             JS = content[-3:] == ".js"
             CPP = content[-4:] == ".cpp"
             continue
@@ -106,8 +109,7 @@ def _process_file(
 
             cov = max(cov, 0)  # clamp to 0
 
-            _line = report_builder_session.create_coverage_line(cov)
-            _file.append(ln, _line)
+            _file.add_line(ln, cov)
 
         elif method == "FN" and not JS:
             """
@@ -175,13 +177,13 @@ def _process_file(
             CoverageType.method if line_str in fn_lines else CoverageType.branch
         )
 
-        _line = report_builder_session.create_coverage_line(
+        # instead of using `.add_line`/merge, this rather overwrites the line:
+        _file.set_line(
+            ln,
             coverage,
             coverage_type,
             missing_branches=(missing_branches if missing_branches != [] else None),
         )
-        # instead of using `.append`/merge, this rather overwrites the line:
-        _file[ln] = _line
 
     return _file
 
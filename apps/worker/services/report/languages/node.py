@@ -4,8 +4,11 @@ from fractions import Fraction
 import sentry_sdk
 
 from services.report.languages.base import BaseLanguageProcessor
-from services.report.report_builder import CoverageType, ReportBuilderSession
-from shared.reports.resources import ReportFile
+from services.report.report_builder import (
+    CoverageFileBuilder,
+    CoverageType,
+    ReportBuilderSession,
+)
 from shared.utils.merge import partials_to_line
 
 
@@ -84,13 +87,17 @@ def next_from_json(
         )
         if filename is None:
             continue
-        _file = report_builder_session.create_coverage_file(filename, do_fix_path=False)
 
         if "lineData" in data:
-            jscoverage(_file, data, report_builder_session)
-            report_builder_session.append(_file)
+            _builder = report_builder_session.create_coverage_file_builder(
+                filename, do_fix_path=False
+            )
+            jscoverage(_builder, data)
+            report_builder_session.append(_builder.build())
             continue
 
+        _file = report_builder_session.create_coverage_file(filename, do_fix_path=False)
+
         if data.get("data"):
             # why. idk. node is like that.
             data = data["data"]
@@ -290,9 +297,7 @@ def _jscoverage_eval_partial(partial):
     ]
 
 
-def jscoverage(
-    _file: ReportFile, data: dict, report_builder_session: ReportBuilderSession
-):
+def jscoverage(_file: CoverageFileBuilder, data: dict):
     branches = {
         ln: map(_jscoverage_eval_partial, branchData[1:])
         for ln, branchData in must_be_dict(data["branchData"]).items()
@@ -304,13 +309,11 @@ def jscoverage(
             if partials:
                 partials = list(partials)
                 coverage = partials_to_line(partials)
-            _file.append(
+            _file.add_line(
                 ln,
-                report_builder_session.create_coverage_line(
-                    coverage,
-                    CoverageType.branch if partials else CoverageType.line,
-                    partials=partials,
-                ),
+                coverage,
+                CoverageType.branch if partials else CoverageType.line,
+                partials=partials,
             )
 
 
@@ -332,26 +335,24 @@ def from_json(report_dict: dict, report_builder_session: ReportBuilderSession) -
         )
         if filename is None:
             continue
-        _file = report_builder_session.create_coverage_file(filename, do_fix_path=False)
+        _file = report_builder_session.create_coverage_file_builder(
+            filename, do_fix_path=False
+        )
 
         if data.get("data"):
             # why. idk. node is like that.
             data = data["data"]
 
         if "lineData" in data:
-            jscoverage(_file, data, report_builder_session)
-            report_builder_session.append(_file)
+            jscoverage(_file, data)
+            report_builder_session.append(_file.build())
             continue
 
         if "linesCovered" in data:
-            for ln, coverage in data["linesCovered"].items():
-                _file.append(
-                    int(ln),
-                    report_builder_session.create_coverage_line(
-                        coverage,
-                    ),
-                )
-            report_builder_session.append(_file)
+            _file.add_lines(
+                (int(ln), coverage) for ln, coverage in data["linesCovered"].items()
+            )
+            report_builder_session.append(_file.build())
             continue
 
         # statements
@@ -359,12 +360,7 @@ def from_json(report_dict: dict, report_builder_session: ReportBuilderSession) -
             if statement.get("skip") is not True:
                 location_int = _location_to_int(statement)
                 if location_int:
-                    _file.append(
-                        location_int,
-                        report_builder_session.create_coverage_line(
-                            data["s"][sid],
-                        ),
-                    )
+                    _file.add_line(location_int, data["s"][sid])
 
         for bid, branch in must_be_dict(data.get("branchMap")).items():
             if branch.get("skip") is not True:
@@ -372,24 +368,14 @@ def from_json(report_dict: dict, report_builder_session: ReportBuilderSession) -
                 for lid, location in enumerate(branch["locations"]):
                     location_int = _location_to_int(location)
                     if location_int:
-                        _file.append(
-                            location_int,
-                            report_builder_session.create_coverage_line(
-                                data["b"][bid][lid],
-                                CoverageType.branch,
-                            ),
+                        _file.add_line(
+                            location_int, data["b"][bid][lid], CoverageType.branch
                         )
 
         for fid, func in must_be_dict(data.get("fnMap")).items():
             if func.get("skip") is not True:
                 location_int = _location_to_int(func["loc"])
                 if location_int:
-                    _file.append(
-                        location_int,
-                        report_builder_session.create_coverage_line(
-                            data["f"][fid],
-                            CoverageType.method,
-                        ),
-                    )
+                    _file.add_line(location_int, data["f"][fid], CoverageType.method)
 
-        report_builder_session.append(_file)
+        report_builder_session.append(_file.build())
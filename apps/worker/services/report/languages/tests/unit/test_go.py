@@ -641,6 +641,48 @@ class TestGo:
             [6, 10, 0],
         ]  # inner overlay
 
+    def test_lines_coverage(self):
+        blocks = [
+            # a block spanning lines 1 to 6, and blocks within it
+            (1, 2, 6, 3, 1),
+            (2, 5, 2, 20, 0),
+            (3, 1, 5, 2, 0),
+            # the same blocks, reported by another package
+            (1, 2, 6, 3, 0),
+            (3, 1, 5, 2, 2),
+            (8, 2, 8, 10, 0),
+            (8, 10, 8, 20, 1),
+        ]
+        # expanding every line of the blocks into partials
+        lines = {}
+        for sl, sc, el, ec, hits in blocks:
+            if sl == el:
+                lines.setdefault(sl, set()).add((sc, ec, hits))
+                continue
+            lines.setdefault(sl, set()).add((sc, None, hits))
+            for ln in range(sl + 1, el):
+                lines.setdefault(ln, set()).add((0, None, hits))
+            if ec > 2:
+                lines.setdefault(el, set()).add((None, ec, hits))
+        expected = [
+            (ln, go.partials_to_line(go.combine_partials(lines[ln])))
+            for ln in sorted(lines)
+        ]
+
+        assert list(go.lines_coverage(blocks)) == expected
+        assert expected == [
+            (1, 1),
+            (2, 1),
+            (3, 2),
+            (4, 2),
+            (5, 1),
+            (6, 1),
+            (8, "1/2"),
+        ]
+        assert list(go.lines_coverage(blocks, partials_as_hits=True)) == [
+            (ln, 1 if isinstance(cov, str) else cov) for ln, cov in expected
+        ]
+
     @pytest.mark.parametrize(
         "line",
         [
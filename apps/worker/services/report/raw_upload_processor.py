@@ -1,17 +1,37 @@
 import logging
+from collections import deque
+from collections.abc import Iterable
 
+import billiard
+import orjson
 import sentry_sdk
+from billiard.pool import ApplyResult
 
 from helpers.exceptions import ReportEmptyError, ReportExpiredException
+from helpers.metrics import MiB
 from services.path_fixer import PathFixer
-from services.report.parser.types import ParsedRawReport
+from services.report.parser.types import ParsedRawReport, ParsedUploadedReportFile
 from services.report.report_builder import ReportBuilder
 from services.report.report_processor import process_report
+from shared.config import get_config
 from shared.reports.resources import Report
 from shared.utils.sessions import Session
 
 log = logging.getLogger(__name__)
 
+# Processing the files of an upload in parallel has to pay for forking the workers,
+# and for serializing the per-file reports back to the parent process,
+# so it is only worth it for uploads with a bunch of files.
+DEFAULT_PARALLEL_MIN_FILES = 8
+# As the per-file reports are held in memory by both the workers and the parent,
+# huge uploads are processed sequentially to bound the memory usage.
+DEFAULT_PARALLEL_MAX_UPLOAD_SIZE = 256 * MiB
+
+# The arguments shared by all the files of an upload, set up in each worker process
+_worker_context: dict[str, tuple] = {}
+
+SerializedReport = tuple[bytes, bytes]
+
 
 @sentry_sdk.trace
 def process_raw_upload(
@@ -53,38 +73,26 @@ def process_raw_upload(
     # ---------------
     # Process reports
     # ---------------
-    for report_file in raw_reports.get_uploaded_files():
-        current_filename = report_file.filename
-        if current_filename in skip_files or not report_file.contents:
-            continue
+    report_files = [
+        report_file
+        for report_file in raw_reports.get_uploaded_files()
+        if report_file.filename not in skip_files and report_file.contents
+    ]
 
-        path_fixer_to_use = path_fixer.get_relative_path_aware_pathfixer(
-            current_filename
+    parallel_workers = get_parallel_workers(report_files)
+    if parallel_workers:
+        report = _process_files_in_parallel(
+            parallel_workers,
+            (commit_yaml, sessionid, ignored_lines, path_fixer),
+            report_files,
         )
-        report_builder_to_use = ReportBuilder(
-            commit_yaml, sessionid, ignored_lines, path_fixer_to_use
-        )
-
-        try:
-            report_from_file = process_report(
-                report=report_file, report_builder=report_builder_to_use
+    else:
+        for report_file in report_files:
+            report_from_file = _process_file(
+                commit_yaml, sessionid, ignored_lines, path_fixer, report_file
             )
-        except ReportExpiredException as r:
-            r.filename = current_filename
-            raise
-
-        if not report_from_file:
-            continue
-        if report.is_empty():
-            # if the initial report is empty, we can avoid a costly merge operation
-            report = report_from_file
-        else:
-            # merging the smaller report into the larger one is faster,
-            # so swap the two reports in that case.
-            if len(report_from_file._files) > len(report._files):
-                report_from_file, report = report, report_from_file
-
-            report.merge(report_from_file)
+            if report_from_file:
+                report = _merge_two(report, report_from_file)
 
     if not report:
         raise ReportEmptyError("No files found in report.")
@@ -93,3 +101,188 @@ def process_raw_upload(
     session.totals = report.totals
 
     return report
+
+
+def get_parallel_workers(report_files: list[ParsedUploadedReportFile]) -> int:
+    """
+    Returns the number of worker processes to process the files of an upload with,
+    or `0` if they should be processed sequentially in this process.
+
+    Parallel processing is opt-in via the `setup.upload_processing.parallel_workers`
+    config, and only kicks in for uploads with enough files that are not too large.
+    """
+    workers = get_config("setup", "upload_processing", "parallel_workers", default=0)
+    min_files = get_config(
+        "setup",
+        "upload_processing",
+        "parallel_min_files",
+        default=DEFAULT_PARALLEL_MIN_FILES,
+    )
+    max_upload_size = get_config(
+        "setup",
+        "upload_processing",
+        "parallel_max_upload_size",
+        default=DEFAULT_PARALLEL_MAX_UPLOAD_SIZE,
+    )
+
+    if workers < 2 or len(report_files) < max(min_files, 2):
+        return 0
+    if sum(report_file.size for report_file in report_files) > max_upload_size:
+        return 0
+    return min(workers, len(report_files))
+
+
+def _process_file(
+    commit_yaml,
+    sessionid: int,
+    ignored_lines: dict,
+    path_fixer: PathFixer,
+    report_file: ParsedUploadedReportFile,
+) -> Report | None:
+    path_fixer_to_use = path_fixer.get_relative_path_aware_pathfixer(
+        report_file.filename
+    )
+    report_builder_to_use = ReportBuilder(
+        commit_yaml, sessionid, ignored_lines, path_fixer_to_use
+    )
+
+    try:
+        return process_report(report=report_file, report_builder=report_builder_to_use)
+    except ReportExpiredException as r:
+        r.filename = report_file.filename
+        raise
+
+
+def _merge_two(report: Report, other: Report) -> Report:
+    if report.is_empty():
+        # if the initial report is empty, we can avoid a costly merge operation
+        return other
+    if other.is_empty():
+        return report
+
+    # merging the smaller report into the larger one is faster,
+    # so swap the two reports in that case.
+    if len(other._files) > len(report._files):
+        other, report = report, other
+
+    report.merge(other)
+    return report
+
+
+def _merge_reports_tree(reports: Iterable[Report]) -> Report:
+    """
+    Merges the `reports` pairwise as a balanced tree, rather than folding all of
+    them into one ever-growing report.
+
+    The reports are consumed as they come in, keeping at most one pending report
+    per level of the tree, like the carries of a binary counter.
+    """
+    levels: list[Report | None] = []
+    for report in reports:
+        level = 0
+        while level < len(levels) and levels[level] is not None:
+            report = _merge_two(levels[level], report)
+            levels[level] = None
+            level += 1
+        if level == len(levels):
+            levels.append(report)
+        else:
+            levels[level] = report
+
+    merged = Report()
+    for report in levels:
+        if report is not None:
+            merged = _merge_two(report, merged)
+    return merged
+
+
+def _init_worker(context: tuple):
+    _worker_context["args"] = context
+
+
+def _process_file_in_worker(
+    report_file: ParsedUploadedReportFile,
+) -> SerializedReport | None:
+    commit_yaml, sessionid, ignored_lines, path_fixer = _worker_context["args"]
+    report = _process_file(
+        commit_yaml, sessionid, ignored_lines, path_fixer, report_file
+    )
+    if not report:
+        return None
+    report_json, chunks, _totals = report.serialize(with_totals=False)
+    return report_json, chunks
+
+
+def _deserialize_report(serialized: SerializedReport) -> Report:
+    report_json, chunks = serialized
+    report_json = orjson.loads(report_json)
+    return Report.from_chunks(
+        chunks=chunks.decode(errors="replace"),
+        files=report_json["files"],
+        sessions=report_json["sessions"],
+    )
+
+
+@sentry_sdk.trace
+def _process_files_in_parallel(
+    workers: int, context: tuple, report_files: list[ParsedUploadedReportFile]
+) -> Report:
+    """
+    Processes the `report_files` in a pool of `workers` processes, and merges
+    the resulting reports.
+
+    The workers are forked so that they inherit the already loaded parsers, and
+    only a bounded window of files is in flight at once so that finished reports
+    do not pile up in memory while waiting to be merged.
+
+    This runs within the tasks of celery's default prefork pool, whose processes
+    are daemonic. `multiprocessing` doesn't let those have children, but `billiard`
+    (celery's fork of it) does.
+    """
+    log.info(
+        "Processing report files in parallel",
+        extra={"workers": workers, "files": len(report_files)},
+    )
+
+    # exiting the context terminates the workers, including when merging fails
+    with billiard.get_context("fork").Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(context,),
+    ) as pool:
+
+        def processed_reports():
+            pending: deque[tuple[ParsedUploadedReportFile, ApplyResult]] = deque()
+            files = iter(report_files)
+            for report_file in files:
+                pending.append(
+                    (
+                        report_file,
+                        pool.apply_async(_process_file_in_worker, (report_file,)),
+                    )
+                )
+                if len(pending) >= workers * 2:
+                    break
+
+            while pending:
+                report_file, result = pending.popleft()
+                try:
+                    serialized = result.get()
+                except ReportExpiredException as r:
+                    # the filename does not survive pickling the exception
+                    r.filename = report_file.filename
+                    raise
+
+                next_file = next(files, None)
+                if next_file is not None:
+                    pending.append(
+                        (
+                            next_file,
+                            pool.apply_async(_process_file_in_worker, (next_file,)),
+                        )
+                    )
+
+                if serialized is not None:
+                    yield _deserialize_report(serialized)
+
+        return _merge_reports_tree(processed_reports())
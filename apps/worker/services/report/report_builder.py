@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from enum import Enum
 from typing import Any
 
@@ -8,6 +8,7 @@ from services.yaml.reader import read_yaml_field
 from shared.reports.reportfile import ReportFile
 from shared.reports.resources import Report
 from shared.reports.types import LineSession, ReportLine
+from shared.utils.merge import merge_coverage, merge_line
 from shared.yaml.user_yaml import UserYaml
 
 log = logging.getLogger(__name__)
@@ -26,6 +27,119 @@ class CoverageType(Enum):
         return self.report_value
 
 
+# (coverage, type, partials, missing_branches, complexity) of a line
+PendingLine = tuple[int | str, str | None, list | None, list | None, object]
+_PLAIN = (None, None, None, None)
+
+
+class CoverageFileBuilder:
+    """
+    Collects the coverage lines of a single file, and materializes the `ReportFile`
+    once all of them were added.
+
+    Lines are kept as plain tuples, instead of creating a `ReportLine` and
+    `LineSession` for each of them and appending them to the `ReportFile` one by one.
+    Lines that are added more than once are merged the same way `ReportFile.append`
+    would merge them.
+    """
+
+    __slots__ = ("_file", "_lines", "_sessionid")
+
+    def __init__(self, file: ReportFile, sessionid: int):
+        self._file = file
+        self._sessionid = sessionid
+        self._lines: dict[int, PendingLine | ReportLine] = {}
+
+    @property
+    def name(self) -> str:
+        return self._file.name
+
+    def add_line(
+        self,
+        ln: int,
+        coverage: int | str,
+        coverage_type: CoverageType | None = None,
+        partials=None,
+        missing_branches=None,
+        complexity=None,
+    ):
+        """Adds a line, merging it with the line previously added on `ln`"""
+        line = (
+            coverage,
+            coverage_type.report_value if coverage_type else None,
+            partials,
+            missing_branches,
+            complexity,
+        )
+        existing = self._lines.get(ln)
+        if existing is None:
+            self._lines[ln] = line
+        elif (
+            type(existing) is tuple
+            and type(existing[0]) is int
+            and type(coverage) is int
+            and existing[1:] == _PLAIN
+            and line[1:] == _PLAIN
+        ):
+            # the most common case: merging plain hit counts
+            self._lines[ln] = (merge_coverage(existing[0], coverage), *_PLAIN)
+        else:
+            self._lines[ln] = merge_line(
+                self._report_line(existing), self._report_line(line)
+            )
+
+    def add_lines(
+        self,
+        lines: Iterable[tuple[int, int | str]],
+        coverage_type: CoverageType | None = None,
+    ):
+        """Adds many `(ln, coverage)` lines of the same `coverage_type`"""
+        for ln, coverage in lines:
+            self.add_line(ln, coverage, coverage_type)
+
+    def set_line(
+        self,
+        ln: int,
+        coverage: int | str,
+        coverage_type: CoverageType | None = None,
+        partials=None,
+        missing_branches=None,
+        complexity=None,
+    ):
+        """Sets a line, overwriting the line previously added on `ln`"""
+        self._lines[ln] = (
+            coverage,
+            coverage_type.report_value if coverage_type else None,
+            partials,
+            missing_branches,
+            complexity,
+        )
+
+    def _report_line(self, line: PendingLine | ReportLine) -> ReportLine:
+        if type(line) is not tuple:
+            return line
+        # positional arguments, as this is called for every line of the report
+        coverage, type_, partials, missing_branches, complexity = line
+        return ReportLine(
+            coverage,
+            type_,
+            [
+                LineSession(
+                    self._sessionid, coverage, missing_branches, partials, complexity
+                )
+            ],
+            complexity,
+        )
+
+    def build(self) -> ReportFile:
+        lines, report_line = self._lines, self._report_line
+        for ln, line in lines.items():
+            lines[ln] = report_line(line)
+        self._file.append_lines(lines)
+        self._lines = {}
+        return self._file
+
+
 class ReportBuilderSession:
     def __init__(self, report_builder: "ReportBuilder", report_filepath: str):
         self.filepath = report_filepath
@@ -62,6 +176,18 @@ class ReportBuilderSession:
             fixed_path, ignore=self._report_builder.ignored_lines.get(fixed_path)
         )
 
+    def create_coverage_file_builder(
+        self, path: str, do_fix_path: bool = True
+    ) -> CoverageFileBuilder | None:
+        """
+        Like `create_coverage_file`, but returns a builder to add all the lines
+        of the file in bulk. The `ReportFile` is materialized with `build()`.
+        """
+        _file = self.create_coverage_file(path, do_fix_path=do_fix_path)
+        if _file is None:
+            return None
+        return CoverageFileBuilder(_file, self._report_builder.sessionid)
+
     def create_coverage_line(
         self,
         coverage: int | str,
@@ -1,4 +1,6 @@
+import codecs
 import logging
+import time
 from typing import Literal
 
 import orjson
@@ -80,6 +82,118 @@ RAW_REPORT_PROCESSOR_COUNTER = Counter(
 )
 
 
+# The formats can be told apart by their first few bytes, so the detection
+# doesn't need to go through whole uploads.
+SNIFF_PREFIX_SIZE = 4 * KiB
+
+XCODE_FIRST_LINE_ENDINGS = (
+    ".h:",
+    ".m:",
+    ".swift:",
+    ".hpp:",
+    ".cpp:",
+    ".cxx:",
+    ".c:",
+    ".C:",
+    ".cc:",
+    ".cxx:",
+    ".c++:",
+)
+XCODE_FILENAME_ENDINGS = (
+    "app.coverage.txt",
+    "framework.coverage.txt",
+    "xctest.coverage.txt",
+)
+
+type ProcessorClass = type[BaseLanguageProcessor]
+
+# The candidate processors of the xml reports, by the tag of their root element.
+# `BullseyeProcessor` is checked beforehand, as its root tag is namespaced.
+XML_PROCESSORS_BY_ROOT_TAG: dict[str, list[ProcessorClass]] = {
+    "statements": [SCoverageProcessor],
+    "Root": [JetBrainsXMLProcessor],
+    "coverage": [CloverProcessor, MonoProcessor, CoberturaProcessor],
+    "CoverageSession": [CSharpProcessor],
+    "report": [JacocoProcessor],
+    "results": [VbProcessor],
+    "CoverageDSPriv": [VbTwoProcessor],
+    "scoverage": [CoberturaProcessor],
+}
+
+# The processors of json objects in order of priority, with the keys the object
+# needs to have (one of) to possibly match the processor.
+# `NodeProcessor` checks the values of the object instead, so it comes last.
+JSON_PROCESSORS_BY_KEY: list[tuple[ProcessorClass, tuple[str, ...]]] = [
+    (ElmProcessor, ("coverageData",)),
+    (RlangProcessor, ("uploader",)),
+    (FlowcoverProcessor, ("flowStatus",)),
+    (VOneProcessor, ("coverage", "RSpec", "MiniTest")),
+    (ScalaProcessor, ("fileReports",)),
+    (CoverallsProcessor, ("source_files",)),
+    (SimplecovProcessor, ("command_name", "meta")),
+    (GapProcessor, ("Type",)),
+    (PyCoverageProcessor, ("files",)),
+]
+
+# All the processors of a type of report, in order of priority, to probe
+# the reports that can't be classified by their signature.
+XML_PROCESSORS: list[ProcessorClass] = [
+    BullseyeProcessor,
+    SCoverageProcessor,
+    JetBrainsXMLProcessor,
+    CloverProcessor,
+    MonoProcessor,
+    CSharpProcessor,
+    JacocoProcessor,
+    VbProcessor,
+    VbTwoProcessor,
+    CoberturaProcessor,
+]
+TXT_PROCESSORS: list[ProcessorClass] = [
+    LcovProcessor,
+    GcovProcessor,
+    LuaProcessor,
+    GapProcessor,
+    DLSTProcessor,
+    GoProcessor,
+    XCodeProcessor,
+]
+JSON_PROCESSORS: list[ProcessorClass] = [
+    SalesforceProcessor,
+    ElmProcessor,
+    RlangProcessor,
+    FlowcoverProcessor,
+    VOneProcessor,
+    ScalaProcessor,
+    CoverallsProcessor,
+    SimplecovProcessor,
+    GapProcessor,
+    PyCoverageProcessor,
+    NodeProcessor,
+]
+
+
+# the byte order marks lxml understands, the utf-32 ones start with the utf-16 ones
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+
+def document_start(prefix: bytes) -> bytes:
+    """
+    Returns the first character of the document, after a BOM and whitespace.
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if prefix.startswith(bom):
+            text = prefix[len(bom) :].decode(encoding, errors="ignore")
+            return text.lstrip()[:1].encode()
+    return prefix.lstrip()[:1]
+
+
 @sentry_sdk.trace
 def report_type_matching(
     report: ParsedUploadedReportFile, first_line: str
@@ -90,59 +204,105 @@ def report_type_matching(
 ):
     name = report.filename or ""
     raw_report = report.contents
-    xcode_first_line_endings = (
-        ".h:",
-        ".m:",
-        ".swift:",
-        ".hpp:",
-        ".cpp:",
-        ".cxx:",
-        ".c:",
-        ".C:",
-        ".cc:",
-        ".cxx:",
-        ".c++:",
-    )
-    xcode_filename_endings = (
-        "app.coverage.txt",
-        "framework.coverage.txt",
-        "xctest.coverage.txt",
-    )
-    if first_line.endswith(xcode_first_line_endings) or name.endswith(
-        xcode_filename_endings
+    if first_line.endswith(XCODE_FIRST_LINE_ENDINGS) or name.endswith(
+        XCODE_FILENAME_ENDINGS
     ):
         return raw_report, "txt"
-    if raw_report.find(b'<plist version="1.0">') >= 0 or name.endswith(".plist"):
+    prefix = raw_report[:SNIFF_PREFIX_SIZE]
+    if prefix.find(b'<plist version="1.0">') >= 0 or name.endswith(".plist"):
         return raw_report, "plist"
     if not raw_report:
         return raw_report, "txt"
 
-    try:
-        processed = orjson.loads(raw_report)
-        if isinstance(processed, dict) or isinstance(processed, list):
-            return processed, "json"
-    except ValueError:
-        pass
-
-    try:
-        parser = etree.XMLParser(recover=True, resolve_entities=False)
-        processed = etree.fromstring(raw_report, parser=parser)
-        if processed is not None and len(processed) > 0:
-            return processed, "xml"
-    except (ValueError, etree.XMLSyntaxError):
-        pass
+    # json and xml documents can only start with these, after whitespace or a BOM
+    start = document_start(prefix)
+
+    if start in (b"{", b"[", b""):
+        try:
+            processed = orjson.loads(raw_report)
+            if isinstance(processed, dict) or isinstance(processed, list):
+                return processed, "json"
+        except ValueError:
+            pass
+
+    if start in (b"<", b""):
+        try:
+            parser = etree.XMLParser(recover=True, resolve_entities=False)
+            processed = etree.fromstring(raw_report, parser=parser)
+            if processed is not None and len(processed) > 0:
+                return processed, "xml"
+        except (ValueError, etree.XMLSyntaxError):
+            pass
 
     return raw_report, "txt"
 
 
+def sniff_txt_processor(
+    raw_report: bytes, first_line: str, report_filename: str
+) -> ProcessorClass | None:
+    """
+    Classifies a text report by its first bytes and filename.
+    """
+    if raw_report.startswith((b"TN:", b"SF:")):
+        return LcovProcessor
+    if "0:Source:" in first_line:
+        return GcovProcessor
+    if raw_report.startswith(b"======="):
+        return LuaProcessor
+    if raw_report.startswith(b"mode: "):
+        return GoProcessor
+    if report_filename.endswith(XCODE_FILENAME_ENDINGS) or first_line.endswith(
+        XCODE_FIRST_LINE_ENDINGS
+    ):
+        return XCodeProcessor
+    return None
+
+
+def candidate_processors(
+    parsed_report, report_type: str, first_line: str, report_filename: str
+) -> list[ProcessorClass]:
+    """
+    Returns the processors that could process the report, in order of priority.
+
+    Instead of probing every processor of the report type, xml reports are
+    classified by their root tag, json objects by their keys, and text reports
+    by their first bytes. Only the text reports that don't match their
+    signature fall back to probing all the text processors.
+    """
+    if report_type == "plist":
+        return [XCodePlistProcessor]
+    if report_type == "xml":
+        if "BullseyeCoverage" in parsed_report.tag:
+            return [BullseyeProcessor]
+        return XML_PROCESSORS_BY_ROOT_TAG.get(parsed_report.tag, [])
+    if report_type == "txt":
+        sniffed = sniff_txt_processor(parsed_report, first_line, report_filename)
+        if sniffed is None:
+            return TXT_PROCESSORS
+        return [sniffed] + [p for p in TXT_PROCESSORS if p is not sniffed]
+    if report_type == "json" and parsed_report:
+        if not isinstance(parsed_report, dict):
+            return JSON_PROCESSORS
+        return [
+            processor
+            for processor, keys in JSON_PROCESSORS_BY_KEY
+            if any(key in parsed_report for key in keys)
+        ] + [NodeProcessor]
+    return []
+
+
 def process_report(
     report: ParsedUploadedReportFile, report_builder: ReportBuilder
 ) -> Report | None:
+    detection_start = time.perf_counter()
     report_filename = report.filename or ""
     first_line = remove_non_ascii(report.get_first_line().decode(errors="replace"))
     raw_report = report.contents
 
-    if b"<classycle " in raw_report and b"</classycle>" in raw_report:
+    if (
+        b"<classycle " in raw_report[:SNIFF_PREFIX_SIZE]
+        and b"</classycle>" in raw_report
+    ):
         log.warning(
             "Ignored <classycle> report",
             extra={"report_filename": report_filename, "first_line": first_line[:100]},
@@ -150,55 +310,20 @@ def process_report(
         return None
 
     parsed_report, report_type = report_type_matching(report, first_line)
+    if report_type == "txt" and parsed_report[-11:] == b"has no code":
+        # empty [dlst]
+        return None
 
-    processors: list[BaseLanguageProcessor] = []
-    if report_type == "plist":
-        processors = [XCodePlistProcessor()]
-    elif report_type == "xml":
-        processors = [
-            BullseyeProcessor(),
-            SCoverageProcessor(),
-            JetBrainsXMLProcessor(),
-            CloverProcessor(),
-            MonoProcessor(),
-            CSharpProcessor(),
-            JacocoProcessor(),
-            VbProcessor(),
-            VbTwoProcessor(),
-            CoberturaProcessor(),
-        ]
-    elif report_type == "txt":
-        if parsed_report[-11:] == b"has no code":
-            # empty [dlst]
-            return None
-        processors = [
-            LcovProcessor(),
-            GcovProcessor(),
-            LuaProcessor(),
-            GapProcessor(),
-            DLSTProcessor(),
-            GoProcessor(),
-            XCodeProcessor(),
-        ]
-    elif report_type == "json" and parsed_report:
-        processors = [
-            SalesforceProcessor(),
-            ElmProcessor(),
-            RlangProcessor(),
-            FlowcoverProcessor(),
-            VOneProcessor(),
-            ScalaProcessor(),
-            CoverallsProcessor(),
-            SimplecovProcessor(),
-            GapProcessor(),
-            PyCoverageProcessor(),
-            NodeProcessor(),
-        ]
-
-    for processor in processors:
+    for processor_class in candidate_processors(
+        parsed_report, report_type, first_line, report_filename
+    ):
+        processor = processor_class()
         if not processor.matches_content(parsed_report, first_line, report_filename):
             continue
-        processor_name = type(processor).__name__
+        processor_name = processor_class.__name__
+        RAW_REPORT_PROCESSOR_RUNTIME_SECONDS.labels(
+            processor=f"{processor_name}.detection"
+        ).observe(time.perf_counter() - detection_start)
 
         RAW_REPORT_SIZE.labels(processor=processor_name).observe(report.size)
         with RAW_REPORT_PROCESSOR_RUNTIME_SECONDS.labels(
@@ -1,6 +1,7 @@
 from json import loads
 from unittest.mock import patch
 
+import billiard
 import pytest
 from lxml import etree
 
@@ -9,13 +10,14 @@ from helpers.exceptions import (
     ReportEmptyError,
     ReportExpiredException,
 )
+from services.path_fixer import PathFixer
 from services.report import raw_upload_processor as process
 from services.report.parser import LegacyReportParser
 from services.report.parser.types import LegacyParsedRawReport, ParsedUploadedReportFile
 from services.report.report_builder import ReportBuilder
 from shared.reports.reportfile import ReportFile
 from shared.reports.resources import Report
-from shared.reports.types import ReportLine, ReportTotals
+from shared.reports.types import LineSession, ReportLine, ReportTotals
 from shared.utils.sessions import Session
 from shared.yaml import UserYaml
 
@@ -772,3 +774,137 @@ class TestProcessReport:
             _ = process.process_raw_upload(UserYaml({}), uploaded_reports, session)
 
         assert e.value.filename == filename
+
+
+def make_lcov_upload(num_files: int, files_per_report: int = 3):
+    uploaded_files = []
+    for i in range(num_files):
+        sections = []
+        for j in range(files_per_report):
+            # every report shares some files with its neighbours
+            sections += [
+                "TN:",
+                f"SF:src/module_{(i + j) % (num_files + 1)}.py",
+                *(f"DA:{line},{(line + i) % 3}" for line in range(1, 20)),
+                "BRDA:5,0,0,1",
+                f"BRDA:5,0,1,{i % 2}",
+                "end_of_record",
+            ]
+        uploaded_files.append(
+            ParsedUploadedReportFile(
+                filename=f"coverage/report_{i}.lcov",
+                file_contents="\n".join(sections).encode(),
+            )
+        )
+    return LegacyParsedRawReport(
+        toc=None, env=None, report_fixes=None, uploaded_files=uploaded_files
+    )
+
+
+def process_in_prefork_child(num_files: int) -> tuple[list[str], ReportTotals]:
+    upload = make_lcov_upload(num_files)
+    path_fixer = PathFixer.init_from_user_yaml(UserYaml({}), toc=[])
+    report = process._process_files_in_parallel(
+        3, (UserYaml({}), 0, {}, path_fixer), upload.uploaded_files
+    )
+    return sorted(report.files), report.totals
+
+
+class TestProcessRawUploadParallel:
+    @pytest.fixture
+    def parallel_config(self, mock_configuration):
+        mock_configuration._params["setup"]["upload_processing"] = {
+            "parallel_workers": 3,
+            "parallel_min_files": 4,
+        }
+        return mock_configuration
+
+    def test_get_parallel_workers(self, parallel_config):
+        upload = make_lcov_upload(10)
+        assert process.get_parallel_workers(upload.uploaded_files) == 3
+        assert process.get_parallel_workers(upload.uploaded_files[:3]) == 0
+
+        parallel_config._params["setup"]["upload_processing"][
+            "parallel_max_upload_size"
+        ] = 1000
+        assert process.get_parallel_workers(upload.uploaded_files) == 0
+
+    def test_get_parallel_workers_disabled_by_default(self, mock_configuration):
+        upload = make_lcov_upload(10)
+        assert process.get_parallel_workers(upload.uploaded_files) == 0
+
+    @pytest.mark.parametrize("num_files", [4, 5, 17])
+    def test_parallel_matches_sequential(self, mocker, parallel_config, num_files):
+        upload = make_lcov_upload(num_files)
+        upload_processing = parallel_config._params["setup"]["upload_processing"]
+        upload_processing["parallel_workers"] = 0
+        sequential_session = Session(flags=["unit"])
+        sequential = process.process_raw_upload(
+            UserYaml({}), upload, sequential_session
+        )
+        upload_processing["parallel_workers"] = 3
+
+        parallel_process = mocker.spy(process, "_process_files_in_parallel")
+        parallel_session = Session(flags=["unit"])
+        parallel = process.process_raw_upload(UserYaml({}), upload, parallel_session)
+
+        assert parallel_process.call_count == 1
+        assert sorted(parallel.files) == sorted(sequential.files)
+        for filename in sequential.files:
+            assert list(parallel.get(filename).lines) == list(
+                sequential.get(filename).lines
+            )
+            assert parallel.get(filename).totals == sequential.get(filename).totals
+        assert parallel.totals == sequential.totals
+        assert parallel_session.totals == sequential_session.totals
+
+    def test_parallel_in_prefork_pool_child(self):
+        # celery's default prefork pool runs the tasks in daemonic processes
+        pool = billiard.get_context("fork").Pool(processes=1)
+        try:
+            files, totals = pool.apply(process_in_prefork_child, (6,))
+        finally:
+            pool.terminate()
+
+        expected_files, expected_totals = process_in_prefork_child(6)
+        assert files == expected_files
+        assert totals == expected_totals
+
+    def test_parallel_expired_report(self, mocker, parallel_config):
+        upload = make_lcov_upload(6)
+
+        def process_report(report, report_builder):
+            if report.filename == "coverage/report_2.lcov":
+                raise ReportExpiredException()
+
+        mocker.patch.object(process, "process_report", side_effect=process_report)
+
+        with pytest.raises(ReportExpiredException) as e:
+            process.process_raw_upload(UserYaml({}), upload, Session())
+
+        assert e.value.filename == "coverage/report_2.lcov"
+
+    def test_parallel_empty_reports(self, mocker, parallel_config):
+        upload = make_lcov_upload(6)
+        mocker.patch.object(process, "process_report", return_value=None)
+
+        with pytest.raises(ReportEmptyError, match="No files found in report."):
+            process.process_raw_upload(UserYaml({}), upload, Session())
+
+    def test_merge_reports_tree(self):
+        reports = []
+        for i in range(7):
+            report = Report()
+            report_file = ReportFile(f"file_{i % 3}.py")
+            report_file.append(
+                1, ReportLine.create(coverage=1, sessions=[LineSession(0, 1)])
+            )
+            report.append(report_file)
+            reports.append(report)
+        reports.insert(3, Report())
+
+        merged = process._merge_reports_tree(iter(reports))
+
+        assert sorted(merged.files) == ["file_0.py", "file_1.py", "file_2.py"]
+        assert merged.totals.lines == 3
+        assert process._merge_reports_tree([]).is_empty()
@@ -1,3 +1,5 @@
+import random
+
 from services.report.report_builder import CoverageType, ReportBuilder
 from shared.reports.reportfile import ReportFile
 from shared.reports.types import ReportLine
@@ -83,3 +85,59 @@ def test_report_builder_session_create_line(mocker):
     builder_session = builder.create_report_builder_session(filepath)
     line = builder_session.create_coverage_line(1, CoverageType.branch)
     assert line == ReportLine.create(1, type="b", sessions=[(45, 1)])
+
+
+def test_coverage_file_builder_matches_append():
+    rng = random.Random(0)
+    builder = ReportBuilder({}, 3, {"file.py": {"lines": {4}}}, lambda path: path)
+    builder_session = builder.create_report_builder_session("filepath")
+
+    expected = builder_session.create_coverage_file("file.py")
+    file_builder = builder_session.create_coverage_file_builder("file.py")
+    assert file_builder.name == "file.py"
+
+    for _ in range(500):
+        ln = rng.randint(1, 30)
+        args = rng.choice(
+            [
+                (rng.choice([-1, 0, 1, 2, 10]),),
+                (rng.choice([0, 3]),),
+                (rng.choice(["0/2", "1/2", "2/2"]), CoverageType.branch),
+                ("1/2", CoverageType.branch, None, ["0:1"]),
+                (1, CoverageType.method, None, None, (1, 2)),
+                ("1/3", None, [[0, 4, 1], [4, None, 0]]),
+            ]
+        )
+        expected.append(ln, builder_session.create_coverage_line(*args))
+        file_builder.add_line(ln, *args)
+
+    file_builder.set_line(5, "0/2", CoverageType.branch, missing_branches=["0", "1"])
+    expected[5] = builder_session.create_coverage_line(
+        "0/2", CoverageType.branch, missing_branches=["0", "1"]
+    )
+
+    file = file_builder.build()
+    assert list(file.lines) == list(expected.lines)
+    assert file.totals == expected.totals
+    assert 4 not in file
+
+
+def test_coverage_file_builder_add_lines():
+    builder = ReportBuilder({}, 0, {}, lambda path: path)
+    builder_session = builder.create_report_builder_session("filepath")
+    file_builder = builder_session.create_coverage_file_builder("file.py")
+
+    file_builder.add_lines([(1, 0), (2, 1), (1, 3)])
+    file_builder.add_lines([(3, 1)], CoverageType.method)
+
+    assert list(file_builder.build().lines) == [
+        (1, ReportLine.create(3, sessions=[(0, 3)])),
+        (2, ReportLine.create(1, sessions=[(0, 1)])),
+        (3, ReportLine.create(1, type="m", sessions=[(0, 1)])),
+    ]
+
+
+def test_create_coverage_file_builder_unfixable_path():
+    builder = ReportBuilder({}, 0, {}, lambda path: None)
+    builder_session = builder.create_report_builder_session("filepath")
+    assert builder_session.create_coverage_file_builder("file.py") is None
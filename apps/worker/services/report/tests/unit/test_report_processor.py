@@ -2,7 +2,15 @@ import pytest
 
 from services.report.languages.helpers import remove_non_ascii
 from services.report.parser.types import ParsedUploadedReportFile
-from services.report.report_processor import process_report, report_type_matching
+from services.report.report_processor import (
+    JSON_PROCESSORS,
+    TXT_PROCESSORS,
+    XML_PROCESSORS,
+    XCodePlistProcessor,
+    candidate_processors,
+    process_report,
+    report_type_matching,
+)
 
 xcode_report = b"""/Users/distiller/project/Auth0/A0ChallengeGenerator.m:
    28|       |@implementation A0SHA256ChallengeGenerator
@@ -36,7 +44,20 @@ xcode_report = b"""/Users/distiller/project/Auth0/A0ChallengeGenerator.m:
             "xml",
             None,
         ),
+        *(
+            (
+                '\ufeff<?xml version="1.0" ?><statements><statement>source.scala</statement></statements>'.encode(
+                    encoding
+                ),
+                "xml",
+                None,
+            )
+            for encoding in ["utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be"]
+        ),
         (b"normal file", "txt", b"normal file"),
+        (b' \r\n\t[{"name": "a"}]', "json", [{"name": "a"}]),
+        (b"TN:\nSF:file.c\nDA:1,1\n<coverage><a/></coverage>", "txt", None),
+        (b'mode: set\n{"a": 1}', "txt", None),
         (b"1", "txt", b"1"),
     ],
 )
@@ -61,3 +82,102 @@ def test_empty_json():
     raw_report = ParsedUploadedReportFile(filename="name", file_contents=b"[]")
     report = process_report(raw_report, None)
     assert report is None
+
+
+ALL_PROCESSORS = {
+    "xml": XML_PROCESSORS,
+    "txt": TXT_PROCESSORS,
+    "json": JSON_PROCESSORS,
+    "plist": [XCodePlistProcessor],
+}
+
+
+def first_matching(processors, content, first_line, name):
+    for processor in processors:
+        if processor().matches_content(content, first_line, name):
+            return processor
+    return None
+
+
+@pytest.mark.parametrize(
+    "filename,contents",
+    [
+        ("coverage.xml", b'<?xml version="1.0" ?><coverage><packages/></coverage>'),
+        ("coverage.xml", b'<coverage generated="1"><project/></coverage>'),
+        ("coverage.xml", b"<coverage><assembly/></coverage>"),
+        ("coverage.xml", b"<scoverage><packages/></scoverage>"),
+        ("coverage.xml", b"<statements><statement/></statements>"),
+        ("coverage.xml", b"<Root><File/></Root>"),
+        ("coverage.xml", b"<CoverageSession><Modules/></CoverageSession>"),
+        ("jacoco.xml", b"<report><package/></report>"),
+        ("coverage.xml", b"<results><modules/></results>"),
+        ("coverage.xml", b"<CoverageDSPriv><Module/></CoverageDSPriv>"),
+        ("coverage.xml", b'<BullseyeCoverage xmlns="x"><folder/></BullseyeCoverage>'),
+        ("coverage.xml", b"<unknown><a/></unknown>"),
+        ("coverage.json", b'[{"name": "a"}]'),
+        ("coverage.json", b'{"coverageData": {"a": 1}}'),
+        ("coverage.json", b'{"uploader": "R", "files": []}'),
+        ("coverage.json", b'{"flowStatus": "ok"}'),
+        ("coverage.json", b'{"coverage": {"a.py": [1]}}'),
+        ("coverage.json", b'{"fileReports": []}'),
+        ("coverage.json", b'{"source_files": []}'),
+        ("coverage.json", b'{"command_name": "RSpec"}'),
+        ("coverage.json", b'{"meta": {"simplecov_version": "1"}}'),
+        ("coverage.json", b'{"Type": "covered", "File": "a"}'),
+        ("coverage.json", b'{"meta": {"show_contexts": false}, "files": {}}'),
+        ("coverage.json", b'{"a.js": {"s": {}}}'),
+        ("coverage.json", b'{"a": 1}'),
+        ("coverage.info", b"TN:\nSF:a.c\nDA:1,1\nend_of_record\n"),
+        ("coverage.info", b"SF:a.c\nDA:1,1\nend_of_record\n"),
+        ("a.c.gcov", b"        -:    0:Source:a.c\n        1:    1:int a;\n"),
+        ("luacov.report.out", b"==============================\na.lua\n"),
+        ("coverage.txt", b"mode: set\na.go:1.1,2.2 1 1\n"),
+        ("coverage.txt", b"a.go:1.1,2.2 1 1\n"),
+        ("app.coverage.txt", xcode_report),
+        ("coverage.txt", b"/a.swift:\n    1|      1|let a = 1\n"),
+        ("coverage.lst", b"|  a\n|1|b\na.d is 100% covered"),
+        ("coverage.txt", b'{"Type": "covered", "File": "a"\n'),
+        ("coverage.txt", b"normal file"),
+        ("coverage.plist", b'<?xml version="1.0"?><plist version="1.0"></plist>'),
+    ],
+)
+def test_candidate_processors(filename, contents):
+    report = ParsedUploadedReportFile(filename=filename, file_contents=contents)
+    first_line = remove_non_ascii(report.get_first_line().decode(errors="replace"))
+    parsed_report, report_type = report_type_matching(report, first_line)
+
+    candidates = candidate_processors(parsed_report, report_type, first_line, filename)
+
+    # the candidates match the same processor as probing all the processors of the type
+    assert first_matching(
+        candidates, parsed_report, first_line, filename
+    ) == first_matching(
+        ALL_PROCESSORS[report_type], parsed_report, first_line, filename
+    )
+    if report_type != "txt":
+        assert len(candidates) <= len(ALL_PROCESSORS[report_type])
+
+
+def test_candidate_processors_are_narrowed():
+    report = ParsedUploadedReportFile(
+        filename="coverage.xml", file_contents=b"<report><package/></report>"
+    )
+    parsed_report, report_type = report_type_matching(report, "<report>")
+    assert [
+        p.__name__
+        for p in candidate_processors(parsed_report, report_type, "", "coverage.xml")
+    ] == ["JacocoProcessor"]
+
+    assert [
+        p.__name__
+        for p in candidate_processors(
+            {"source_files": [], "coverage": {}}, "json", "", "coverage.json"
+        )
+    ] == ["VOneProcessor", "CoverallsProcessor", "NodeProcessor"]
+
+    assert (
+        candidate_processors(b"mode: set\n", "txt", "mode: set", "coverage.txt")[
+            0
+        ].__name__
+        == "GoProcessor"
+    )
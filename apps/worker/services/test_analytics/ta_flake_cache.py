@@ -0,0 +1,119 @@
+import logging
+import time
+from collections.abc import Set as AbstractSet
+
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+
+from services.test_analytics.ta_timeseries import get_flaky_tests_set
+from shared.helpers.redis import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+VERSION_KEY_NAME = "ta_flaky_tests_version:{}"
+SET_KEY_NAME = "ta_flaky_tests:{}:{}"
+SET_TTL = 60 * 60 * 24
+
+# `calc_test_id` produces 128 bit hashes
+TEST_ID_SIZE = 16
+
+# repo_id -> (version, flaky test ids), shared by all the TA processors of this worker.
+_local_cache: TTLCache[int, tuple[int, frozenset[bytes]]] = TTLCache(
+    maxsize=1000, ttl=300
+)
+
+
+def encode_flaky_tests(test_ids: AbstractSet[bytes]) -> bytes | None:
+    """
+    Encodes the set of flaky test ids as the concatenation of the sorted ids.
+    Returns `None` if the ids can't be encoded that way.
+    """
+    if any(len(test_id) != TEST_ID_SIZE for test_id in test_ids):
+        return None
+    return b"".join(sorted(test_ids))
+
+
+def decode_flaky_tests(blob: bytes) -> frozenset[bytes]:
+    return frozenset(
+        blob[i : i + TEST_ID_SIZE] for i in range(0, len(blob), TEST_ID_SIZE)
+    )
+
+
+def _new_version() -> int:
+    """
+    The version a missing counter is seeded with.
+
+    The counter has no TTL but can still be evicted, and restarting it from 0
+    would make the sets cached under the previous versions current again.
+    Seeding it with the time makes sure the new version was never used before.
+    """
+    return time.time_ns()
+
+
+def _get_flaky_tests_version(redis, repo_id: int) -> int:
+    key = VERSION_KEY_NAME.format(repo_id)
+    version = redis.get(key)
+    if version is None:
+        seed = _new_version()
+        if redis.set(key, seed, nx=True):
+            return seed
+        # seeded concurrently by another processor
+        version = redis.get(key)
+    return int(version or 0)
+
+
+def bump_flaky_tests_version(repo_id: int):
+    """
+    Invalidates the cached flaky test sets of the repo.
+
+    This has to be called *after* the changes to the repo's flakes are committed.
+    """
+    key = VERSION_KEY_NAME.format(repo_id)
+    try:
+        pipeline = get_redis_connection().pipeline()
+        pipeline.set(key, _new_version(), nx=True)
+        pipeline.incr(key)
+        pipeline.execute()
+    except RedisError:
+        log.warning("Failed to bump flaky tests version", extra={"repo_id": repo_id})
+
+
+def get_cached_flaky_tests_set(repo_id: int) -> frozenset[bytes]:
+    """
+    Returns the ids of the repo's currently flaky tests.
+
+    The set is cached in this process and in Redis, keyed by a version counter
+    which `process_flakes` bumps whenever a test becomes or stops being flaky.
+    Checking the cache costs a single `GET` of that counter as long as the
+    version didn't change, and falls back to querying the `Flake` table.
+    """
+    redis = get_redis_connection()
+    try:
+        version = _get_flaky_tests_version(redis, repo_id)
+    except RedisError:
+        log.warning("Failed to get flaky tests version", extra={"repo_id": repo_id})
+        return frozenset(get_flaky_tests_set(repo_id))
+
+    cached = _local_cache.get(repo_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    set_key = SET_KEY_NAME.format(repo_id, version)
+    try:
+        blob = redis.get(set_key)
+    except RedisError:
+        blob = None
+
+    if blob is not None:
+        flaky_tests = decode_flaky_tests(blob)
+    else:
+        flaky_tests = frozenset(get_flaky_tests_set(repo_id))
+        encoded = encode_flaky_tests(flaky_tests)
+        if encoded is not None:
+            try:
+                redis.set(set_key, encoded, ex=SET_TTL, nx=True)
+            except RedisError:
+                pass
+
+    _local_cache[repo_id] = (version, flaky_tests)
+    return flaky_tests
@@ -5,6 +5,7 @@ from django.db.models import Q, QuerySet
 from django.utils import timezone
 from redis.exceptions import LockError
 
+from services.test_analytics.ta_flake_cache import bump_flaky_tests_version
 from services.test_analytics.ta_metrics import process_flakes_summary
 from shared.django_apps.reports.models import CommitReport, ReportSession
 from shared.django_apps.ta_timeseries.models import Testrun
@@ -43,10 +44,13 @@ def get_testruns(
     ).order_by("timestamp")
 
 
-def handle_pass(curr_flakes: dict[bytes, Flake], test_id: bytes):
+def handle_pass(curr_flakes: dict[bytes, Flake], test_id: bytes) -> bool:
+    """
+    Returns whether the flake expired.
+    """
     # possible that we expire it and stop caring about it
     if test_id not in curr_flakes:
-        return
+        return False
 
     curr_flakes[test_id].recent_passes_count += 1
     curr_flakes[test_id].count += 1
@@ -54,11 +58,16 @@ def handle_pass(curr_flakes: dict[bytes, Flake], test_id: bytes):
         curr_flakes[test_id].end_date = timezone.now()
         curr_flakes[test_id].save()
         del curr_flakes[test_id]
+        return True
+    return False
 
 
 def handle_failure(
     curr_flakes: dict[bytes, Flake], test_id: bytes, testrun: Testrun, repo_id: int
-):
+) -> bool:
+    """
+    Returns whether a new flake was created.
+    """
     existing_flake = curr_flakes.get(test_id)
 
     if existing_flake:
@@ -79,14 +88,18 @@ def handle_failure(
     if testrun.outcome != "flaky_fail":
         testrun.outcome = "flaky_fail"
 
+    return existing_flake is None
+
 
 def process_flakes_for_commit(repo_id: int, commit_id: str):
     uploads = get_relevant_uploads(repo_id, commit_id)
 
     curr_flakes = fetch_current_flakes(repo_id)
+    flaky_tests_changed = False
 
     for upload in uploads:
         testruns = get_testruns(upload, curr_flakes)
+        changed_testruns = []
 
         for testrun in testruns:
             test_id = bytes(testrun.test_id)
@@ -95,13 +108,19 @@ def process_flakes_for_commit(repo_id: int, commit_id: str):
                     if test_id not in curr_flakes:
                         continue
 
-                    handle_pass(curr_flakes, test_id)
+                    flaky_tests_changed |= handle_pass(curr_flakes, test_id)
                 case "failure" | "flaky_fail" | "error":
-                    handle_failure(curr_flakes, test_id, testrun, repo_id)
+                    outcome = testrun.outcome
+                    flaky_tests_changed |= handle_failure(
+                        curr_flakes, test_id, testrun, repo_id
+                    )
+                    if testrun.outcome != outcome:
+                        changed_testruns.append(testrun)
                 case _:
                     continue
 
-        Testrun.objects.bulk_update(testruns, ["outcome"])
+        if changed_testruns:
+            Testrun.objects.bulk_update(changed_testruns, ["outcome"])
 
     Flake.objects.bulk_create(
         curr_flakes.values(),
@@ -110,6 +129,9 @@ def process_flakes_for_commit(repo_id: int, commit_id: str):
         update_fields=["end_date", "count", "recent_passes_count", "fail_count"],
     )
 
+    if flaky_tests_changed:
+        bump_flaky_tests_version(repo_id)
+
 
 def process_flakes_for_repo(repo_id: int):
     redis_client = get_redis_connection()
@@ -6,7 +6,9 @@ from typing import Any
 import sentry_sdk
 import test_results_parser
 
-from services.test_analytics.ta_timeseries import get_flaky_tests_set, insert_testrun
+from rollouts import TA_TIMESERIES_COPY_INGESTION
+from services.test_analytics.ta_flake_cache import get_cached_flaky_tests_set
+from services.test_analytics.ta_timeseries import insert_testrun
 from services.yaml import UserYaml, read_yaml_field
 from shared.api_archive.archive import ArchiveService
 from shared.config import get_config
@@ -89,7 +91,8 @@ def insert_testruns_timeseries(
     upload: ReportSession,
     parsing_infos: list[test_results_parser.ParsingInfo],
 ):
-    flaky_test_set = get_flaky_tests_set(repoid)
+    flaky_test_set = get_cached_flaky_tests_set(repoid)
+    use_copy = TA_TIMESERIES_COPY_INGESTION.check_value(repoid, default=False)
 
     for parsing_info in parsing_infos:
         insert_testrun(
@@ -101,4 +104,5 @@ def insert_testruns_timeseries(
             flags=upload.flag_names,
             parsing_info=parsing_info,
             flaky_test_ids=flaky_test_set,
+            use_copy=use_copy,
         )
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import csv
+import io
+import itertools
+import json
+import logging
+from collections.abc import Iterator
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import TypedDict
+from typing import Any, TypedDict
 
+import psycopg2
 import test_results_parser
-from django.db import connections
+from django.db import connections, transaction
 from django.db.models import Q
 
 from services.test_results import FlakeInfo
@@ -17,6 +25,8 @@ from shared.django_apps.ta_timeseries.models import (
 )
 from shared.django_apps.test_analytics.models import Flake
 
+log = logging.getLogger(__name__)
+
 LOWER_BOUND_NUM_DAYS = 60
 
 
@@ -36,7 +46,30 @@ def get_flaky_tests_dict(repo_id: int) -> dict[bytes, FlakeInfo]:
     }
 
 
-def insert_testrun(
+TESTRUN_COPY_COLUMNS = (
+    "timestamp",
+    "test_id",
+    "name",
+    "classname",
+    "testsuite",
+    "computed_name",
+    "outcome",
+    "duration_seconds",
+    "failure_message",
+    "framework",
+    "filename",
+    "properties",
+    "repo_id",
+    "commit_sha",
+    "branch",
+    "flags",
+    "upload_id",
+)
+
+TESTRUN_COPY_BATCH_SIZE = 10_000
+
+
+def _testrun_values(
     timestamp: datetime,
     repo_id: int | None,
     commit_sha: str | None,
@@ -44,9 +77,8 @@ def insert_testrun(
     upload_id: int | None,
     flags: list[str] | None,
     parsing_info: test_results_parser.ParsingInfo,
-    flaky_test_ids: set[bytes] | None = None,
-):
-    testruns_to_create = []
+    flaky_test_ids: AbstractSet[bytes] | None = None,
+) -> Iterator[dict[str, Any]]:
     for testrun in parsing_info["testruns"]:
         test_id = calc_test_id(
             testrun["name"], testrun["classname"], testrun["testsuite"]
@@ -59,29 +91,120 @@ def insert_testrun(
         if outcome == "failure" and flaky_test_ids and test_id in flaky_test_ids:
             outcome = "flaky_fail"
 
-        testruns_to_create.append(
-            Testrun(
-                timestamp=timestamp,
-                test_id=test_id,
-                name=testrun["name"],
-                classname=testrun["classname"],
-                testsuite=testrun["testsuite"],
-                computed_name=testrun["computed_name"]
-                or f"{testrun['classname']}::{testrun['name']}",
-                outcome=outcome,
-                duration_seconds=testrun["duration"],
-                failure_message=testrun["failure_message"],
-                framework=parsing_info["framework"],
-                filename=testrun["filename"],
-                properties=testrun.get("properties"),
-                repo_id=repo_id,
-                commit_sha=commit_sha,
-                branch=branch,
-                flags=flags,
-                upload_id=upload_id,
+        yield {
+            "timestamp": timestamp,
+            "test_id": test_id,
+            "name": testrun["name"],
+            "classname": testrun["classname"],
+            "testsuite": testrun["testsuite"],
+            "computed_name": testrun["computed_name"]
+            or f"{testrun['classname']}::{testrun['name']}",
+            "outcome": outcome,
+            "duration_seconds": testrun["duration"],
+            "failure_message": testrun["failure_message"],
+            "framework": parsing_info["framework"],
+            "filename": testrun["filename"],
+            "properties": testrun.get("properties"),
+            "repo_id": repo_id,
+            "commit_sha": commit_sha,
+            "branch": branch,
+            "flags": flags,
+            "upload_id": upload_id,
+        }
+
+
+def _copy_text_array(values: list[str] | None) -> str | None:
+    if values is None:
+        return None
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for value in values)
+    return "{" + ",".join(f'"{value}"' for value in escaped) + "}"
+
+
+def _copy_row(values: dict[str, Any]) -> list[Any]:
+    """
+    Serializes a testrun into a row of `COPY ... WITH (FORMAT csv)`, matching
+    how the Django fields would write them.
+    """
+    return [
+        values["timestamp"].isoformat(),
+        "\\x" + values["test_id"].hex(),
+        values["name"],
+        values["classname"],
+        values["testsuite"],
+        values["computed_name"],
+        values["outcome"],
+        values["duration_seconds"],
+        values["failure_message"],
+        values["framework"],
+        values["filename"],
+        json.dumps(values["properties"]) if values["properties"] is not None else None,
+        values["repo_id"],
+        values["commit_sha"],
+        values["branch"],
+        _copy_text_array(values["flags"]),
+        values["upload_id"],
+    ]
+
+
+def _bulk_create_testruns(testruns: list[dict[str, Any]]):
+    Testrun.objects.bulk_create([Testrun(**values) for values in testruns])
+
+
+def _copy_testruns(testruns: list[dict[str, Any]]):
+    buffer = io.StringIO()
+    # `QUOTE_NOTNULL` leaves `None` as an unquoted empty field, which COPY reads
+    # as NULL, while an empty string is written as `""`
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n")
+    writer.writerows(_copy_row(values) for values in testruns)
+    buffer.seek(0)
+
+    sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+        Testrun._meta.db_table, ", ".join(TESTRUN_COPY_COLUMNS)
+    )
+    with transaction.atomic(using="ta_timeseries"):
+        with connections["ta_timeseries"].cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+
+
+def insert_testrun(
+    timestamp: datetime,
+    repo_id: int | None,
+    commit_sha: str | None,
+    branch: str | None,
+    upload_id: int | None,
+    flags: list[str] | None,
+    parsing_info: test_results_parser.ParsingInfo,
+    flaky_test_ids: AbstractSet[bytes] | None = None,
+    use_copy: bool = False,
+    batch_size: int = TESTRUN_COPY_BATCH_SIZE,
+):
+    testrun_values = _testrun_values(
+        timestamp,
+        repo_id,
+        commit_sha,
+        branch,
+        upload_id,
+        flags,
+        parsing_info,
+        flaky_test_ids,
+    )
+
+    if not use_copy or connections["ta_timeseries"].vendor != "postgresql":
+        _bulk_create_testruns(list(testrun_values))
+        return
+
+    # stream the testruns into `COPY FROM STDIN` in batches, falling back to
+    # `bulk_create` for any batch that COPY fails to write
+    for batch in itertools.batched(testrun_values, batch_size):
+        try:
+            _copy_testruns(list(batch))
+        except psycopg2.Error:
+            log.warning(
+                "Failed to COPY testruns, falling back to bulk_create",
+                extra={"repo_id": repo_id, "upload_id": upload_id},
+                exc_info=True,
             )
-        )
-    Testrun.objects.bulk_create(testruns_to_create)
+            _bulk_create_testruns(list(batch))
 
 
 class TestInstance(TypedDict):
@@ -154,7 +277,7 @@ def get_pr_comment_agg(repo_id: int, commit_sha: str) -> PRCommentAgg:
 
 def get_testruns_for_flake_detection(
     upload_id: int,
-    flaky_test_ids: set[bytes],
+    flaky_test_ids: AbstractSet[bytes],
 ) -> list[Testrun]:
     return list(
         Testrun.objects.filter(
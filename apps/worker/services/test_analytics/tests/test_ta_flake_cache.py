@@ -0,0 +1,101 @@
+import pytest
+from django.utils import timezone
+
+from services.test_analytics import ta_flake_cache
+from services.test_analytics.ta_flake_cache import (
+    SET_KEY_NAME,
+    VERSION_KEY_NAME,
+    bump_flaky_tests_version,
+    decode_flaky_tests,
+    encode_flaky_tests,
+    get_cached_flaky_tests_set,
+)
+from shared.django_apps.ta_timeseries.models import calc_test_id
+from shared.django_apps.test_analytics.models import Flake
+from shared.helpers.redis import get_redis_connection
+
+
+@pytest.fixture
+def clear_cache():
+    ta_flake_cache._local_cache.clear()
+    redis = get_redis_connection()
+    for key in redis.scan_iter("ta_flaky_tests*"):
+        redis.delete(key)
+    yield
+    ta_flake_cache._local_cache.clear()
+
+
+def create_flake(repo_id: int, test_id: bytes, ended: bool = False) -> Flake:
+    return Flake.objects.create(
+        repoid=repo_id,
+        test_id=test_id,
+        count=1,
+        fail_count=1,
+        recent_passes_count=0,
+        start_date=timezone.now(),
+        end_date=timezone.now() if ended else None,
+    )
+
+
+def test_encode_decode_flaky_tests():
+    test_ids = {calc_test_id(f"test_{i}", "class", "suite") for i in range(10)}
+
+    blob = encode_flaky_tests(test_ids)
+    assert len(blob) == 160
+    assert decode_flaky_tests(blob) == test_ids
+    assert encode_flaky_tests(set()) == b""
+    assert decode_flaky_tests(b"") == frozenset()
+    assert encode_flaky_tests({b"short"}) is None
+
+
+@pytest.mark.django_db(databases=["default"])
+def test_get_cached_flaky_tests_set(clear_cache, django_assert_num_queries):
+    flaky = calc_test_id("flaky", "class", "suite")
+    create_flake(1, flaky)
+    create_flake(1, calc_test_id("ended", "class", "suite"), ended=True)
+
+    with django_assert_num_queries(1):
+        assert get_cached_flaky_tests_set(1) == {flaky}
+    redis = get_redis_connection()
+    version = int(redis.get(VERSION_KEY_NAME.format(1)))
+    assert version > 0
+    assert redis.get(SET_KEY_NAME.format(1, version)) == flaky
+
+    # served from the local cache
+    with django_assert_num_queries(0):
+        assert get_cached_flaky_tests_set(1) == {flaky}
+
+    # served from redis by another processor
+    ta_flake_cache._local_cache.clear()
+    with django_assert_num_queries(0):
+        assert get_cached_flaky_tests_set(1) == {flaky}
+
+    other = calc_test_id("other", "class", "suite")
+    create_flake(1, other)
+    with django_assert_num_queries(0):
+        assert get_cached_flaky_tests_set(1) == {flaky}
+
+    bump_flaky_tests_version(1)
+    assert int(redis.get(VERSION_KEY_NAME.format(1))) == version + 1
+    with django_assert_num_queries(1):
+        assert get_cached_flaky_tests_set(1) == {flaky, other}
+
+
+@pytest.mark.django_db(databases=["default"])
+def test_get_cached_flaky_tests_set_evicted_version(clear_cache):
+    flaky = calc_test_id("flaky", "class", "suite")
+    create_flake(1, flaky)
+    redis = get_redis_connection()
+    # a set cached under a version which was since evicted
+    redis.set(SET_KEY_NAME.format(1, 0), b"")
+    redis.set(SET_KEY_NAME.format(1, 1), b"")
+
+    assert get_cached_flaky_tests_set(1) == {flaky}
+    version = int(redis.get(VERSION_KEY_NAME.format(1)))
+    assert version > 1
+
+    redis.delete(VERSION_KEY_NAME.format(1))
+    bump_flaky_tests_version(1)
+    assert int(redis.get(VERSION_KEY_NAME.format(1))) > version + 1
+    ta_flake_cache._local_cache.clear()
+    assert get_cached_flaky_tests_set(1) == {flaky}
@@ -3,6 +3,7 @@ from typing import TypedDict
 import pytest
 from django.utils import timezone
 
+from services.test_analytics.ta_flake_cache import VERSION_KEY_NAME
 from services.test_analytics.ta_process_flakes import KEY_NAME, process_flakes_for_repo
 from shared.django_apps.reports.models import CommitReport, ReportSession
 from shared.django_apps.reports.tests.factories import CommitReportFactory
@@ -308,3 +309,52 @@ def test_testrun_outcome_updates(setup_test_data):
         "test2": "flaky_fail",  # Updated from error
         "test3": "flaky_fail",  # Already flaky_fail, unchanged
     }
+
+
+def test_process_flakes_only_updates_changed_testruns(setup_test_data, mocker):
+    result = setup_test_data(
+        uploads=[
+            {
+                "state": "processed",
+                "testruns": [
+                    {"test_id": "test1", "outcome": "failure"},
+                    {"test_id": "test2", "outcome": "flaky_fail"},
+                    {"test_id": "test3", "outcome": "pass"},
+                ],
+            }
+        ],
+        existing_flakes=[{"test_id": "test2", "count": 1, "fail_count": 1}],
+    )
+    bulk_update = mocker.spy(Testrun.objects, "bulk_update")
+    redis = get_redis_connection()
+    version_key = VERSION_KEY_NAME.format(result["repoid"])
+    redis.delete(version_key)
+
+    process_flakes_for_repo(result["repoid"])
+
+    bulk_update.assert_called_once()
+    updated = bulk_update.call_args.args[0]
+    assert [bytes(testrun.test_id) for testrun in updated] == [b"test1"]
+    assert Testrun.objects.get(test_id=b"test1").outcome == "flaky_fail"
+    # a new flake was created for `test1`
+    assert redis.get(version_key) is not None
+
+
+def test_process_flakes_keeps_version_if_flaky_set_unchanged(setup_test_data):
+    result = setup_test_data(
+        uploads=[
+            {
+                "state": "processed",
+                "testruns": [{"test_id": "test1", "outcome": "flaky_fail"}],
+            }
+        ],
+        existing_flakes=[{"test_id": "test1", "count": 1, "fail_count": 1}],
+    )
+    redis = get_redis_connection()
+    version_key = VERSION_KEY_NAME.format(result["repoid"])
+    redis.delete(version_key)
+
+    process_flakes_for_repo(result["repoid"])
+
+    assert redis.get(version_key) is None
+    assert Flake.objects.get(test_id=b"test1").fail_count == 2
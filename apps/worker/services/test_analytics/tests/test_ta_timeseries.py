@@ -1,6 +1,7 @@
 import time
 from datetime import datetime, timedelta
 
+import psycopg2
 import pytest
 from django.db import connections
 from freezegun import freeze_time
@@ -54,6 +55,109 @@ def test_insert_testrun():
     assert t.outcome == "pass"
 
 
+COPY_PARSING_INFO = {
+    "framework": "Pytest",
+    "testruns": [
+        {
+            "name": "test_name",
+            "classname": "test_classname",
+            "computed_name": "computed_name",
+            "duration": 1.0,
+            "outcome": "pass",
+            "testsuite": "test_suite",
+            "failure_message": None,
+            "filename": "test_filename",
+            "build_url": None,
+        },
+        {
+            "name": "flaky_test_name",
+            "classname": "",
+            "computed_name": None,
+            "duration": None,
+            "outcome": "error",
+            "testsuite": "test_suite",
+            "failure_message": 'multi\nline, "quoted" message',
+            "filename": None,
+            "build_url": None,
+            "properties": {"eval": {"score": 1}},
+        },
+    ],
+}
+
+COPY_TESTRUN_FIELDS = [
+    "test_id",
+    "name",
+    "classname",
+    "testsuite",
+    "computed_name",
+    "outcome",
+    "duration_seconds",
+    "failure_message",
+    "framework",
+    "filename",
+    "properties",
+    "repo_id",
+    "commit_sha",
+    "branch",
+    "flags",
+]
+
+
+@pytest.mark.django_db(databases=["ta_timeseries"])
+def test_insert_testrun_copy_matches_bulk_create():
+    flaky_test_ids = {calc_test_id("flaky_test_name", "", "test_suite")}
+    timestamp = datetime.now()
+    for upload_id, use_copy in [(1, False), (2, True)]:
+        insert_testrun(
+            timestamp=timestamp + timedelta(seconds=upload_id),
+            repo_id=1,
+            commit_sha="commit_sha",
+            branch=None,
+            upload_id=upload_id,
+            flags=["flag1", 'fl"ag\\2', ""],
+            parsing_info=COPY_PARSING_INFO,
+            flaky_test_ids=flaky_test_ids,
+            use_copy=use_copy,
+            batch_size=1,
+        )
+
+    bulk_created = list(
+        Testrun.objects.filter(upload_id=1)
+        .order_by("name")
+        .values(*COPY_TESTRUN_FIELDS)
+    )
+    copied = list(
+        Testrun.objects.filter(upload_id=2)
+        .order_by("name")
+        .values(*COPY_TESTRUN_FIELDS)
+    )
+    assert len(copied) == 2
+    assert copied == bulk_created
+    assert copied[0]["outcome"] == "flaky_fail"
+    assert copied[0]["computed_name"] == "::flaky_test_name"
+
+
+@pytest.mark.django_db(databases=["ta_timeseries"])
+def test_insert_testrun_copy_falls_back_to_bulk_create(mocker):
+    mocker.patch(
+        "services.test_analytics.ta_timeseries._copy_testruns",
+        side_effect=psycopg2.DataError("bad row"),
+    )
+
+    insert_testrun(
+        timestamp=datetime.now(),
+        repo_id=1,
+        commit_sha="commit_sha",
+        branch="branch",
+        upload_id=1,
+        flags=None,
+        parsing_info=COPY_PARSING_INFO,
+        use_copy=True,
+    )
+
+    assert Testrun.objects.filter(upload_id=1).count() == 2
+
+
 @pytest.mark.django_db(databases=["ta_timeseries"])
 def test_pr_comment_agg():
     insert_testrun(
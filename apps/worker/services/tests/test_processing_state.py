@@ -69,3 +69,99 @@ def test_batch_merging_many_uploads():
     state.mark_uploads_as_merged(merging)
 
     assert should_trigger_postprocessing(state.get_upload_numbers())
+
+
+def _result(upload_id: int) -> dict:
+    return {"upload_id": upload_id, "arguments": {}, "successful": True}
+
+
+def test_elected_merger():
+    state = ProcessingState(1234, uuid4().hex)
+    state.mark_uploads_as_processing([1, 2, 3])
+
+    state.mark_upload_as_processed(1)
+    state.store_processing_results([_result(1)])
+    token = state.try_become_merger()
+    assert token
+
+    # another finisher only hands over its uploads
+    state.mark_upload_as_processed(2)
+    state.store_processing_results([_result(2)])
+    assert state.try_become_merger() is None
+
+    batch = state.take_uploads_for_merging(token)
+    assert sorted(upload["upload_id"] for upload in batch) == [1, 2]
+    assert not should_trigger_postprocessing(state.get_upload_numbers())
+    state.mark_uploads_as_merged([1, 2])
+
+    # upload 3 is processed, but its results are not handed over yet
+    state.mark_upload_as_processed(3)
+    assert state.take_uploads_for_merging(token) == []
+    assert state.release_merger(token)
+
+    # so the next finisher becomes the merger
+    state.store_processing_results([_result(3)])
+    token = state.try_become_merger()
+    assert token
+    assert state.take_uploads_for_merging(token) == [_result(3)]
+    state.mark_uploads_as_merged([3])
+    assert state.release_merger(token)
+
+    assert should_trigger_postprocessing(state.get_upload_numbers())
+
+
+def test_elected_merger_release_with_pending_uploads():
+    state = ProcessingState(1234, uuid4().hex)
+    state.mark_uploads_as_processing([1, 2])
+
+    state.mark_upload_as_processed(1)
+    state.store_processing_results([_result(1)])
+    token = state.try_become_merger()
+    assert state.take_uploads_for_merging(token) == [_result(1)]
+    state.mark_uploads_as_merged([1])
+
+    # upload 2 is handed over after the last batch was taken
+    state.mark_upload_as_processed(2)
+    state.store_processing_results([_result(2)])
+    assert state.try_become_merger() is None
+
+    # which means the merger can not step down yet
+    assert not state.release_merger(token)
+    assert state.take_uploads_for_merging(token) == [_result(2)]
+    state.mark_uploads_as_merged([2])
+    assert state.release_merger(token)
+
+
+def test_abandoned_merger_uploads_are_merged_again():
+    state = ProcessingState(1234, uuid4().hex)
+    state.mark_uploads_as_processing([1])
+    state.mark_upload_as_processed(1)
+    state.store_processing_results([_result(1)])
+
+    token = state.try_become_merger()
+    assert state.take_uploads_for_merging(token) == [_result(1)]
+    state.abandon_merger(token)
+
+    # the lease of the abandoned merger is no longer valid
+    assert state.take_uploads_for_merging(token) is None
+
+    token = state.try_become_merger()
+    assert state.take_uploads_for_merging(token) == [_result(1)]
+
+
+def test_merger_lease_renewal():
+    state = ProcessingState(1234, uuid4().hex)
+    state.mark_uploads_as_processing([1])
+    state.mark_upload_as_processed(1)
+    state.store_processing_results([_result(1)])
+
+    token = state.try_become_merger()
+    assert state.take_uploads_for_merging(token) == [_result(1)]
+    assert state.renew_merger(token)
+
+    # the lease expired, and another merger took over the uploads
+    state.abandon_merger(token)
+    new_token = state.try_become_merger()
+    assert not state.renew_merger(token)
+    assert state.renew_merger(new_token)
+    assert state.take_uploads_for_merging(new_token) == [_result(1)]
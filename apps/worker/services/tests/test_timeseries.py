@@ -1,24 +1,30 @@
+import json
 from datetime import UTC, datetime
 
 import pytest
 from celery import group
 
+from database.models.reports import RepositoryFlag
 from database.models.timeseries import Dataset, Measurement, MeasurementName
 from database.tests.factories import CommitFactory, RepositoryFactory
 from database.tests.factories.reports import RepositoryFlagFactory
 from database.tests.factories.timeseries import DatasetFactory, MeasurementFactory
+from services import timeseries
+from services.report import legacy_totals
 from services.timeseries import (
     backfill_batch_size,
+    commit_totals_measurements,
     delete_repository_data,
     delete_repository_measurements,
     repository_commits_query,
     repository_datasets_query,
+    upsert_commits_totals_measurements,
 )
 from shared.reports.readonly import ReadOnlyReport
 from shared.reports.reportfile import ReportFile
 from shared.reports.resources import Report
-from shared.reports.types import ReportLine
-from shared.utils.sessions import Session
+from shared.reports.types import ReportLine, ReportTotals
+from shared.utils.sessions import Session, SessionType
 from shared.yaml import UserYaml
 from tasks.save_commit_measurements import save_commit_measurements
 
@@ -744,6 +750,142 @@ class TestTimeseriesService:
 
         assert dbsession.query(Measurement).count() == 0
 
+    def test_upsert_commits_totals_measurements(self, dbsession, repository, mocker):
+        commits = [
+            CommitFactory.create(branch="foo", repository=repository) for _ in range(2)
+        ]
+        # the coverage of a flag uploaded twice depends on the overlap of the uploads
+        multiple_sessions_commit = CommitFactory.create(
+            branch="foo", repository=repository
+        )
+        session = multiple_sessions_commit.report_json["sessions"]["0"]
+        multiple_sessions_commit.report_json = {
+            "files": {},
+            "sessions": {"0": session, "1": session},
+        }
+        dbsession.add_all([*commits, multiple_sessions_commit])
+        dbsession.flush()
+
+        upsert = mocker.spy(timeseries, "upsert_measurements")
+        get_report = mocker.patch(
+            "services.report.ReportService.get_existing_report_for_commit"
+        )
+        remaining_commits = upsert_commits_totals_measurements(
+            dbsession,
+            [*commits, multiple_sessions_commit],
+            [MeasurementName.coverage.value, MeasurementName.flag_coverage.value],
+        )
+        assert remaining_commits == [multiple_sessions_commit]
+        # all the measurements are upserted at once, and no report is loaded
+        assert upsert.call_count == 1
+        assert len(upsert.call_args.args[1]) == 4
+        assert not get_report.called
+
+        repository_flag = (
+            dbsession.query(RepositoryFlag)
+            .filter_by(repository_id=repository.repoid, flag_name="unit")
+            .one()
+        )
+        for commit in commits:
+            measurements = {
+                (measurement.name, measurement.measurable_id): measurement.value
+                for measurement in dbsession.query(Measurement).filter_by(
+                    commit_sha=commit.commitid
+                )
+            }
+            assert measurements == {
+                (MeasurementName.coverage.value, f"{repository.repoid}"): 85.0,
+                (MeasurementName.flag_coverage.value, f"{repository_flag.id}"): 85.0,
+            }
+        assert (
+            dbsession.query(Measurement)
+            .filter_by(commit_sha=multiple_sessions_commit.commitid)
+            .count()
+            == 0
+        )
+
+    def test_upsert_commits_totals_measurements_carryforward(
+        self, dbsession, repository, mocker
+    ):
+        # the `unit` flag was carried forward with `paths: ["folder/"]`, so the
+        # carried forward report only has the covered file of the parent upload,
+        # while the session keeps the totals of the whole parent upload
+        report = Report()
+        report_file = ReportFile("folder/file.py")
+        report_file.append(1, ReportLine.create(1, sessions=[[0, 1]]))
+        report_file.append(2, ReportLine.create(1, sessions=[[0, 1]]))
+        report.append(report_file)
+        report.add_session(
+            Session(
+                flags=["unit"],
+                session_type=SessionType.carriedforward,
+                totals=ReportTotals(files=2, lines=4, hits=2, coverage="50.00000"),
+            )
+        )
+        report_json, _chunks, _totals = report.serialize()
+
+        commit = CommitFactory.create(branch="foo", repository=repository)
+        commit.report_json = json.loads(report_json)
+        commit.totals = legacy_totals(report)
+        dbsession.add(commit)
+        dbsession.flush()
+
+        assert (
+            commit_totals_measurements(
+                commit, [MeasurementName.flag_coverage.value], {}
+            )
+            is None
+        )
+        remaining_commits = upsert_commits_totals_measurements(
+            dbsession,
+            [commit],
+            [MeasurementName.coverage.value, MeasurementName.flag_coverage.value],
+        )
+        assert remaining_commits == [commit]
+
+        mocker.patch(
+            "services.report.ReportService.get_existing_report_for_commit",
+            return_value=ReadOnlyReport.create_from_report(report),
+        )
+        save_commit_measurements(
+            commit,
+            dataset_names=[
+                MeasurementName.coverage.value,
+                MeasurementName.flag_coverage.value,
+            ],
+        )
+        repository_flag = (
+            dbsession.query(RepositoryFlag)
+            .filter_by(repository_id=repository.repoid, flag_name="unit")
+            .one()
+        )
+        measurement = (
+            dbsession.query(Measurement)
+            .filter_by(
+                name=MeasurementName.flag_coverage.value,
+                commit_sha=commit.commitid,
+                measurable_id=f"{repository_flag.id}",
+            )
+            .one()
+        )
+        assert measurement.value == 100.0
+
+    def test_commit_totals_measurements_without_totals(self, dbsession, repository):
+        commit = CommitFactory.create(repository=repository, totals=None)
+        dbsession.add(commit)
+        dbsession.flush()
+
+        assert (
+            commit_totals_measurements(commit, [MeasurementName.coverage.value], {})
+            is None
+        )
+        assert (
+            commit_totals_measurements(
+                commit, [MeasurementName.flag_coverage.value], {}
+            )
+            is not None
+        )
+
     def test_repository_commits_query(self, dbsession, repository, mocker):
         commit1 = CommitFactory.create(
             repository=repository,
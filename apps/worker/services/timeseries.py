@@ -1,6 +1,7 @@
 import dataclasses
+import itertools
 import logging
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Sequence
 from datetime import datetime
 from typing import Any
 
@@ -13,9 +14,16 @@ from database.models.reports import RepositoryFlag
 from helpers.timeseries import backfill_max_batch_size
 from services.yaml import UserYaml, get_repo_yaml
 from shared.reports.resources import Report
+from shared.utils.sessions import SessionType, parse_totals
 
 log = logging.getLogger(__name__)
 
+# the datasets which can be derived from the totals stored with the commits
+TOTALS_DATASETS = (MeasurementName.coverage.value, MeasurementName.flag_coverage.value)
+
+# keeps the upserts under the limit of parameters of a statement
+UPSERT_BATCH_SIZE = 1000
+
 
 def maybe_upsert_coverage_measurement(commit, dataset_names, db_session, report):
     if MeasurementName.coverage.value in dataset_names:
@@ -38,20 +46,7 @@ def maybe_upsert_flag_measurements(commit, dataset_names, db_session, report):
 
         for flag_name, flag in report.flags.items():
             if flag.totals.coverage is not None:
-                flag_id = flag_ids.get(flag_name)
-                if not flag_id:
-                    log.warning(
-                        "Repository flag not found.  Created repository flag.",
-                        extra={"repoid": commit.repoid, "flag_name": flag_name},
-                    )
-                    repo_flag = RepositoryFlag(
-                        repository_id=commit.repoid,
-                        flag_name=flag_name,
-                    )
-                    db_session.add(repo_flag)
-                    db_session.flush()
-                    flag_id = repo_flag.id
-
+                flag_id = get_or_create_flag_id(db_session, commit, flag_ids, flag_name)
                 measurements.append(
                     create_measurement_dict(
                         MeasurementName.flag_coverage.value,
@@ -73,6 +68,111 @@ def maybe_upsert_flag_measurements(commit, dataset_names, db_session, report):
             upsert_measurements(db_session, measurements)
 
 
+def get_or_create_flag_id(
+    db_session: Session, commit: Commit, flag_ids: dict[str, int], flag_name: str
+) -> int:
+    flag_id = flag_ids.get(flag_name)
+    if not flag_id:
+        log.warning(
+            "Repository flag not found.  Created repository flag.",
+            extra={"repoid": commit.repoid, "flag_name": flag_name},
+        )
+        repo_flag = RepositoryFlag(
+            repository_id=commit.repoid,
+            flag_name=flag_name,
+        )
+        db_session.add(repo_flag)
+        db_session.flush()
+        flag_id = flag_ids[flag_name] = repo_flag.id
+    return flag_id
+
+
+def commit_totals_measurements(
+    commit: Commit, dataset_names: Sequence[str], flag_ids: dict[str, int]
+) -> list[dict[str, Any]] | None:
+    """
+    Derives the coverage and flag coverage measurements of the `commit` from the
+    totals stored with it and with its sessions, without loading its report.
+
+    Returns `None` when they can't be derived like so: when the totals are missing,
+    when a flag was uploaded in several sessions, as the coverage of the flag then
+    depends on how the lines of those sessions overlap, or when a flag was carried
+    forward, as the totals of a carried forward session are the ones of the parent
+    upload, before the report was filtered by the flag's paths and shifted.
+    """
+    db_session = commit.get_db_session()
+    measurements = []
+
+    if MeasurementName.coverage.value in dataset_names:
+        if not commit.totals:
+            return None
+        coverage = commit.totals.get("c")
+        if coverage is not None:
+            measurements.append(
+                create_measurement_dict(
+                    MeasurementName.coverage.value,
+                    commit,
+                    measurable_id=f"{commit.repoid}",
+                    value=float(coverage),
+                )
+            )
+
+    if MeasurementName.flag_coverage.value in dataset_names:
+        flag_totals = {}
+        for session in commit.report_json.get("sessions", {}).values():
+            if session.get("st") == SessionType.carriedforward.value:
+                return None
+            for flag_name in session.get("f") or []:
+                if flag_name in flag_totals:
+                    return None
+                flag_totals[flag_name] = parse_totals(session.get("t"))
+
+        for flag_name, totals in flag_totals.items():
+            if totals is None:
+                return None
+            if totals.coverage is not None:
+                flag_id = get_or_create_flag_id(db_session, commit, flag_ids, flag_name)
+                measurements.append(
+                    create_measurement_dict(
+                        MeasurementName.flag_coverage.value,
+                        commit,
+                        measurable_id=f"{flag_id}",
+                        value=float(totals.coverage),
+                    )
+                )
+
+    return measurements
+
+
+def upsert_commits_totals_measurements(
+    db_session: Session, commits: Iterable[Commit], dataset_names: Sequence[str]
+) -> list[Commit]:
+    """
+    Upserts the measurements of all the `commits` which can be derived from their
+    totals (see `commit_totals_measurements`) at once.
+
+    Returns the commits whose measurements could not be derived, which need their
+    report to be loaded.
+    """
+    flag_ids: dict[int, dict[str, int]] = {}
+    measurements = []
+    remaining_commits = []
+    for commit in commits:
+        if commit.repoid not in flag_ids:
+            flag_ids[commit.repoid] = repository_flag_ids(commit.repository)
+        commit_measurements = commit_totals_measurements(
+            commit, dataset_names, flag_ids[commit.repoid]
+        )
+        if commit_measurements is None:
+            remaining_commits.append(commit)
+        else:
+            measurements.extend(commit_measurements)
+
+    if measurements:
+        upsert_measurements(db_session, measurements)
+    return remaining_commits
+
+
 @dataclasses.dataclass
 class ComponentForMeasurement:
     component_id: str
@@ -144,22 +244,23 @@ def create_measurement_dict(
 def upsert_measurements(
     db_session: Session, measurements: list[dict[str, Any]]
 ) -> None:
-    command = insert(Measurement.__table__).values(measurements)
-    command = command.on_conflict_do_update(
-        index_elements=[
-            Measurement.name,
-            Measurement.owner_id,
-            Measurement.repo_id,
-            Measurement.measurable_id,
-            Measurement.commit_sha,
-            Measurement.timestamp,
-        ],
-        set_={
-            "branch": command.excluded.branch,
-            "value": command.excluded.value,
-        },
-    )
-    db_session.execute(command)
+    for batch in itertools.batched(measurements, UPSERT_BATCH_SIZE):
+        command = insert(Measurement.__table__).values(batch)
+        command = command.on_conflict_do_update(
+            index_elements=[
+                Measurement.name,
+                Measurement.owner_id,
+                Measurement.repo_id,
+                Measurement.measurable_id,
+                Measurement.commit_sha,
+                Measurement.timestamp,
+            ],
+            set_={
+                "branch": command.excluded.branch,
+                "value": command.excluded.value,
+            },
+        )
+        db_session.execute(command)
     db_session.flush()
 
 
@@ -196,7 +297,7 @@ def repository_datasets_query(
     return datasets
 
 
-def repository_flag_ids(repository: Repository) -> Mapping[str, int]:
+def repository_flag_ids(repository: Repository) -> dict[str, int]:
     db_session = repository.get_db_session()
     repo_flags = (
         db_session.query(RepositoryFlag).filter_by(repository=repository).yield_per(100)
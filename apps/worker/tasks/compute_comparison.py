@@ -4,7 +4,8 @@ from typing import Literal, TypedDict
 import orjson
 import sentry_sdk
 from asgiref.sync import async_to_sync
-from celery import group
+from sqlalchemy import null
+from sqlalchemy.dialects.postgresql import insert
 
 from app import celery_app
 from database.enums import CompareCommitError, CompareCommitState
@@ -12,7 +13,6 @@ from database.models import CompareCommit, CompareComponent, CompareFlag
 from database.models.reports import RepositoryFlag
 from helpers.comparison import minimal_totals
 from helpers.github_installation import get_installation_name_for_owner_for_task
-from rollouts import PARALLEL_COMPONENT_COMPARISON
 from services.comparison import ComparisonProxy, FilteredComparison
 from services.comparison_utils import get_comparison_proxy
 from services.report import ReportService
@@ -21,10 +21,10 @@ from shared.api_archive.archive import ArchiveService
 from shared.celery_config import compute_comparison_task_name
 from shared.components import Component
 from shared.helpers.flag import Flag
+from shared.reports.filtered import ReportFilter, calculate_filtered_diff_totals
 from shared.torngit.exceptions import TorngitRateLimitError
 from shared.yaml import UserYaml
 from tasks.base import BaseCodecovTask
-from tasks.compute_component_comparison import compute_component_comparison_task
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +36,11 @@ ComputeComparisonTaskErrors = (
 )
 
 
+# the flags and components of a comparison, as `("flag", flag_name)`
+# and `("component", component_id)`
+type FilterKey = tuple[Literal["flag", "component"], str]
+
+
 class ComputeComparisonTaskReturn(TypedDict):
     success: bool
     error: ComputeComparisonTaskErrors | None
@@ -105,14 +110,64 @@ class ComputeComparisonTask(BaseCodecovTask, name=compute_comparison_task_name):
         log.info("Computing comparison successful", extra=log_extra)
         db_session.commit()
 
-        self.compute_flag_comparison(db_session, comparison, comparison_proxy)
+        components = self.get_components(comparison_proxy)
+        patch_totals_by_filter = self.get_patch_totals_by_filter(
+            comparison_proxy, components
+        )
+        self.compute_flag_comparison(
+            db_session, comparison, comparison_proxy, patch_totals_by_filter
+        )
         db_session.commit()
-        self.compute_component_comparisons(db_session, comparison, comparison_proxy)
+        self.compute_component_comparisons(
+            db_session, comparison, comparison_proxy, components, patch_totals_by_filter
+        )
         db_session.commit()
 
         return {"successful": True}
 
-    def compute_flag_comparison(self, db_session, comparison, comparison_proxy):
+    def get_components(self, comparison_proxy: ComparisonProxy) -> list[Component]:
+        head_commit = comparison_proxy.comparison.head.commit
+        yaml: UserYaml = async_to_sync(get_current_yaml)(
+            head_commit, comparison_proxy.repository_service
+        )
+        return yaml.get_components()
+
+    @sentry_sdk.trace
+    def get_patch_totals_by_filter(
+        self, comparison_proxy: ComparisonProxy, components: list[Component]
+    ) -> dict[FilterKey, dict | None]:
+        """
+        Calculates the patch totals of every flag and component of the comparison,
+        going through the diff only once for all of them.
+        """
+        head_report = comparison_proxy.comparison.head.report
+        head_flags = list(head_report.flags.keys())
+        filters: dict[FilterKey, ReportFilter] = {
+            ("flag", flag_name): (None, [flag_name]) for flag_name in head_flags
+        }
+        for component in components:
+            filters[("component", component.component_id)] = (
+                component.paths,
+                component.get_matching_flags(head_flags),
+            )
+        if not filters:
+            return {}
+
+        diff = comparison_proxy.get_diff()
+        return {
+            key: patch_totals.asdict() if patch_totals else None
+            for key, patch_totals in calculate_filtered_diff_totals(
+                head_report, filters, diff
+            ).items()
+        }
+
+    def compute_flag_comparison(
+        self,
+        db_session,
+        comparison,
+        comparison_proxy,
+        patch_totals_by_filter: dict[FilterKey, dict | None],
+    ):
         log_extra = {"comparison_id": comparison.id}
         log.info("Computing flag comparisons", extra=log_extra)
         head_report_flags = comparison_proxy.comparison.head.report.flags
@@ -124,6 +179,7 @@ class ComputeComparisonTask(BaseCodecovTask, name=compute_comparison_task_name):
             head_report_flags,
             comparison,
             comparison_proxy,
+            patch_totals_by_filter,
         )
 
     @sentry_sdk.trace
@@ -133,64 +189,94 @@ class ComputeComparisonTask(BaseCodecovTask, name=compute_comparison_task_name):
         head_report_flags: dict[str, Flag],
         comparison: CompareCommit,
         comparison_proxy: ComparisonProxy,
+        patch_totals_by_filter: dict[FilterKey, dict | None],
     ):
         repository_id = comparison.compare_commit.repository.repoid
-        for flag_name in head_report_flags.keys():
-            totals = self.get_flag_comparison_totals(flag_name, comparison_proxy)
-            repositoryflag = (
-                db_session.query(RepositoryFlag)
-                .filter_by(
-                    flag_name=flag_name,
-                    repository_id=repository_id,
-                )
-                .first()
-            )
-            if not repositoryflag:
-                log.warning(
-                    "Repository flag not found for flag. Created repository flag.",
-                    extra={"repoid": repository_id, "flag_name": flag_name},
-                )
-                repositoryflag = RepositoryFlag(
-                    repository_id=repository_id,
-                    flag_name=flag_name,
-                )
-                db_session.add(repositoryflag)
-                db_session.flush()
-
-            flag_comparison_entry = (
-                db_session.query(CompareFlag)
-                .filter_by(
-                    commit_comparison_id=comparison.id,
-                    repositoryflag_id=repositoryflag.id,
-                )
-                .first()
+        flag_names = list(head_report_flags.keys())
+        repository_flags = self.get_or_create_repository_flags(
+            db_session, repository_id, flag_names
+        )
+        existing_flag_comparisons = {
+            flag_comparison.repositoryflag_id: flag_comparison
+            for flag_comparison in db_session.query(CompareFlag).filter(
+                CompareFlag.commit_comparison_id == comparison.id,
+                CompareFlag.repositoryflag_id.in_(
+                    [repositoryflag.id for repositoryflag in repository_flags.values()]
+                ),
             )
+        }
 
+        new_flag_comparisons = []
+        for flag_name in flag_names:
+            totals = self.get_flag_comparison_totals(
+                flag_name, comparison_proxy, patch_totals_by_filter
+            )
+            repositoryflag = repository_flags[flag_name]
+            flag_comparison_entry = existing_flag_comparisons.get(repositoryflag.id)
             if not flag_comparison_entry:
-                log.debug(
-                    "No previous flag comparisons; adding flag comparisons",
-                    extra={"repoid": repository_id},
-                )
-                self.store_flag_comparison(
-                    db_session, comparison, repositoryflag, totals
+                new_flag_comparisons.append(
+                    {
+                        "commit_comparison_id": comparison.id,
+                        "repositoryflag_id": repositoryflag.id,
+                        **totals,
+                    }
                 )
             else:
-                log.debug(
-                    "Updating totals for existing flag comparison entry",
-                    extra={"repoid": repository_id},
-                )
                 flag_comparison_entry.head_totals = totals["head_totals"]
                 flag_comparison_entry.base_totals = totals["base_totals"]
                 flag_comparison_entry.patch_totals = totals["patch_totals"]
+
+        if new_flag_comparisons:
+            db_session.execute(
+                insert(CompareFlag.__table__).values(new_flag_comparisons)
+            )
+        db_session.flush()
         log.info(
             "Flag comparisons stored successfully",
-            extra={"number_stored": len(head_report_flags)},
+            extra={
+                "number_stored": len(flag_names),
+                "number_created": len(new_flag_comparisons),
+            },
         )
 
+    def get_or_create_repository_flags(
+        self, db_session, repository_id: int, flag_names: list[str]
+    ) -> dict[str, RepositoryFlag]:
+        repository_flags: dict[str, RepositoryFlag] = {}
+        for repositoryflag in (
+            db_session.query(RepositoryFlag)
+            .filter(
+                RepositoryFlag.repository_id == repository_id,
+                RepositoryFlag.flag_name.in_(flag_names),
+            )
+            .order_by(RepositoryFlag.id_)
+        ):
+            # keeps the first flag, like `.first()` used to
+            repository_flags.setdefault(repositoryflag.flag_name, repositoryflag)
+
+        missing_flags = [name for name in flag_names if name not in repository_flags]
+        if missing_flags:
+            log.warning(
+                "Repository flag not found for flag. Created repository flag.",
+                extra={"repoid": repository_id, "flag_names": missing_flags},
+            )
+            new_flags = [
+                RepositoryFlag(repository_id=repository_id, flag_name=flag_name)
+                for flag_name in missing_flags
+            ]
+            db_session.add_all(new_flags)
+            db_session.flush()
+            repository_flags.update(
+                (repositoryflag.flag_name, repositoryflag)
+                for repositoryflag in new_flags
+            )
+        return repository_flags
+
     def get_flag_comparison_totals(
         self,
         flag_name: str,
         comparison_proxy: ComparisonProxy,
+        patch_totals_by_filter: dict[FilterKey, dict | None],
     ):
         flag_head_report = comparison_proxy.comparison.head.report.flags.get(flag_name)
         flag_base_report = (
@@ -200,44 +286,21 @@ class ComputeComparisonTask(BaseCodecovTask, name=compute_comparison_task_name):
         )
         head_totals = None if not flag_head_report else flag_head_report.totals.asdict()
         base_totals = None if not flag_base_report else flag_base_report.totals.asdict()
-        totals = {
+        return {
             "head_totals": head_totals,
             "base_totals": base_totals,
-            "patch_totals": None,
+            "patch_totals": patch_totals_by_filter.get(("flag", flag_name)),
         }
-        diff = comparison_proxy.get_diff()
-        if diff:
-            patch_totals = flag_head_report.apply_diff(diff)
-            if patch_totals:
-                totals["patch_totals"] = patch_totals.asdict()
-        return totals
 
-    def store_flag_comparison(
+    @sentry_sdk.trace
+    def compute_component_comparisons(
         self,
         db_session,
         comparison: CompareCommit,
-        repositoryflag: RepositoryFlag,
-        totals,
-    ):
-        flag_comparison = CompareFlag(
-            commit_comparison=comparison,
-            repositoryflag=repositoryflag,
-            patch_totals=totals["patch_totals"],
-            head_totals=totals["head_totals"],
-            base_totals=totals["base_totals"],
-        )
-        db_session.add(flag_comparison)
-        db_session.flush()
-
-    @sentry_sdk.trace
-    def compute_component_comparisons(
-        self, db_session, comparison: CompareCommit, comparison_proxy: ComparisonProxy
+        comparison_proxy: ComparisonProxy,
+        components: list[Component],
+        patch_totals_by_filter: dict[FilterKey, dict | None],
     ):
-        head_commit = comparison_proxy.comparison.head.commit
-        yaml: UserYaml = async_to_sync(get_current_yaml)(
-            head_commit, comparison_proxy.repository_service
-        )
-        components = yaml.get_components()
         log.info(
             "Computing component comparisons",
             extra={
@@ -245,73 +308,74 @@ class ComputeComparisonTask(BaseCodecovTask, name=compute_comparison_task_name):
                 "component_count": len(components),
             },
         )
-        if PARALLEL_COMPONENT_COMPARISON.check_value(
-            comparison.compare_commit.repoid, default=False
+        if not components:
+            return
+
+        existing_component_comparisons: dict[str, CompareComponent] = {}
+        for component_comparison in (
+            db_session.query(CompareComponent)
+            .filter(
+                CompareComponent.commit_comparison_id == comparison.id,
+                CompareComponent.component_id.in_(
+                    [component.component_id for component in components]
+                ),
+            )
+            .order_by(CompareComponent.id_)
         ):
-            self.parallel_compute_component_comparison(comparison.id, components)
-        else:
-            for component in components:
-                self.compute_component_comparison(
-                    db_session, comparison, comparison_proxy, component
-                )
+            existing_component_comparisons.setdefault(
+                component_comparison.component_id, component_comparison
+            )
 
-    @sentry_sdk.trace
-    def parallel_compute_component_comparison(
-        self,
-        comparison_id: int,
-        components: list[Component],
-    ):
-        task_group = group(
-            [
-                compute_component_comparison_task.s(
-                    comparison_id, component.component_id
+        new_component_comparisons = []
+        for component in components:
+            totals = self.get_component_comparison_totals(
+                comparison_proxy, component, patch_totals_by_filter
+            )
+            component_comparison = existing_component_comparisons.get(
+                component.component_id
+            )
+            if not component_comparison:
+                new_component_comparisons.append(
+                    {
+                        "commit_comparison_id": comparison.id,
+                        "component_id": component.component_id,
+                        **totals,
+                        # left as SQL NULL, not JSON null, if the diff is empty
+                        "patch_totals": totals["patch_totals"] or null(),
+                    }
                 )
-                for component in components
-            ]
-        )
-        task_group.apply_async()
+            else:
+                component_comparison.head_totals = totals["head_totals"]
+                component_comparison.base_totals = totals["base_totals"]
+                # keeps the previous patch totals if the diff is empty
+                if totals["patch_totals"]:
+                    component_comparison.patch_totals = totals["patch_totals"]
+
+        if new_component_comparisons:
+            db_session.execute(
+                insert(CompareComponent.__table__).values(new_component_comparisons)
+            )
+        db_session.flush()
 
-    def compute_component_comparison(
+    def get_component_comparison_totals(
         self,
-        db_session,
-        comparison: CompareCommit,
         comparison_proxy: ComparisonProxy,
         component: Component,
+        patch_totals_by_filter: dict[FilterKey, dict | None],
     ):
-        component_comparison = (
-            db_session.query(CompareComponent)
-            .filter_by(
-                commit_comparison_id=comparison.id,
-                component_id=component.component_id,
-            )
-            .first()
-        )
-        if not component_comparison:
-            component_comparison = CompareComponent(
-                commit_comparison=comparison,
-                component_id=component.component_id,
-            )
-
         # filter comparison by component
         head_report = comparison_proxy.comparison.head.report
         flags = component.get_matching_flags(head_report.flags.keys())
         filtered: FilteredComparison = comparison_proxy.get_filtered_comparison(
             flags=flags, path_patterns=component.paths
         )
-
-        # component comparison totals
-        component_comparison.base_totals = (
-            filtered.project_coverage_base.report.totals.asdict()
-        )
-        component_comparison.head_totals = filtered.head.report.totals.asdict()
-        diff = comparison_proxy.get_diff()
-        if diff:
-            patch_totals = filtered.head.report.apply_diff(diff)
-            if patch_totals:
-                component_comparison.patch_totals = patch_totals.asdict()
-
-        db_session.add(component_comparison)
-        db_session.flush()
+        return {
+            "head_totals": filtered.head.report.totals.asdict(),
+            "base_totals": filtered.project_coverage_base.report.totals.asdict(),
+            "patch_totals": patch_totals_by_filter.get(
+                ("component", component.component_id)
+            ),
+        }
 
     @sentry_sdk.trace
     def store_results(self, comparison: CompareCommit, impacted_files):
@@ -4,10 +4,12 @@ from datetime import datetime
 from asgiref.sync import async_to_sync
 from celery.exceptions import SoftTimeLimitExceeded
 from redis.exceptions import LockError
-from sqlalchemy import and_
+from sqlalchemy import and_, case, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm.session import Session
 
 from app import celery_app
+from database.events import sync_repos_with_shelter
 from database.models import Owner, Repository
 from services.owner import get_owner_provider_service
 from shared.celery_config import (
@@ -34,7 +36,8 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
        in other teams/orgs/groups that the user has permission for. If using a GitHub
        integration, we get all the repos included in the integration.
 
-    2. Loop over repos and upsert the owner, repo, and fork (if any) into the database.
+    2. Upsert the owners, repos, and forks (if any) of each page of repos into the
+       database, with one bulk statement for the owners and one for the repos.
 
     3. Update the permissions for the user (permissions col in the owners table).
 
@@ -134,7 +137,6 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
         owner: Owner,
         repository_service_ids: list[tuple[int, str]] | None,
     ):
-        repoids_added = []
         # Casting to str in case celery interprets the service ID as a integer for some reason
         # As that has caused issues with testing locally
         service_ids = {str(x[0]) for x in repository_service_ids}
@@ -164,31 +166,39 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
             for x in repository_service_ids
             if str(x[0]) in missing_repo_service_ids
         ]
-        async for repo_data in git.get_repos_from_nodeids_generator(
-            repos_to_search, owner.username
-        ):
-            # Get or create owner
-            if repo_data["owner"]["is_expected_owner"]:
-                new_repo_ownerid = owner.ownerid
-            else:
-                upserted_owner_id = self.upsert_owner(
-                    db_session,
-                    git.service,
-                    repo_data["owner"]["service_id"],
-                    repo_data["owner"]["username"],
-                )
-                new_repo_ownerid = upserted_owner_id
-            # Get or create repo
-            # Yes we had issues trying to insert a repeated repo at this point.
-            # Maybe race condition?
-            repoid = self.upsert_repo(
-                db_session=db_session,
-                service=git.service,
-                ownerid=new_repo_ownerid,
-                repo_data={**repo_data, "service_id": str(repo_data["service_id"])},
-                using_integration=True,
+        repos_data = [
+            repo_data
+            async for repo_data in git.get_repos_from_nodeids_generator(
+                repos_to_search, owner.username
             )
-            repoids_added.append(repoid)
+        ]
+        # Get or create owners
+        ownerids = self.upsert_owners(
+            db_session,
+            git.service,
+            {
+                str(repo_data["owner"]["service_id"]): repo_data["owner"]["username"]
+                for repo_data in repos_data
+                if not repo_data["owner"]["is_expected_owner"]
+            },
+        )
+        # Get or create repos
+        # Yes we had issues trying to insert a repeated repo at this point.
+        # Maybe race condition?
+        repoids_added = self.upsert_repos(
+            db_session,
+            git.service,
+            [
+                (
+                    owner.ownerid
+                    if repo_data["owner"]["is_expected_owner"]
+                    else ownerids[str(repo_data["owner"]["service_id"])],
+                    {**repo_data, "service_id": str(repo_data["service_id"])},
+                    True,
+                )
+                for repo_data in repos_data
+            ],
+        )
         return repoids_added
 
     def _possibly_update_ghinstallation_covered_repos(
@@ -285,20 +295,30 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
                     if repo["repo"]["service_id"] in missing_service_ids
                 ]
 
-                for repo in missing_repos:
-                    repo_data = repo["repo"]
-                    new_repo = Repository(
-                        ownerid=ownerid,
-                        service_id=repo_data["service_id"],
-                        name=repo_data["name"],
-                        language=repo_data["language"],
-                        private=repo_data["private"],
-                        branch=repo_data["branch"],
-                        using_integration=True,
+                if missing_repos:
+                    insert_statement = (
+                        insert(table)
+                        .returning(table.columns.repoid)
+                        .values(
+                            [
+                                {
+                                    "ownerid": ownerid,
+                                    "service_id": repo["repo"]["service_id"],
+                                    "name": repo["repo"]["name"],
+                                    "language": repo["repo"]["language"],
+                                    "private": repo["repo"]["private"],
+                                    "branch": repo["repo"]["branch"],
+                                    "using_integration": True,
+                                }
+                                for repo in missing_repos
+                            ]
+                        )
                     )
-                    db_session.add(new_repo)
-                    db_session.flush()
-                    repoids.append(new_repo.repoid)
+                    result = db_session.execute(insert_statement)
+                    new_repoids = [r[0] for r in result.fetchall()]
+                    # the ORM events don't see the bulk statement
+                    sync_repos_with_shelter(new_repoids)
+                    repoids.extend(new_repoids)
 
         # Here comes the actual function
         received_repos = False
@@ -360,54 +380,43 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
         # We're testing processing repos a page at a time and this helper
         # function avoids duplicating the code in the old and new paths
         def process_repos(repos):
+            usernames = {}
+            for repo in repos:
+                usernames[str(repo["owner"]["service_id"])] = repo["owner"]["username"]
+                if fork := repo["repo"].get("fork"):
+                    usernames[str(fork["owner"]["service_id"])] = fork["owner"][
+                        "username"
+                    ]
+            ownerids = self.upsert_owners(db_session, service, usernames)
+
+            repos_to_upsert = []
             for repo in repos:
-                _ownerid = owners_by_id.get(
+                _ownerid = ownerids[str(repo["owner"]["service_id"])]
+                owners_by_id[
                     (
                         service,
                         repo["owner"]["service_id"],
                         repo["owner"]["username"],
                     )
-                )
-                if not _ownerid:
-                    _ownerid = self.upsert_owner(
-                        db_session,
-                        service,
-                        repo["owner"]["service_id"],
-                        repo["owner"]["username"],
-                    )
-                    owners_by_id[
+                ] = _ownerid
+                repos_to_upsert.append((_ownerid, repo["repo"], using_integration))
+                if fork := repo["repo"].get("fork"):
+                    repos_to_upsert.append(
                         (
-                            service,
-                            repo["owner"]["service_id"],
-                            repo["owner"]["username"],
+                            ownerids[str(fork["owner"]["service_id"])],
+                            fork["repo"],
+                            None,
                         )
-                    ] = _ownerid
-
-                repoid = self.upsert_repo(
-                    db_session, service, _ownerid, repo["repo"], using_integration
-                )
-
-                repoids.append(repoid)
-
-                if repo["repo"].get("fork"):
-                    _ownerid = self.upsert_owner(
-                        db_session,
-                        service,
-                        repo["repo"]["fork"]["owner"]["service_id"],
-                        repo["repo"]["fork"]["owner"]["username"],
                     )
 
-                    _repoid = self.upsert_repo(
-                        db_session, service, _ownerid, repo["repo"]["fork"]["repo"]
-                    )
-
-                    repoids.append(_repoid)
-
-                    if repo["repo"]["fork"]["repo"]["private"]:
-                        private_project_ids.append(int(_repoid))
-                if repo["repo"]["private"]:
-                    private_project_ids.append(int(repoid))
-                db_session.commit()
+            upserted_repoids = self.upsert_repos(db_session, service, repos_to_upsert)
+            repoids.extend(upserted_repoids)
+            private_project_ids.extend(
+                int(repoid)
+                for (_, repo_data, _), repoid in zip(repos_to_upsert, upserted_repoids)
+                if repo_data["private"]
+            )
+            db_session.commit()
 
         try:
             async for page in git.list_repos_generator():
@@ -646,6 +655,173 @@ class SyncReposTask(BaseCodecovTask, name=sync_repos_task_name):
         db_session.flush()
         return new_repo.repoid
 
+    def upsert_owners(
+        self, db_session: Session, service: str, usernames: dict[str, str]
+    ) -> dict[str, int]:
+        """
+        Bulk version of `upsert_owner`, upserting all the owners with a single
+        `INSERT ... ON CONFLICT DO UPDATE` statement.
+
+        `usernames` maps the service_id of each owner to its username.
+        Returns the ownerid of each service_id.
+        """
+        if not usernames:
+            return {}
+
+        log.info(
+            "Upserting owners",
+            extra={"git_service": service, "number_owners": len(usernames)},
+        )
+        table = Owner.__table__
+        now = datetime.now()
+        statement = insert(table).values(
+            [
+                {
+                    "service": service,
+                    "service_id": service_id,
+                    "username": username,
+                    "createstamp": now,
+                }
+                for service_id, username in usernames.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.service, table.c.service_id],
+            set_={
+                # like `upsert_owner`, keep the username if only its case changed
+                "username": case(
+                    (
+                        func.lower(func.coalesce(table.c.username, ""))
+                        == func.lower(statement.excluded.username),
+                        table.c.username,
+                    ),
+                    else_=statement.excluded.username,
+                )
+            },
+        ).returning(table.c.service_id, table.c.ownerid)
+        return dict(db_session.execute(statement).fetchall())
+
+    def upsert_repos(
+        self,
+        db_session: Session,
+        service: str,
+        repos: list[tuple[int, dict, bool | None]],
+    ) -> list[int]:
+        """
+        Bulk version of `upsert_repo`, for a list of `(ownerid, repo_data, using_integration)`.
+        Returns the repoid of each of the `repos`.
+
+        The repos that either don't exist yet or already exist with the same
+        owner and service_id are upserted with a single `INSERT ... ON CONFLICT DO UPDATE`
+        statement. The rare repos that moved to another owner or were recreated
+        with another service_id go through `upsert_repo`.
+        """
+        if not repos:
+            return []
+
+        table = Repository.__table__
+        owners_table = Owner.__table__
+        keys = [
+            (ownerid, str(repo_data["service_id"])) for ownerid, repo_data, _ in repos
+        ]
+        existing = db_session.execute(
+            select(
+                table.c.repoid,
+                table.c.ownerid,
+                table.c.service_id,
+                table.c.name,
+                table.c.private,
+                table.c.deleted,
+            )
+            .select_from(
+                table.join(owners_table, table.c.ownerid == owners_table.c.ownerid)
+            )
+            .where(
+                owners_table.c.service == service,
+                or_(
+                    table.c.service_id.in_([service_id for _, service_id in keys]),
+                    tuple_(table.c.ownerid, table.c.name).in_(
+                        [
+                            (ownerid, repo_data["name"])
+                            for ownerid, repo_data, _ in repos
+                        ]
+                    ),
+                ),
+            )
+        ).fetchall()
+        by_key = {(row.ownerid, row.service_id): row for row in existing}
+        live_service_ids = {row.service_id for row in existing if row.deleted is False}
+        slugs = {(row.ownerid, row.name) for row in existing}
+
+        repoids: dict[tuple[int, str], int] = {}
+        rows: dict[tuple[int, str], dict] = {}
+        changed_repoids = []
+        for key, (ownerid, repo_data, using_integration) in zip(keys, repos):
+            if key in repoids or key in rows:
+                continue
+            if row := by_key.get(key):
+                if row.name != repo_data["name"] or row.private != repo_data["private"]:
+                    changed_repoids.append(row.repoid)
+            elif key[1] in live_service_ids or (ownerid, repo_data["name"]) in slugs:
+                repoids[key] = self.upsert_repo(
+                    db_session, service, ownerid, repo_data, using_integration
+                )
+                continue
+            rows[key] = {
+                "ownerid": ownerid,
+                "service_id": key[1],
+                "name": repo_data["name"],
+                "language": repo_data["language"],
+                "private": repo_data["private"],
+                "branch": repo_data["branch"],
+                "using_integration": using_integration,
+            }
+
+        if rows:
+            log.info(
+                "Upserting repos",
+                extra={"git_service": service, "number_repos": len(rows)},
+            )
+            statement = insert(table).values(list(rows.values()))
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.ownerid, table.c.service_id],
+                set_={
+                    "private": excluded.private,
+                    "language": excluded.language,
+                    "name": excluded.name,
+                    "deleted": False,
+                    "updatestamp": case(
+                        (
+                            and_(
+                                table.c.private.is_not_distinct_from(excluded.private),
+                                table.c.language.is_not_distinct_from(
+                                    excluded.language
+                                ),
+                                table.c.name.is_not_distinct_from(excluded.name),
+                                table.c.deleted.is_(False),
+                            ),
+                            table.c.updatestamp,
+                        ),
+                        else_=datetime.now(),
+                    ),
+                },
+            ).returning(table.c.ownerid, table.c.service_id, table.c.repoid)
+            upserted = {
+                (ownerid, service_id): repoid
+                for ownerid, service_id, repoid in db_session.execute(statement)
+            }
+            repoids.update(upserted)
+            # the ORM events don't see the bulk statement
+            sync_repos_with_shelter(
+                [
+                    *(repoid for key, repoid in upserted.items() if key not in by_key),
+                    *changed_repoids,
+                ]
+            )
+
+        return [repoids[key] for key in keys]
+
     def sync_repos_languages(
         self, sync_repos_output: dict, manual_trigger: bool, current_owner: Owner
     ):
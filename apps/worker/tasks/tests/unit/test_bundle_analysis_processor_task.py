@@ -1,3 +1,4 @@
+import json
 from unittest.mock import ANY
 
 import pytest
@@ -7,6 +8,11 @@ from database.enums import ReportType
 from database.models import CommitReport, Upload
 from database.tests.factories import CommitFactory, RepositoryFactory, UploadFactory
 from shared.api_archive.archive import ArchiveService
+from shared.bundle_analysis import (
+    BundleAnalysisReportLoader,
+    ShardedBundleAnalysisReport,
+    StoragePaths,
+)
 from shared.bundle_analysis.storage import get_bucket_name
 from shared.django_apps.bundle_analysis.models import CacheConfig
 from shared.storage.exceptions import PutRequestRateLimitError
@@ -32,6 +38,9 @@ class MockBundleAnalysisReport:
             MockBundleReport("BundleA", 1111),
         ]
 
+    def bundle_names(self):
+        return [bundle.name for bundle in self.bundle_reports()]
+
     def ingest(self, path, compare_sha: str | None = None):
         return 123, "BundleA"
 
@@ -1412,3 +1421,114 @@ def test_bundle_analysis_processor_task_carryforward_error(
         dbsession.query(CommitReport).filter_by(commit_id=commit.id).count()
     )
     assert total_ba_reports == 1
+
+
+def bundle_stats(bundle_name: str) -> str:
+    return json.dumps(
+        {
+            "version": "2",
+            "plugin": {
+                "name": "codecov-vite-bundle-analysis-plugin",
+                "version": "1.0.0",
+            },
+            "builtAt": 1701451048604,
+            "duration": 331,
+            "bundler": {"name": "rollup", "version": "3.29.4"},
+            "bundleName": bundle_name,
+            "assets": [
+                {
+                    "name": "assets/index-c8676264.js",
+                    "size": 1000,
+                    "gzipSize": 500,
+                    "normalized": "assets/index-*.js",
+                }
+            ],
+            "chunks": [
+                {
+                    "id": "index",
+                    "uniqueId": "0-index",
+                    "entry": True,
+                    "initial": True,
+                    "files": ["assets/index-c8676264.js"],
+                    "names": ["index"],
+                }
+            ],
+            "modules": [
+                {"name": "./src/index.ts", "size": 100, "chunkUniqueIds": ["0-index"]}
+            ],
+        }
+    )
+
+
+@pytest.mark.django_db(databases={"default", "timeseries"})
+def test_bundle_analysis_processor_sharded_storage(
+    mocker,
+    dbsession,
+    mock_storage,
+):
+    mocker.patch.object(
+        BundleAnalysisProcessorTask,
+        "app",
+        tasks={
+            bundle_analysis_save_measurements_task_name: mocker.MagicMock(),
+        },
+    )
+    mocker.patch(
+        "services.bundle_analysis.report.BUNDLE_ANALYSIS_SHARDED_STORAGE.check_value",
+        return_value=True,
+    )
+
+    commit = CommitFactory.create(state="pending")
+    dbsession.add(commit)
+    dbsession.flush()
+
+    commit_report = CommitReport(commit_id=commit.id_)
+    dbsession.add(commit_report)
+    dbsession.flush()
+
+    for bundle_name in ["BundleA", "BundleB"]:
+        storage_path = f"v1/uploads/{bundle_name}.json"
+        mock_storage.write_file(
+            get_bucket_name(), storage_path, bundle_stats(bundle_name)
+        )
+        upload = UploadFactory.create(storage_path=storage_path, report=commit_report)
+        dbsession.add(upload)
+        dbsession.flush()
+
+        BundleAnalysisProcessorTask().run_impl(
+            dbsession,
+            {"results": []},
+            repoid=commit.repoid,
+            commitid=commit.commitid,
+            commit_yaml={},
+            params={
+                "upload_id": upload.id_,
+                "commit": commit.commitid,
+            },
+        )
+        assert upload.state == "processed"
+
+    repo_key = ArchiveService.get_archive_hash(commit.repository)
+    stored_paths = set(mock_storage.storage[get_bucket_name()])
+    assert (
+        StoragePaths.bundle_report_manifest.path(
+            repo_key=repo_key, report_key=commit_report.external_id
+        )
+        in stored_paths
+    )
+    assert (
+        StoragePaths.bundle_report.path(
+            repo_key=repo_key, report_key=commit_report.external_id
+        )
+        not in stored_paths
+    )
+
+    report = BundleAnalysisReportLoader(commit.repository).load(
+        commit_report.external_id
+    )
+    try:
+        assert isinstance(report, ShardedBundleAnalysisReport)
+        assert report.bundle_names() == ["BundleA", "BundleB"]
+        assert report.bundle_report("BundleB").total_size() == 1000
+    finally:
+        report.cleanup()
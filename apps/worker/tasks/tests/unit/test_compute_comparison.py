@@ -1,6 +1,7 @@
 import json
 
 from celery import group
+from sqlalchemy import event
 
 from database.enums import CompareCommitError, CompareCommitState
 from database.models import CompareComponent, CompareFlag, RepositoryFlag
@@ -8,8 +9,8 @@ from database.tests.factories import CompareCommitFactory
 from rollouts import PARALLEL_COMPONENT_COMPARISON
 from services.report import ReportService
 from shared.reports.readonly import ReadOnlyReport
-from shared.reports.resources import Report
-from shared.reports.types import ReportTotals
+from shared.reports.resources import Report, ReportFile, Session
+from shared.reports.types import ReportLine, ReportTotals
 from shared.torngit.exceptions import TorngitRateLimitError
 from shared.yaml import UserYaml
 from tasks.compute_comparison import ComputeComparisonTask
@@ -19,9 +20,6 @@ class TestComputeComparisonTask:
     def test_set_state_to_processed(
         self, dbsession, mocker, mock_repo_provider, mock_storage
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -79,9 +77,6 @@ class TestComputeComparisonTask:
         mock_storage,
         sample_report_with_multiple_flags,
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -180,9 +175,6 @@ class TestComputeComparisonTask:
         mock_storage,
         sample_report_without_flags,
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -266,9 +258,6 @@ class TestComputeComparisonTask:
     def test_update_existing_flag_comparisons(
         self, dbsession, mocker, mock_repo_provider, mock_storage, sample_report
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -317,9 +306,6 @@ class TestComputeComparisonTask:
     def test_set_state_to_error_missing_base_report(
         self, dbsession, mocker, sample_report
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         # We need a head report, but no base report
         head_commit = comparison.compare_commit
@@ -357,9 +343,6 @@ class TestComputeComparisonTask:
     def test_set_state_to_error_missing_head_report(
         self, dbsession, mocker, sample_report
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -375,9 +358,6 @@ class TestComputeComparisonTask:
         assert comparison.error == CompareCommitError.missing_head_report.value
 
     def test_run_task_ratelimit_error(self, dbsession, mocker, sample_report):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -413,9 +393,6 @@ class TestComputeComparisonTask:
     def test_compute_component_comparisons(
         self, dbsession, mocker, mock_repo_provider, mock_storage, sample_report
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         mocker.patch.object(
             ReportService,
             "get_existing_report_for_commit",
@@ -557,12 +534,11 @@ class TestComputeComparisonTask:
             "diff": 0,
         }
 
-    def test_compute_component_comparisons_parallel(
+    def test_compute_component_comparisons_in_one_pass(
         self, dbsession, mocker, mock_repo_provider, mock_storage, sample_report
     ):
-        mocker.patch("tasks.base.get_db_session", return_value=dbsession)
-
-        mocker.patch.object(group, "apply_async", group.apply)
+        apply_async = mocker.patch.object(group, "apply_async")
+        # the rollout used to fan out a task per component
         mocker.patch.object(
             PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=True
         )
@@ -600,20 +576,6 @@ class TestComputeComparisonTask:
             }
         )
 
-        get_current_yaml = mocker.patch(
-            "tasks.compute_component_comparison.get_current_yaml"
-        )
-        get_current_yaml.return_value = UserYaml(
-            {
-                "component_management": {
-                    "individual_components": [
-                        {"component_id": "go_files", "paths": [r".*\.go"]},
-                        {"component_id": "unit_flags", "flag_regexes": [r"unit.*"]},
-                    ]
-                }
-            }
-        )
-
         comparison = CompareCommitFactory.create()
         dbsession.add(comparison)
         dbsession.flush()
@@ -622,6 +584,7 @@ class TestComputeComparisonTask:
         task = ComputeComparisonTask()
         res = task.run_impl(dbsession, comparison.id)
         assert res == {"successful": True}
+        apply_async.assert_not_called()
 
         component_comparisons = (
             dbsession.query(CompareComponent)
@@ -734,9 +697,6 @@ class TestComputeComparisonTask:
         mock_storage,
         sample_report_with_multiple_flags,
     ):
-        mocker.patch.object(
-            PARALLEL_COMPONENT_COMPARISON, "check_value", return_value=False
-        )
         mocker.patch.object(
             ReportService,
             "get_existing_report_for_commit",
@@ -779,3 +739,130 @@ class TestComputeComparisonTask:
         assert len(flag_comparisons) == 2
         for comparison in flag_comparisons:
             assert comparison.patch_totals is None
+
+    def test_flag_and_component_comparisons_query_count(
+        self, dbsession, mocker, mock_repo_provider, mock_storage
+    ):
+        num_flags = 30
+        report = Report()
+        for i in range(num_flags):
+            report.add_session(Session(flags=[f"flag_{i}"]))
+        report_file = ReportFile("file.py")
+        for ln in range(1, 50):
+            report_file.append(
+                ln, ReportLine.create(ln % 2, sessions=[[ln % num_flags, ln % 2]])
+            )
+        report.append(report_file)
+        mocker.patch.object(
+            ReportService,
+            "get_existing_report_for_commit",
+            return_value=ReadOnlyReport.create_from_report(report),
+        )
+        mock_repo_provider.get_compare.return_value = {
+            "diff": {
+                "files": {
+                    "file.py": {
+                        "type": "modified",
+                        "before": None,
+                        "segments": [
+                            {"header": ["1", "40", "1", "40"], "lines": ["+"] * 40}
+                        ],
+                    }
+                }
+            }
+        }
+        mocker.patch(
+            "services.comparison.get_repo_provider_service",
+            return_value=mock_repo_provider,
+        )
+        get_current_yaml = mocker.patch("tasks.compute_comparison.get_current_yaml")
+        get_current_yaml.return_value = UserYaml(
+            {
+                "component_management": {
+                    "individual_components": [
+                        {
+                            "component_id": f"component_{i}",
+                            "flag_regexes": [f"flag_{i}"],
+                        }
+                        for i in range(20)
+                    ]
+                }
+            }
+        )
+
+        comparison = CompareCommitFactory.create()
+        dbsession.add(comparison)
+        # only some of the flags already exist
+        dbsession.add_all(
+            RepositoryFlag(
+                repository_id=comparison.compare_commit.repository.repoid,
+                flag_name=f"flag_{i}",
+            )
+            for i in range(0, num_flags, 2)
+        )
+        dbsession.flush()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.extend(
+                (statement.split()[0], table)
+                for table in ("compare_flagcomparison", "compare_componentcomparison")
+                if f" {table}" in statement
+            )
+
+        def run_task():
+            statements.clear()
+            event.listen(dbsession.bind, "before_cursor_execute", count_statement)
+            try:
+                task = ComputeComparisonTask()
+                assert task.run_impl(dbsession, comparison.id) == {"successful": True}
+            finally:
+                event.remove(dbsession.bind, "before_cursor_execute", count_statement)
+
+        run_task()
+        # one lookup and one insert for all the flags, and the same for the components
+        assert sorted(statements) == [
+            ("INSERT", "compare_componentcomparison"),
+            ("INSERT", "compare_flagcomparison"),
+            ("SELECT", "compare_componentcomparison"),
+            ("SELECT", "compare_flagcomparison"),
+        ]
+
+        flag_comparisons = (
+            dbsession.query(CompareFlag)
+            .filter_by(commit_comparison_id=comparison.id)
+            .all()
+        )
+        assert len(flag_comparisons) == num_flags
+        repository_flags = (
+            dbsession.query(RepositoryFlag)
+            .filter_by(repository_id=comparison.compare_commit.repository.repoid)
+            .all()
+        )
+        assert len(repository_flags) == num_flags
+        component_comparisons = (
+            dbsession.query(CompareComponent)
+            .filter_by(commit_comparison_id=comparison.id)
+            .order_by(CompareComponent.id_)
+            .all()
+        )
+        assert [c.component_id for c in component_comparisons] == [
+            f"component_{i}" for i in range(20)
+        ]
+        # `flag_0` only covers the added line 30
+        assert component_comparisons[0].patch_totals["lines"] == 1
+        assert component_comparisons[0].patch_totals["misses"] == 1
+
+        # running it again updates the existing comparisons
+        run_task()
+        assert ("INSERT", "compare_flagcomparison") not in statements
+        assert ("INSERT", "compare_componentcomparison") not in statements
+        assert statements.count(("SELECT", "compare_flagcomparison")) == 1
+        assert statements.count(("SELECT", "compare_componentcomparison")) == 1
+        assert (
+            dbsession.query(CompareFlag)
+            .filter_by(commit_comparison_id=comparison.id)
+            .count()
+            == num_flags
+        )
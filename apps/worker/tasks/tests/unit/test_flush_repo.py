@@ -1,7 +1,9 @@
+import json
+
 import pytest
 
 from services.cleanup.utils import CleanupResult, CleanupSummary
-from shared.api_archive.archive import ArchiveService
+from shared.api_archive.archive import ArchiveService, MinioEndpoints
 from shared.bundle_analysis import StoragePaths
 from shared.django_apps.compare.tests.factories import (
     CommitComparisonFactory,
@@ -18,6 +20,7 @@ from shared.django_apps.reports.tests.factories import (
     RepositoryFlagFactory,
     UploadFactory,
 )
+from shared.helpers.upload_context import repository_key, upload_token_key
 from tasks.flush_repo import FlushRepoTask
 
 
@@ -134,3 +137,77 @@ def test_flush_repo_little_bit_of_everything(mocker, mock_storage):
     )
     assert len(archive) == 0
     assert len(ba_archive) == 0
+
+
+@pytest.mark.django_db(databases=["timeseries", "default"])
+def test_flush_repo_sharded_bundle_report(mock_storage):
+    repo = RepositoryFactory()
+    archive_service = ArchiveService(repo)
+    commit = CommitFactory(repository=repo)
+    ba_report = CommitReportFactory(commit=commit, report_type="bundle_analysis")
+
+    manifest = {"version": 1, "bundles": {}, "metadata": {}}
+    for shard_key in ["shard1", "shard2"]:
+        manifest["bundles"][shard_key] = {"shard": shard_key, "is_cached": False}
+        shard_path = StoragePaths.bundle_report_shard.path(
+            repo_key=archive_service.storage_hash,
+            report_key=ba_report.external_id,
+            shard_key=shard_key,
+        )
+        archive_service.storage.write_file("bundle-analysis", shard_path, shard_key)
+    manifest_path = StoragePaths.bundle_report_manifest.path(
+        repo_key=archive_service.storage_hash, report_key=ba_report.external_id
+    )
+    archive_service.storage.write_file(
+        "bundle-analysis", manifest_path, json.dumps(manifest)
+    )
+
+    ba_archive = mock_storage.storage["bundle-analysis"]
+    assert len(ba_archive) == 3
+
+    task = FlushRepoTask()
+    res = task.run_impl({}, repoid=repo.repoid)
+
+    assert res.summary["CommitReport"] == CleanupResult(1, 3)
+    assert len(ba_archive) == 0
+
+
+@pytest.mark.django_db(databases=["timeseries", "default"])
+def test_flush_repo_cached_diffs(mock_storage):
+    repo = RepositoryFactory()
+    other_repo = RepositoryFactory()
+    for repository in [repo, other_repo]:
+        archive_service = ArchiveService(repository)
+        for diff_id, context in [("abc", "commit"), ("abc...def", "compare")]:
+            path = MinioEndpoints.diff.get_path(
+                version="v4",
+                repo_hash=archive_service.storage_hash,
+                diff_id=diff_id,
+                context=context,
+            )
+            archive_service.write_file(path, "{}")
+
+    archive = mock_storage.storage["archive"]
+    assert len(archive) == 4
+
+    task = FlushRepoTask()
+    res = task.run_impl({}, repoid=repo.repoid)
+
+    assert res.summary["Repository"] == CleanupResult(1, 2)
+    other_repo_hash = ArchiveService(other_repo).storage_hash
+    assert len(archive) == 2
+    assert all(other_repo_hash in path for path in archive)
+
+
+@pytest.mark.django_db(databases=["timeseries", "default"])
+def test_flush_repo_invalidates_upload_context(mock_storage, mock_redis):
+    repo = RepositoryFactory()
+    upload_token = repo.upload_token
+
+    task = FlushRepoTask()
+    task.run_impl({}, repoid=repo.repoid)
+
+    # the API must not keep accepting the revoked upload token from its cache
+    mock_redis.delete.assert_any_call(
+        repository_key(repo.repoid), upload_token_key(upload_token)
+    )
@@ -8,6 +8,7 @@ import vcr
 from celery.exceptions import SoftTimeLimitExceeded
 from freezegun import freeze_time
 from redis.exceptions import LockError
+from sqlalchemy import event
 
 from database.models import Owner, Repository
 from database.tests.factories import (
@@ -386,6 +387,193 @@ class TestSyncReposTaskUnit:
         assert new_repo.branch == repo_data.get("branch")
         assert new_repo.private is True
 
+    def test_upsert_owners(self, dbsession):
+        service = "github"
+        same_owner = OwnerFactory.create(
+            service=service, service_id="1", username="Codecov"
+        )
+        renamed_owner = OwnerFactory.create(
+            service=service, service_id="2", username="old_name"
+        )
+        dbsession.add_all([same_owner, renamed_owner])
+        dbsession.flush()
+
+        ownerids = SyncReposTask().upsert_owners(
+            dbsession, service, {"1": "codecov", "2": "new_name", "3": "new_owner"}
+        )
+        dbsession.expire_all()
+
+        assert ownerids["1"] == same_owner.ownerid
+        assert ownerids["2"] == renamed_owner.ownerid
+        # like `upsert_owner`, only the case of the username changed
+        assert same_owner.username == "Codecov"
+        assert renamed_owner.username == "new_name"
+        new_owner = dbsession.query(Owner).filter(Owner.ownerid == ownerids["3"]).one()
+        assert (new_owner.service, new_owner.service_id) == (service, "3")
+        assert new_owner.username == "new_owner"
+
+        assert SyncReposTask().upsert_owners(dbsession, service, {}) == {}
+
+    def test_upsert_repos(self, dbsession):
+        service = "gitlab"
+        owner = OwnerFactory.create(service=service, service_id="45343385")
+        other_owner = OwnerFactory.create(service=service, service_id="40404")
+        dbsession.add_all([owner, other_owner])
+        existing_repo = RepositoryFactory.create(
+            owner=owner, service_id="1", name="old-name", private=False, deleted=True
+        )
+        moved_repo = RepositoryFactory.create(
+            owner=other_owner, service_id="2", name="moved", private=True
+        )
+        recreated_repo = RepositoryFactory.create(
+            owner=owner, service_id="old-3", name="recreated", private=True
+        )
+        dbsession.add_all([existing_repo, moved_repo, recreated_repo])
+        dbsession.flush()
+
+        def repo_data(service_id, name, private=False):
+            return {
+                "service_id": service_id,
+                "name": name,
+                "private": private,
+                "language": "python",
+                "branch": "main",
+            }
+
+        repoids = SyncReposTask().upsert_repos(
+            dbsession,
+            service,
+            [
+                (owner.ownerid, repo_data("1", "new-name"), True),
+                (owner.ownerid, repo_data("2", "moved", True), True),
+                (owner.ownerid, repo_data("3", "recreated", True), True),
+                (owner.ownerid, repo_data("4", "new-repo"), True),
+                (other_owner.ownerid, repo_data(5, "fork"), None),
+                (owner.ownerid, repo_data("1", "new-name"), None),
+            ],
+        )
+        dbsession.expire_all()
+
+        assert repoids[:3] == [
+            existing_repo.repoid,
+            moved_repo.repoid,
+            recreated_repo.repoid,
+        ]
+        assert repoids[5] == existing_repo.repoid
+
+        assert existing_repo.name == "new-name"
+        assert existing_repo.deleted is False
+        assert existing_repo.updatestamp is not None
+        assert moved_repo.ownerid == owner.ownerid
+        assert recreated_repo.service_id == "3"
+
+        new_repo = dbsession.query(Repository).filter_by(repoid=repoids[3]).one()
+        assert (new_repo.ownerid, new_repo.service_id) == (owner.ownerid, "4")
+        assert new_repo.name == "new-repo"
+        assert new_repo.language == "python"
+        assert new_repo.using_integration is True
+        assert new_repo.image_token is not None
+        fork = dbsession.query(Repository).filter_by(repoid=repoids[4]).one()
+        assert (fork.ownerid, fork.service_id) == (other_owner.ownerid, "5")
+        assert fork.using_integration is None
+
+        assert SyncReposTask().upsert_repos(dbsession, service, []) == []
+
+    @pytest.mark.django_db
+    def test_sync_repos_bulk_upserts_each_page(self, dbsession, mock_owner_provider):
+        mock_all_plans_and_tiers()
+        user = OwnerFactory.create(
+            organizations=[],
+            service="github",
+            username="1nf1n1t3l00p",
+            permission=[],
+            service_id="45343385",
+        )
+        dbsession.add(user)
+        existing_repo = RepositoryFactory.create(
+            owner=user, service_id="0", name="old-name", private=True
+        )
+        dbsession.add(existing_repo)
+        dbsession.flush()
+
+        def repo(i, owner_service_id):
+            data = {
+                "owner": {
+                    "service_id": owner_service_id,
+                    "username": f"owner-{owner_service_id}",
+                },
+                "repo": {
+                    "service_id": str(i),
+                    "name": f"repo-{i}",
+                    "language": "python",
+                    "private": i % 2 == 0,
+                    "branch": "main",
+                },
+            }
+            if i % 10 == 5:
+                data["repo"]["fork"] = {
+                    "owner": {"service_id": "fork-owner", "username": "fork-owner"},
+                    "repo": {
+                        "service_id": f"fork-{i}",
+                        "name": f"fork-{i}",
+                        "language": None,
+                        "private": False,
+                        "branch": "main",
+                    },
+                }
+            return data
+
+        pages = [
+            [repo(i, user.service_id) for i in range(50)],
+            [repo(i, f"org-{i % 3}") for i in range(50, 120)],
+        ]
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            if statement.split()[0] in ("SELECT", "INSERT", "UPDATE") and (
+                "repos" in statement or "owners" in statement
+            ):
+                statements.append(statement)
+
+        statements_per_page = []
+
+        async def mock_list_repos_generator(*args, **kwargs):
+            for page in pages:
+                before = len(statements)
+                yield page
+                statements_per_page.append(len(statements) - before)
+
+        mock_owner_provider.list_repos_generator = mock_list_repos_generator
+        mock_owner_provider.service = "github"
+
+        event.listen(dbsession.bind, "before_cursor_execute", count_statement)
+        try:
+            SyncReposTask().run_impl(
+                dbsession, ownerid=user.ownerid, using_integration=False
+            )
+        finally:
+            event.remove(dbsession.bind, "before_cursor_execute", count_statement)
+
+        # one statement for the owners, one to look up the repos and one for the repos
+        assert statements_per_page == [3, 3]
+
+        repos = (
+            dbsession.query(Repository)
+            .filter(
+                Repository.service_id.in_(
+                    [str(i) for i in range(120)]
+                    + [f"fork-{i}" for i in range(5, 120, 10)]
+                )
+            )
+            .all()
+        )
+        assert len(repos) == 120 + 12
+        assert existing_repo.name == "repo-0"
+        repoids = {repo.service_id: repo.repoid for repo in repos}
+        assert repoids["0"] == existing_repo.repoid
+        assert user.permission == sorted(repoids[str(i)] for i in range(0, 120, 2))
+
     @pytest.mark.django_db
     def test_only_public_repos_already_in_db(self, dbsession):
         token = "ecd73a086eadc85db68747a66bdbd662a785a072"
@@ -1,4 +1,4 @@
-from database.models import MeasurementName
+from database.models import Measurement, MeasurementName
 from database.tests.factories import RepositoryFactory
 from database.tests.factories.core import CommitFactory
 from database.tests.factories.timeseries import DatasetFactory
@@ -40,22 +40,70 @@ def test_backfill_commits_run_impl(dbsession, mocker):
     )
     assert res == {"successful": True}
 
-    mocked_app.tasks[
+    # the flag coverage is derived from the totals of the sessions
+    assert not mocked_app.tasks[
         timeseries_save_commit_measurements_task_name
-    ].apply_async.assert_any_call(
+    ].apply_async.called
+    for commit in (commit1, commit2):
+        measurement = (
+            dbsession.query(Measurement)
+            .filter_by(name=dataset.name, commit_sha=commit.commitid)
+            .one()
+        )
+        assert measurement.value == 85.0
+
+
+def test_backfill_commits_run_impl_loads_reports(dbsession, mocker):
+    mocker.patch("tasks.timeseries_backfill.is_timeseries_enabled", return_value=True)
+    mocked_app = mocker.patch.object(
+        TimeseriesBackfillCommitsTask,
+        "app",
+        tasks={
+            timeseries_save_commit_measurements_task_name: mocker.MagicMock(),
+        },
+    )
+
+    repository = RepositoryFactory.create()
+    dbsession.add(repository)
+    dbsession.flush()
+
+    commit1 = CommitFactory(repository=repository)
+    dbsession.add(commit1)
+    # a flag uploaded in several sessions
+    commit2 = CommitFactory(repository=repository)
+    session = commit2.report_json["sessions"]["0"]
+    commit2.report_json = {"files": {}, "sessions": {"0": session, "1": session}}
+    dbsession.add(commit2)
+    dbsession.flush()
+
+    dataset_names = [
+        MeasurementName.flag_coverage.value,
+        MeasurementName.component_coverage.value,
+    ]
+    task = TimeseriesBackfillCommitsTask()
+    res = task.run_impl(
+        dbsession,
+        commit_ids=[commit1.id_, commit2.id_],
+        dataset_names=dataset_names,
+    )
+    assert res == {"successful": True}
+
+    apply_async = mocked_app.tasks[
+        timeseries_save_commit_measurements_task_name
+    ].apply_async
+    assert apply_async.call_count == 2
+    apply_async.assert_any_call(
         kwargs={
             "commitid": commit1.commitid,
             "repoid": commit1.repoid,
-            "dataset_names": [dataset.name],
+            "dataset_names": [MeasurementName.component_coverage.value],
         }
     )
-    mocked_app.tasks[
-        timeseries_save_commit_measurements_task_name
-    ].apply_async.assert_any_call(
+    apply_async.assert_any_call(
         kwargs={
             "commitid": commit2.commitid,
             "repoid": commit2.repoid,
-            "dataset_names": [dataset.name],
+            "dataset_names": dataset_names,
         }
     )
 
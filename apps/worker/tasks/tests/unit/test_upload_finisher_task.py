@@ -13,10 +13,15 @@ from helpers.checkpoint_logger import _kwargs_key
 from helpers.checkpoint_logger.flows import UploadFlow
 from helpers.exceptions import RepositoryWithoutValidBotError
 from helpers.log_context import LogContext, set_log_context
+from rollouts import UPLOAD_FINISHER_ELECTED_MERGER
 from services.processing.merging import get_joined_flag, update_uploads
+from services.processing.state import ProcessingState, UploadNumbers
 from services.processing.types import MergeResult, ProcessingResult
 from services.timeseries import MeasurementName
-from shared.celery_config import timeseries_save_commit_measurements_task_name
+from shared.celery_config import (
+    timeseries_save_commit_measurements_task_name,
+    upload_finisher_task_name,
+)
 from shared.torngit.exceptions import TorngitObjectNotFoundError
 from shared.yaml import UserYaml
 from tasks.upload_finisher import (
@@ -658,3 +663,137 @@ class TestUploadFinisherTask:
                 commitid=commit.commitid,
                 commit_yaml={},
             )
+
+    @pytest.mark.django_db
+    def test_elected_merger_hands_over_uploads(self, dbsession, mocker, mock_redis):
+        commit = CommitFactory.create()
+        dbsession.add(commit)
+        dbsession.flush()
+
+        mocker.patch("tasks.upload_finisher.load_commit_diff", return_value=None)
+        mocker.patch.object(
+            UPLOAD_FINISHER_ELECTED_MERGER, "check_value", return_value=True
+        )
+        mocker.patch.object(ProcessingState, "try_become_merger", return_value=None)
+        mocker.patch.object(
+            ProcessingState,
+            "get_upload_numbers",
+            return_value=UploadNumbers(processing=0, processed=1),
+        )
+        store_results = mocker.patch.object(ProcessingState, "store_processing_results")
+        merge_uploads = mocker.patch.object(UploadFinisherTask, "merge_uploads")
+        mocked_app = mocker.patch.object(
+            UploadFinisherTask,
+            "app",
+            tasks={upload_finisher_task_name: mocker.MagicMock()},
+        )
+        # another task already is the merger, so this one neither waits on the report lock nor retries
+        mock_redis.lock.side_effect = LockError()
+
+        processing_results = [{"upload_id": 0, "successful": True, "arguments": {}}]
+        task = UploadFinisherTask()
+        task.request.retries = 0
+        result = task.run_impl(
+            dbsession,
+            processing_results,
+            repoid=commit.repoid,
+            commitid=commit.commitid,
+            commit_yaml={},
+        )
+
+        assert result is None
+        store_results.assert_called_once_with(processing_results)
+        merge_uploads.assert_not_called()
+        # a delayed finisher takes over in case the merger dies
+        mocked_app.tasks[upload_finisher_task_name].apply_async.assert_called_once_with(
+            args=([],),
+            kwargs={
+                "repoid": commit.repoid,
+                "commitid": commit.commitid,
+                "commit_yaml": {},
+            },
+            countdown=ANY,
+        )
+
+    @pytest.mark.django_db
+    def test_elected_merger_merges_in_batches(self, dbsession, mocker, mock_redis):
+        commit = CommitFactory.create()
+        dbsession.add(commit)
+        dbsession.flush()
+
+        mocker.patch("tasks.upload_finisher.load_commit_diff", return_value=None)
+        mocker.patch("tasks.upload_finisher.cleanup_intermediate_reports")
+        mocker.patch.object(
+            UPLOAD_FINISHER_ELECTED_MERGER, "check_value", return_value=True
+        )
+        first_batch = [
+            {"upload_id": i, "successful": True, "arguments": {}} for i in range(10)
+        ]
+        second_batch = [{"upload_id": 10, "successful": True, "arguments": {}}]
+        mocker.patch.object(ProcessingState, "store_processing_results")
+        mocker.patch.object(ProcessingState, "try_become_merger", return_value="token")
+        mocker.patch.object(
+            ProcessingState,
+            "take_uploads_for_merging",
+            side_effect=[first_batch, [], second_batch, []],
+        )
+        # new uploads are handed over while merging the first batch
+        release_merger = mocker.patch.object(
+            ProcessingState, "release_merger", side_effect=[False, True]
+        )
+        mocker.patch.object(
+            ProcessingState,
+            "get_upload_numbers",
+            return_value=UploadNumbers(processing=1, processed=0),
+        )
+        merge_uploads = mocker.patch.object(UploadFinisherTask, "merge_uploads")
+
+        UploadFinisherTask().run_impl(
+            dbsession,
+            second_batch,
+            repoid=commit.repoid,
+            commitid=commit.commitid,
+            commit_yaml={},
+        )
+
+        assert [call.args[4] for call in merge_uploads.call_args_list] == [
+            first_batch,
+            second_batch,
+        ]
+        assert release_merger.call_count == 2
+
+    @pytest.mark.django_db
+    def test_elected_merger_lost_lease(self, dbsession, mocker, mock_redis):
+        commit = CommitFactory.create()
+        dbsession.add(commit)
+        dbsession.flush()
+
+        mocker.patch("tasks.upload_finisher.load_commit_diff", return_value=None)
+        mocker.patch("tasks.upload_finisher.perform_report_merging")
+        cleanup = mocker.patch("tasks.upload_finisher.cleanup_intermediate_reports")
+        save_report = mocker.patch.object(ReportService, "save_report")
+        mocker.patch.object(
+            UPLOAD_FINISHER_ELECTED_MERGER, "check_value", return_value=True
+        )
+        processing_results = [{"upload_id": 0, "successful": True, "arguments": {}}]
+        mocker.patch.object(ProcessingState, "store_processing_results")
+        mocker.patch.object(ProcessingState, "try_become_merger", return_value="token")
+        mocker.patch.object(
+            ProcessingState, "take_uploads_for_merging", return_value=processing_results
+        )
+        # another merger took over while waiting for the report lock
+        mocker.patch.object(ProcessingState, "renew_merger", return_value=False)
+        mark_merged = mocker.patch.object(ProcessingState, "mark_uploads_as_merged")
+
+        result = UploadFinisherTask().run_impl(
+            dbsession,
+            processing_results,
+            repoid=commit.repoid,
+            commitid=commit.commitid,
+            commit_yaml={},
+        )
+
+        assert result is None
+        save_report.assert_not_called()
+        mark_merged.assert_not_called()
+        cleanup.assert_not_called()
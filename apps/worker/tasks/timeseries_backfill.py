@@ -9,7 +9,12 @@ from sqlalchemy.orm.session import Session
 from app import celery_app
 from database.models import Commit, Repository
 from database.models.timeseries import Dataset
-from services.timeseries import backfill_batch_size, repository_commits_query
+from services.timeseries import (
+    TOTALS_DATASETS,
+    backfill_batch_size,
+    repository_commits_query,
+    upsert_commits_totals_measurements,
+)
 from shared.celery_config import (
     timeseries_backfill_commits_task_name,
     timeseries_backfill_dataset_task_name,
@@ -36,13 +41,38 @@ class TimeseriesBackfillCommitsTask(
             log.warning("Timeseries not enabled")
             return {"successful": False}
 
-        commits = db_session.query(Commit).filter(Commit.id_.in_(commit_ids))
+        commits = db_session.query(Commit).filter(Commit.id_.in_(commit_ids)).all()
+
+        # the datasets derived from totals are saved right away for the whole batch,
+        # and a task loading the report is only needed for what remains
+        totals_dataset_names = [
+            name for name in dataset_names if name in TOTALS_DATASETS
+        ]
+        report_dataset_names = [
+            name for name in dataset_names if name not in TOTALS_DATASETS
+        ]
+        remaining_commit_ids = {commit.id_ for commit in commits}
+        if totals_dataset_names:
+            remaining_commit_ids = {
+                commit.id_
+                for commit in upsert_commits_totals_measurements(
+                    db_session, commits, totals_dataset_names
+                )
+            }
+
         for commit in commits:
+            commit_dataset_names = (
+                dataset_names
+                if commit.id_ in remaining_commit_ids
+                else report_dataset_names
+            )
+            if not commit_dataset_names:
+                continue
             self.app.tasks[timeseries_save_commit_measurements_task_name].apply_async(
                 kwargs={
                     "commitid": commit.commitid,
                     "repoid": commit.repoid,
-                    "dataset_names": dataset_names,
+                    "dataset_names": commit_dataset_names,
                 }
             )
         return {"successful": True}
@@ -44,6 +44,7 @@ from shared.django_apps.user_measurements.models import UserMeasurement
 from shared.helpers.redis import get_redis_connection
 from shared.metrics import Histogram
 from shared.torngit.exceptions import TorngitClientError, TorngitRepoNotFoundError
+from shared.upload.counters import commit_sessions_key, increment_count
 from shared.upload.utils import UploaderType, bulk_insert_coverage_measurements
 from shared.yaml import UserYaml
 from shared.yaml.user_yaml import OwnerContext
@@ -576,6 +577,12 @@ class UploadTask(BaseCodecovTask, name=upload_task_name):
             argument_list.append(arguments)
 
         db_session.commit()
+        if upload_flag_map:
+            increment_count(
+                upload_context.redis_connection,
+                commit_sessions_key(commit.id),
+                len(upload_flag_map),
+            )
         return CreateUploadResponse(
             argument_list=argument_list,
             measurements_list=measurements_list,
@@ -1,6 +1,7 @@
 import logging
 import random
 import re
+import time
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 
@@ -18,13 +19,19 @@ from helpers.checkpoint_logger.flows import UploadFlow
 from helpers.exceptions import RepositoryWithoutValidBotError
 from helpers.github_installation import get_installation_name_for_owner_for_task
 from helpers.save_commit_error import save_commit_error
+from rollouts import UPLOAD_FINISHER_ELECTED_MERGER
 from services.comparison import get_or_create_comparison
 from services.processing.intermediate import (
     cleanup_intermediate_reports,
     load_intermediate_reports,
 )
 from services.processing.merging import merge_reports, update_uploads
-from services.processing.state import ProcessingState, should_trigger_postprocessing
+from services.processing.metrics import MERGE_BATCH_UPLOADS, REPORT_LOCK_WAIT_SECONDS
+from services.processing.state import (
+    MERGER_LEASE_TTL,
+    ProcessingState,
+    should_trigger_postprocessing,
+)
 from services.processing.types import ProcessingResult
 from services.report import ReportService
 from services.repository import get_repo_provider_service
@@ -37,7 +44,7 @@ from shared.celery_config import (
     timeseries_save_commit_measurements_task_name,
     upload_finisher_task_name,
 )
-from shared.helpers.cache import cache
+from shared.helpers.diff_cache import COMMIT_DIFF, diff_cache
 from shared.helpers.redis import get_redis_connection
 from shared.reports.resources import Report
 from shared.timeseries.helpers import is_timeseries_enabled
@@ -104,38 +111,37 @@ class UploadFinisherTask(BaseCodecovTask, name=upload_finisher_task_name):
 
         state = ProcessingState(repoid, commitid)
 
-        upload_ids = [upload["upload_id"] for upload in processing_results]
         diff = load_commit_diff(commit, self.name)
 
-        try:
-            with get_report_lock(repoid, commitid, self.hard_time_limit_task):
-                report_service = ReportService(commit_yaml)
-                report = perform_report_merging(
-                    report_service, commit_yaml, commit, processing_results
+        if UPLOAD_FINISHER_ELECTED_MERGER.check_value(repoid):
+            merged_results = self.merge_as_elected_merger(
+                db_session, commit, commit_yaml, state, processing_results, diff
+            )
+            if not merged_results:
+                UploadFlow.log(UploadFlow.PROCESSING_COMPLETE)
+                UploadFlow.log(UploadFlow.SKIPPING_NOTIFICATION)
+                return
+            processing_results = merged_results
+        else:
+            upload_ids = [upload["upload_id"] for upload in processing_results]
+            MERGE_BATCH_UPLOADS.labels(merger="finisher").observe(len(upload_ids))
+            try:
+                self.merge_uploads(
+                    db_session, commit, commit_yaml, state, processing_results, diff
                 )
-
-                log.info(
-                    "Saving combined report",
-                    extra={"processing_results": processing_results},
+            except LockError:
+                max_retry = 200 * 3**self.request.retries
+                retry_in = min(random.randint(max_retry // 2, max_retry), 60 * 60 * 5)
+                log.warning(
+                    "Unable to acquire report lock. Retrying",
+                    extra={
+                        "countdown": retry_in,
+                        "number_retries": self.request.retries,
+                    },
                 )
+                self.retry(max_retries=MAX_RETRIES, countdown=retry_in)
 
-                if diff:
-                    report.apply_diff(diff)
-                report_service.save_report(commit, report)
-
-                db_session.commit()
-                state.mark_uploads_as_merged(upload_ids)
-
-        except LockError:
-            max_retry = 200 * 3**self.request.retries
-            retry_in = min(random.randint(max_retry // 2, max_retry), 60 * 60 * 5)
-            log.warning(
-                "Unable to acquire report lock. Retrying",
-                extra={"countdown": retry_in, "number_retries": self.request.retries},
-            )
-            self.retry(max_retries=MAX_RETRIES, countdown=retry_in)
-
-        cleanup_intermediate_reports(upload_ids)
+            cleanup_intermediate_reports(upload_ids)
 
         if not should_trigger_postprocessing(state.get_upload_numbers()):
             UploadFlow.log(UploadFlow.PROCESSING_COMPLETE)
@@ -189,6 +195,143 @@ class UploadFinisherTask(BaseCodecovTask, name=upload_finisher_task_name):
             log.warning("Unable to acquire lock", extra={"lock_name": lock_name})
             UploadFlow.log(UploadFlow.FINISHER_LOCK_ERROR)
 
+    def merge_uploads(
+        self,
+        db_session,
+        commit: Commit,
+        commit_yaml: UserYaml,
+        state: ProcessingState,
+        processing_results: list[ProcessingResult],
+        diff: dict | None,
+        merger_token: str | None = None,
+        lease_ttl: int = MERGER_LEASE_TTL,
+    ) -> bool:
+        """
+        Merges the given uploads into the "master report" of the commit and saves it,
+        while holding the report lock.
+
+        When merging as the elected merger, its lease is checked before saving the
+        report, and before marking the uploads as merged. This returns `False` if
+        the lease was lost, as another merger is merging the same uploads again.
+        """
+        upload_ids = [upload["upload_id"] for upload in processing_results]
+
+        lock_wait_start = time.monotonic()
+        with get_report_lock(commit.repoid, commit.commitid, self.hard_time_limit_task):
+            REPORT_LOCK_WAIT_SECONDS.observe(time.monotonic() - lock_wait_start)
+
+            report_service = ReportService(commit_yaml)
+            report = perform_report_merging(
+                report_service, commit_yaml, commit, processing_results
+            )
+
+            log.info(
+                "Saving combined report",
+                extra={"processing_results": processing_results},
+            )
+
+            if diff:
+                report.apply_diff(diff)
+            if merger_token and not state.renew_merger(merger_token, lease_ttl):
+                return False
+            report_service.save_report(commit, report)
+
+            db_session.commit()
+            if merger_token and not state.renew_merger(merger_token, lease_ttl):
+                return False
+            state.mark_uploads_as_merged(upload_ids)
+            return True
+
+    def merge_as_elected_merger(
+        self,
+        db_session,
+        commit: Commit,
+        commit_yaml: UserYaml,
+        state: ProcessingState,
+        processing_results: list[ProcessingResult],
+        diff: dict | None,
+    ) -> list[ProcessingResult] | None:
+        """
+        Hands the given uploads over to the single merger of the commit.
+
+        If this task gets elected as the merger, it merges all the uploads which are
+        ready for merging in batches, and returns the `ProcessingResult`s it merged.
+        Otherwise, this returns `None`, as the uploads will be merged by the current
+        merger, instead of retrying to acquire the report lock.
+        In that case, a delayed finisher is scheduled, which takes over the uploads
+        in case the current merger dies before merging them.
+        """
+        if processing_results:
+            state.store_processing_results(processing_results)
+
+        # the lease must not expire while this task is still running
+        lease_ttl = max(MERGER_LEASE_TTL, self.hard_time_limit_task)
+        token = state.try_become_merger(lease_ttl)
+        if token is None:
+            log.info(
+                "Uploads are handed over to the elected merger",
+                extra={"processing_results": processing_results},
+            )
+            if state.get_upload_numbers().processed:
+                self.app.tasks[upload_finisher_task_name].apply_async(
+                    args=([],),
+                    kwargs={
+                        "repoid": commit.repoid,
+                        "commitid": commit.commitid,
+                        "commit_yaml": commit_yaml.to_dict(),
+                    },
+                    countdown=lease_ttl,
+                )
+            return None
+
+        merged_results: list[ProcessingResult] = []
+        while True:
+            batch = state.take_uploads_for_merging(token, lease_ttl)
+            if batch is None:
+                # the lease expired, and another merger will take over
+                log.warning("Merger lease of commit expired")
+                return None
+
+            if not batch:
+                if state.release_merger(token):
+                    return merged_results
+                # more uploads were handed over in the meantime
+                continue
+
+            MERGE_BATCH_UPLOADS.labels(merger="elected").observe(len(batch))
+            try:
+                merged = self.merge_uploads(
+                    db_session,
+                    commit,
+                    commit_yaml,
+                    state,
+                    batch,
+                    diff,
+                    merger_token=token,
+                    lease_ttl=lease_ttl,
+                )
+            except LockError:
+                # step down, the uploads of this batch are merged by the next merger
+                state.abandon_merger(token)
+                max_retry = 200 * 3**self.request.retries
+                retry_in = min(random.randint(max_retry // 2, max_retry), 60 * 60 * 5)
+                log.warning(
+                    "Unable to acquire report lock as elected merger. Retrying",
+                    extra={
+                        "countdown": retry_in,
+                        "number_retries": self.request.retries,
+                    },
+                )
+                self.retry(max_retries=MAX_RETRIES, countdown=retry_in)
+
+            if not merged:
+                # another merger took over, and merges this batch again
+                log.warning("Merger lease of commit expired while merging")
+                return None
+
+            cleanup_intermediate_reports([upload["upload_id"] for upload in batch])
+            merged_results.extend(batch)
+
     def finish_reports_processing(
         self,
         db_session,
@@ -413,11 +556,11 @@ def perform_report_merging(
 
 
 @sentry_sdk.trace
-@cache.cache_function(ttl=60 * 60)  # the commit diff is immutable
 def load_commit_diff(commit: Commit, task_name: str | None = None) -> dict | None:
     repository = commit.repository
     commitid = commit.commitid
-    try:
+
+    def fetch_commit_diff() -> dict:
         installation_name_to_use = (
             get_installation_name_for_owner_for_task(task_name, repository.owner)
             if task_name
@@ -428,6 +571,12 @@ def load_commit_diff(commit: Commit, task_name: str | None = None) -> dict | Non
         )
         return async_to_sync(repository_service.get_commit_diff)(commitid)
 
+    try:
+        # the commit diff is immutable
+        return diff_cache.get_or_fetch(
+            repository, None, commitid, COMMIT_DIFF, fetch_commit_diff
+        )
+
     # TODO(swatinem): can we maybe get rid of all this logging?
     except TorngitError:
         # When this happens, we have that commit.totals["diff"] is not available.
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from database.enums import ReportType
+from database.models import CommitReport, MeasurementName
+from database.tests.factories import CommitFactory, UploadFactory
+from database.tests.factories.timeseries import DatasetFactory
+from services.bundle_analysis.report import BundleAnalysisReportService
+from shared.bundle_analysis import BundleAnalysisReport, BundleAnalysisReportLoader
+from shared.bundle_analysis.models import AssetType
+from shared.yaml import UserYaml
+
+NUM_ASSETS = 5_000
+ASSET_EXTENSIONS = ["js", "js", "js", "css", "woff2", "png"]
+DATASET_NAMES = [
+    MeasurementName.bundle_analysis_report_size,
+    MeasurementName.bundle_analysis_asset_size,
+    MeasurementName.bundle_analysis_font_size,
+    MeasurementName.bundle_analysis_image_size,
+    MeasurementName.bundle_analysis_javascript_size,
+    MeasurementName.bundle_analysis_stylesheet_size,
+]
+
+
+def make_bundle_stats(num_assets: int) -> dict:
+    assets = [
+        {
+            "name": f"assets/asset_{i}-{i:08x}.{ASSET_EXTENSIONS[i % len(ASSET_EXTENSIONS)]}",
+            "size": 1000 + i,
+            "gzipSize": 500 + i,
+            "normalized": f"assets/asset_{i}-*.{ASSET_EXTENSIONS[i % len(ASSET_EXTENSIONS)]}",
+        }
+        for i in range(num_assets)
+    ]
+    chunks = [
+        {
+            "id": f"chunk_{i}",
+            "uniqueId": f"{i}-chunk_{i}",
+            "entry": i == 0,
+            "initial": i < 10,
+            "files": [asset["name"]],
+            "names": [f"chunk_{i}"],
+        }
+        for i, asset in enumerate(assets)
+        if asset["name"].endswith(".js")
+    ]
+    modules = [
+        {
+            "name": f"./src/module_{i}.ts",
+            "size": 100 + i,
+            "chunkUniqueIds": [chunk["uniqueId"]],
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+    return {
+        "version": "2",
+        "plugin": {"name": "codecov-vite-bundle-analysis-plugin", "version": "1.0.0"},
+        "builtAt": 1701451048604,
+        "duration": 331,
+        "bundler": {"name": "rollup", "version": "3.29.4"},
+        "bundleName": "sample",
+        "assets": assets,
+        "chunks": chunks,
+        "modules": modules,
+    }
+
+
+@pytest.fixture
+def bundle_report_upload(dbsession, mock_storage, tmp_path):
+    """
+    An upload of a bundle with `NUM_ASSETS` assets, the report of which is in storage.
+    """
+    commit = CommitFactory()
+    dbsession.add(commit)
+    commit_report = CommitReport(
+        commit=commit, report_type=ReportType.BUNDLE_ANALYSIS.value
+    )
+    dbsession.add(commit_report)
+    upload = UploadFactory.create(report=commit_report)
+    dbsession.add(upload)
+    for name in DATASET_NAMES:
+        dbsession.add(
+            DatasetFactory.create(
+                name=name.value, repository_id=commit.repository.repoid
+            )
+        )
+    dbsession.flush()
+
+    stats_path = tmp_path / "bundle_stats.json"
+    stats_path.write_text(json.dumps(make_bundle_stats(NUM_ASSETS)))
+    report = BundleAnalysisReport()
+    try:
+        report.ingest(str(stats_path))
+        BundleAnalysisReportLoader(commit.repository).save(
+            report, commit_report.external_id
+        )
+    finally:
+        report.cleanup()
+
+    return commit, upload
+
+
+def test_asset_sizes(bundle_report_upload, benchmark):
+    commit, upload = bundle_report_upload
+    report = BundleAnalysisReportLoader(commit.repository).load(
+        upload.report.external_id
+    )
+    bundle_report = report.bundle_report("sample")
+
+    asset_sizes = benchmark(bundle_report.asset_sizes)
+
+    assert sum(len(sizes) for sizes in asset_sizes.values()) == NUM_ASSETS
+    assert asset_sizes.keys() == {
+        AssetType.JAVASCRIPT,
+        AssetType.STYLESHEET,
+        AssetType.FONT,
+        AssetType.IMAGE,
+    }
+    report.cleanup()
+
+
+def test_save_measurements(dbsession, bundle_report_upload, benchmark):
+    commit, upload = bundle_report_upload
+    report_service = BundleAnalysisReportService(UserYaml.from_dict({}))
+
+    def bench_fn():
+        result = report_service.save_measurements(commit, upload, "sample")
+        assert result.error is None
+
+    benchmark(bench_fn)
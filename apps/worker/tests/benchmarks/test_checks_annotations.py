@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from services.notification.notifiers.checks import PatchChecksNotifier
+from shared.reports.resources import Report, ReportFile
+from shared.reports.types import ReportLine
+from shared.yaml import UserYaml
+
+ADDED_LINES = 50_000
+
+
+def make_comparison_and_diff():
+    report_file = ReportFile("generated.py")
+    for ln in range(1, ADDED_LINES + 1):
+        # runs of uncovered lines, between covered and partial lines
+        coverage = 0 if ln % 10 < 6 else (1 if ln % 10 < 8 else "1/2")
+        report_file.append(ln, ReportLine.create(coverage))
+    report = Report()
+    report.append(report_file)
+
+    diff = {
+        "files": {
+            "generated.py": {
+                "type": "new",
+                "segments": [
+                    {
+                        "header": ["0", "0", "1", str(ADDED_LINES)],
+                        "lines": [f"+line {ln}" for ln in range(1, ADDED_LINES + 1)],
+                    }
+                ],
+                "totals": {"added": ADDED_LINES},
+            }
+        }
+    }
+    return SimpleNamespace(head=SimpleNamespace(report=report)), diff
+
+
+def test_create_annotations(benchmark):
+    comparison, diff = make_comparison_and_diff()
+    notifier = PatchChecksNotifier(
+        repository=None,
+        title="title",
+        notifier_yaml_settings={},
+        notifier_site_settings=True,
+        current_yaml=UserYaml({}),
+        repository_service=None,
+    )
+
+    def bench_fn():
+        annotations = notifier.create_annotations(comparison, diff)
+        assert len(annotations) == ADDED_LINES // 10 + 1
+
+    benchmark(bench_fn)
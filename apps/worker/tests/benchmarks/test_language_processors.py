@@ -0,0 +1,147 @@
+import pytest
+from lxml import etree
+
+from services.report.languages import cobertura, go, jacoco, lcov, node
+from services.report.report_builder import ReportBuilder
+
+NUM_FILES = 200
+LINES_PER_FILE = 2_500
+
+
+def create_report_builder_session():
+    report_builder = ReportBuilder(
+        current_yaml={"codecov": {"max_report_age": None}},
+        sessionid=0,
+        ignored_lines={},
+        path_fixer=lambda path, bases_to_try=None: path,
+    )
+    return report_builder.create_report_builder_session("filename")
+
+
+def make_lcov() -> bytes:
+    records = []
+    for i in range(NUM_FILES):
+        records.append(f"TN:\nSF:src/file_{i}.c")
+        records.extend(f"DA:{ln},{ln % 3}" for ln in range(1, LINES_PER_FILE))
+        records.extend(
+            f"BRDA:{ln},0,{branch},{(ln + branch) % 2}"
+            for ln in range(10, LINES_PER_FILE, 10)
+            for branch in range(2)
+        )
+        records.append("end_of_record")
+    return "\n".join(records).encode()
+
+
+def make_go() -> bytes:
+    lines = ["mode: count"]
+    for i in range(NUM_FILES):
+        for ln in range(1, LINES_PER_FILE, 5):
+            lines.append(f"pkg/file_{i}.go:{ln}.2,{ln + 4}.3 2 {ln % 3}")
+            # overlapping blocks on the same lines
+            lines.append(f"pkg/file_{i}.go:{ln + 1}.5,{ln + 1}.20 1 {ln % 2}")
+    return "\n".join(lines).encode()
+
+
+def make_go_coverpkg(num_blocks: int) -> bytes:
+    """
+    A profile merged across packages with `-coverpkg`, where every package
+    reports the same blocks with its own counts.
+    """
+    num_packages = 10
+    blocks_per_file = 500
+    num_files = num_blocks // (num_packages * blocks_per_file * 2)
+    lines = ["mode: count"]
+    for package in range(num_packages):
+        for i in range(num_files):
+            for ln in range(1, blocks_per_file * 5, 5):
+                hits = (ln + package) % 3
+                lines.append(f"pkg/file_{i}.go:{ln}.2,{ln + 4}.3 2 {hits}")
+                lines.append(f"pkg/file_{i}.go:{ln + 1}.5,{ln + 1}.20 1 {hits % 2}")
+    return "\n".join(lines).encode()
+
+
+def make_cobertura() -> bytes:
+    classes = []
+    for i in range(NUM_FILES):
+        lines = "".join(
+            f'<line number="{ln}" hits="{ln % 3}" branch="true" condition-coverage="50% (1/2)"/>'
+            if ln % 10 == 0
+            else f'<line number="{ln}" hits="{ln % 3}"/>'
+            for ln in range(1, LINES_PER_FILE)
+        )
+        classes.append(
+            f'<class name="file_{i}" filename="src/file_{i}.py"><lines>{lines}</lines></class>'
+        )
+    return (
+        "<coverage><packages><package><classes>"
+        + "".join(classes)
+        + "</classes></package></packages></coverage>"
+    ).encode()
+
+
+def make_jacoco() -> bytes:
+    sourcefiles = []
+    for i in range(NUM_FILES):
+        lines = "".join(
+            f'<line nr="{ln}" mi="{ln % 2}" ci="{ln % 3}" mb="{ln % 2 if ln % 10 == 0 else 0}" cb="{1 if ln % 10 == 0 else 0}"/>'
+            for ln in range(1, LINES_PER_FILE)
+        )
+        sourcefiles.append(f'<sourcefile name="File{i}.java">{lines}</sourcefile>')
+    return (
+        '<report name="project"><package name="com/example">'
+        + "".join(sourcefiles)
+        + "</package></report>"
+    ).encode()
+
+
+def make_node() -> dict:
+    def location(ln):
+        return {"start": {"line": ln, "column": 0}, "end": {"line": ln, "column": 10}}
+
+    report = {}
+    for i in range(NUM_FILES):
+        statements = range(1, LINES_PER_FILE)
+        branches = range(10, LINES_PER_FILE, 10)
+        report[f"src/file_{i}.js"] = {
+            "statementMap": {str(ln): location(ln) for ln in statements},
+            "s": {str(ln): ln % 3 for ln in statements},
+            "branchMap": {
+                str(ln): {"locations": [location(ln), location(ln)]} for ln in branches
+            },
+            "b": {str(ln): [1, ln % 2] for ln in branches},
+            "fnMap": {},
+        }
+    return report
+
+
+PROCESSORS = {
+    "lcov": (make_lcov, lcov.from_txt),
+    "go": (make_go, go.from_txt),
+    "cobertura": (lambda: etree.fromstring(make_cobertura()), cobertura.from_xml),
+    "jacoco": (lambda: etree.fromstring(make_jacoco()), jacoco.from_xml),
+    "node": (make_node, node.from_json),
+}
+
+
+@pytest.mark.parametrize("processor", PROCESSORS.keys())
+def test_language_processor(processor, benchmark):
+    make_content, process = PROCESSORS[processor]
+    content = make_content()
+
+    def bench_fn():
+        report_builder_session = create_report_builder_session()
+        process(content, report_builder_session)
+        assert len(report_builder_session.output_report().files) == NUM_FILES
+
+    benchmark(bench_fn)
+
+
+def test_go_coverprofile(benchmark):
+    content = make_go_coverpkg(1_000_000)
+
+    def bench_fn():
+        report_builder_session = create_report_builder_session()
+        go.from_txt(content, report_builder_session)
+        assert len(report_builder_session.output_report().files) == 100
+
+    benchmark(bench_fn)
@@ -0,0 +1,56 @@
+import pytest
+
+from services.report.parser.types import (
+    LegacyParsedRawReport,
+    ParsedUploadedReportFile,
+)
+from services.report.raw_upload_processor import process_raw_upload
+from shared.utils.sessions import Session
+from shared.yaml import UserYaml
+
+NUM_FILES = 100
+SOURCE_FILES_PER_REPORT = 20
+LINES_PER_SOURCE_FILE = 200
+
+
+def make_upload(num_files: int) -> LegacyParsedRawReport:
+    uploaded_files = []
+    for i in range(num_files):
+        sections = []
+        for j in range(SOURCE_FILES_PER_REPORT):
+            sections += [
+                "TN:",
+                f"SF:src/package_{j}/module_{(i + j) % num_files}.py",
+                *(
+                    f"DA:{line},{(line * i) % 4}"
+                    for line in range(1, LINES_PER_SOURCE_FILE)
+                ),
+                *(
+                    f"BRDA:{line},0,{branch},{(line + branch) % 2}"
+                    for line in range(10, LINES_PER_SOURCE_FILE, 10)
+                    for branch in range(2)
+                ),
+                "end_of_record",
+            ]
+        uploaded_files.append(
+            ParsedUploadedReportFile(
+                filename=f"coverage/report_{i}.lcov",
+                file_contents="\n".join(sections).encode(),
+            )
+        )
+    return LegacyParsedRawReport(
+        toc=None, env=None, report_fixes=None, uploaded_files=uploaded_files
+    )
+
+
+@pytest.mark.parametrize("workers", [0, 4], ids=["sequential", "parallel"])
+def test_process_raw_upload(workers, mock_configuration, benchmark):
+    mock_configuration._params["setup"]["upload_processing"] = {
+        "parallel_workers": workers
+    }
+    upload = make_upload(NUM_FILES)
+
+    def bench_fn():
+        process_raw_upload(UserYaml({}), upload, Session())
+
+    benchmark(bench_fn)
@@ -0,0 +1,24 @@
+from services.path_fixer import PathFixer
+
+NUM_PATHS = 100_000
+NUM_PATTERNS = 200
+
+
+def test_path_fixer_ignore(benchmark):
+    """
+    Cleans the paths of a large report against a YAML with lots of `ignore`
+    rules and flag `paths`.
+    """
+    paths = [
+        f"src/package_{i % 500}/module_{i % 37}/file_{i}.py" for i in range(NUM_PATHS)
+    ]
+    path_patterns = [f"!^src/package_{i}/module_3/.*" for i in range(NUM_PATTERNS // 2)]
+    path_patterns += [f"^src/package_{i}/.*" for i in range(NUM_PATTERNS // 2)]
+
+    def bench_fn():
+        path_fixer = PathFixer(
+            yaml_fixes=[], path_patterns=path_patterns, toc=[]
+        ).get_relative_path_aware_pathfixer(None)
+        return sum(path_fixer(path) is not None for path in paths)
+
+    assert benchmark(bench_fn) > 0
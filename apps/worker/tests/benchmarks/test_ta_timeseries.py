@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.test_analytics.ta_timeseries import insert_testrun
+
+NUM_TESTRUNS = 20_000
+
+
+def make_parsing_info(num_testruns: int) -> dict:
+    return {
+        "framework": "Pytest",
+        "testruns": [
+            {
+                "name": f"test_{i}",
+                "classname": f"tests.module_{i % 100}",
+                "computed_name": None,
+                "duration": 0.01,
+                "outcome": "failure" if i % 10 == 0 else "pass",
+                "testsuite": "pytest",
+                "failure_message": "assert 1 == 2" if i % 10 == 0 else None,
+                "filename": f"tests/module_{i % 100}.py",
+                "build_url": None,
+            }
+            for i in range(num_testruns)
+        ],
+    }
+
+
+@pytest.mark.django_db(databases=["ta_timeseries"])
+@pytest.mark.parametrize(
+    "use_copy",
+    [pytest.param(False, id="bulk_create"), pytest.param(True, id="copy")],
+)
+def test_insert_testrun(use_copy, benchmark):
+    parsing_info = make_parsing_info(NUM_TESTRUNS)
+    timestamp = datetime.now()
+    upload_ids = iter(range(1, 1_000_000))
+
+    def bench_fn():
+        upload_id = next(upload_ids)
+        insert_testrun(
+            timestamp=timestamp + timedelta(seconds=upload_id),
+            repo_id=1,
+            commit_sha="commit_sha",
+            branch="main",
+            upload_id=upload_id,
+            flags=["unit"],
+            parsing_info=parsing_info,
+            use_copy=use_copy,
+        )
+
+    benchmark(bench_fn)
@@ -0,0 +1,113 @@
+import json
+from datetime import datetime, timedelta
+from hashlib import sha1
+
+import pytest
+from sqlalchemy.dialects.postgresql import insert
+
+from database.models import Commit, MeasurementName
+from database.tests.factories import RepositoryFactory
+from services.report import legacy_totals
+from services.timeseries import upsert_commits_totals_measurements
+from shared.api_archive.archive import ArchiveService
+from shared.reports.reportfile import ReportFile
+from shared.reports.resources import Report
+from shared.reports.types import ReportLine
+from shared.utils.sessions import Session
+from tasks.save_commit_measurements import save_commit_measurements
+
+NUM_COMMITS = 10_000
+NUM_FILES = 20
+LINES_PER_FILE = 100
+FLAGS = ["unit", "integration", "e2e"]
+BATCH_SIZE = 500
+DATASET_NAMES = [MeasurementName.coverage.value, MeasurementName.flag_coverage.value]
+
+
+def make_report() -> Report:
+    report = Report()
+    for flag in FLAGS:
+        report.add_session(Session(flags=[flag]))
+    for i in range(NUM_FILES):
+        report_file = ReportFile(f"src/file_{i}.py")
+        for ln in range(1, LINES_PER_FILE):
+            sessions = [
+                [sessionid, (ln + sessionid) % 3]
+                for sessionid in range(len(FLAGS))
+                if (ln + i + sessionid) % 4
+            ]
+            report_file.append(ln, ReportLine.create(sessions[0][1], sessions=sessions))
+        report.append(report_file)
+    for session in report.sessions.values():
+        session.totals = report.filter(flags=session.flags).totals
+    return report
+
+
+@pytest.fixture
+def repository_commits(dbsession, mock_storage):
+    """
+    A repository with a year of history, of commits all having the same report.
+    """
+    repository = RepositoryFactory.create()
+    dbsession.add(repository)
+    dbsession.flush()
+
+    report = make_report()
+    report_json, chunks, _totals = report.serialize(with_totals=False)
+    report_json = json.loads(report_json)
+    totals = legacy_totals(report)
+
+    archive_service = ArchiveService(repository)
+    timestamp = datetime(2024, 1, 1)
+    rows = []
+    for i in range(NUM_COMMITS):
+        commitid = sha1(str(i).encode()).hexdigest()
+        archive_service.write_chunks(commitid, chunks)
+        rows.append(
+            {
+                "commitid": commitid,
+                "repoid": repository.repoid,
+                "branch": "main",
+                "state": "complete",
+                "timestamp": timestamp + timedelta(minutes=50 * i),
+                "totals": totals,
+                "report": report_json,
+            }
+        )
+    for start in range(0, NUM_COMMITS, BATCH_SIZE):
+        dbsession.execute(
+            insert(Commit.__table__).values(rows[start : start + BATCH_SIZE])
+        )
+    dbsession.flush()
+
+    return [
+        commit_id
+        for (commit_id,) in dbsession.query(Commit.id_).filter_by(
+            repoid=repository.repoid
+        )
+    ]
+
+
+def backfill_per_commit(dbsession, commit_ids):
+    for commit in dbsession.query(Commit).filter(Commit.id_.in_(commit_ids)):
+        save_commit_measurements(commit, DATASET_NAMES)
+
+
+def backfill_from_totals(dbsession, commit_ids):
+    commits = dbsession.query(Commit).filter(Commit.id_.in_(commit_ids)).all()
+    assert upsert_commits_totals_measurements(dbsession, commits, DATASET_NAMES) == []
+
+
+@pytest.mark.parametrize(
+    "backfill",
+    [
+        pytest.param(backfill_per_commit, id="per_commit"),
+        pytest.param(backfill_from_totals, id="totals"),
+    ],
+)
+def test_backfill_commits(dbsession, repository_commits, backfill, benchmark):
+    def bench_fn():
+        for start in range(0, NUM_COMMITS, BATCH_SIZE):
+            backfill(dbsession, repository_commits[start : start + BATCH_SIZE])
+
+    benchmark(bench_fn)
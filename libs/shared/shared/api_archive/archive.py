@@ -32,6 +32,9 @@ class MinioEndpoints(Enum):
         "{version}/repos/{repo_hash}/static_analysis/files/{location}"
     )
 
+    diff = "{version}/repos/{repo_hash}/diffs/{diff_id}/{context}.json"
+    diffs_folder = "{version}/repos/{repo_hash}/diffs/"
+
     def get_path(self, **kwaargs):
         return self.value.format(**kwaargs)
 
@@ -16,6 +16,7 @@ from shared.bundle_analysis.report import (
     BundleReport,
     ModuleReport,
 )
+from shared.bundle_analysis.sharded import ShardedBundleAnalysisReport
 from shared.bundle_analysis.storage import BundleAnalysisReportLoader, StoragePaths
 
 __all__ = [
@@ -32,6 +33,7 @@ __all__ = [
     "BundleAnalysisReport",
     "BundleReport",
     "ModuleReport",
+    "ShardedBundleAnalysisReport",
     "BundleAnalysisReportLoader",
     "StoragePaths",
     "RouteChange",
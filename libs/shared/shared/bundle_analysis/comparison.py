@@ -91,9 +91,11 @@ class AssetComparison:
         self,
         base_asset_report: AssetReport | None = None,
         head_asset_report: AssetReport | None = None,
+        head_bundle_report: BundleReport | None = None,
     ):
         self.base_asset_report = base_asset_report
         self.head_asset_report = head_asset_report
+        self.head_bundle_report = head_bundle_report
 
     @sentry_sdk.trace
     def asset_change(self) -> AssetChange:
@@ -140,7 +142,10 @@ class AssetComparison:
         asset_report = self.head_asset_report
         if asset_report is None:
             return []
-        return asset_report.modules(pr_changed_files)
+        module_index = None
+        if pr_changed_files is not None and self.head_bundle_report is not None:
+            module_index = self.head_bundle_report.module_index
+        return asset_report.modules(pr_changed_files, module_index)
 
 
 class BundleComparison:
@@ -181,7 +186,9 @@ class BundleComparison:
                 matches += self._match_assets(asset_reports, [])
 
         return [
-            AssetComparison(base_asset_report, head_asset_report)
+            AssetComparison(
+                base_asset_report, head_asset_report, self.head_bundle_report
+            )
             for base_asset_report, head_asset_report in matches
         ]
 
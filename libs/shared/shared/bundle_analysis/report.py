@@ -5,6 +5,7 @@ import sqlite3
 import tempfile
 from collections import defaultdict, deque
 from collections.abc import Iterator
+from functools import cached_property
 from typing import Any
 
 import sentry_sdk
@@ -55,6 +56,89 @@ class ModuleReport:
         return self.module.size
 
 
+class ModulePathIndex:
+    """
+    Index over module names used to find the modules touched by a PR's changed files.
+
+    The module names we store are relative to the root of the app while the PR's
+    file paths are relative to the root of the repo, so a module matches a changed
+    file when its path components are a suffix of the file's path components.
+    For example,
+        PR changed files: ["abc/def.ts", "ghi/jkl.ts"],
+        modules: ["def.ts", "mno.ts"]
+        -> ["def.ts"]
+
+    Similar to the worker's `helpers.pathmap.Tree`, module names are stored as a
+    tree of their path components in reverse order, so matching a changed file
+    only walks that file's own components instead of every module.
+    Match results are memoized per list of changed files, so an index shared by
+    all assets of a bundle resolves a PR's changed files only once.
+    """
+
+    def __init__(self) -> None:
+        self.root = _ModulePathNode()
+        self._size = 0
+        self._matches: dict[tuple[str, ...], dict[int, list[Module]]] = {}
+
+    @staticmethod
+    def _components(path: str) -> list[str]:
+        path = os.path.normpath(path[2:] if path.startswith("./") else path)
+        return [
+            component for component in path.split("/") if component not in ("", ".")
+        ]
+
+    def insert(self, asset_id: int, module: Module) -> None:
+        components = self._components(module.name)
+        if not components:
+            return
+
+        node = self.root
+        for component in reversed(components):
+            node = node.children.setdefault(component, _ModulePathNode())
+        node.modules.append((self._size, asset_id, module))
+        self._size += 1
+        self._matches.clear()
+
+    def match(self, pr_changed_files: list[str]) -> dict[int, list[Module]]:
+        """
+        Returns the modules matching any of the given files, grouped by asset id
+        and in insertion order.
+        """
+        key = tuple(pr_changed_files)
+        if key in self._matches:
+            return self._matches[key]
+
+        found: dict[int, tuple[int, int, Module]] = {}
+        for path in pr_changed_files:
+            node = self.root
+            for component in reversed(self._components(path)):
+                node = node.children.get(component)
+                if node is None:
+                    break
+                for entry in node.modules:
+                    found[entry[0]] = entry
+
+        matches: dict[int, list[Module]] = defaultdict(list)
+        seen = set()
+        for _, asset_id, module in sorted(found.values(), key=lambda e: e[0]):
+            if (asset_id, module.id) not in seen:
+                seen.add((asset_id, module.id))
+                matches[asset_id].append(module)
+
+        self._matches[key] = dict(matches)
+        return self._matches[key]
+
+
+class _ModulePathNode:
+    __slots__ = ("children", "modules")
+
+    def __init__(self) -> None:
+        # child nodes, keyed by path component
+        self.children: dict[str, _ModulePathNode] = {}
+        # (insertion order, asset id, module) of the module names terminating here
+        self.modules: list[tuple[int, int, Module]] = []
+
+
 class AssetReport:
     """
     Report wrapper around a single asset (many of which can exist in a single bundle).
@@ -93,7 +177,18 @@ class AssetReport:
     def asset_type(self) -> AssetType:
         return self.asset.asset_type
 
-    def modules(self, pr_changed_files: list[str] | None = None) -> list[ModuleReport]:
+    def modules(
+        self,
+        pr_changed_files: list[str] | None = None,
+        module_index: ModulePathIndex | None = None,
+    ) -> list[ModuleReport]:
+        """
+        Returns the modules of this asset, optionally only those whose name matches
+        one of the PR's changed files.
+
+        A `module_index` covering this asset (see `BundleReport.module_index`) can
+        be passed in so that it is shared between all the assets of a bundle.
+        """
         with get_db_session(self.db_path) as session:
             query = (
                 session.query(Module)
@@ -105,30 +200,17 @@ class AssetReport:
             if pr_changed_files is None:
                 return [ModuleReport(self.db_path, module) for module in query]
 
-            """
-            Apply filter on modules where the module name has to be part of the PR's changed file list.
-            However we can't simply do a simple equality match because the module names we store is relative
-            to the root of the app while the PR's file path is relative to the root of the repo. So we will
-            need to check that any of the PR's file lists ends with any of the modules for the given asset.
-            For example,
-                PR changed files: ["abc/def.ts", "ghi/jkl.ts"],
-                modules: ["def.ts", "mno.ts"]
-                -> ["def.ts"]
-            """
-            normalized_changed_files = [
-                os.path.normpath(path[2:] if path.startswith("./") else path)
-                for path in pr_changed_files
-            ]
-            filtered_modules = set()
-            for file in normalized_changed_files:
+            if module_index is None:
+                module_index = ModulePathIndex()
                 for module in query:
-                    normalized_module = os.path.normpath(
-                        module.name[1:] if file.startswith(".") else module.name
-                    )
-                    if file.endswith(normalized_module):
-                        filtered_modules.add(module)
+                    module_index.insert(self.asset.id, module)
 
-            return [ModuleReport(self.db_path, module) for module in filtered_modules]
+            return [
+                ModuleReport(self.db_path, module)
+                for module in module_index.match(pr_changed_files).get(
+                    self.asset.id, []
+                )
+            ]
 
     def routes(self) -> list[str] | None:
         plugin_name = self.bundle_info.get("plugin_name")
@@ -227,6 +309,27 @@ class BundleReport:
             query = query.filter(Asset.asset_type.in_(asset_types))
         return query
 
+    @cached_property
+    def module_index(self) -> ModulePathIndex:
+        """
+        Index over the modules of all assets in this bundle, built with a single
+        query and shared by every asset comparison of the bundle.
+        """
+        with get_db_session(self.db_path) as session:
+            rows = (
+                session.query(Asset.id, Module)
+                .select_from(Module)
+                .join(Module.chunks)
+                .join(Chunk.assets)
+                .join(Asset.session)
+                .join(Session.bundle)
+                .filter(Bundle.id == self.bundle.id)
+            )
+            module_index = ModulePathIndex()
+            for asset_id, module in rows:
+                module_index.insert(asset_id, module)
+            return module_index
+
     @sentry_sdk.trace
     def asset_report_by_name(self, name: str) -> AssetReport | None:
         with get_db_session(self.db_path) as session:
@@ -260,6 +363,25 @@ class BundleReport:
                 AssetReport(self.db_path, asset, self.info()) for asset in assets.all()
             )
 
+    @sentry_sdk.trace
+    def asset_sizes(self) -> dict[AssetType, dict[str, int]]:
+        """
+        Returns the sizes of all the assets of this bundle by asset type and by
+        asset UUID, from a single query and without building `AssetReport`s.
+        """
+        with get_db_session(self.db_path) as session:
+            rows = (
+                session.query(Asset.asset_type, Asset.uuid, func.sum(Asset.size))
+                .join(Asset.session)
+                .join(Session.bundle)
+                .filter(Bundle.id == self.bundle.id)
+                .group_by(Asset.asset_type, Asset.uuid)
+            )
+            sizes: dict[AssetType, dict[str, int]] = defaultdict(dict)
+            for asset_type, uuid, size in rows:
+                sizes[asset_type][uuid] = size
+            return dict(sizes)
+
     def total_size(
         self,
         asset_types: list[AssetType] | None = None,
@@ -545,23 +667,29 @@ class BundleAnalysisReport:
         for curr_bundle_report in self.bundle_reports():
             for prev_bundle_report in prev_bundle_reports:
                 if curr_bundle_report.name == prev_bundle_report.name:
-                    # Rule 1 check
-                    associated_assets_found |= (
-                        self._associate_bundle_report_assets_by_name(
-                            curr_bundle_report, prev_bundle_report
-                        )
+                    associated_assets_found |= self._associated_assets(
+                        curr_bundle_report, prev_bundle_report
                     )
 
-                    # Rule 2 check
-                    associated_assets_found |= (
-                        self._associate_bundle_report_assets_by_module_names(
-                            curr_bundle_report, prev_bundle_report
-                        )
-                    )
+        self._update_asset_uuids(associated_assets_found)
 
+    def _associated_assets(
+        self, curr_bundle_report: BundleReport, prev_bundle_report: BundleReport
+    ) -> set[tuple[str, str]]:
+        # Rule 1 check
+        associated_assets_found = self._associate_bundle_report_assets_by_name(
+            curr_bundle_report, prev_bundle_report
+        )
+        # Rule 2 check
+        associated_assets_found |= self._associate_bundle_report_assets_by_module_names(
+            curr_bundle_report, prev_bundle_report
+        )
+        return associated_assets_found
+
+    def _update_asset_uuids(self, associated_assets: set[tuple[str, str]]) -> None:
         with get_db_session(self.db_path) as session:
             # Update the Assets table for the bundle correct uuid
-            for pair in associated_assets_found:
+            for pair in associated_assets:
                 prev_uuid, curr_uuid = pair
                 session.query(Asset).filter(Asset.uuid == curr_uuid).update(
                     {Asset.uuid: prev_uuid}
@@ -573,6 +701,10 @@ class BundleAnalysisReport:
             metadata = session.query(Metadata).all()
             return {MetadataKey(item.key): item.value for item in metadata}
 
+    def bundle_names(self) -> list[str]:
+        with get_db_session(self.db_path) as session:
+            return [name for (name,) in session.query(Bundle.name)]
+
     def bundle_reports(self) -> Iterator[BundleReport]:
         with get_db_session(self.db_path) as session:
             bundles = session.query(Bundle).all()
@@ -0,0 +1,242 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import ijson
+import sentry_sdk
+
+from shared.bundle_analysis.models import MetadataKey
+from shared.bundle_analysis.report import BundleAnalysisReport, BundleReport
+
+MANIFEST_VERSION = 1
+
+
+def shard_key(bundle_name: str) -> str:
+    """
+    The key of the shard of a bundle, bundle names can contain characters
+    which aren't safe to use in storage paths.
+    """
+    return hashlib.sha1(bundle_name.encode()).hexdigest()
+
+
+def local_shards_dir(db_path: str) -> str:
+    """
+    The directory the shards of the sharded report at `db_path` are downloaded to.
+    """
+    return f"{db_path}_shards"
+
+
+def _peek_bundle_name(path: str) -> str | None:
+    with open(path, "rb") as f:
+        for prefix, _, value in ijson.parse(f):
+            if prefix == "bundleName":
+                return value
+    return None
+
+
+def _compact_shard(path: str) -> None:
+    """
+    Drops the rows that deleted bundles left behind in the join tables, and
+    reclaims the space of all the deleted rows, as SQLite databases don't
+    shrink when rows are deleted.
+    """
+    con = sqlite3.connect(path)
+    try:
+        con.executescript(
+            """
+            delete from assets_chunks where asset_id not in (select id from assets);
+            delete from chunks_modules where chunk_id not in (select id from chunks);
+            delete from dynamic_imports where chunk_id not in (select id from chunks);
+            vacuum;
+            """
+        )
+    finally:
+        con.close()
+
+
+class ShardedBundleAnalysisReport(BundleAnalysisReport):
+    """
+    Bundle analysis report stored as one SQLite database per bundle (a "shard"),
+    plus a small manifest listing the bundles with their shard, `is_cached` flag,
+    and the report metadata.
+
+    Shards are only downloaded when one of their bundles is accessed, and
+    ingesting an upload only touches the shard of the uploaded bundle, so that
+    processing an upload doesn't require loading and saving all the other bundles
+    of the commit.
+
+    `db_path` is an empty report database which the shards are stored next to.
+    """
+
+    def __init__(
+        self,
+        manifest: dict[str, Any] | None = None,
+        load_shard: Callable[[str, str], None] | None = None,
+        report_key: str | None = None,
+    ):
+        super().__init__()
+        self.manifest = manifest or {
+            "version": MANIFEST_VERSION,
+            "bundles": {},
+            "metadata": {},
+        }
+        # downloads the shard with the given key to the given local path
+        self._load_shard = load_shard
+        # the key of the report in storage this report was loaded from
+        self.report_key = report_key
+
+        self._shards: dict[str, BundleAnalysisReport] = {}
+        # bundles modified since the report was loaded, and shards to delete
+        self.changed_bundles: set[str] = set()
+        self.deleted_shards: set[str] = set()
+
+    @classmethod
+    @sentry_sdk.trace
+    def from_report(cls, report: BundleAnalysisReport) -> "ShardedBundleAnalysisReport":
+        """
+        Splits a single file `BundleAnalysisReport` into shards.
+        """
+        sharded_report = cls()
+        sharded_report.manifest["metadata"] = {
+            key.value: value
+            for key, value in report.metadata().items()
+            if key != MetadataKey.SCHEMA_VERSION
+        }
+        bundle_names = report.bundle_names()
+        for bundle_name in bundle_names:
+            path = sharded_report._shard_path(bundle_name)
+            shutil.copyfile(report.db_path, path)
+            shard = BundleAnalysisReport(path)
+            for other_bundle_name in bundle_names:
+                if other_bundle_name != bundle_name:
+                    shard.delete_bundle_by_name(other_bundle_name)
+            _compact_shard(path)
+
+            sharded_report._shards[bundle_name] = shard
+            sharded_report.manifest["bundles"][bundle_name] = {
+                "shard": shard_key(bundle_name),
+                "is_cached": shard.is_cached(),
+            }
+            sharded_report.changed_bundles.add(bundle_name)
+        return sharded_report
+
+    def _shard_path(self, bundle_name: str) -> str:
+        shards_dir = local_shards_dir(self.db_path)
+        os.makedirs(shards_dir, exist_ok=True)
+        return os.path.join(shards_dir, f"{shard_key(bundle_name)}.sqlite")
+
+    def get_shard(
+        self, bundle_name: str, create: bool = False
+    ) -> BundleAnalysisReport | None:
+        """
+        Returns the shard of the given bundle, downloading it if needed.
+        """
+        if bundle_name in self._shards:
+            return self._shards[bundle_name]
+
+        entry = self.manifest["bundles"].get(bundle_name)
+        if entry is None and not create:
+            return None
+
+        path = self._shard_path(bundle_name)
+        if entry is not None:
+            self._load_shard(entry["shard"], path)
+        shard = BundleAnalysisReport(path)
+        self._shards[bundle_name] = shard
+        return shard
+
+    def cleanup(self):
+        super().cleanup()
+        shutil.rmtree(local_shards_dir(self.db_path), ignore_errors=True)
+        self._shards.clear()
+
+    @sentry_sdk.trace
+    def ingest(self, path: str, compare_sha: str | None = None) -> tuple[int, str]:
+        """
+        Ingest the bundle stats JSON at the given file path into the shard of its bundle.
+        Returns session ID of ingested data.
+        """
+        shard = self.get_shard(_peek_bundle_name(path) or "", create=True)
+        session_id, bundle_name = shard.ingest(path, compare_sha)
+
+        self.manifest["bundles"][bundle_name] = {
+            "shard": shard_key(bundle_name),
+            "is_cached": False,
+        }
+        self.deleted_shards.discard(shard_key(bundle_name))
+        if compare_sha:
+            self.manifest["metadata"][MetadataKey.COMPARE_SHA.value] = compare_sha
+        self.changed_bundles.add(bundle_name)
+        return session_id, bundle_name
+
+    @sentry_sdk.trace
+    def associate_previous_assets(
+        self, prev_bundle_analysis_report: BundleAnalysisReport
+    ) -> None:
+        """
+        Same as `BundleAnalysisReport.associate_previous_assets`, for the bundles
+        changed since this report was loaded. The assets of the other bundles
+        were associated when they were ingested.
+        """
+        for bundle_name in self.changed_bundles:
+            curr_bundle_report = self.bundle_report(bundle_name)
+            prev_bundle_report = prev_bundle_analysis_report.bundle_report(bundle_name)
+            if curr_bundle_report is None or prev_bundle_report is None:
+                continue
+            self._shards[bundle_name]._update_asset_uuids(
+                self._associated_assets(curr_bundle_report, prev_bundle_report)
+            )
+
+    def metadata(self) -> dict[MetadataKey, Any]:
+        metadata = super().metadata()
+        for key, value in self.manifest["metadata"].items():
+            metadata[MetadataKey(key)] = value
+        return metadata
+
+    def bundle_names(self) -> list[str]:
+        return list(self.manifest["bundles"])
+
+    def bundle_reports(self) -> Iterator[BundleReport]:
+        for bundle_name in self.bundle_names():
+            bundle_report = self.bundle_report(bundle_name)
+            if bundle_report is not None:
+                yield bundle_report
+
+    def bundle_report(self, bundle_name: str) -> BundleReport | None:
+        shard = self.get_shard(bundle_name)
+        if shard is None:
+            return None
+        return shard.bundle_report(bundle_name)
+
+    def session_count(self) -> int:
+        return sum(
+            self.get_shard(bundle_name).session_count()
+            for bundle_name in self.bundle_names()
+        )
+
+    def update_is_cached(self, data: dict[str, bool]) -> None:
+        for bundle_name, value in data.items():
+            shard = self.get_shard(bundle_name)
+            if shard is None:
+                continue
+            shard.update_is_cached({bundle_name: value})
+            self.manifest["bundles"][bundle_name]["is_cached"] = value
+            self.changed_bundles.add(bundle_name)
+
+    def is_cached(self) -> bool:
+        return any(entry["is_cached"] for entry in self.manifest["bundles"].values())
+
+    @sentry_sdk.trace
+    def delete_bundle_by_name(self, bundle_name: str) -> None:
+        entry = self.manifest["bundles"].pop(bundle_name, None)
+        if entry is None:
+            return
+
+        shard = self._shards.pop(bundle_name, None)
+        if shard is not None:
+            shard.cleanup()
+        self.changed_bundles.discard(bundle_name)
+        self.deleted_shards.add(entry["shard"])
@@ -1,4 +1,6 @@
+import json
 import logging
+import os
 import tempfile
 from enum import Enum
 
@@ -6,6 +8,7 @@ import sentry_sdk
 
 from shared.api_archive.archive import ArchiveService
 from shared.bundle_analysis.report import BundleAnalysisReport
+from shared.bundle_analysis.sharded import ShardedBundleAnalysisReport
 from shared.config import get_config
 from shared.storage.exceptions import FileNotInStorageError, PutRequestRateLimitError
 
@@ -18,6 +21,8 @@ def get_bucket_name() -> str:
 
 class StoragePaths(Enum):
     bundle_report = "v1/repos/{repo_key}/{report_key}/bundle_report.sqlite"
+    bundle_report_manifest = "v1/repos/{repo_key}/{report_key}/bundles/manifest.json"
+    bundle_report_shard = "v1/repos/{repo_key}/{report_key}/bundles/{shard_key}.sqlite"
     upload = "v1/uploads/{upload_key}.json"
 
     def path(self, **kwargs):
@@ -29,6 +34,9 @@ class BundleAnalysisReportLoader:
     Loads and saves `BundleAnalysisReport`s into the underlying storage service.
     Requires a `repo_key` that uniquely and permanently (i.e. maybe not the name/slug)
     that identifies a repo in the storage layer.
+
+    Reports are either stored as a single SQLite file, or as a manifest and one
+    SQLite file per bundle (see `ShardedBundleAnalysisReport`).
     """
 
     def __init__(self, repository):
@@ -49,24 +57,91 @@ class BundleAnalysisReportLoader:
         )
         _, db_path = tempfile.mkstemp(prefix="bundle_analysis_")
 
-        with open(db_path, "w+b") as f:
-            try:
+        try:
+            with open(db_path, "w+b") as f:
                 self.storage_service.read_file(self.bucket_name, path, file_obj=f)
-            except FileNotInStorageError:
-                return None
+        except FileNotInStorageError:
+            os.remove(db_path)
+            return self._load_sharded(report_key)
         return BundleAnalysisReport(db_path)
 
+    def _load_sharded(self, report_key: str) -> ShardedBundleAnalysisReport | None:
+        manifest_path = StoragePaths.bundle_report_manifest.path(
+            repo_key=self.repo_key, report_key=report_key
+        )
+        try:
+            manifest = json.loads(
+                self.storage_service.read_file(self.bucket_name, manifest_path)
+            )
+        except FileNotInStorageError:
+            return None
+
+        def load_shard(shard_key: str, local_path: str):
+            shard_path = StoragePaths.bundle_report_shard.path(
+                repo_key=self.repo_key, report_key=report_key, shard_key=shard_key
+            )
+            with open(local_path, "w+b") as f:
+                self.storage_service.read_file(self.bucket_name, shard_path, file_obj=f)
+
+        return ShardedBundleAnalysisReport(manifest, load_shard, report_key)
+
     @sentry_sdk.trace
     def save(self, report: BundleAnalysisReport, report_key: str):
         """
         Saves a `BundleAnalysisReport` for the given report key into storage.
+
+        Only the shards of the bundles changed since a `ShardedBundleAnalysisReport`
+        was loaded are written back, unless it is saved under another report key.
         """
+        if isinstance(report, ShardedBundleAnalysisReport):
+            self._save_sharded(report, report_key)
+            return
+
         storage_path = StoragePaths.bundle_report.path(
             repo_key=self.repo_key, report_key=report_key
         )
+        with open(report.db_path, "rb") as f:
+            self._write_file(storage_path, f)
+
+    def _save_sharded(self, report: ShardedBundleAnalysisReport, report_key: str):
+        if report.report_key == report_key:
+            bundle_names = report.changed_bundles
+            deleted_shards = report.deleted_shards
+        else:
+            bundle_names = report.bundle_names()
+            deleted_shards = set()
+
+        for bundle_name in bundle_names:
+            shard_path = StoragePaths.bundle_report_shard.path(
+                repo_key=self.repo_key,
+                report_key=report_key,
+                shard_key=report.manifest["bundles"][bundle_name]["shard"],
+            )
+            with open(report.get_shard(bundle_name).db_path, "rb") as f:
+                self._write_file(shard_path, f)
+
+        # the manifest is written last, so that it never lists missing shards
+        manifest_path = StoragePaths.bundle_report_manifest.path(
+            repo_key=self.repo_key, report_key=report_key
+        )
+        self._write_file(manifest_path, json.dumps(report.manifest))
+
+        for shard_key in deleted_shards:
+            shard_path = StoragePaths.bundle_report_shard.path(
+                repo_key=self.repo_key, report_key=report_key, shard_key=shard_key
+            )
+            try:
+                self.storage_service.delete_file(self.bucket_name, shard_path)
+            except FileNotInStorageError:
+                pass
+
+        report.report_key = report_key
+        report.changed_bundles = set()
+        report.deleted_shards = set()
+
+    def _write_file(self, storage_path: str, data):
         try:
-            with open(report.db_path, "rb") as f:
-                self.storage_service.write_file(self.bucket_name, storage_path, f)
+            self.storage_service.write_file(self.bucket_name, storage_path, data)
         except Exception as e:
             log.info(f"Bundle analysis GCS save file error: {e}")
             if "TooManyRequests" in str(e):
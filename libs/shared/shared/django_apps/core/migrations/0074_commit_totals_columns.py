@@ -0,0 +1,59 @@
+# Generated by Django 4.2.21 on 2026-10-19 06:25
+
+from django.db import migrations, models
+
+from shared.django_apps.migration_utils import RiskyAddField
+
+
+class Migration(migrations.Migration):
+    """
+    ALTER TABLE commits ADD COLUMN totals_coverage DOUBLE PRECISION NULL;
+    ALTER TABLE commits ADD COLUMN totals_hits INTEGER NULL;
+    ALTER TABLE commits ADD COLUMN totals_misses INTEGER NULL;
+    ALTER TABLE commits ADD COLUMN totals_partials INTEGER NULL;
+    ALTER TABLE commits ADD COLUMN totals_lines INTEGER NULL;
+    ALTER TABLE commits ADD COLUMN totals_complexity DOUBLE PRECISION NULL;
+    ALTER TABLE commits ADD COLUMN totals_complexity_total DOUBLE PRECISION NULL;
+    """
+
+    dependencies = [
+        ("core", "0073_increment_version"),
+    ]
+
+    operations = [
+        RiskyAddField(
+            model_name="commit",
+            name="totals_coverage",
+            field=models.FloatField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_hits",
+            field=models.IntegerField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_misses",
+            field=models.IntegerField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_partials",
+            field=models.IntegerField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_lines",
+            field=models.IntegerField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_complexity",
+            field=models.FloatField(null=True),
+        ),
+        RiskyAddField(
+            model_name="commit",
+            name="totals_complexity_total",
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.21 on 2026-10-19 06:25
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0074_commit_totals_columns"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="commit",
+            index=models.Index(
+                condition=models.Q(("state", "complete")),
+                fields=["repository", "branch", "-timestamp"],
+                include=(
+                    "totals_coverage",
+                    "totals_hits",
+                    "totals_misses",
+                    "totals_partials",
+                    "totals_lines",
+                    "totals_complexity",
+                    "totals_complexity_total",
+                ),
+                name="commits_complete_totals",
+            ),
+        ),
+    ]
@@ -20,6 +20,7 @@ from shared.django_apps.core.managers import RepositoryManager
 from shared.django_apps.utils.config import should_write_data_to_storage_config_check
 from shared.django_apps.utils.model_utils import ArchiveField
 from shared.reports.resources import Report
+from shared.utils.totals import commit_totals_columns
 
 # Added to avoid 'doesn't declare an explicit app_label and isn't in an application in INSTALLED_APPS' error\
 # Needs to be called the same as the API app
@@ -244,8 +245,23 @@ class Commit(ExportModelOperationsMixin("core.commit"), models.Model):
         null=True, choices=CommitStates.choices
     )  # Really an ENUM in db
 
+    # Typed copies of values in `totals`, which the charts aggregate over
+    totals_coverage = models.FloatField(null=True)
+    totals_hits = models.IntegerField(null=True)
+    totals_misses = models.IntegerField(null=True)
+    totals_partials = models.IntegerField(null=True)
+    totals_lines = models.IntegerField(null=True)
+    totals_complexity = models.FloatField(null=True)
+    totals_complexity_total = models.FloatField(null=True)
+
     def save(self, *args, **kwargs):
         self.updatestamp = timezone.now()
+        columns = commit_totals_columns(self.totals)
+        for name, value in columns.items():
+            setattr(self, name, value)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "totals" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *columns}
         super().save(*args, **kwargs)
 
     @cached_property
@@ -298,6 +314,21 @@ class Commit(ExportModelOperationsMixin("core.commit"), models.Model):
                 fields=["repository", "branch", "state", "-timestamp"],
                 name="commits_repoid_branch_state_ts",
             ),
+            # allows charts to be computed from the index alone
+            models.Index(
+                fields=["repository", "branch", "-timestamp"],
+                include=[
+                    "totals_coverage",
+                    "totals_hits",
+                    "totals_misses",
+                    "totals_partials",
+                    "totals_lines",
+                    "totals_complexity",
+                    "totals_complexity_total",
+                ],
+                condition=models.Q(state="complete"),
+                name="commits_complete_totals",
+            ),
             models.Index(
                 fields=["repository", "pullid"],
                 name="commits_on_pull",
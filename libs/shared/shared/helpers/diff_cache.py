@@ -0,0 +1,151 @@
+import logging
+from collections.abc import Callable
+from contextlib import suppress
+
+import orjson
+from redis import Redis, RedisError
+from redis.exceptions import LockError
+
+from shared.api_archive.archive import ArchiveService, MinioEndpoints
+from shared.metrics import Counter, inc_counter
+from shared.storage.exceptions import FileNotInStorageError
+
+log = logging.getLogger(__name__)
+
+DIFF_CACHE_PROVIDER_CALLS = Counter(
+    "diff_cache_provider_calls",
+    "Number of diffs that had to be fetched from the git provider",
+    ["context"],
+)
+DIFF_CACHE_PROVIDER_CALLS_SAVED = Counter(
+    "diff_cache_provider_calls_saved",
+    "Number of diffs that were served by the diff cache instead of the git provider",
+    ["context"],
+)
+
+# how long the index remembers a stored diff, the diffs stay in storage until
+# the repository is cleaned up
+INDEX_TTL = 60 * 60 * 24 * 30
+
+# the contexts of the cached diffs, shared by the worker and the API
+COMMIT_DIFF = "commit"
+# the comparison of two commits, with its commits
+COMPARE_DIFF = "compare_with_commits"
+# how long to wait for another task fetching the same diff
+LOCK_TIMEOUT = 60
+LOCK_BLOCKING_TIMEOUT = 30
+
+
+class DiffCache:
+    """
+    A durable cache of the diffs fetched from the git providers.
+
+    The diff between two commits never changes, so the diffs are stored in the archive
+    (compressed by the storage service), keyed by `(repo, base_sha, head_sha, context)`.
+    A Redis index in front of the archive tells which diffs are stored, so that a miss
+    doesn't cost a storage request, and a Redis lock makes sure that concurrent tasks
+    only fetch a missing diff once.
+
+    Like `shared.helpers.cache`, the cache is transparent until it is configured
+    with a Redis connection, which the worker and the API do at startup.
+    """
+
+    def __init__(self):
+        self._redis: Redis | None = None
+
+    def configure(self, redis_connection: Redis | None):
+        self._redis = redis_connection
+
+    def get_or_fetch(
+        self,
+        repository,
+        base_sha: str | None,
+        head_sha: str,
+        context: str,
+        fetch: Callable[[], dict],
+    ) -> dict:
+        """
+        Returns the cached diff, or the diff returned by `fetch` which is then cached.
+
+        `context` tells apart the different kinds of diffs between the same commits,
+        e.g. `COMMIT_DIFF` or `COMPARE_DIFF`, the payload of a context has to be
+        the same wherever it is fetched.
+        Errors raised by `fetch` are not cached.
+        """
+        if self._redis is None:
+            return fetch()
+
+        key = f"diff_cache:{repository.repoid}:{base_sha or ''}:{head_sha}:{context}"
+        archive_service = ArchiveService(repository)
+        diff = self._read(archive_service, key)
+        if diff is not None:
+            inc_counter(DIFF_CACHE_PROVIDER_CALLS_SAVED, labels={"context": context})
+            return diff
+
+        lock = self._redis.lock(
+            f"{key}:lock", timeout=LOCK_TIMEOUT, blocking_timeout=LOCK_BLOCKING_TIMEOUT
+        )
+        try:
+            acquired = lock.acquire()
+        except RedisError:
+            acquired = False
+
+        try:
+            if acquired:
+                # another task may have fetched the diff while we were waiting
+                diff = self._read(archive_service, key)
+                if diff is not None:
+                    inc_counter(
+                        DIFF_CACHE_PROVIDER_CALLS_SAVED, labels={"context": context}
+                    )
+                    return diff
+
+            diff = fetch()
+            inc_counter(DIFF_CACHE_PROVIDER_CALLS, labels={"context": context})
+            self._write(archive_service, key, base_sha, head_sha, context, diff)
+            return diff
+        finally:
+            if acquired:
+                with suppress(LockError, RedisError):
+                    lock.release()
+
+    def _read(self, archive_service: ArchiveService, key: str) -> dict | None:
+        try:
+            path = self._redis.get(key)
+        except RedisError:
+            log.warning("Unable to read the diff cache index", exc_info=True)
+            return None
+        if path is None:
+            return None
+
+        try:
+            return orjson.loads(archive_service.read_file(path.decode()))
+        except FileNotInStorageError:
+            return None
+        except Exception:
+            log.warning("Unable to read a cached diff", exc_info=True)
+            return None
+
+    def _write(
+        self,
+        archive_service: ArchiveService,
+        key: str,
+        base_sha: str | None,
+        head_sha: str,
+        context: str,
+        diff: dict,
+    ):
+        path = MinioEndpoints.diff.get_path(
+            version="v4",
+            repo_hash=archive_service.storage_hash,
+            diff_id=f"{base_sha}...{head_sha}" if base_sha else head_sha,
+            context=context,
+        )
+        try:
+            archive_service.write_file(path, orjson.dumps(diff))
+            self._redis.set(key, path, ex=INDEX_TTL)
+        except Exception:
+            log.warning("Unable to cache a diff", exc_info=True)
+
+
+diff_cache = DiffCache()
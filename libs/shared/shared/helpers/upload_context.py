@@ -0,0 +1,31 @@
+import hashlib
+import logging
+from uuid import UUID
+
+from redis import Redis, RedisError
+
+log = logging.getLogger(__name__)
+
+# The keys of the upload context cache of the API, which the worker has to
+# invalidate when it changes repositories without going through model signals.
+
+
+def repository_key(repoid: int) -> str:
+    return f"upload_context:repository:{repoid}"
+
+
+def upload_token_key(upload_token: str | UUID) -> str:
+    # the tokens themselves are never written to Redis
+    token_hash = hashlib.sha256(str(upload_token).encode()).hexdigest()
+    return f"upload_context:token:{token_hash}"
+
+
+def invalidate_repository(
+    redis_connection: Redis, repoid: int, *upload_tokens: str | UUID | None
+):
+    keys = [repository_key(repoid)]
+    keys.extend(upload_token_key(token) for token in upload_tokens if token)
+    try:
+        redis_connection.delete(*keys)
+    except RedisError:
+        log.warning("Unable to invalidate the upload context cache", exc_info=True)
@@ -41,9 +41,11 @@ class ReadOnlyReport(ReportMixin, SharedReadOnlyReport):
 
 
 @sentry_sdk.trace
-def build_report_from_commit(commit: Commit, report_class=None):
+def build_report_from_commit(commit: Commit, report_class=None, chunks=None):
     """
     Builds a `shared.reports.resources.Report` from a given commit.
+
+    The `chunks` are read from storage unless they were already read by the caller.
     """
 
     if not commit.report:
@@ -53,14 +55,15 @@ def build_report_from_commit(commit: Commit, report_class=None):
     sessions = commit.report["sessions"]
     totals = commit.totals
 
-    try:
-        chunks = ArchiveService(commit.repository).read_chunks(commit.commitid)
-    except FileNotInStorageError:
-        log.warning(
-            "File for chunks not found in storage",
-            extra={"commit": commit.commitid, "repo": commit.repository_id},
-        )
-        return None
+    if chunks is None:
+        try:
+            chunks = ArchiveService(commit.repository).read_chunks(commit.commitid)
+        except FileNotInStorageError:
+            log.warning(
+                "File for chunks not found in storage",
+                extra={"commit": commit.commitid, "repo": commit.repository_id},
+            )
+            return None
 
     if report_class is None:
         report_class = SerializableReport
@@ -1,4 +1,5 @@
 import dataclasses
+import re
 from collections.abc import Generator
 from typing import Literal, Protocol, TypedDict
 
@@ -14,10 +15,49 @@ class DiffSegment(TypedDict):
     """The segment header, which is `old_line`, `old_length`, `new_line`, `new_length`."""
 
 
+DiffRun = tuple[Literal["+", "-", " "], int]
+"""A run of consecutive added ("+"), removed ("-") or context (" ") lines, and its length."""
+
+
+class CompactDiffSegment:
+    """
+    A diff segment which stores its lines as `DiffRun`s, and only keeps
+    the text of the lines if that was asked for when parsing the diff.
+
+    It can be used in place of a `DiffSegment`: `segment["lines"]` recreates the lines,
+    which only consist of the "+", "-" or " " prefix if the text was dropped.
+    """
+
+    __slots__ = ("header", "runs", "text")
+
+    def __init__(
+        self, header: list[str], runs: list[DiffRun], text: list[str] | None = None
+    ):
+        self.header = header
+        self.runs = runs
+        self.text = text
+
+    @property
+    def lines(self) -> list[str]:
+        if self.text is not None:
+            return self.text
+        return [kind for kind, count in self.runs for _ in range(count)]
+
+    def __getitem__(self, key: str):
+        if key == "header":
+            return self.header
+        if key == "lines":
+            return self.lines
+        raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return f"CompactDiffSegment(header={self.header!r}, runs={self.runs!r})"
+
+
 class DiffFile(TypedDict):
     type: Literal["new", "modified", "deleted"]
     "Whether the file was added, removed or modified in this diff."
-    segments: list[DiffSegment]
+    segments: list[DiffSegment | CompactDiffSegment]
     """A list of diff segments, or "hunk"s as they are also called."""
 
 
@@ -39,7 +79,9 @@ class AbstractReportFile(Protocol):
         "Get the line specified by `line_no` (1-indexed), or `None` if the line does not exist."
         ...
 
-    def calculate_diff(self, segments: list[DiffSegment]) -> ReportTotals:
+    def calculate_diff(
+        self, segments: list[DiffSegment | CompactDiffSegment]
+    ) -> ReportTotals:
         "Calculates the totals for the given diff `segments`."
         ...
 
@@ -50,20 +92,219 @@ class AbstractReport(Protocol):
         ...
 
 
-def relevant_lines(segment: DiffSegment) -> Generator[int]:
+_find_runs = re.compile(r"\++|-+|[^+-]+").finditer
+_RUN_KINDS: dict[str, Literal["+", "-"]] = {"+": "+", "-": "-"}
+
+
+def _encode_runs(kinds: str) -> list[DiffRun]:
+    "Run-length encodes the first characters of the lines of a diff segment."
+    return [
+        (_RUN_KINDS.get(match.group()[0], " "), match.end() - match.start())
+        for match in _find_runs(kinds)
+    ]
+
+
+def segment_runs(segment: DiffSegment | CompactDiffSegment) -> list[DiffRun]:
+    "Returns the lines of a diff segment as `DiffRun`s."
+    if isinstance(segment, CompactDiffSegment):
+        return segment.runs
+    return _encode_runs("".join(line[0] for line in segment["lines"]))
+
+
+def relevant_lines(segment: DiffSegment | CompactDiffSegment) -> Generator[int]:
     "Iterates over the relevant line numbers in a diff segment."
-    return (
-        i
-        for i, line in enumerate(
-            (ln for ln in segment["lines"] if ln[0] != "-"),
-            start=int(segment["header"][2]) or 1,
-        )
-        if line[0] == "+"
-    )
+    pos = int(segment["header"][2]) or 1
+    for kind, count in segment_runs(segment):
+        if kind == "-":
+            continue
+        if kind == "+":
+            yield from range(pos, pos + count)
+        pos += count
+
+
+def shift_lines[T](
+    lines: list[T | str],
+    segments: list[DiffSegment | CompactDiffSegment],
+    forward: bool = True,
+) -> list[T | str]:
+    """
+    Returns the `lines` of a file shifted according to the diff `segments`,
+    with removed lines taken out, and empty placeholders (`""`) for added lines.
+
+    With `forward=False`, the diff is applied in reverse, which turns the lines of
+    the "after" side of the diff into the lines of its "before" side.
+
+    The new list is built in a single pass using slices, as long as the segments
+    are ordered and do not overlap, which is the case for diffs coming from git.
+    """
+    # Header is [pos_in_base, lines_len_base, pos_in_head, lines_len_head]
+    header_pos, removed, added = (2, "-", "+") if forward else (0, "+", "-")
+
+    shifted: list[T | str] = []
+    src = 0  # the next line of `lines` not yet copied to `shifted`
+    for segment in segments:
+        pos = (int(segment["header"][header_pos]) or 1) - 1
+        for kind, count in segment_runs(segment):
+            if kind == removed or kind == added:
+                if pos < len(shifted):
+                    # the segments are out of order
+                    return _shift_lines_in_place(lines, segments, forward)
+                # catch up to `pos` by copying the unchanged lines in between
+                end = src + pos - len(shifted)
+                shifted.extend(lines[src:end])
+                src = min(end, len(lines))
+
+                if kind == removed:
+                    src = min(src + count, len(lines))
+                else:
+                    shifted.extend([""] * count)
+                    pos += count
+            else:
+                pos += count
+
+    shifted.extend(lines[src:])
+    return shifted
+
+
+def _shift_lines_in_place[T](
+    lines: list[T | str],
+    segments: list[DiffSegment | CompactDiffSegment],
+    forward: bool = True,
+) -> list[T | str]:
+    header_pos, removed, added = (2, "-", "+") if forward else (0, "+", "-")
+
+    for segment in segments:
+        pos = (int(segment["header"][header_pos]) or 1) - 1
+        for kind, count in segment_runs(segment):
+            if kind == removed:
+                del lines[pos : pos + count]
+            elif kind == added:
+                lines[pos:pos] = [""] * count
+                pos += count
+            else:
+                pos += count
+    return lines
+
+
+_get_start_of_line = re.compile(rb"@@ \-(\d+),?(\d*) \+(\d+),?(\d*).*").match
+
+_PLUS, _MINUS, _SPACE = b"+- "
+
+
+def parse_compact_diff(diff: bytes | str, keep_lines: bool = False) -> RawDiff | None:
+    """
+    Parses a unified diff (of multiple files) straight into a `RawDiff`
+    made of `CompactDiffSegment`s.
+
+    This results in the same structure as `TorngitBaseAdapter.diff_to_json`,
+    but does not hold onto the text of every line unless `keep_lines` is given.
+    """
+    if isinstance(diff, str):
+        diff = diff.encode()
+
+    files: dict[str, dict] = {}
+    # the first characters of the lines of each segment, run-length encoded at the end
+    pending: list[tuple[CompactDiffSegment, bytearray]] = []
+    segment: CompactDiffSegment | None = None
+    kinds = bytearray()
+
+    for file_diff in (b"\n" + diff).split(b"\ndiff --git a/")[1:]:
+        lines = file_diff.replace(b"\r\n", b"\n").split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+
+        before: str | None
+        after: str | None
+        before_b, sep, after_b = lines.pop(0).partition(b" b/")
+        if sep:
+            before, after = _decode(before_b), _decode(after_b)
+        else:
+            before, after = None, None
+            for line in lines:
+                if line.startswith(b"--- a/"):
+                    before = _decode(line[6:])
+                elif line.startswith(b"+++ b/"):
+                    after = _decode(line[6:])
+                    break
+
+        if after is None:
+            continue
+
+        file: dict = {
+            "type": "new" if before == "/dev/null" else "modified",
+            "before": None if before == after or before == "/dev/null" else before,
+            "segments": [],
+        }
+        files[after] = file
+
+        for line in lines:
+            if not line:
+                continue
+
+            first = line[0]
+            if first == _PLUS or first == _MINUS:
+                if line[:4] in (b"--- ", b"+++ "):
+                    continue
+            elif first != _SPACE:
+                sol4 = line[:4]
+                if line.startswith(b"\\ No newline at end of file"):
+                    continue
+                elif sol4 == b"dele":
+                    file["before"] = after
+                    file["type"] = "deleted"
+                    file.pop("segments")
+                    break
+                elif sol4 == b"new " and not line.startswith(b"new mode "):
+                    file["type"] = "new"
+                    continue
+                elif sol4 == b"Bina":
+                    file["type"] = "binary"
+                    file.pop("before")
+                    file.pop("segments")
+                    break
+                elif sol4 in (b"--- ", b"+++ ", b"inde", b"diff", b"old ", b"new "):
+                    continue
+                elif sol4 == b"@@ -":
+                    header = [
+                        _decode(group) for group in _get_start_of_line(line).groups()
+                    ]
+                    segment = CompactDiffSegment(header, [], [] if keep_lines else None)
+                    kinds = bytearray()
+                    pending.append((segment, kinds))
+                    file["segments"].append(segment)
+                    continue
+
+            # like `diff_to_json`, any other line is part of the current segment
+            if segment is not None:
+                kinds.append(first)
+                if segment.text is not None:
+                    segment.text.append(_decode(line))
+
+    for segment, segment_kinds in pending:
+        segment.runs = _encode_runs(segment_kinds.decode("latin-1"))
+
+    if not files:
+        return None
+
+    for file in files.values():
+        added = removed = 0
+        for segment in file.get("segments", ()):
+            for kind, count in segment.runs:
+                if kind == "+":
+                    added += count
+                elif kind == "-":
+                    removed += count
+        file["stats"] = {"added": added, "removed": removed}
+
+    return {"files": files}  # type: ignore[typeddict-item]
+
+
+def _decode(value: bytes) -> str:
+    return value.decode(errors="replace")
 
 
 def calculate_file_diff(
-    file: AbstractReportFile, segments: list[DiffSegment]
+    file: AbstractReportFile, segments: list[DiffSegment | CompactDiffSegment]
 ) -> ReportTotals:
     """
     Calculates the `ReportTotals` across all relevant lines in the diff `segments`.
@@ -97,6 +338,11 @@ def calculate_report_diff(report: AbstractReport, diff: RawDiff) -> CalculatedDi
                 files[path] = file_totals
                 list_of_file_totals.append(file_totals)
 
+    return CalculatedDiff(general=sum_file_diffs(list_of_file_totals), files=files)
+
+
+def sum_file_diffs(list_of_file_totals: list[ReportTotals]) -> ReportTotals:
+    "Sums the per-file totals of a diff into the totals across the diff."
     totals = sum_totals(list_of_file_totals)
 
     if totals.lines == 0:
@@ -104,4 +350,4 @@ def calculate_report_diff(report: AbstractReport, diff: RawDiff) -> CalculatedDi
             totals, coverage=None, complexity=None, complexity_total=None
         )
 
-    return CalculatedDiff(general=totals, files=files)
+    return totals
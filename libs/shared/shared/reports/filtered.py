@@ -1,12 +1,17 @@
 import dataclasses
 import logging
+from collections import Counter, defaultdict
+from collections.abc import Mapping, Sequence
 
 from shared.reports.diff import (
     CalculatedDiff,
+    CompactDiffSegment,
     DiffSegment,
     RawDiff,
     calculate_file_diff,
     calculate_report_diff,
+    relevant_lines,
+    sum_file_diffs,
 )
 from shared.reports.totals import get_line_totals
 from shared.reports.types import EMPTY, ReportTotals
@@ -24,6 +29,16 @@ def _contain_any_of_the_flags(expected_flags, actual_flags):
     return len(set(expected_flags) & set(actual_flags)) > 0
 
 
+def _filtered_line(line, sessions):
+    """Returns `line` with only the given (non-empty) `sessions`"""
+    return dataclasses.replace(
+        line,
+        complexity=get_complexity_from_sessions(sessions),
+        sessions=sessions,
+        coverage=merge_all([s.coverage for s in sessions]),
+    )
+
+
 class FilteredReportFile:
     __slots__ = ["report_file", "session_ids", "_totals", "_cached_lines"]
 
@@ -37,14 +52,7 @@ class FilteredReportFile:
         new_sessions = [s for s in line.sessions if s.id in self.session_ids]
         if len(new_sessions) == 0:
             return EMPTY
-        remaining_coverages = [s.coverage for s in new_sessions]
-        new_coverage = merge_all(remaining_coverages)
-        return dataclasses.replace(
-            line,
-            complexity=get_complexity_from_sessions(new_sessions),
-            sessions=new_sessions,
-            coverage=new_coverage,
-        )
+        return _filtered_line(line, new_sessions)
 
     @property
     def name(self):
@@ -76,7 +84,9 @@ class FilteredReportFile:
         self._cached_lines = ret
         return ret
 
-    def calculate_diff(self, segments: list[DiffSegment]) -> ReportTotals:
+    def calculate_diff(
+        self, segments: list[DiffSegment | CompactDiffSegment]
+    ) -> ReportTotals:
         return calculate_file_diff(self, segments)
 
     def get(self, ln):
@@ -215,3 +225,93 @@ class FilteredReport:
                     yield file
                 else:
                     yield FilteredReportFile(file, self.session_ids_to_include)
+
+
+type ReportFilter = tuple[Sequence[str] | None, Sequence[str] | None]
+"""The `(paths, flags)` to filter a report by."""
+
+
+def calculate_filtered_diff_totals[K](
+    report, filters: Mapping[K, ReportFilter], diff: RawDiff | None
+) -> dict[K, ReportTotals | None]:
+    """
+    Calculates the totals of the `diff` for many filtered versions of the `report`,
+    giving the same results as `report.filter(paths, flags).apply_diff(diff, _save=False)`
+    for each of the `(paths, flags)` filters.
+
+    Instead of going through the diff once per filter, every line of the diff is only
+    read once, and filtered for each distinct set of sessions selected by the flags.
+    """
+    if not diff or not diff.get("files"):
+        return dict.fromkeys(filters)
+
+    # the filters selecting the same sessions share the lines of the diff
+    session_sets: dict[frozenset[int] | None, int] = {}
+    filter_sets: dict[K, int] = {}
+    for key, (_paths, flags) in filters.items():
+        session_ids = (
+            frozenset(
+                sid
+                for sid, session in report.sessions.items()
+                if _contain_any_of_the_flags(flags, session.flags)
+            )
+            if flags
+            else None  # not filtered by flags
+        )
+        filter_sets[key] = session_sets.setdefault(session_ids, len(session_sets))
+    session_set_list = list(session_sets)
+    sets_by_session: dict[int, list[int]] = defaultdict(list)
+    for index, session_ids in enumerate(session_set_list):
+        for sid in session_ids or ():
+            sets_by_session[sid].append(index)
+    unfiltered = session_sets.get(None)
+
+    # the diff totals of each file, by session set
+    file_diffs: dict[str, list[ReportTotals | None]] = {}
+    for path, data in diff["files"].items():
+        if data["type"] not in ("modified", "new"):
+            continue
+        file = report.get(path)
+        if file is None:
+            continue
+
+        lines: list[list] = [[] for _ in session_set_list]
+        line_numbers = Counter(
+            ln for segment in data["segments"] for ln in relevant_lines(segment)
+        )
+        for ln, count in line_numbers.items():
+            line = file.get(ln)
+            if not line:
+                continue
+            if unfiltered is not None:
+                lines[unfiltered].extend([line] * count)
+
+            sessions = line.sessions
+            filtered_lines = {}
+            for index in {i for s in sessions for i in sets_by_session.get(s.id, ())}:
+                session_ids = session_set_list[index]
+                kept = tuple(i for i, s in enumerate(sessions) if s.id in session_ids)
+                filtered = filtered_lines.get(kept)
+                if filtered is None:
+                    filtered = filtered_lines[kept] = _filtered_line(
+                        line, [sessions[i] for i in kept]
+                    )
+                lines[index].extend([filtered] * count)
+
+        file_diffs[path] = [
+            # unfiltered report files without coverage are left out of the diff
+            None if index == unfiltered and not file else get_line_totals(lines[index])
+            for index in range(len(session_set_list))
+        ]
+
+    results = {}
+    for key, (paths, _flags) in filters.items():
+        matcher = Matcher(paths)
+        index = filter_sets[key]
+        list_of_file_totals = [
+            totals[index]
+            for path, totals in file_diffs.items()
+            if totals[index] is not None and matcher.match(path)
+        ]
+        results[key] = sum_file_diffs(list_of_file_totals)
+    return results
@@ -1,11 +1,18 @@
 import dataclasses
 import logging
+from collections.abc import Mapping
 from itertools import zip_longest
 from typing import Any, cast
 
 import orjson
 
-from shared.reports.diff import DiffSegment, calculate_file_diff
+from shared.reports.diff import (
+    CompactDiffSegment,
+    DiffSegment,
+    calculate_file_diff,
+    segment_runs,
+    shift_lines,
+)
 from shared.reports.totals import get_line_totals
 from shared.reports.types import EMPTY, ReportLine, ReportTotals
 from shared.utils.merge import merge_all, merge_line
@@ -136,7 +143,9 @@ class ReportFile:
             if line:
                 yield ln, self._line(line)
 
-    def calculate_diff(self, segments: list[DiffSegment]) -> ReportTotals:
+    def calculate_diff(
+        self, segments: list[DiffSegment | CompactDiffSegment]
+    ) -> ReportTotals:
         return calculate_file_diff(self, segments)
 
     def __iter__(self):
@@ -279,6 +288,43 @@ class ReportFile:
         self._invalidate_caches()
         return True
 
+    def append_lines(self, lines: Mapping[int, ReportLine]) -> None:
+        """Append many lines to the report at once
+        this behaves like calling `append` for every `{ln: line}`, merging lines that
+        already exist, but only grows the lines and invalidates the caches once
+        """
+        ignored = []
+        length = 0
+        for ln, line in lines.items():
+            if not isinstance(ln, int):
+                raise TypeError(f"expecting type int got {type(ln)}")
+            elif not isinstance(line, ReportLine):
+                raise TypeError(f"expecting type ReportLine got {type(line)}")
+            elif ln < 1:
+                raise ValueError(f"Line number must be greater then 0. Got {ln}")
+            elif self._ignore and self._ignore(ln):
+                ignored.append(ln)
+            elif ln > length:
+                length = ln
+
+        if len(ignored) == len(lines):
+            return
+
+        parsed_lines = self._lines
+        if len(parsed_lines) < length:
+            parsed_lines.extend([EMPTY] * (length - len(parsed_lines)))
+
+        ignored_lines = set(ignored)
+        for ln, line in lines.items():
+            if ln in ignored_lines:
+                continue
+            existing = parsed_lines[ln - 1]
+            parsed_lines[ln - 1] = (
+                merge_line(self._line(existing), line) if existing else line
+            )
+
+        self._invalidate_caches()
+
     def merge(self, other_file, joined=True, is_disjoint=False):
         """merges another report chunk
         returning the <dict totals>
@@ -330,21 +376,21 @@ class ReportFile:
 
     def does_diff_adjust_tracked_lines(self, diff, future_file):
         for segment in diff["segments"]:
-            # loop through each line
+            # loop through each run of lines
             pos = int(segment["header"][2]) or 1
-            for line in segment["lines"]:
-                if line[0] == "-":
+            for kind, count in segment_runs(segment):
+                if kind == "-":
                     if pos in self:
                         # tracked line removed
                         return True
 
-                elif line[0] == "+":
-                    if pos in future_file:
+                elif kind == "+":
+                    if any(ln in future_file for ln in range(pos, pos + count)):
                         # tracked line added
                         return True
-                    pos += 1
+                    pos += count
                 else:
-                    pos += 1
+                    pos += count
         return False
 
     def shift_lines_by_diff(self, diff, forward=True) -> None:
@@ -356,22 +402,9 @@ class ReportFile:
         adjust coverage info so that it works AS IF it was uploaded for commit B.
         """
         try:
-            removed = "-"
-            added = "+"
-            # loop through each segment in the diff.
-            for segment in diff["segments"]:
-                # Header is [pos_in_base, lines_len_base, pos_in_head, lines_len_head]
-                pos = (int(segment["header"][2]) or 1) - 1
-                # loop through each line in segment
-                for line in segment["lines"]:
-                    if line[0] == removed:
-                        if len(self._lines) > pos:
-                            self._lines.pop(pos)
-                    elif line[0] == added:
-                        self._lines.insert(pos, "")
-                        pos += 1
-                    else:
-                        pos += 1
+            self._parsed_lines = shift_lines(
+                self._lines, diff["segments"], forward=forward
+            )
         except (ValueError, KeyError, TypeError, IndexError):
             log.exception("Failed to shift lines by diff")
             pass
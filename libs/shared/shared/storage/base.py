@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import BinaryIO, overload
 
 CHUNK_SIZE = 1024 * 32
@@ -101,6 +102,22 @@ class BaseStorageService(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def list_folder_contents(self, bucket_name: str, prefix: str) -> Iterator[str]:
+        """Lists the paths of all the files whose path starts with `prefix`
+
+        Args:
+            bucket_name (str): The name of the bucket the files live in
+            prefix (str): The prefix of the paths, usually a folder ending with `/`
+
+        Raises:
+            NotImplementedError: If the current instance did not implement this method
+
+        Returns:
+            Iterator[str]: The paths of the files
+        """
+        raise NotImplementedError()
+
 
 class PresignedURLService(ABC):
     @abstractmethod
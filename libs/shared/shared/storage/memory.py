@@ -134,3 +134,19 @@ class MemoryStorageService(BaseStorageService):
         except KeyError:
             raise FileNotInStorageError()
         return True
+
+    def list_folder_contents(self, bucket_name, prefix):
+        """Lists the paths of all the files whose path starts with `prefix`
+
+        Args:
+            bucket_name (str): The name of the bucket the files live in
+            prefix (str): The prefix of the paths, usually a folder ending with `/`
+
+        Returns:
+            list[str]: The paths of the files
+        """
+        return [
+            path
+            for path in self.storage.get(bucket_name, {})
+            if path.startswith(prefix)
+        ]
@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from collections.abc import Iterator
 from datetime import timedelta
 from functools import cache
 from io import BytesIO
@@ -338,6 +339,12 @@ class MinioStorageService(BaseStorageService, PresignedURLService):
                 )
             raise e
 
+    def list_folder_contents(self, bucket_name: str, prefix: str) -> Iterator[str]:
+        for obj in self.minio_client.list_objects(
+            bucket_name, prefix=prefix, recursive=True
+        ):
+            yield obj.object_name
+
     def create_presigned_put(self, bucket: str, path: str, expires: int) -> str:
         expires_td = timedelta(seconds=expires)
         return self.minio_client.presigned_put_object(bucket, path, expires_td)
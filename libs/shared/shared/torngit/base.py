@@ -1,9 +1,14 @@
+import asyncio
 import re
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from enum import Enum
 
 import httpx
 
+from shared.config import get_config
 from shared.django_apps.core.models import Repository
+from shared.reports.diff import parse_compact_diff, segment_runs
 from shared.torngit.enums import Endpoints
 from shared.torngit.response_types import ProviderPull
 from shared.typings.oauth_token_types import (
@@ -29,6 +34,36 @@ class TokenType(Enum):
 TokenTypeMapping = dict[TokenType, Token]
 
 
+async def fetch_pages_concurrently[P, T](
+    fetch_page: Callable[[P], Awaitable[T]], pages: Iterable[P], window: int
+) -> AsyncIterator[T]:
+    """
+    Fetches the `pages` with up to `window` requests in flight at once,
+    yielding the fetched pages in the order of `pages`.
+
+    The requests that are still in flight when the consumer stops iterating
+    (or one of the requests fails) are cancelled.
+    """
+    pages = iter(pages)
+    in_flight: deque[asyncio.Future[T]] = deque()
+    try:
+        for page in pages:
+            in_flight.append(asyncio.ensure_future(fetch_page(page)))
+            if len(in_flight) >= window:
+                break
+
+        while in_flight:
+            result = await in_flight.popleft()
+            for page in pages:
+                in_flight.append(asyncio.ensure_future(fetch_page(page)))
+                break
+            yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
 class TorngitBaseAdapter:
     _repo_url: str | None = None
     _aws_key = None
@@ -86,6 +121,14 @@ class TorngitBaseAdapter:
             timeout=timeout,
         )
 
+    @property
+    def pagination_window(self) -> int:
+        """
+        The number of pages of a paginated listing that are fetched concurrently,
+        once the total number of pages is known. `1` fetches them one by one.
+        """
+        return max(1, get_config(self.service, "pagination_window", default=1))
+
     def get_token_by_type(self, token_type: TokenType):
         if self._token_type_mapping.get(token_type) is not None:
             return self._token_type_mapping.get(token_type)
@@ -227,14 +270,25 @@ class TorngitBaseAdapter:
         if results:
             return {"files": self._add_diff_totals(results)}
 
+    def diff_to_compact(self, diff: bytes | str, keep_lines: bool = False):
+        """
+        Processes a full diff into the same object pattern as `diff_to_json`,
+        but with compact, run-length encoded segments, which only keep the text
+        of the diff lines if `keep_lines` is given.
+        """
+        return parse_compact_diff(diff, keep_lines=keep_lines)
+
     def _add_diff_totals(self, diff):
         for data in diff.values():
             rm = 0
             add = 0
             if "segments" in data:
                 for segment in data["segments"]:
-                    rm += sum([1 for line in segment["lines"] if line[0] == "-"])
-                    add += sum([1 for line in segment["lines"] if line[0] == "+"])
+                    for kind, count in segment_runs(segment):
+                        if kind == "-":
+                            rm += count
+                        elif kind == "+":
+                            add += count
             data["stats"] = {"added": add, "removed": rm}
         return diff
 
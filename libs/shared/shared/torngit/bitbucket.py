@@ -1,11 +1,16 @@
 import logging
 import os
 import urllib.parse as urllib_parse
+from contextlib import aclosing
 
 import httpx
 from oauthlib import oauth1
 
-from shared.torngit.base import TokenType, TorngitBaseAdapter
+from shared.torngit.base import (
+    TokenType,
+    TorngitBaseAdapter,
+    fetch_pages_concurrently,
+)
 from shared.torngit.enums import Endpoints
 from shared.torngit.exceptions import (
     TorngitClientError,
@@ -312,6 +317,10 @@ class Bitbucket(TorngitBaseAdapter):
         return (usernames, repos_to_log)
 
     async def _fetch_page_of_repos(self, client, username, token, page):
+        """
+        Returns the page of repos, the url of the next page,
+        and the number of the last page if known.
+        """
         # https://confluence.atlassian.com/display/BITBUCKET/repositories+Endpoint#repositoriesEndpoint-GETalistofrepositoriesforanaccount
         res = await self.api(
             client,
@@ -341,7 +350,10 @@ class Bitbucket(TorngitBaseAdapter):
                     },
                 }
             )
-        return (repos, res.get("next"))
+        # `size` is optional, and only returned when it's cheap to compute
+        size, pagelen = res.get("size"), res.get("pagelen")
+        last_page = -(-size // pagelen) if size and pagelen else None
+        return (repos, res.get("next"), last_page)
 
     async def list_repos(self, username=None, token=None):
         """
@@ -375,7 +387,7 @@ class Bitbucket(TorngitBaseAdapter):
                 try:
                     while True:
                         page += 1
-                        repos, has_next = await self._fetch_page_of_repos(
+                        repos, has_next, _last_page = await self._fetch_page_of_repos(
                             client, team, token, page
                         )
 
@@ -410,18 +422,11 @@ class Bitbucket(TorngitBaseAdapter):
         )
         async with self.get_client() as client:
             for team in usernames:
-                page = 0
                 try:
-                    while True:
-                        page += 1
-                        repos, has_next = await self._fetch_page_of_repos(
-                            client, team, token, page
-                        )
-
+                    async for repos in self._list_team_repos_generator(
+                        client, team, token
+                    ):
                         yield repos
-
-                        if len(repos) == 0 or not has_next:
-                            break
                 except TorngitClientError:
                     log.warning(
                         "Unable to fetch repos from team on Bitbucket",
@@ -432,6 +437,42 @@ class Bitbucket(TorngitBaseAdapter):
             extra={"usernames": usernames},
         )
 
+    async def _list_team_repos_generator(self, client, team, token):
+        """
+        Yields the pages of repos of `team`. Once the first page tells how many
+        pages there are, the remaining pages are requested `pagination_window`
+        at a time.
+        """
+
+        async def fetch_page(page):
+            return await self._fetch_page_of_repos(client, team, token, page)
+
+        page = 1
+        repos, has_next, last_page = await fetch_page(page)
+        yield repos
+        if len(repos) == 0 or not has_next:
+            return
+
+        window = self.pagination_window
+        if window > 1 and last_page is not None and last_page > page:
+            async with aclosing(
+                fetch_pages_concurrently(
+                    fetch_page, range(page + 1, last_page + 1), window
+                )
+            ) as pages:
+                async for repos, has_next, _last_page in pages:
+                    yield repos
+                    if len(repos) == 0 or not has_next:
+                        return
+            page = last_page
+
+        while True:
+            page += 1
+            repos, has_next, _last_page = await fetch_page(page)
+            yield repos
+            if len(repos) == 0 or not has_next:
+                break
+
     async def list_permissions(self, token=None):
         data, page = [], 0
         async with self.get_client() as client:
@@ -3,6 +3,7 @@ import hashlib
 import logging
 import os
 from base64 import b64decode
+from contextlib import aclosing
 from datetime import UTC, datetime
 from string import Template
 from urllib.parse import parse_qs, urlencode
@@ -17,7 +18,11 @@ from shared.helpers.cache import cache
 from shared.helpers.redis import get_redis_connection
 from shared.metrics import Counter
 from shared.rate_limits import set_entity_to_rate_limited
-from shared.torngit.base import TokenType, TorngitBaseAdapter
+from shared.torngit.base import (
+    TokenType,
+    TorngitBaseAdapter,
+    fetch_pages_concurrently,
+)
 from shared.torngit.enums import Endpoints
 from shared.torngit.exceptions import (
     TorngitClientError,
@@ -554,6 +559,29 @@ query Repos($owner: String!, $cursor: String, $first: Int!) {
         return None
 
 
+def _page_number(url: str) -> int | None:
+    page = httpx.URL(url).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+
+def _remaining_page_urls(response: Response) -> list[str] | None:
+    """
+    Returns the urls of all the pages after the one in `response`, if the
+    response links to the `last` page of a page-numbered listing.
+    """
+    next_url = response.links.get("next", {}).get("url")
+    last_url = response.links.get("last", {}).get("url")
+    if not next_url or not last_url:
+        return None
+    next_page, last_page = _page_number(next_url), _page_number(last_url)
+    if next_page is None or last_page is None:
+        return None
+    return [
+        str(httpx.URL(next_url).copy_set_param("page", page))
+        for page in range(next_page, last_page + 1)
+    ]
+
+
 class Github(TorngitBaseAdapter):
     service = "github"
     graphql = GitHubGraphQLQueries()
@@ -609,6 +637,10 @@ class Github(TorngitBaseAdapter):
         """
         Makes a single http request to GitHub and returns the parsed response
         """
+        response = await self._api_response(*args, token=token, **kwargs)
+        return self._parse_response(response)
+
+    async def _api_response(self, *args, token=None, **kwargs) -> Response:
         token_to_use = token or self.token
 
         log.info(
@@ -622,8 +654,7 @@ class Github(TorngitBaseAdapter):
 
         if not token_to_use:
             raise TorngitMisconfiguredCredentials()
-        response = await self.make_http_call(*args, token_to_use=token_to_use, **kwargs)
-        return self._parse_response(response)
+        return await self.make_http_call(*args, token_to_use=token_to_use, **kwargs)
 
     async def paginated_api_generator(
         self, client, method, url_name, token=None, **kwargs
@@ -631,6 +662,9 @@ class Github(TorngitBaseAdapter):
         """
         Generator that requests pages from GitHub and yields each page as they come.
         Continues to request pages while there's a link to the next page.
+
+        If the first page links to the `last` page, the remaining pages are
+        requested `pagination_window` at a time.
         """
         token_to_use = token or self.token
         if not token_to_use:
@@ -638,19 +672,35 @@ class Github(TorngitBaseAdapter):
         url = self.count_and_get_url_template(
             url_name=url_name
         ).substitute()  # counts first call
-        page = 1
-        while url:
-            args = [client, method, url]
-            response = await self.make_http_call(
-                *args, token_to_use=token_to_use, **kwargs
+
+        async def fetch_page(url: str) -> Response:
+            return await self.make_http_call(
+                client, method, url, token_to_use=token_to_use, **kwargs
             )
+
+        async def fetch_next_page(url: str) -> Response:
+            _ = self.count_and_get_url_template(
+                url_name=url_name
+            ).substitute()  # counts subsequent calls
+            return await fetch_page(url)
+
+        response = await fetch_page(url)
+        yield self._parse_response(response)
+
+        window = self.pagination_window
+        if window > 1 and (page_urls := _remaining_page_urls(response)):
+            async with aclosing(
+                fetch_pages_concurrently(fetch_next_page, page_urls, window)
+            ) as responses:
+                async for response in responses:
+                    yield self._parse_response(response)
+
+        # pages may have been added while fetching the ones we knew about
+        url = response.links.get("next", {}).get("url", "")
+        while url:
+            response = await fetch_next_page(url)
             yield self._parse_response(response)
             url = response.links.get("next", {}).get("url", "")
-            if page > 1:
-                _ = self.count_and_get_url_template(
-                    url_name=url_name
-                ).substitute()  # counts subsequent calls
-            page += 1
 
     def _parse_response(self, res: Response):
         if res.status_code == 204:
@@ -1197,7 +1247,10 @@ class Github(TorngitBaseAdapter):
 
     async def _fetch_page_of_repos_using_installation(
         self, client, page_size=100, page=1
-    ):
+    ) -> tuple[list[dict], int | None]:
+        """
+        Returns the page of repos, and the number of the last page if known.
+        """
         # https://docs.github.com/en/rest/apps/installations?apiVersion=2022-11-28
         url = self.count_and_get_url_template(
             url_name="fetch_page_of_repos_using_installation"
@@ -1210,6 +1263,8 @@ class Github(TorngitBaseAdapter):
         )
 
         repos = res.get("repositories", [])
+        total_count = res.get("total_count")
+        last_page = -(-total_count // page_size) if total_count else None
 
         log.info(
             "Fetched page of repos using installation",
@@ -1222,22 +1277,27 @@ class Github(TorngitBaseAdapter):
             },
         )
 
-        return self._process_repository_page(repos)
+        return self._process_repository_page(repos), last_page
 
     async def _fetch_page_of_repos(
         self, client, username, token, page_size=100, page=1
-    ):
+    ) -> tuple[list[dict], int | None]:
+        """
+        Returns the page of repos, and the number of the last page if known.
+        """
         # https://developer.github.com/v3/repos/#list-your-repositories
         if username is None:
             url = self.count_and_get_url_template(
                 url_name="fetch_page_of_repos_without_username"
             ).substitute(page_size=page_size, page=page)
-            repos = await self.api(client, "get", url, token=token)
         else:
             url = self.count_and_get_url_template(
                 url_name="fetch_page_of_repos_with_username"
             ).substitute(username=username, page_size=page_size, page=page)
-            repos = await self.api(client, "get", url, token=token)
+        response = await self._api_response(client, "get", url, token=token)
+        repos = self._parse_response(response)
+        last_url = response.links.get("last", {}).get("url")
+        last_page = _page_number(last_url) if last_url else None
 
         log.info(
             "Fetched page of repos",
@@ -1251,7 +1311,7 @@ class Github(TorngitBaseAdapter):
             },
         )
 
-        return self._process_repository_page(repos)
+        return self._process_repository_page(repos), last_page
 
     async def _get_owner_from_nodeid(self, client, token, owner_node_id: str):
         query = self.graphql.prepare(
@@ -1338,7 +1398,7 @@ class Github(TorngitBaseAdapter):
         async with self.get_client() as client:
             while True:
                 page += 1
-                repos = await self._fetch_page_of_repos_using_installation(
+                repos, _last_page = await self._fetch_page_of_repos_using_installation(
                     client, page=page, page_size=page_size
                 )
 
@@ -1371,7 +1431,7 @@ class Github(TorngitBaseAdapter):
         async with self.get_client() as client:
             while True:
                 page += 1
-                repos = await self._fetch_page_of_repos(
+                repos, _last_page = await self._fetch_page_of_repos(
                     client, username, token, page=page, page_size=page_size
                 )
 
@@ -1388,26 +1448,46 @@ class Github(TorngitBaseAdapter):
         """
         New version of list_repos() that should replace the old one after safely
         rolling out in the worker.
+
+        Once the first page tells how many pages there are, the remaining pages
+        are requested `pagination_window` at a time.
         """
         token = self.get_token_by_type_if_none(token, TokenType.read)
         page_size = 50
         async with self.get_client() as client:
-            page = 0
-            while True:
-                page += 1
 
-                repos = (
-                    await self._fetch_page_of_repos_using_installation(
+            async def fetch_page(page: int) -> tuple[list[dict], int | None]:
+                if using_installation:
+                    return await self._fetch_page_of_repos_using_installation(
                         client, page=page, page_size=page_size
                     )
-                    if using_installation
-                    else await self._fetch_page_of_repos(
-                        client, username, token, page=page, page_size=page_size
-                    )
+                return await self._fetch_page_of_repos(
+                    client, username, token, page=page, page_size=page_size
                 )
 
-                yield repos
+            page = 1
+            repos, last_page = await fetch_page(page)
+            yield repos
+            if len(repos) < page_size:
+                return
+
+            window = self.pagination_window
+            if window > 1 and last_page is not None and last_page > page:
+                async with aclosing(
+                    fetch_pages_concurrently(
+                        fetch_page, range(page + 1, last_page + 1), window
+                    )
+                ) as pages:
+                    async for repos, _last_page in pages:
+                        yield repos
+                        if len(repos) < page_size:
+                            return
+                page = last_page
 
+            while True:
+                page += 1
+                repos, _last_page = await fetch_page(page)
+                yield repos
                 if len(repos) < page_size:
                     break
 
@@ -2,6 +2,7 @@ import json
 import logging
 import os
 from base64 import b64decode
+from contextlib import aclosing
 from string import Template
 from urllib.parse import quote, urlencode
 
@@ -9,7 +10,11 @@ import httpx
 
 from shared.config import get_config
 from shared.metrics import Counter
-from shared.torngit.base import TokenType, TorngitBaseAdapter
+from shared.torngit.base import (
+    TokenType,
+    TorngitBaseAdapter,
+    fetch_pages_concurrently,
+)
 from shared.torngit.enums import Endpoints
 from shared.torngit.exceptions import (
     TorngitCantRefreshTokenError,
@@ -542,36 +547,65 @@ class Gitlab(TorngitBaseAdapter):
         max_number_of_pages=None,
         token=None,
     ):
-        current_page = None
-        has_more = True
-        count_so_far = 0
+        """
+        Yields the pages of a listing, following the `X-Next-Page` header.
 
+        If the first page tells the `X-Total-Pages`, the remaining pages are
+        requested `pagination_window` at a time.
+        """
         async with self.get_client() as client:
-            while has_more and (
-                max_number_of_pages is None or count_so_far < max_number_of_pages
-            ):
+
+            async def fetch_page(page):
                 current_kwargs = dict(per_page=max_per_page, **default_kwargs)
-                if current_page is not None:
-                    current_kwargs["page"] = current_page
-                current_result = await self.fetch_and_handle_errors(
+                if page is not None:
+                    current_kwargs["page"] = page
+                return await self.fetch_and_handle_errors(
                     client, "GET", base_url, **current_kwargs
                 )
+
+            async def fetch_next_page(page):
+                # count calls after initial call
+                self.count_and_get_url_template(counter_name)
+                return await fetch_page(page)
+
+            def parse(result):
+                return None if result.status_code == 204 else result.json()
+
+            current_result = await fetch_page(None)
+            count_so_far = 1
+            yield parse(current_result)
+
+            next_page = current_result.headers.get("X-Next-Page")
+            total_pages = current_result.headers.get("X-Total-Pages")
+            window = self.pagination_window
+            if (
+                window > 1
+                and next_page
+                and next_page.isdigit()
+                and total_pages
+                and total_pages.isdigit()
+            ):
+                last_page = int(total_pages)
+                if max_number_of_pages is not None:
+                    last_page = min(last_page, int(next_page) + max_number_of_pages - 2)
+                async with aclosing(
+                    fetch_pages_concurrently(
+                        fetch_next_page, range(int(next_page), last_page + 1), window
+                    )
+                ) as results:
+                    async for current_result in results:
+                        count_so_far += 1
+                        yield parse(current_result)
+                # pages may have been added while fetching the ones we knew about
+                next_page = current_result.headers.get("X-Next-Page")
+
+            while next_page and (
+                max_number_of_pages is None or count_so_far < max_number_of_pages
+            ):
+                current_result = await fetch_next_page(next_page)
                 count_so_far += 1
-                if count_so_far > 1:
-                    # count calls after initial call
-                    self.count_and_get_url_template(counter_name)
-                yield (
-                    None if current_result.status_code == 204 else current_result.json()
-                )
-                if (
-                    max_number_of_pages is not None
-                    and count_so_far >= max_number_of_pages
-                ):
-                    has_more = False
-                elif current_result.headers.get("X-Next-Page"):
-                    current_page, has_more = current_result.headers["X-Next-Page"], True
-                else:
-                    current_page, has_more = None, False
+                yield parse(current_result)
+                next_page = current_result.headers.get("X-Next-Page")
 
     async def get_authenticated_user(self, code, redirect_uri=None):
         """
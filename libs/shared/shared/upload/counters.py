@@ -0,0 +1,135 @@
+"""
+Rolling counters of the uploads, kept in Redis so that the upload throttles don't
+have to count rows in the database on every request.
+
+A counter is seeded with the database count the first time it is read, and it is then
+incremented whenever new rows are created. Incrementing only ever touches counters
+which already exist: a missing counter is left missing, and the next read seeds it
+from the database, which already includes the new rows.
+Incrementing a missing counter marks it as "dirty" though, as a read which is seeding
+it at the same time might have counted before the new rows were created. Seeding
+watches the counter and that mark, and counts again if either changed before the count
+is stored, so that no increment is lost in between.
+
+The counters are reconciled with the database periodically:
+- they expire after `COUNTER_TTL`, after which they are seeded again.
+- a caller about to reject an upload because of a counter can `verify_count` it first,
+  which overwrites the counter with the database count, at most once per
+  `VERIFY_INTERVAL`.
+
+Any Redis error falls back to counting in the database.
+"""
+
+import logging
+from collections.abc import Callable
+
+from redis import Redis, RedisError, WatchError
+
+log = logging.getLogger(__name__)
+
+COUNTER_TTL = 10 * 60
+VERIFY_INTERVAL = 60
+# attempts at incrementing a counter which is concurrently modified,
+# before giving up and dropping the counter
+MAX_INCREMENT_ATTEMPTS = 5
+# attempts at seeding a counter which is concurrently incremented,
+# before giving up and leaving the counter missing
+MAX_SEED_ATTEMPTS = 3
+
+
+def commit_sessions_key(commit_id: int) -> str:
+    """The non-error, non-carriedforward sessions of a commit"""
+    return f"upload_counter:commit_sessions:{commit_id}"
+
+
+def owner_measurements_key(owner_id: int) -> str:
+    """The coverage measurements of the private repos of an owner"""
+    return f"upload_counter:owner_measurements:{owner_id}"
+
+
+def _dirty_key(key: str) -> str:
+    return f"{key}:dirty"
+
+
+def _store_count(
+    redis: Redis, key: str, count: Callable[[], int], overwrite: bool
+) -> int:
+    """
+    Stores `count()` as the counter, counting again if the counter was incremented
+    while counting, as the count might not include the new rows.
+    """
+    value = None
+    try:
+        with redis.pipeline() as pipe:
+            for _ in range(MAX_SEED_ATTEMPTS):
+                try:
+                    pipe.watch(key, _dirty_key(key))
+                    value = count()
+                    pipe.multi()
+                    pipe.set(key, value, ex=COUNTER_TTL, nx=not overwrite)
+                    pipe.execute()
+                    return value
+                except WatchError:
+                    continue
+    except RedisError:
+        log.warning("Unable to store an upload counter", exc_info=True)
+    # the counter is left as is, and the next read counts again
+    return value if value is not None else count()
+
+
+def get_count(redis: Redis, key: str, count: Callable[[], int]) -> int:
+    """
+    Returns the value of the counter, seeding it with `count()` if it is missing.
+    """
+    try:
+        value = redis.get(key)
+    except RedisError:
+        log.warning("Unable to read an upload counter", exc_info=True)
+        return count()
+    if value is not None:
+        return int(value)
+
+    return _store_count(redis, key, count, overwrite=False)
+
+
+def verify_count(redis: Redis, key: str, count: Callable[[], int]) -> int:
+    """
+    Reconciles the counter with `count()`, unless it was already reconciled in the
+    last `VERIFY_INTERVAL`, in which case the counter is trusted.
+    """
+    try:
+        if not redis.set(f"{key}:verified", 1, ex=VERIFY_INTERVAL, nx=True):
+            value = redis.get(key)
+            if value is not None:
+                return int(value)
+    except RedisError:
+        log.warning("Unable to read an upload counter", exc_info=True)
+        return count()
+
+    return _store_count(redis, key, count, overwrite=True)
+
+
+def increment_count(redis: Redis, key: str, amount: int = 1) -> None:
+    """
+    Adds `amount` to the counter, if it exists, or marks it as dirty otherwise.
+    """
+    try:
+        with redis.pipeline() as pipe:
+            for _ in range(MAX_INCREMENT_ATTEMPTS):
+                try:
+                    pipe.watch(key)
+                    exists = pipe.exists(key)
+                    pipe.multi()
+                    if exists:
+                        pipe.incrby(key, amount)
+                    else:
+                        pipe.incr(_dirty_key(key))
+                        pipe.expire(_dirty_key(key), COUNTER_TTL)
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+        # the next read will count from the database again
+        redis.delete(key)
+    except RedisError:
+        log.warning("Unable to increment an upload counter", exc_info=True)
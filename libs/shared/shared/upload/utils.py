@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import timedelta
 from enum import Enum
 
@@ -8,7 +9,9 @@ from django.utils import timezone
 from shared.django_apps.codecov_auth.models import TrialStatus
 from shared.django_apps.reports.models import ReportType
 from shared.django_apps.user_measurements.models import UserMeasurement
+from shared.helpers.redis import get_redis_connection
 from shared.plan.service import PlanService
+from shared.upload.counters import increment_count, owner_measurements_key
 
 
 class UploaderType(Enum):
@@ -45,7 +48,9 @@ def bulk_insert_coverage_measurements(
     if there's an error
     """
     with transaction.atomic():
-        return UserMeasurement.objects.bulk_create(measurements)
+        created = UserMeasurement.objects.bulk_create(measurements)
+    _increment_measurement_counters(created)
+    return created
 
 
 def insert_coverage_measurement(
@@ -57,7 +62,7 @@ def insert_coverage_measurement(
     private_repo: bool,
     report_type: ReportType,
 ):
-    return UserMeasurement.objects.create(
+    measurement = UserMeasurement.objects.create(
         repo_id=repo_id,
         commit_id=commit_id,
         upload_id=upload_id,
@@ -66,3 +71,22 @@ def insert_coverage_measurement(
         private_repo=private_repo,
         report_type=report_type,
     )
+    _increment_measurement_counters([measurement])
+    return measurement
+
+
+def _increment_measurement_counters(measurements: list[UserMeasurement]) -> None:
+    """
+    Keeps the upload counters of `query_monthly_coverage_measurements` up to date.
+    """
+    per_owner = Counter(
+        measurement.owner_id
+        for measurement in measurements
+        if measurement.private_repo
+        and measurement.report_type == ReportType.COVERAGE.value
+    )
+    if not per_owner:
+        return
+    redis = get_redis_connection()
+    for owner_id, amount in per_owner.items():
+        increment_count(redis, owner_measurements_key(owner_id), amount)
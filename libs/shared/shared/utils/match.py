@@ -1,25 +1,69 @@
 import re
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+
+# patterns referring to their own groups can't be merged with other patterns,
+# as the group numbers change within the merged pattern
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def combine_patterns(patterns: Iterable[re.Pattern]) -> list[re.Pattern]:
+    """
+    Merges the given patterns into a single alternation, so that a string is
+    matched against all of them in a single pass of the regex engine.
+    `any(p.match(s) for p in combine_patterns(patterns))` is equivalent to
+    `any(p.match(s) for p in patterns)`.
+
+    Patterns which can't be merged (e.g. because of their inline flags or
+    backreferences) are returned next to the merged one.
+    """
+    patterns = list(patterns)
+    mergeable = [
+        pattern
+        for pattern in patterns
+        if pattern.flags == re.UNICODE and not _GROUP_REFERENCE.search(pattern.pattern)
+    ]
+    if len(mergeable) < 2:
+        return patterns
+
+    try:
+        combined = re.compile("|".join(f"(?:{p.pattern})" for p in mergeable))
+    except re.error:
+        return patterns
+
+    return [combined] + [pattern for pattern in patterns if pattern not in mergeable]
+
+
+@lru_cache(maxsize=1024)
+def _compile_patterns(
+    patterns: frozenset[str],
+) -> tuple[list[re.Pattern], list[re.Pattern]]:
+    positives: list[re.Pattern] = []
+    negatives: list[re.Pattern] = []
+    for pattern in patterns:
+        if not pattern:
+            continue
+        if pattern.startswith(("^!", "!")):
+            negatives.append(re.compile(pattern.replace("!", "")))
+        else:
+            positives.append(re.compile(pattern))
+    return combine_patterns(positives), combine_patterns(negatives)
 
 
 class Matcher:
     def __init__(self, patterns: Sequence[str] | None):
-        self._patterns = set(patterns or [])
+        self._patterns = frozenset(patterns or [])
         self._is_initialized = False
         # a list of patterns that will result in `True` on a match
         self._positives: list[re.Pattern] = []
         # a list of patterns that will result in `False` on a match
         self._negatives: list[re.Pattern] = []
+        # the same paths are usually matched over and over
+        self._results: dict[str, bool] = {}
 
     def _get_matchers(self) -> tuple[list[re.Pattern], list[re.Pattern]]:
         if not self._is_initialized:
-            for pattern in self._patterns:
-                if not pattern:
-                    continue
-                if pattern.startswith(("^!", "!")):
-                    self._negatives.append(re.compile(pattern.replace("!", "")))
-                else:
-                    self._positives.append(re.compile(pattern))
+            self._positives, self._negatives = _compile_patterns(self._patterns)
             self._is_initialized = True
 
         return self._positives, self._negatives
@@ -28,6 +72,12 @@ class Matcher:
         if not self._patterns or s in self._patterns:
             return True
 
+        result = self._results.get(s)
+        if result is None:
+            result = self._results[s] = self._match(s)
+        return result
+
+    def _match(self, s: str) -> bool:
         positives, negatives = self._get_matchers()
 
         # must not match
@@ -1,7 +1,7 @@
-from collections import defaultdict
+import heapq
 from enum import IntEnum
 from fractions import Fraction
-from itertools import groupby
+from functools import lru_cache
 
 from shared.reports.types import LineSession, ReportLine
 
@@ -10,6 +10,10 @@ def merge_all(coverages, missing_branches=None):
     if len(coverages) == 1:
         return coverages[0]
 
+    if all(type(c) is int for c in coverages):
+        # the most common case: merging plain hit counts
+        return -1 if -1 in coverages else max(coverages)
+
     cov = coverages[0]
     for _ in coverages[1:]:
         cov = merge_coverage(cov, _, missing_branches)
@@ -33,16 +37,33 @@ def merge_branch(b1, b2):
         return b1
     if isinstance(b2, list):
         return b2
-    br1, br2 = b1.split("/", 1)
-    if br1 == br2:  # equal 1/1
+    hits1, total1 = _parse_branch(b1)
+    if hits1 == total1:  # equal 1/1
         return b1
-    br3, br4 = b2.split("/", 1)
-    if br3 == br4:  # equal 1/1
+    hits2, total2 = _parse_branch(b2)
+    if hits2 == total2:  # equal 1/1
         return b2
     # return the greatest found
-    return (
-        f"{br1 if int(br1) > int(br3) else br3}/{br2 if int(br2) > int(br4) else br4}"
-    )
+    return f"{max(hits1, hits2)}/{max(total1, total2)}"
+
+
+@lru_cache(maxsize=1024)
+def _parse_branch(branch: str) -> tuple[int, int]:
+    """
+    Parses a `"hits/total"` branch coverage into its numbers.
+
+    Reports only have a handful of distinct branch values,
+    so the parsed values are cached instead of splitting the strings over and over.
+    """
+    hits, total = branch.split("/", 1)
+    return int(hits), int(total)
+
+
+def _branch_total(branch: str) -> int:
+    """The total number of branches, for both `"hits/total"` and plain `"total"` values."""
+    if "/" in branch:
+        return _parse_branch(branch)[1]
+    return int(branch)
 
 
 def merge_partial_line(p1, p2):
@@ -54,33 +75,71 @@ def merge_partial_line(p1, p2):
         # one result already
         return np
 
-    fl = defaultdict(list)
-    [
-        [fl[x].append(_c) for x in range(_s or 0, _e + 1)]
-        for _s, _e, _c in np
-        if _e is not None
+    # Partials (`[start, end, coverage]`) cover the columns `start..=end`.
+    # Open-ended partials (`end=None`) extend to the last column covered by
+    # any of the bounded partials.
+    bounded = [(s or 0, e, c) for s, e, c in np if e is not None and e >= (s or 0)]
+    open_ended = [(s or 0, c) for s, e, c in np if e is None]
+    if bounded:
+        last_column = max(e for _, e, _ in bounded)
+    elif open_ended:
+        last_column = max(s for s, _ in open_ended)
+    else:
+        return []
+    intervals = bounded + [
+        (s, last_column, c) for s, c in open_ended if s <= last_column
     ]
-    ks = list(fl.keys())
-    mx = max(ks) + 1 if ks else 0
-    # appends coverage on each column when [X, None, C]
-    [[fl[x].append(_c) for x in range(_s or 0, mx)] for _s, _e, _c in np if _e is None]
-    ks = list(fl.keys())
-    # fl = {1: [1], 2: [1], 4: [0], 3: [1], 5: [0], 7: [0], 8: [0]}
-    pp = []
-    append = pp.append
-    for cov, group in groupby(
-        sorted([(cl, max(cv)) for cl, cv in list(fl.items())]), lambda c: c[1]
-    ):
-        group = list(group)  # noqa: PLW2901
-        append(_ifg(group[0][0], group[-1][0], cov))
+
+    # sweep over the columns, tracking the highest coverage of the covering partials,
+    # and group the resulting stretches of columns by their coverage
+    pp: list[list] = []
+    for start, end, cov in _max_coverage_stretches(intervals):
+        if pp and pp[-1][2] == cov:
+            pp[-1][1] = end
+        else:
+            pp.append([start, end, cov])
+    for partial in pp:
+        if partial[1] <= partial[0]:
+            partial[1] = partial[0] + 1
 
     # never ends
-    if [[max(ks), None, _c] for _s, _e, _c in np if _e is None]:
+    if open_ended:
         pp[-1][1] = None
 
     return pp
 
 
+def _max_coverage_stretches(intervals):
+    """
+    Yields the `(start, end, coverage)` stretches of columns covered by the given
+    `(start, end, coverage)` intervals, with the highest coverage of all the intervals
+    covering them. Ties are resolved in favor of the earlier interval.
+    """
+    order = sorted(range(len(intervals)), key=lambda idx: intervals[idx][0])
+    # the covering intervals, as `(-coverage, idx, end)`, highest coverage first
+    active: list[tuple] = []
+    i = 0
+    pos = intervals[order[0]][0]
+    while i < len(order) or active:
+        if not active and intervals[order[i]][0] > pos:
+            pos = intervals[order[i]][0]
+        while i < len(order) and intervals[order[i]][0] <= pos:
+            idx = order[i]
+            _, end, cov = intervals[idx]
+            heapq.heappush(active, (-cov, idx, end))
+            i += 1
+        while active and active[0][2] < pos:
+            heapq.heappop(active)
+        if not active:
+            continue
+
+        _, idx, end = active[0]
+        if i < len(order):
+            end = min(end, intervals[order[i]][0] - 1)
+        yield pos, end, intervals[idx][2]
+        pos = end + 1
+
+
 def merge_coverage(l1, l2, branches_missing=True):
     if l1 is None or l2 is None:
         return l1 if l1 is not None else l2
@@ -89,44 +148,40 @@ def merge_coverage(l1, l2, branches_missing=True):
         # ignored line
         return -1
 
-    l1t = cast_ints_float(l1)
-    l2t = cast_ints_float(l2)
-
-    if isinstance(l1t, float | Fraction) and isinstance(l2t, float | Fraction):
+    if isinstance(l1, int | float | Fraction) and isinstance(
+        l2, int | float | Fraction
+    ):
         return l1 if l1 >= l2 else l2
 
-    elif isinstance(l1t, str) or isinstance(l2t, str):
-        if isinstance(l1t, float):
+    elif isinstance(l1, str) or isinstance(l2, str):
+        if isinstance(l1, int | float):
             # using or here because if l1 is 0 return l2
             # this will trigger 100% if l1 is > 0
             branches_missing = [] if l1 else False
             l1 = l2
 
-        elif isinstance(l2t, float):
+        elif isinstance(l2, int | float):
             branches_missing = [] if l2 else False
 
         if branches_missing == []:
             # all branches were hit, no need to merge them
-            l1 = l1.split("/")[-1]
-            return f"{l1}/{l1}"
+            total = _branch_total(l1)
+            return f"{total}/{total}"
 
         elif isinstance(branches_missing, list):
             # we know how many are missing
-            target = int(l1.split("/")[-1])
+            target = _branch_total(l1)
             bf = target - len(branches_missing)
             return f"{bf if bf > 0 else 0}/{target}"
 
         return merge_branch(l1, l2)
 
-    elif isinstance(l1t, list) and isinstance(l2t, list):
+    elif isinstance(l1, list) and isinstance(l2, list):
         return merge_partial_line(l1, l2)
 
-    elif isinstance(l1t, bool) or isinstance(l2t, bool):
-        return (l2 or l1) if isinstance(l1t, bool) else (l1 or l2)
-
     return merge_coverage(
-        partials_to_line(l1) if isinstance(l1t, list) else l1,
-        partials_to_line(l2) if isinstance(l2t, list) else l2,
+        partials_to_line(l1) if isinstance(l1, list) else l1,
+        partials_to_line(l2) if isinstance(l2, list) else l2,
     )
 
 
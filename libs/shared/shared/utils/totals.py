@@ -49,3 +49,31 @@ def _sum(array):
                 # https://sentry.io/codecov/v4/issues/159966549/
                 return sum([a if isinstance(a, int) else 0 for a in array])
     return None
+
+
+# The typed columns of the `commits` table mirroring values of its `totals`,
+# with the key of each value in `totals` and its type
+COMMIT_TOTALS_COLUMNS = {
+    "totals_coverage": ("c", float),
+    "totals_hits": ("h", int),
+    "totals_misses": ("m", int),
+    "totals_partials": ("p", int),
+    "totals_lines": ("n", int),
+    "totals_complexity": ("C", float),
+    "totals_complexity_total": ("N", float),
+}
+
+
+def commit_totals_columns(totals: dict | None) -> dict[str, float | int | None]:
+    """
+    Returns the values of the typed totals columns of a commit with the given
+    `totals`, which keep coverage as a string.
+    """
+    columns = {}
+    for column, (key, type_) in COMMIT_TOTALS_COLUMNS.items():
+        value = totals.get(key) if totals else None
+        try:
+            columns[column] = type_(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            columns[column] = None
+    return columns
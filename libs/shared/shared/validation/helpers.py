@@ -73,6 +73,20 @@ class CoverageRangeSchemaField:
             raise Invalid(f"{data} should have numbers as the range limits")
 
 
+@functools.cache
+def _required_changes_parser() -> pp.ParserElement:
+    """
+    The grammar of `comment.require_changes`, built once per process.
+    """
+    valid_requirements = pp.oneOf(
+        "coverage_drop uncovered_patch any_change", asKeyword=True
+    )
+    or_groups_parser = pp.delimitedList(valid_requirements, "or").setResultsName(
+        "or_groups", listAllMatches=True
+    )
+    return pp.delimitedList(or_groups_parser, "and")
+
+
 class CoverageCommentRequirementSchemaField:
     """Converts `comment.require_changes` into CoverageCommentRequiredChanges
 
@@ -126,18 +140,10 @@ class CoverageCommentRequirementSchemaField:
             raise Invalid("required_changes is empty")
         data = data.lower()
 
-        valid_requirements = pp.oneOf(
-            "coverage_drop uncovered_patch any_change", asKeyword=True
-        )
-        or_groups_parser = pp.delimitedList(valid_requirements, "or").setResultsName(
-            "or_groups", listAllMatches=True
-        )
-        and_groups_parser = pp.delimitedList(or_groups_parser, "and")
-
         try:
-            raw_or_groups: list[pp.ParseResults] = and_groups_parser.parseString(
-                data, parseAll=True
-            )["or_groups"]
+            raw_or_groups: list[pp.ParseResults] = (
+                _required_changes_parser().parseString(data, parseAll=True)["or_groups"]
+            )
             parsed_or_groups = [
                 functools.reduce(self._parse_or_group, raw_group, 0)
                 for raw_group in raw_or_groups
@@ -1,3 +1,7 @@
+from collections.abc import Callable
+from functools import lru_cache, wraps
+from typing import Any
+
 from cerberus import Validator
 
 from shared.validation.helpers import (
@@ -14,19 +18,61 @@ from shared.validation.helpers import (
     UserGivenBranchRegex,
 )
 
+# The same few patterns are found in most of the YAMLs validated by a process
+COERCION_CACHE_SIZE = 4096
+
+
+def memoized_coercion(coerce: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Memoizes a pure coercion process-wide, for the scalar values it is given.
+    Lists are copied out of the cache, as the validated documents are mutable.
+    """
+    cached_coerce = lru_cache(maxsize=COERCION_CACHE_SIZE, typed=True)(coerce)
+
+    @wraps(coerce)
+    def wrapper(value: Any) -> Any:
+        if not isinstance(value, str | bool | int | float):
+            return coerce(value)
+        result = cached_coerce(value)
+        return list(result) if isinstance(result, list) else result
+
+    wrapper.cache_clear = cached_coerce.cache_clear
+    wrapper.cache_info = cached_coerce.cache_info
+    return wrapper
+
+
+@memoized_coercion
+def regexify_path_pattern(value: str) -> str:
+    return PathPatternSchemaField().validate(value)
+
+
+@memoized_coercion
+def regexify_path_fix(value: str) -> str:
+    return CustomFixPathSchemaField().validate(value)
+
+
+@memoized_coercion
+def branch_name(value: str) -> str:
+    return UserGivenBranchRegex().validate(value)
+
+
+@memoized_coercion
+def coverage_comment_required_changes(value: str | bool) -> list[int]:
+    return CoverageCommentRequirementSchemaField().validate(value)
+
 
 class CodecovYamlValidator(Validator):
     def _normalize_coerce_secret(self, value: str) -> str:
         return value
 
     def _normalize_coerce_regexify_path_pattern(self, value):
-        return PathPatternSchemaField().validate(value)
+        return regexify_path_pattern(value)
 
     def _normalize_coerce_regexify_path_fix(self, value):
-        return CustomFixPathSchemaField().validate(value)
+        return regexify_path_fix(value)
 
     def _normalize_coerce_branch_name(self, value):
-        return UserGivenBranchRegex().validate(value)
+        return branch_name(value)
 
     def _normalize_coerce_percentage_to_number(self, value):
         return PercentSchemaField().validate(value)
@@ -41,7 +87,7 @@ class CodecovYamlValidator(Validator):
         return BranchSchemaField().validate(value)
 
     def _normalize_coerce_coverage_comment_required_changes(self, value):
-        return CoverageCommentRequirementSchemaField().validate(value)
+        return coverage_comment_required_changes(value)
 
     def _normalize_coerce_byte_size(self, value):
         return ByteSizeSchemaField().validate(value)
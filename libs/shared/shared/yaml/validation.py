@@ -1,5 +1,10 @@
 import binascii
+import hashlib
 import logging
+import threading
+from typing import Any
+
+from cachetools import LRUCache
 
 from shared.encryption.yaml_secret import yaml_secret_encryptor
 from shared.validation.cli_schema import schema as cli_schema
@@ -13,6 +18,13 @@ YAML_TOP_LEVEL_RESERVED_KEYS: list[str] = [
     "to_string"  # Used to store the full YAML string preserving the original comments
 ]
 
+# Most YAMLs validated by a process are the same few repo and owner YAMLs,
+# so the results of validating them are kept around
+VALIDATION_CACHE_SIZE = 512
+
+_validation_cache: LRUCache = LRUCache(maxsize=VALIDATION_CACHE_SIZE)
+_validation_cache_lock = threading.Lock()
+
 # *** Reminder: when changes are made to YAML validation, you will need to update the version of shared in both
 # worker (to apply the changes) AND codecov-api (so the validate route reflects the changes) ***
 
@@ -39,7 +51,53 @@ def validate_yaml(inputted_yaml_dict, show_secrets_for=None):
     if not isinstance(inputted_yaml_dict, dict):
         raise InvalidYamlException([], "Yaml needs to be a dict")
     pre_process_yaml(inputted_yaml_dict)
-    return do_actual_validation(inputted_yaml_dict, show_secrets_for)
+
+    cache_key = _validation_cache_key(inputted_yaml_dict, show_secrets_for)
+    with _validation_cache_lock:
+        cached = _validation_cache.get(cache_key)
+    if cached is None:
+        try:
+            cached = do_actual_validation(inputted_yaml_dict, show_secrets_for)
+        except InvalidYamlException as exc:
+            cached = exc
+        with _validation_cache_lock:
+            _validation_cache[cache_key] = cached
+
+    if isinstance(cached, InvalidYamlException):
+        raise InvalidYamlException(
+            error_location=_copy_document(cached.error_location),
+            error_message=cached.error_message,
+            error_dict=_copy_document(cached.error_dict),
+            original_exc=cached.original_exc,
+        )
+    return _copy_document(cached)
+
+
+def clear_validation_cache() -> None:
+    with _validation_cache_lock:
+        _validation_cache.clear()
+
+
+def _validation_cache_key(yaml_dict: dict, show_secrets_for) -> str:
+    """
+    The `repr` of a YAML parsed dict contains all of its content, and unlike
+    `json.dumps` it handles the dates and other types a YAML parser can produce.
+    """
+    return hashlib.sha256(repr((yaml_dict, show_secrets_for)).encode()).hexdigest()
+
+
+def _copy_document(value: Any) -> Any:
+    """
+    Copies the containers of a validated document, which only holds immutable
+    scalars otherwise, so that callers can't modify the cached one.
+    """
+    if isinstance(value, dict):
+        return {k: _copy_document(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_document(v) for v in value]
+    if isinstance(value, set):
+        return {_copy_document(v) for v in value}
+    return value
 
 
 def remove_reserved_keys(inputted_yaml_dict: dict[str, any]) -> None:
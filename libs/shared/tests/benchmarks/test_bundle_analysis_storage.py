@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from shared.bundle_analysis import (
+    BundleAnalysisReport,
+    BundleAnalysisReportLoader,
+    ShardedBundleAnalysisReport,
+)
+
+NUM_BUNDLES = 30
+ASSETS_PER_BUNDLE = 200
+REPORT_KEY = "8d1099f1-ba73-472f-957f-6908eced3f42"
+
+
+def make_bundle_stats(bundle_name: str, num_assets: int) -> dict:
+    assets = [
+        {
+            "name": f"assets/{bundle_name}_{i}-{i:08x}.js",
+            "size": 1000 + i,
+            "gzipSize": 500 + i,
+            "normalized": f"assets/{bundle_name}_{i}-*.js",
+        }
+        for i in range(num_assets)
+    ]
+    chunks = [
+        {
+            "id": f"chunk_{i}",
+            "uniqueId": f"{i}-chunk_{i}",
+            "entry": i == 0,
+            "initial": i < 10,
+            "files": [asset["name"]],
+            "names": [f"chunk_{i}"],
+        }
+        for i, asset in enumerate(assets)
+    ]
+    modules = [
+        {
+            "name": f"./src/{bundle_name}/module_{i}.ts",
+            "size": 100 + i,
+            "chunkUniqueIds": [chunk["uniqueId"]],
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+    return {
+        "version": "2",
+        "plugin": {"name": "codecov-vite-bundle-analysis-plugin", "version": "1.0.0"},
+        "builtAt": 1701451048604,
+        "duration": 331,
+        "bundler": {"name": "rollup", "version": "3.29.4"},
+        "bundleName": bundle_name,
+        "assets": assets,
+        "chunks": chunks,
+        "modules": modules,
+    }
+
+
+@pytest.mark.parametrize(
+    "report_class",
+    [
+        pytest.param(BundleAnalysisReport, id="single_file"),
+        pytest.param(ShardedBundleAnalysisReport, id="sharded"),
+    ],
+)
+def test_process_bundle_upload(report_class, mock_storage, tmp_path, benchmark):
+    """
+    Ingests an upload into the report of a commit which already has
+    `NUM_BUNDLES - 1` other bundles, like the worker does for every upload.
+    """
+    stats_paths = []
+    for i in range(NUM_BUNDLES):
+        stats_path = tmp_path / f"bundle_{i}.json"
+        stats_path.write_text(
+            json.dumps(make_bundle_stats(f"bundle_{i}", ASSETS_PER_BUNDLE))
+        )
+        stats_paths.append(str(stats_path))
+
+    loader = BundleAnalysisReportLoader(None)
+    report = report_class()
+    for stats_path in stats_paths[:-1]:
+        report.ingest(stats_path)
+    loader.save(report, REPORT_KEY)
+    report.cleanup()
+
+    def bench_fn():
+        report = loader.load(REPORT_KEY)
+        report.ingest(stats_paths[-1])
+        loader.save(report, REPORT_KEY)
+        report.cleanup()
+
+    benchmark(bench_fn)
+
+    report = loader.load(REPORT_KEY)
+    assert len(report.bundle_names()) == NUM_BUNDLES
+    report.cleanup()
@@ -0,0 +1,78 @@
+import pytest
+
+from shared.reports.diff import relevant_lines
+from shared.reports.reportfile import ReportFile
+from shared.reports.types import ReportLine
+from shared.torngit.base import TorngitBaseAdapter
+
+NUM_DIFF_LINES = 200_000
+
+
+def make_diff(num_lines: int) -> str:
+    """
+    Generates a diff resembling a regenerated lockfile,
+    with segments of large runs of removed and added lines.
+    """
+    lines = [
+        "diff --git a/package-lock.json b/package-lock.json",
+        "index 8695aedf2b..e0d2b1e89d 100644",
+        "--- a/package-lock.json",
+        "+++ b/package-lock.json",
+    ]
+    segment_size = 1_000
+    for segment in range(num_lines // segment_size):
+        start = segment * segment_size + 1
+        lines.append(f"@@ -{start},600 +{start},600 @@")
+        lines.extend(f'   "context-{start + i}": "1.0.0",' for i in range(200))
+        lines.extend(f'-  "removed-{start + i}": "1.0.0",' for i in range(400))
+        lines.extend(f'+  "added-{start + i}": "2.0.0",' for i in range(400))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize(
+    "compact",
+    [pytest.param(False, id="diff_to_json"), pytest.param(True, id="compact")],
+)
+def test_parse_diff(compact, benchmark):
+    diff = make_diff(NUM_DIFF_LINES)
+    diff_bytes = diff.encode()
+    torngit = TorngitBaseAdapter()
+
+    def bench_fn():
+        if compact:
+            torngit.diff_to_compact(diff_bytes)
+        else:
+            torngit.diff_to_json(diff)
+
+    benchmark(bench_fn)
+
+
+@pytest.mark.parametrize(
+    "compact",
+    [pytest.param(False, id="diff_to_json"), pytest.param(True, id="compact")],
+)
+def test_diff_relevant_lines(compact, benchmark):
+    diff = make_diff(NUM_DIFF_LINES)
+    torngit = TorngitBaseAdapter()
+    parsed = torngit.diff_to_compact(diff) if compact else torngit.diff_to_json(diff)
+    segments = parsed["files"]["package-lock.json"]["segments"]
+
+    def bench_fn():
+        for segment in segments:
+            for _ in relevant_lines(segment):
+                pass
+
+    benchmark(bench_fn)
+
+
+def test_shift_lines_by_diff(benchmark):
+    diff = TorngitBaseAdapter().diff_to_json(make_diff(NUM_DIFF_LINES))
+    file_diff = diff["files"]["package-lock.json"]
+    num_lines = NUM_DIFF_LINES
+
+    def bench_fn():
+        file = ReportFile("package-lock.json")
+        file._parsed_lines = [ReportLine.create(1)] * num_lines
+        file.shift_lines_by_diff(file_diff)
+
+    benchmark(bench_fn)
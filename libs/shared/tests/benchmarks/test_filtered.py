@@ -0,0 +1,66 @@
+import pytest
+
+from shared.reports.filtered import calculate_filtered_diff_totals
+from shared.reports.readonly import ReadOnlyReport
+from shared.reports.resources import Report, ReportFile, Session
+from shared.reports.types import ReportLine
+
+NUM_FLAGS = 100
+NUM_COMPONENTS = 50
+NUM_FILES = 100
+LINES_PER_FILE = 500
+
+
+def make_report_and_diff() -> tuple[ReadOnlyReport, dict]:
+    """
+    A report uploaded with many flags, and a diff touching every other line
+    of all its files.
+    """
+    report = Report()
+    for i in range(NUM_FLAGS):
+        report.add_session(Session(flags=[f"flag_{i}"]))
+    diff = {"files": {}}
+    for i in range(NUM_FILES):
+        report_file = ReportFile(f"src/dir_{i % 10}/file_{i}.py")
+        for ln in range(1, LINES_PER_FILE):
+            sessions = [[(ln + i + s) % NUM_FLAGS, (ln + s) % 2] for s in range(3)]
+            report_file.append(ln, ReportLine.create(ln % 2, sessions=sessions))
+        report.append(report_file)
+        diff["files"][report_file.name] = {
+            "type": "modified",
+            "segments": [
+                {
+                    "header": ["1", str(LINES_PER_FILE), "1", str(LINES_PER_FILE)],
+                    "lines": ["+", " "] * (LINES_PER_FILE // 2),
+                }
+            ],
+        }
+    return ReadOnlyReport.create_from_report(report), diff
+
+
+def make_filters() -> dict:
+    filters = {("flag", f"flag_{i}"): (None, [f"flag_{i}"]) for i in range(NUM_FLAGS)}
+    for i in range(NUM_COMPONENTS):
+        filters[("component", f"component_{i}")] = (
+            [f"src/dir_{i % 10}/.*"],
+            [f"flag_{i}", f"flag_{i + NUM_COMPONENTS}"] if i % 2 else None,
+        )
+    return filters
+
+
+@pytest.mark.parametrize(
+    "batched",
+    [pytest.param(False, id="apply_diff"), pytest.param(True, id="batched")],
+)
+def test_filtered_diff_totals(batched, benchmark):
+    report, diff = make_report_and_diff()
+    filters = make_filters()
+
+    def bench_fn():
+        if batched:
+            calculate_filtered_diff_totals(report, filters, diff)
+        else:
+            for paths, flags in filters.values():
+                report.filter(paths=paths, flags=flags).apply_diff(diff, _save=False)
+
+    benchmark(bench_fn)
@@ -0,0 +1,67 @@
+import random
+
+from shared.reports.types import LineSession, ReportLine
+from shared.utils.merge import merge_all, merge_line, merge_partial_line
+
+NUM_SESSIONS = 300
+NUM_PARTIALS = 2_000
+
+
+def make_partials(rng: random.Random, num_partials: int) -> list[list]:
+    # minified JS has very long lines, with lots of short partials
+    partials = []
+    for _ in range(num_partials):
+        start = rng.randint(0, 100_000)
+        partials.append([start, start + rng.randint(0, 50), rng.randint(0, 3)])
+    return partials
+
+
+def test_merge_partial_line(benchmark):
+    rng = random.Random(0)
+    p1 = make_partials(rng, NUM_PARTIALS)
+    p2 = make_partials(rng, NUM_PARTIALS)
+
+    def bench_fn():
+        merge_partial_line(p1, p2)
+
+    benchmark(bench_fn)
+
+
+def test_merge_all(benchmark):
+    rng = random.Random(0)
+    hits = [rng.randint(0, 10) for _ in range(NUM_SESSIONS)]
+    branches = [f"{rng.randint(0, 4)}/4" for _ in range(NUM_SESSIONS)]
+
+    def bench_fn():
+        merge_all(hits)
+        merge_all(branches)
+
+    benchmark(bench_fn)
+
+
+def test_merge_line(benchmark):
+    rng = random.Random(0)
+
+    def make_line(session_ids) -> ReportLine:
+        return ReportLine.create(
+            coverage="1/4",
+            type="b",
+            sessions=[
+                LineSession(
+                    id=session_id,
+                    coverage=f"{rng.randint(0, 4)}/4",
+                    branches=rng.sample(["0", "1", "2", "3"], 2),
+                    partials=make_partials(rng, 20),
+                )
+                for session_id in session_ids
+            ],
+        )
+
+    # half of the sessions overlap, and need to be merged session by session
+    l1 = make_line(range(NUM_SESSIONS))
+    l2 = make_line(range(NUM_SESSIONS // 2, NUM_SESSIONS + NUM_SESSIONS // 2))
+
+    def bench_fn():
+        merge_line(l1, l2)
+
+    benchmark(bench_fn)
@@ -0,0 +1,28 @@
+from shared.utils.match import Matcher
+
+NUM_PATHS = 100_000
+NUM_PATTERNS = 200
+
+
+def make_paths(num_paths: int) -> list[str]:
+    return [
+        f"src/package_{i % 500}/module_{i % 37}/file_{i}.py" for i in range(num_paths)
+    ]
+
+
+def make_patterns(num_patterns: int) -> list[str]:
+    # what the YAML validation turns `ignore` and flag/component `paths` into
+    patterns = [f"^src/package_{i}/.*" for i in range(0, num_patterns - 10)]
+    patterns += [f"!^src/package_{i}/module_3/.*" for i in range(10)]
+    return patterns
+
+
+def test_matcher_match(benchmark):
+    paths = make_paths(NUM_PATHS)
+    patterns = make_patterns(NUM_PATTERNS)
+
+    def bench_fn():
+        matcher = Matcher(patterns)
+        return sum(matcher.match(path) for path in paths)
+
+    assert benchmark(bench_fn) > 0
@@ -0,0 +1,48 @@
+from copy import deepcopy
+
+from shared.yaml.validation import clear_validation_cache, validate_yaml
+
+NUM_PATTERNS = 200
+
+USER_YAML = {
+    "codecov": {"require_ci_to_pass": True, "notify": {"wait_for_ci": True}},
+    "coverage": {
+        "precision": 2,
+        "round": "down",
+        "range": "60...80",
+        "status": {
+            "project": {
+                f"component_{i}": {"target": "auto", "paths": [f"src/component_{i}/**"]}
+                for i in range(20)
+            },
+            "patch": {"default": {"branches": ["main", "release/.*"]}},
+        },
+    },
+    "comment": {
+        "layout": "reach,diff,flags,tree",
+        "require_changes": "coverage_drop or uncovered_patch",
+    },
+    "ignore": [f"generated/module_{i}/**/*.py" for i in range(NUM_PATTERNS)],
+    "fixes": [f"/build/workspace_{i}/::src/" for i in range(NUM_PATTERNS)],
+    "flags": {
+        f"flag_{i}": {"paths": [f"src/flag_{i}/", "tests/"], "carryforward": True}
+        for i in range(20)
+    },
+}
+
+
+def test_validate_yaml_uncached(benchmark):
+    def bench_fn():
+        clear_validation_cache()
+        validate_yaml(deepcopy(USER_YAML))
+
+    benchmark(bench_fn)
+
+
+def test_validate_yaml_cached(benchmark):
+    validate_yaml(deepcopy(USER_YAML))
+
+    def bench_fn():
+        validate_yaml(deepcopy(USER_YAML))
+
+    benchmark(bench_fn)
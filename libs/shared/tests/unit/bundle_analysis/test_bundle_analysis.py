@@ -21,6 +21,7 @@ from shared.bundle_analysis.models import (
     Session,
     get_db_session,
 )
+from shared.bundle_analysis.report import ModulePathIndex
 from shared.storage.exceptions import PutRequestRateLimitError
 
 sample_bundle_stats_path = (
@@ -251,6 +252,30 @@ def test_bundle_report_asset_filtering():
         report.cleanup()
 
 
+def test_bundle_report_asset_sizes():
+    try:
+        report = BundleAnalysisReport()
+        report.ingest(sample_bundle_stats_path)
+        bundle_report = report.bundle_report("sample")
+
+        sizes = bundle_report.asset_sizes()
+        assert sizes == {
+            asset_type: {
+                asset.uuid: asset.size
+                for asset in bundle_report.asset_reports(asset_types=[asset_type])
+            }
+            for asset_type in {
+                asset.asset_type for asset in bundle_report.asset_reports()
+            }
+        }
+        assert (
+            sum(size for by_uuid in sizes.values() for size in by_uuid.values())
+            == bundle_report.total_size()
+        )
+    finally:
+        report.cleanup()
+
+
 def test_bundle_report_asset_ordering():
     try:
         report = BundleAnalysisReport()
@@ -1142,3 +1167,53 @@ def test_bundle_report_cleans_bad_chunks(version):
         temp_path.unlink()
     finally:
         report.cleanup()
+
+
+def test_module_path_index_matches_path_component_suffixes():
+    modules = [
+        Module(id=1, name="./src/App.tsx"),
+        Module(id=2, name="./index.html"),
+        Module(id=3, name="def.ts"),
+        Module(id=4, name="../../node_modules/react/index.js"),
+    ]
+    module_index = ModulePathIndex()
+    for module in modules:
+        module_index.insert(1, module)
+    module_index.insert(2, modules[1])
+
+    matches = module_index.match(
+        [
+            "./app1/src/App.tsx",
+            "/example/app2/index.html",
+            "abc/def.ts",
+            "abc/xdef.ts",  # <- not a path component suffix
+            "node_modules/react/index.js",  # <- module is outside of the app root
+        ]
+    )
+    assert {asset_id: [m.id for m in ms] for asset_id, ms in matches.items()} == {
+        1: [1, 2, 3],
+        2: [2],
+    }
+    assert module_index.match([]) == {}
+    # results are memoized per list of changed files
+    assert module_index.match(["abc/def.ts"]) is module_index.match(["abc/def.ts"])
+
+
+def test_bundle_report_module_index():
+    try:
+        report = BundleAnalysisReport()
+        report.ingest(sample_bundle_stats_path)
+        bundle_report = report.bundle_report("sample")
+        changed_files = ["app1/index.html", "./app1/src/main.tsx", "abc/def/ghi.ts"]
+
+        assert bundle_report.module_index is bundle_report.module_index
+        for asset_report in bundle_report.asset_reports():
+            expected = {module.name for module in asset_report.modules(changed_files)}
+            assert {
+                module.name
+                for module in asset_report.modules(
+                    changed_files, bundle_report.module_index
+                )
+            } == expected
+    finally:
+        report.cleanup()
@@ -0,0 +1,322 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from shared.bundle_analysis import (
+    BundleAnalysisReport,
+    BundleAnalysisReportLoader,
+    ShardedBundleAnalysisReport,
+    StoragePaths,
+)
+from shared.bundle_analysis.models import SCHEMA_VERSION, MetadataKey
+from shared.bundle_analysis.sharded import local_shards_dir, shard_key
+from shared.bundle_analysis.storage import get_bucket_name
+
+samples_path = Path(__file__).parent.parent.parent / "samples"
+sample_bundle_stats_path = samples_path / "sample_bundle_stats.json"
+sample_bundle_stats_path_other = samples_path / "sample_bundle_stats_other.json"
+sample_bundle_stats_path_another_bundle = (
+    samples_path / "sample_bundle_stats_another_bundle.json"
+)
+asset_link_prev_a_path = samples_path / "asset_link_prev_a.json"
+asset_link_prev_b_path = samples_path / "asset_link_prev_b.json"
+asset_link_curr_a_path = samples_path / "asset_link_curr_a.json"
+asset_link_curr_b_path = samples_path / "asset_link_curr_b.json"
+
+REPORT_KEY = "8d1099f1-ba73-472f-957f-6908eced3f42"
+
+
+@pytest.fixture
+def loader(mock_storage):
+    return BundleAnalysisReportLoader(None)
+
+
+def stored_paths(mock_storage) -> set[str]:
+    return set(mock_storage.storage.get(get_bucket_name(), {}))
+
+
+def shard_path(report_key: str, bundle_name: str) -> str:
+    return StoragePaths.bundle_report_shard.path(
+        repo_key=BundleAnalysisReportLoader(None).repo_key,
+        report_key=report_key,
+        shard_key=shard_key(bundle_name),
+    )
+
+
+def manifest_path(report_key: str) -> str:
+    return StoragePaths.bundle_report_manifest.path(
+        repo_key=BundleAnalysisReportLoader(None).repo_key, report_key=report_key
+    )
+
+
+def test_save_load_sharded_report(loader, mock_storage):
+    created_report = ShardedBundleAnalysisReport()
+    created_report.ingest(sample_bundle_stats_path)
+    created_report.ingest(sample_bundle_stats_path_another_bundle, "abc123")
+    loader.save(created_report, REPORT_KEY)
+    created_report.cleanup()
+
+    assert stored_paths(mock_storage) == {
+        manifest_path(REPORT_KEY),
+        shard_path(REPORT_KEY, "sample"),
+        shard_path(REPORT_KEY, "sample2"),
+    }
+
+    report = loader.load(REPORT_KEY)
+    try:
+        assert isinstance(report, ShardedBundleAnalysisReport)
+        assert report.bundle_names() == ["sample", "sample2"]
+        assert report.metadata() == {
+            MetadataKey.SCHEMA_VERSION: SCHEMA_VERSION,
+            MetadataKey.COMPARE_SHA: "abc123",
+        }
+        assert not report.is_cached()
+        # shards are only downloaded when their bundle is accessed
+        assert not os.path.exists(local_shards_dir(report.db_path))
+
+        assert report.bundle_report("sample").total_size() == 150572
+        assert report.bundle_report("missing") is None
+        assert len(os.listdir(local_shards_dir(report.db_path))) == 1
+
+        assert [bundle.name for bundle in report.bundle_reports()] == [
+            "sample",
+            "sample2",
+        ]
+        assert report.session_count() == 2
+    finally:
+        report.cleanup()
+
+    assert not os.path.exists(report.db_path)
+    assert not os.path.exists(local_shards_dir(report.db_path))
+
+
+def test_ingest_rewrites_only_affected_shard(loader, mock_storage, mocker):
+    created_report = ShardedBundleAnalysisReport()
+    created_report.ingest(sample_bundle_stats_path)
+    created_report.ingest(sample_bundle_stats_path_another_bundle)
+    loader.save(created_report, REPORT_KEY)
+    created_report.cleanup()
+
+    read_file = mocker.spy(mock_storage, "read_file")
+    write_file = mocker.spy(mock_storage, "write_file")
+
+    report = loader.load(REPORT_KEY)
+    try:
+        # re-upload of the `sample` bundle, it replaces the previous one
+        session_id, bundle_name = report.ingest(sample_bundle_stats_path_other)
+        assert bundle_name == "sample"
+        assert session_id == 2
+        loader.save(report, REPORT_KEY)
+    finally:
+        report.cleanup()
+
+    read_paths = {call.args[1] for call in read_file.call_args_list}
+    written_paths = [call.args[1] for call in write_file.call_args_list]
+    assert shard_path(REPORT_KEY, "sample2") not in read_paths
+    assert written_paths == [
+        shard_path(REPORT_KEY, "sample"),
+        manifest_path(REPORT_KEY),
+    ]
+
+    report = loader.load(REPORT_KEY)
+    try:
+        assert report.bundle_report("sample").total_size() == 151672
+        assert report.session_count() == 2
+    finally:
+        report.cleanup()
+
+
+def test_load_single_file_report(loader):
+    created_report = BundleAnalysisReport()
+    created_report.ingest(sample_bundle_stats_path)
+    loader.save(created_report, REPORT_KEY)
+    created_report.cleanup()
+
+    report = loader.load(REPORT_KEY)
+    try:
+        assert type(report) is BundleAnalysisReport
+        assert report.bundle_names() == ["sample"]
+    finally:
+        report.cleanup()
+
+    assert loader.load("missing") is None
+
+
+def test_from_report():
+    report = BundleAnalysisReport()
+    report.ingest(sample_bundle_stats_path)
+    report.ingest(sample_bundle_stats_path_another_bundle, "abc123")
+    report.update_is_cached({"sample2": True})
+
+    sharded_report = ShardedBundleAnalysisReport.from_report(report)
+    try:
+        assert sharded_report.bundle_names() == ["sample", "sample2"]
+        assert sharded_report.metadata() == report.metadata()
+        assert sharded_report.changed_bundles == {"sample", "sample2"}
+        assert sharded_report.manifest["bundles"]["sample2"]["is_cached"]
+
+        for bundle_name in report.bundle_names():
+            shard = sharded_report.get_shard(bundle_name)
+            assert shard.bundle_names() == [bundle_name]
+            assert (
+                sharded_report.bundle_report(bundle_name).total_size()
+                == report.bundle_report(bundle_name).total_size()
+            )
+    finally:
+        report.cleanup()
+        sharded_report.cleanup()
+
+
+def test_carry_forward_sharded_report(loader, mock_storage):
+    created_report = ShardedBundleAnalysisReport()
+    created_report.ingest(sample_bundle_stats_path)
+    created_report.ingest(sample_bundle_stats_path_another_bundle)
+    loader.save(created_report, REPORT_KEY)
+    created_report.cleanup()
+
+    # what the worker does to carry forward the cached bundles of the parent commit
+    report = loader.load(REPORT_KEY)
+    try:
+        report.delete_bundle_by_name("sample")
+        report.update_is_cached({"sample2": True})
+        assert report.is_cached()
+        loader.save(report, "new-report-key")
+    finally:
+        report.cleanup()
+
+    # the parent report is untouched
+    assert stored_paths(mock_storage) == {
+        manifest_path(REPORT_KEY),
+        shard_path(REPORT_KEY, "sample"),
+        shard_path(REPORT_KEY, "sample2"),
+        manifest_path("new-report-key"),
+        shard_path("new-report-key", "sample2"),
+    }
+
+    report = loader.load("new-report-key")
+    try:
+        assert report.bundle_names() == ["sample2"]
+        assert report.bundle_report("sample2").is_cached()
+    finally:
+        report.cleanup()
+
+    # deleting a bundle from a stored report deletes its shard
+    report = loader.load(REPORT_KEY)
+    try:
+        report.delete_bundle_by_name("sample")
+        loader.save(report, REPORT_KEY)
+    finally:
+        report.cleanup()
+
+    assert shard_path(REPORT_KEY, "sample") not in stored_paths(mock_storage)
+    manifest = json.loads(
+        mock_storage.read_file(get_bucket_name(), manifest_path(REPORT_KEY))
+    )
+    assert list(manifest["bundles"]) == ["sample2"]
+
+
+def test_associate_previous_assets():
+    def asset_uuids(report: BundleAnalysisReport) -> dict[str, str]:
+        return {
+            asset.hashed_name: asset.uuid
+            for bundle_name in ("BundleA", "BundleB")
+            for asset in report.bundle_report(bundle_name).asset_reports()
+        }
+
+    prev_report = BundleAnalysisReport()
+    prev_report.ingest(asset_link_prev_a_path)
+    prev_report.ingest(asset_link_prev_b_path)
+
+    report = BundleAnalysisReport()
+    report.ingest(asset_link_curr_a_path)
+    report.ingest(asset_link_curr_b_path)
+    sharded_report = ShardedBundleAnalysisReport.from_report(report)
+    try:
+        report.associate_previous_assets(prev_report)
+        sharded_report.associate_previous_assets(prev_report)
+
+        assert asset_uuids(sharded_report) == asset_uuids(report)
+        assert set(asset_uuids(report).values()) & set(
+            asset_uuids(prev_report).values()
+        )
+    finally:
+        prev_report.cleanup()
+        report.cleanup()
+        sharded_report.cleanup()
+
+
+def test_from_report_shard_size(tmp_path):
+    def bundle_stats(bundle_name: str) -> dict:
+        assets = [
+            {
+                "name": f"assets/{bundle_name}_{i}-{i:08x}.js",
+                "size": 1000 + i,
+                "gzipSize": 500 + i,
+                "normalized": f"assets/{bundle_name}_{i}-*.js",
+            }
+            for i in range(200)
+        ]
+        chunks = [
+            {
+                "id": f"chunk_{i}",
+                "uniqueId": f"{i}-chunk_{i}",
+                "entry": i == 0,
+                "initial": i < 10,
+                "files": [asset["name"]],
+                "names": [f"chunk_{i}"],
+            }
+            for i, asset in enumerate(assets)
+        ]
+        modules = [
+            {
+                "name": f"./src/{bundle_name}/module_{i}.ts",
+                "size": 100 + i,
+                "chunkUniqueIds": [chunk["uniqueId"]],
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        return {
+            "version": "2",
+            "plugin": {
+                "name": "codecov-vite-bundle-analysis-plugin",
+                "version": "1.0.0",
+            },
+            "builtAt": 1701451048604,
+            "duration": 331,
+            "bundler": {"name": "rollup", "version": "3.29.4"},
+            "bundleName": bundle_name,
+            "assets": assets,
+            "chunks": chunks,
+            "modules": modules,
+        }
+
+    report = BundleAnalysisReport()
+    single_bundle_sizes = {}
+    for i in range(10):
+        stats_path = tmp_path / f"bundle_{i}.json"
+        stats_path.write_text(json.dumps(bundle_stats(f"bundle_{i}")))
+        report.ingest(str(stats_path))
+
+        single_bundle_report = BundleAnalysisReport()
+        single_bundle_report.ingest(str(stats_path))
+        single_bundle_sizes[f"bundle_{i}"] = os.path.getsize(
+            single_bundle_report.db_path
+        )
+        single_bundle_report.cleanup()
+
+    sharded_report = ShardedBundleAnalysisReport.from_report(report)
+    try:
+        for bundle_name, size in single_bundle_sizes.items():
+            shard = sharded_report.get_shard(bundle_name)
+            # the shard only holds its own bundle, not the whole report
+            assert os.path.getsize(shard.db_path) <= size
+            assert (
+                sharded_report.bundle_report(bundle_name).total_size()
+                == report.bundle_report(bundle_name).total_size()
+            )
+        assert os.path.getsize(report.db_path) > 5 * max(single_bundle_sizes.values())
+    finally:
+        report.cleanup()
+        sharded_report.cleanup()
@@ -29,6 +29,22 @@ class CommitTests(TestCase):
         report2 = CommitReportFactory(commit=commit, code=None)
         assert commit.commitreport == report2
 
+    def test_totals_columns(self):
+        commit = CommitFactory(
+            totals={"c": "85.00000", "h": 17, "m": 3, "p": 0, "n": 20, "C": 0, "N": 0}
+        )
+        commit.refresh_from_db()
+        assert commit.totals_coverage == 85.0
+        assert commit.totals_hits == 17
+        assert commit.totals_lines == 20
+
+        commit.totals = {"c": "50.00000", "h": 1, "m": 1, "p": 0, "n": 2}
+        commit.save(update_fields=["totals"])
+        commit.refresh_from_db()
+        assert commit.totals_coverage == 50.0
+        assert commit.totals_lines == 2
+        assert commit.totals_complexity is None
+
     sample_report = {
         "files": {
             "different/test_file.py": [
@@ -0,0 +1,155 @@
+import fakeredis
+import pytest
+from prometheus_client import REGISTRY
+
+from shared.helpers.diff_cache import DiffCache
+
+DIFF = {"diff": {"files": {"a.py": {"type": "modified", "segments": []}}}}
+
+
+class FakeRepository:
+    repoid = 1
+    service = "github"
+    service_id = "123"
+
+
+class FakeLock:
+    def __init__(self, on_acquire=None, acquired=True):
+        self.on_acquire = on_acquire
+        self.acquired = acquired
+        self.released = False
+
+    def acquire(self):
+        if self.on_acquire:
+            self.on_acquire()
+        return self.acquired
+
+    def release(self):
+        self.released = True
+
+
+class Fetcher:
+    def __init__(self, result=DIFF):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def get_counter(name, context):
+    return REGISTRY.get_sample_value(f"{name}_total", labels={"context": context}) or 0
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def diff_cache(redis, mocker):
+    diff_cache = DiffCache()
+    diff_cache.configure(redis)
+    # `fakeredis` can't run the lua script releasing the lock
+    mocker.patch.object(redis, "lock", return_value=FakeLock())
+    return diff_cache
+
+
+def test_not_configured(mock_storage):
+    fetch = Fetcher()
+    diff_cache = DiffCache()
+    for _ in range(2):
+        assert (
+            diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch)
+            == DIFF
+        )
+    assert fetch.calls == 2
+    assert mock_storage.storage == {}
+
+
+def test_get_or_fetch(diff_cache, redis, mock_storage):
+    saved_before = get_counter("diff_cache_provider_calls_saved", "compare")
+    calls_before = get_counter("diff_cache_provider_calls", "compare")
+    fetch = Fetcher()
+
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert fetch.calls == 1
+
+    path = redis.get("diff_cache:1:a:b:compare").decode()
+    assert path.endswith("/diffs/a...b/compare.json")
+    assert path in mock_storage.storage["archive"]
+
+    assert get_counter("diff_cache_provider_calls", "compare") - calls_before == 1
+    assert get_counter("diff_cache_provider_calls_saved", "compare") - saved_before == 1
+
+
+def test_keys(diff_cache, mock_storage):
+    fetch = Fetcher()
+    diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch)
+    diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare_with_commits", fetch)
+    diff_cache.get_or_fetch(FakeRepository(), "c", "b", "compare", fetch)
+    diff_cache.get_or_fetch(FakeRepository(), None, "b", "commit", fetch)
+    assert fetch.calls == 4
+
+    other_repo = FakeRepository()
+    other_repo.repoid = 2
+    diff_cache.get_or_fetch(other_repo, "a", "b", "compare", fetch)
+    assert fetch.calls == 5
+
+    diff_cache.get_or_fetch(FakeRepository(), None, "b", "commit", fetch)
+    assert fetch.calls == 5
+
+
+def test_errors_are_not_cached(diff_cache, redis, mock_storage):
+    fetch = Fetcher(ValueError("provider error"))
+    with pytest.raises(ValueError):
+        diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch)
+    assert redis.get("diff_cache:1:a:b:compare") is None
+
+    fetch.result = DIFF
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert fetch.calls == 2
+
+
+def test_missing_storage_object(diff_cache, redis, mock_storage):
+    fetch = Fetcher()
+    diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch)
+    mock_storage.storage["archive"].clear()
+
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert fetch.calls == 2
+
+
+def test_fetched_while_waiting_for_lock(redis, mocker, mock_storage):
+    other_task_cache = DiffCache()
+    other_task_cache.configure(redis)
+    lock = FakeLock(
+        on_acquire=lambda: other_task_cache.get_or_fetch(
+            FakeRepository(), "a", "b", "compare", Fetcher()
+        )
+    )
+    diff_cache = DiffCache()
+    diff_cache.configure(redis)
+    mocker.patch.object(redis, "lock", side_effect=[lock, FakeLock()])
+
+    fetch = Fetcher()
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert fetch.calls == 0
+    assert lock.released
+
+
+def test_lock_not_acquired(redis, mocker, mock_storage):
+    diff_cache = DiffCache()
+    diff_cache.configure(redis)
+    lock = FakeLock(acquired=False)
+    mocker.patch.object(redis, "lock", return_value=lock)
+
+    fetch = Fetcher()
+    assert diff_cache.get_or_fetch(FakeRepository(), "a", "b", "compare", fetch) == DIFF
+    assert fetch.calls == 1
+    assert not lock.released
+    assert redis.get("diff_cache:1:a:b:compare") is not None
@@ -0,0 +1,31 @@
+from uuid import uuid4
+
+import fakeredis
+
+from shared.helpers.upload_context import (
+    invalidate_repository,
+    repository_key,
+    upload_token_key,
+)
+
+
+def test_upload_token_key():
+    token = uuid4()
+    assert upload_token_key(token) == upload_token_key(str(token))
+    assert str(token) not in upload_token_key(token)
+    assert upload_token_key(token) != upload_token_key(uuid4())
+
+
+def test_invalidate_repository():
+    redis = fakeredis.FakeRedis()
+    token, other_token = uuid4(), uuid4()
+    for key in [
+        repository_key(1),
+        upload_token_key(token),
+        upload_token_key(other_token),
+    ]:
+        redis.set(key, "1")
+
+    invalidate_repository(redis, 1, token, None)
+
+    assert redis.keys() == [upload_token_key(other_token).encode()]
@@ -1,6 +1,13 @@
 from unittest.mock import patch
 
-from shared.reports.filtered import FilteredReport, FilteredReportFile
+import pytest
+
+from shared.reports.filtered import (
+    FilteredReport,
+    FilteredReportFile,
+    calculate_filtered_diff_totals,
+)
+from shared.reports.readonly import ReadOnlyReport
 from shared.reports.resources import Report, ReportFile, ReportTotals, Session
 from shared.reports.types import LineSession, NetworkFile, ReportLine
 from shared.utils.sessions import SessionType
@@ -840,3 +847,86 @@ class TestFilteredReport:
             complexity_total=0,
             diff=0,
         )
+
+
+class TestCalculateFilteredDiffTotals:
+    FILTERS = {
+        "unfiltered": (None, None),
+        "empty": ([], []),
+        "paths": ([r".*\.go"], None),
+        "unit": (None, ["unit"]),
+        "unit_go": ([r".*\.go"], ["unit"]),
+        "unit_and_integration": (None, ["unit", "integration"]),
+        "unit_or_integration": (["file_1.go"], ["integration", "unit"]),
+        "missing": (None, ["missing"]),
+    }
+
+    @pytest.fixture
+    def report_and_diff(self):
+        report = Report()
+        report.add_session(Session(id=0, flags=["unit"]))
+        report.add_session(Session(id=1, flags=["integration"]))
+        report.add_session(Session(id=2, flags=["unit", "other"]))
+        report.add_session(Session(id=3, flags=None))
+        for name in ["file_1.go", "file_2.go", "file_3.py"]:
+            report_file = ReportFile(name)
+            for ln in range(1, 30):
+                sessions = [
+                    (sid, [0, 1, "1/2"][(ln + sid) % 3])
+                    for sid in range(4)
+                    if (ln + sid) % 5 != 0
+                ]
+                report_file.append(
+                    ln,
+                    ReportLine.create(
+                        sessions[0][1],
+                        type="b" if ln % 7 == 0 else None,
+                        sessions=sessions,
+                    ),
+                )
+            report.append(report_file)
+        # a file without any coverage
+        report.append(ReportFile("empty.go"))
+
+        segment = {
+            "header": ["1", "10", "1", "12"],
+            "lines": ["+"] * 5 + [" ", "-"] * 5,
+        }
+        diff = {
+            "files": {
+                "file_1.go": {"type": "modified", "segments": [segment, segment]},
+                "file_2.go": {"type": "deleted", "segments": [segment]},
+                "file_3.py": {"type": "new", "segments": [segment]},
+                "empty.go": {"type": "modified", "segments": [segment]},
+                "unknown.go": {"type": "new", "segments": [segment]},
+            }
+        }
+        return report, diff
+
+    def test_same_as_filtered_reports(self, report_and_diff):
+        report, diff = report_and_diff
+        results = calculate_filtered_diff_totals(report, self.FILTERS, diff)
+
+        for key, (paths, flags) in self.FILTERS.items():
+            expected = report.filter(paths=paths, flags=flags).apply_diff(
+                diff, _save=False
+            )
+            assert results[key] == expected, key
+        assert results["unit"].lines > 0
+        assert results["missing"].lines == 0
+
+    def test_readonly_report(self, report_and_diff):
+        report, diff = report_and_diff
+        readonly_report = ReadOnlyReport.create_from_report(report)
+        assert calculate_filtered_diff_totals(
+            readonly_report, self.FILTERS, diff
+        ) == calculate_filtered_diff_totals(report, self.FILTERS, diff)
+
+    def test_no_diff(self, report_and_diff):
+        report, _diff = report_and_diff
+        assert calculate_filtered_diff_totals(
+            report, self.FILTERS, None
+        ) == dict.fromkeys(self.FILTERS)
+        assert calculate_filtered_diff_totals(
+            report, {"unit": (None, ["unit"])}, {"files": {}}
+        ) == {"unit": None}
@@ -0,0 +1,150 @@
+import textwrap
+
+import pytest
+
+from shared.reports.diff import (
+    CompactDiffSegment,
+    parse_compact_diff,
+    relevant_lines,
+    segment_runs,
+)
+from shared.reports.reportfile import ReportFile
+from shared.reports.types import ReportLine
+from shared.torngit.base import TorngitBaseAdapter
+
+DIFF = textwrap.dedent(
+    """\
+    diff --git a/README.md b/README.md
+    index 8695aedf2b..e0d2b1e89d 100644
+    --- a/README.md
+    +++ b/README.md
+    @@ -1,5 +1,6 @@
+     first line
+    -second line
+    +second line, changed
+    +an added line
+     third line
+
+     fourth line
+    @@ -20 +21,2 @@ some context
+    --- a removed comment
+    -removed
+    +added
+    \\ No newline at end of file
+    +another
+    diff --git a/old.py b/new.py
+    similarity index 90%
+    rename from old.py
+    rename to new.py
+    index 1234567..89abcde 100644
+    --- a/old.py
+    +++ b/new.py
+    @@ -3,3 +3,3 @@ def foo():
+         a = 1\r
+    -    b = 2\r
+    +    b = 3\r
+         c = 4\r
+    diff --git a/new_file.py b/new_file.py
+    new file mode 100644
+    index 0000000..d5ee3d6
+    --- /dev/null
+    +++ b/new_file.py
+    @@ -0,0 +1,3 @@
+    +one
+    +two
+    +three
+    diff --git a/deleted.py b/deleted.py
+    deleted file mode 100644
+    index d5ee3d6..0000000
+    --- a/deleted.py
+    +++ /dev/null
+    @@ -1,2 +0,0 @@
+    -one
+    -two
+    diff --git a/image.png b/image.png
+    new file mode 100644
+    index 0000000..d5ee3d6
+    Binary files /dev/null and b/image.png differ
+    """
+)
+
+
+def assert_equivalent(compact: dict, expected: dict, keep_lines: bool):
+    assert compact["files"].keys() == expected["files"].keys()
+    for path, file in expected["files"].items():
+        compact_file = compact["files"][path]
+        assert {k: v for k, v in compact_file.items() if k != "segments"} == {
+            k: v for k, v in file.items() if k != "segments"
+        }
+        assert ("segments" in compact_file) == ("segments" in file)
+        for compact_segment, segment in zip(
+            compact_file.get("segments", []), file.get("segments", []), strict=True
+        ):
+            assert isinstance(compact_segment, CompactDiffSegment)
+            assert compact_segment["header"] == segment["header"]
+            assert segment_runs(compact_segment) == segment_runs(segment)
+            assert list(relevant_lines(compact_segment)) == list(
+                relevant_lines(segment)
+            )
+            if keep_lines:
+                assert compact_segment["lines"] == segment["lines"]
+            else:
+                assert compact_segment["lines"] == [
+                    line[0] if line[0] in "+-" else " " for line in segment["lines"]
+                ]
+
+
+@pytest.mark.parametrize("keep_lines", [False, True])
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_parse_compact_diff_matches_diff_to_json(keep_lines, as_bytes):
+    expected = TorngitBaseAdapter().diff_to_json(DIFF)
+    compact = parse_compact_diff(
+        DIFF.encode() if as_bytes else DIFF, keep_lines=keep_lines
+    )
+
+    assert_equivalent(compact, expected, keep_lines)
+    assert compact["files"]["README.md"]["stats"] == {"added": 4, "removed": 2}
+    assert compact["files"]["README.md"]["segments"][0].runs == [
+        (" ", 1),
+        ("-", 1),
+        ("+", 2),
+        (" ", 2),
+    ]
+    assert compact["files"]["new.py"]["before"] == "old.py"
+    assert compact["files"]["deleted.py"]["type"] == "deleted"
+    assert compact["files"]["image.png"]["type"] == "binary"
+
+
+def test_parse_compact_diff_empty():
+    assert parse_compact_diff(b"") is None
+    assert TorngitBaseAdapter().diff_to_json("") is None
+
+
+def test_segment_runs():
+    segment = {"header": ["1", "4", "1", "4"], "lines": [" a", "-b", "-c", "+d", " e"]}
+    assert segment_runs(segment) == [(" ", 1), ("-", 2), ("+", 1), (" ", 1)]
+    assert list(relevant_lines(segment)) == [2]
+
+
+def test_report_file_accepts_compact_diff():
+    diff = parse_compact_diff(DIFF)["files"]["README.md"]
+    json_diff = TorngitBaseAdapter().diff_to_json(DIFF)["files"]["README.md"]
+
+    def make_file():
+        file = ReportFile("README.md")
+        for ln in range(1, 25):
+            file.append(ln, ReportLine.create(coverage=ln % 3))
+        return file
+
+    compact_shifted, json_shifted = make_file(), make_file()
+    compact_shifted.shift_lines_by_diff(diff)
+    json_shifted.shift_lines_by_diff(json_diff)
+    assert list(compact_shifted.lines) == list(json_shifted.lines)
+
+    future_file = make_file()
+    assert make_file().does_diff_adjust_tracked_lines(
+        diff, future_file
+    ) == make_file().does_diff_adjust_tracked_lines(json_diff, future_file)
+    assert make_file().calculate_diff(diff["segments"]) == make_file().calculate_diff(
+        json_diff["segments"]
+    )
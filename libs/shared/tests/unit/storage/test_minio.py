@@ -275,6 +275,19 @@ def test_write_then_delete_file():
         storage.read_file(BUCKET_NAME, path)
 
 
+def test_list_folder_contents():
+    storage = make_storage()
+    folder = f"test_list_folder_contents/{uuid4().hex}"
+    paths = [f"{folder}/a.txt", f"{folder}/nested/b.txt"]
+
+    ensure_bucket(storage)
+    for path in paths + [f"{folder}_other/c.txt"]:
+        storage.write_file(BUCKET_NAME, path, "lorem ipsum")
+
+    assert sorted(storage.list_folder_contents(BUCKET_NAME, f"{folder}/")) == paths
+    assert list(storage.list_folder_contents(BUCKET_NAME, f"{folder}/missing/")) == []
+
+
 def test_delete_file_doesnt_exist():
     storage = make_storage()
     path = f"test_delete_file_doesnt_exist/{uuid4().hex}"
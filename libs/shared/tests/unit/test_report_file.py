@@ -1,5 +1,8 @@
+import random
+
 import pytest
 
+from shared.reports.diff import CompactDiffSegment, segment_runs
 from shared.reports.resources import ReportFile
 from shared.reports.types import ReportLine
 
@@ -313,6 +316,172 @@ def test_shift_lines_by_diff_changes_to_no_code_at_eof():
     ]
 
 
+def shift_lines_reference(lines, diff):
+    """The line-by-line implementation `ReportFile.shift_lines_by_diff` used to have."""
+    lines = list(lines)
+    for segment in diff["segments"]:
+        pos = (int(segment["header"][2]) or 1) - 1
+        for line in segment["lines"]:
+            if line[0] == "-":
+                if len(lines) > pos:
+                    lines.pop(pos)
+            elif line[0] == "+":
+                lines.insert(pos, "")
+                pos += 1
+            else:
+                pos += 1
+    return lines
+
+
+def random_diff(rng: random.Random, num_lines: int) -> dict:
+    segments = []
+    base_pos = head_pos = 1
+    while base_pos <= num_lines + 5 and len(segments) < 5:
+        gap = rng.randint(0, 10)
+        base_pos += gap
+        head_pos += gap
+        lines = [rng.choice("+- ") + "line" for _ in range(rng.randint(1, 15))]
+        base_len = sum(1 for line in lines if line[0] != "+")
+        head_len = sum(1 for line in lines if line[0] != "-")
+        segments.append(
+            {
+                "header": [
+                    str(base_pos if base_len else base_pos - 1),
+                    str(base_len),
+                    str(head_pos if head_len else head_pos - 1),
+                    str(head_len),
+                ],
+                "lines": lines,
+            }
+        )
+        base_pos += base_len
+        head_pos += head_len
+    return {"type": "modified", "segments": segments}
+
+
+def invert_diff(diff: dict) -> dict:
+    swap = {"+": "-", "-": "+"}
+    return {
+        "type": "modified",
+        "segments": [
+            {
+                "header": [*segment["header"][2:], *segment["header"][:2]],
+                "lines": [
+                    swap.get(line[0], line[0]) + line[1:] for line in segment["lines"]
+                ],
+            }
+            for segment in diff["segments"]
+        ],
+    }
+
+
+def make_report_file(num_lines: int) -> ReportFile:
+    file = ReportFile("file.py")
+    for ln in range(1, num_lines + 1):
+        file.append(ln, ReportLine.create(ln))
+    return file
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(200))
+def test_shift_lines_by_diff_matches_reference(seed):
+    rng = random.Random(seed)
+    num_lines = rng.randint(0, 60)
+    diff = random_diff(rng, num_lines)
+
+    file = make_report_file(num_lines)
+    expected = shift_lines_reference(file._lines, diff)
+    file.shift_lines_by_diff(diff)
+    assert file._lines == expected
+
+    # compact diffs are shifted the same way
+    compact_file = make_report_file(num_lines)
+    compact_file.shift_lines_by_diff(
+        {
+            "type": "modified",
+            "segments": [
+                CompactDiffSegment(segment["header"], segment_runs(segment))
+                for segment in diff["segments"]
+            ],
+        }
+    )
+    assert compact_file._lines == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(200))
+def test_shift_lines_by_diff_backward(seed):
+    rng = random.Random(seed)
+    num_lines = rng.randint(0, 60)
+    diff = random_diff(rng, num_lines)
+
+    file = make_report_file(num_lines)
+    expected = shift_lines_reference(file._lines, invert_diff(diff))
+    file.shift_lines_by_diff(diff, forward=False)
+    assert file._lines == expected
+
+
+@pytest.mark.unit
+def test_shift_lines_by_diff_unordered_segments():
+    diff = {
+        "type": "modified",
+        "segments": [
+            {"header": ["10", "1", "10", "2"], "lines": [" a", "+b"]},
+            {"header": ["2", "2", "2", "1"], "lines": ["-c", " d"]},
+        ],
+    }
+    file = make_report_file(15)
+    expected = shift_lines_reference(file._lines, diff)
+    file.shift_lines_by_diff(diff)
+    assert file._lines == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(50))
+def test_append_lines_matches_append(seed):
+    rng = random.Random(seed)
+    ignore = {"eof": 40, "lines": {3, 7}}
+    lines = [
+        (
+            rng.randint(1, 50),
+            ReportLine.create(
+                coverage=coverage,
+                type="b" if isinstance(coverage, str) else None,
+                sessions=[[rng.randint(0, 2), coverage]],
+            ),
+        )
+        for coverage in (
+            rng.choice([0, 1, 5, "1/2", "2/2"]) for _ in range(rng.randint(0, 60))
+        )
+    ]
+
+    lines = dict(lines)
+
+    expected = ReportFile("file.py", ignore=ignore)
+    expected.append(2, ReportLine.create(1, sessions=[[0, 1]]))
+    for ln, line in lines.items():
+        expected.append(ln, line)
+
+    file = ReportFile("file.py", ignore=ignore)
+    file.append(2, ReportLine.create(1, sessions=[[0, 1]]))
+    file.append_lines(lines)
+
+    assert file._lines == expected._lines
+    assert file.totals == expected.totals
+
+
+@pytest.mark.unit
+def test_append_lines_invalid():
+    file = ReportFile("name.h")
+    with pytest.raises(TypeError):
+        file.append_lines({"line": ReportLine.create(1)})
+    with pytest.raises(TypeError):
+        file.append_lines({1: [1]})
+    with pytest.raises(ValueError):
+        file.append_lines({0: ReportLine.create(1)})
+    assert file._lines == []
+
+
 @pytest.mark.unit
 def test_del_item():
     r = ReportFile("name.h")
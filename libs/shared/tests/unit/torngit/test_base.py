@@ -1,8 +1,41 @@
+import asyncio
 import textwrap
+from contextlib import aclosing
 
 import pytest
 
-from shared.torngit.base import TokenType, TorngitBaseAdapter
+from shared.torngit.base import (
+    TokenType,
+    TorngitBaseAdapter,
+    fetch_pages_concurrently,
+)
+
+
+class PageFetcher:
+    """Fake page fetcher that records how many pages are fetched at once."""
+
+    def __init__(self, delays=None, fail_on=None):
+        self.delays = delays or {}
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, page):
+        self.started.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(page, 0.001))
+            if page == self.fail_on:
+                raise ValueError(page)
+            return f"page {page}"
+        except asyncio.CancelledError:
+            self.cancelled.append(page)
+            raise
+        finally:
+            self.in_flight -= 1
 
 
 class TestTorngitBaseAdapter:
@@ -124,3 +157,58 @@ class TestTorngitBaseAdapter:
                 }
             }
         }
+
+
+class TestFetchPagesConcurrently:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window", [1, 2, 3, 10])
+    async def test_yields_pages_in_order(self, window):
+        # the earlier pages are the slowest ones to arrive
+        fetcher = PageFetcher(delays={1: 0.03, 2: 0.02, 3: 0.01})
+        pages = [
+            page
+            async for page in fetch_pages_concurrently(fetcher, range(1, 7), window)
+        ]
+        assert pages == [f"page {page}" for page in range(1, 7)]
+        assert fetcher.max_in_flight == min(window, 6)
+
+    @pytest.mark.asyncio
+    async def test_no_pages(self):
+        fetcher = PageFetcher()
+        assert [page async for page in fetch_pages_concurrently(fetcher, [], 3)] == []
+        assert fetcher.started == []
+
+    @pytest.mark.asyncio
+    async def test_error_cancels_pages_in_flight(self):
+        fetcher = PageFetcher(delays={3: 1, 4: 1}, fail_on=2)
+        with pytest.raises(ValueError):
+            async for page in fetch_pages_concurrently(fetcher, range(1, 10), 3):
+                assert page == "page 1"
+        # the page after the window may be cancelled before it even starts
+        assert fetcher.started[:3] == [1, 2, 3]
+        assert len(fetcher.started) <= 4
+        assert 3 in fetcher.cancelled
+        assert fetcher.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_pages_in_flight(self):
+        fetcher = PageFetcher(delays={2: 1, 3: 1})
+        async with aclosing(
+            fetch_pages_concurrently(fetcher, range(1, 10), 3)
+        ) as pages:
+            async for page in pages:
+                assert page == "page 1"
+                break
+        assert fetcher.started[:3] == [1, 2, 3]
+        assert len(fetcher.started) <= 4
+        assert {2, 3} <= set(fetcher.cancelled)
+        assert fetcher.in_flight == 0
+
+    def test_pagination_window(self, mock_configuration):
+        instance = TorngitBaseAdapter()
+        instance.service = "github"
+        assert instance.pagination_window == 1
+        mock_configuration._params["github"] = {"pagination_window": 4}
+        assert instance.pagination_window == 4
+        mock_configuration._params["github"] = {"pagination_window": 0}
+        assert instance.pagination_window == 1
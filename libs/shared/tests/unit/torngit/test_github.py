@@ -1459,6 +1459,53 @@ class TestUnitGithub:
         )
         assert after - before == 2
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window", [1, 3])
+    async def test_paginated_api_generator_page_numbers(
+        self, ghapp_handler, mock_configuration, window
+    ):
+        mock_configuration._params["github"] = {"pagination_window": window}
+        base_url = "https://api.github.com/app/hook/deliveries?per_page=50"
+        last_page = 7
+        in_flight, max_in_flight = 0, 0
+
+        async def side_effect(request):
+            nonlocal in_flight, max_in_flight
+            page = int(request.url.params.get("page", 1))
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # the first pages are the slowest ones to arrive
+            await asyncio.sleep(0.001 * (last_page - page))
+            in_flight -= 1
+            links = [f'<{base_url}&page={last_page}>; rel="last"']
+            if page < last_page:
+                links.append(f'<{base_url}&page={page + 1}>; rel="next"')
+            return httpx.Response(
+                status_code=200, headers={"link": ", ".join(links)}, json=[page]
+            )
+
+        before = REGISTRY.get_sample_value(
+            "git_provider_api_calls_github_total",
+            labels={"endpoint": "list_webhook_deliveries"},
+        )
+        with respx.mock:
+            route = respx.get(url__startswith=base_url).mock(side_effect=side_effect)
+            async with ghapp_handler.get_client() as client:
+                pages = [
+                    page
+                    async for page in ghapp_handler.paginated_api_generator(
+                        client, "get", url_name="list_webhook_deliveries"
+                    )
+                ]
+        assert pages == [[page] for page in range(1, last_page + 1)]
+        assert route.call_count == last_page
+        assert max_in_flight == window
+        after = REGISTRY.get_sample_value(
+            "git_provider_api_calls_github_total",
+            labels={"endpoint": "list_webhook_deliveries"},
+        )
+        assert after - before == last_page
+
     @pytest.mark.asyncio
     async def test_webhook_redelivery_success(self, ghapp_handler):
         delivery_id = 17323228732
@@ -618,3 +618,51 @@ class TestUnitGitlab:
     async def test_count_and_get_url_template_unrecognized(self, valid_handler):
         with pytest.raises(KeyError):
             valid_handler.count_and_get_url_template(url_name="whoops")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "window,max_number_of_pages,expected_pages",
+        [(1, None, 6), (4, None, 6), (4, 3, 3), (4, 1, 1)],
+    )
+    async def test_make_paginated_call_total_pages(
+        self,
+        valid_handler,
+        mock_configuration,
+        window,
+        max_number_of_pages,
+        expected_pages,
+    ):
+        mock_configuration._params["gitlab"] = {"pagination_window": window}
+        total_pages = 6
+        in_flight, max_in_flight = 0, 0
+
+        async def side_effect(request):
+            nonlocal in_flight, max_in_flight
+            page = int(request.url.params.get("page", 1))
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # the first pages are the slowest ones to arrive
+            await asyncio.sleep(0.001 * (total_pages - page))
+            in_flight -= 1
+            headers = {"X-Total-Pages": str(total_pages)}
+            if page < total_pages:
+                headers["X-Next-Page"] = str(page + 1)
+            return httpx.Response(status_code=200, headers=headers, json=[page])
+
+        with respx.mock:
+            route = respx.get(url__startswith="https://gitlab.com/api/v4/groups").mock(
+                side_effect=side_effect
+            )
+            pages = [
+                page
+                async for page in valid_handler.make_paginated_call(
+                    "https://gitlab.com/api/v4/groups",
+                    default_kwargs={},
+                    max_per_page=100,
+                    counter_name="list_teams",
+                    max_number_of_pages=max_number_of_pages,
+                )
+            ]
+        assert pages == [[page] for page in range(1, expected_pages + 1)]
+        assert route.call_count == expected_pages
+        assert max_in_flight == min(window, max(expected_pages - 1, 1))
@@ -0,0 +1,183 @@
+import threading
+
+import fakeredis
+import pytest
+from redis import RedisError
+
+from shared.upload.counters import (
+    COUNTER_TTL,
+    MAX_INCREMENT_ATTEMPTS,
+    commit_sessions_key,
+    get_count,
+    increment_count,
+    verify_count,
+)
+
+KEY = commit_sessions_key(1)
+
+
+class DatabaseCount:
+    def __init__(self, value=0):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis(server):
+    return fakeredis.FakeRedis(server=server)
+
+
+def test_get_count_seeds_missing_counter(redis):
+    count = DatabaseCount(3)
+    assert get_count(redis, KEY, count) == 3
+    assert get_count(redis, KEY, count) == 3
+    assert count.calls == 1
+    assert 0 < redis.ttl(KEY) <= COUNTER_TTL
+
+
+def test_increment_count(redis):
+    count = DatabaseCount(3)
+    get_count(redis, KEY, count)
+    increment_count(redis, KEY)
+    increment_count(redis, KEY, 5)
+    assert get_count(redis, KEY, count) == 9
+    assert count.calls == 1
+    # incrementing keeps the expiry, so that the counter is reconciled eventually
+    assert 0 < redis.ttl(KEY) <= COUNTER_TTL
+
+
+def test_increment_missing_counter(redis):
+    increment_count(redis, KEY)
+    assert redis.get(KEY) is None
+
+    # the rows the increment was for are in the database
+    count = DatabaseCount(1)
+    assert get_count(redis, KEY, count) == 1
+    assert count.calls == 1
+
+
+class ConcurrentUpload(DatabaseCount):
+    """
+    A database count during which another upload creates a row and increments the
+    counter, after the count was taken.
+    """
+
+    def __init__(self, redis, value=0):
+        super().__init__(value)
+        self.redis = redis
+
+    def __call__(self):
+        value = super().__call__()
+        if self.calls == 1:
+            self.value += 1
+            increment_count(self.redis, KEY)
+        return value
+
+
+def test_increment_while_seeding(redis):
+    count = ConcurrentUpload(redis, 3)
+
+    # the first count misses the new row, so it is counted again
+    assert get_count(redis, KEY, count) == 4
+    assert int(redis.get(KEY)) == 4
+    assert count.calls == 2
+
+
+def test_increment_while_verifying(redis):
+    get_count(redis, KEY, DatabaseCount(10))
+    count = ConcurrentUpload(redis, 3)
+
+    assert verify_count(redis, KEY, count) == 4
+    assert int(redis.get(KEY)) == 4
+    assert count.calls == 2
+
+
+def test_concurrent_increments(redis, server):
+    get_count(redis, KEY, DatabaseCount(10))
+    num_threads = 8
+    increments_per_thread = 50
+
+    def increment():
+        connection = fakeredis.FakeRedis(server=server)
+        for _ in range(increments_per_thread):
+            increment_count(connection, KEY)
+
+    threads = [threading.Thread(target=increment) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert int(redis.get(KEY)) == 10 + num_threads * increments_per_thread
+
+
+def test_contended_increment_drops_counter(redis, mocker):
+    get_count(redis, KEY, DatabaseCount(10))
+
+    # the counter is modified by someone else between every `WATCH` and `EXEC`
+    original_pipeline = redis.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = original_pipeline(*args, **kwargs)
+        original_multi = pipe.multi
+
+        def multi():
+            redis.incr(KEY)
+            original_multi()
+
+        pipe.multi = multi
+        return pipe
+
+    mocker.patch.object(redis, "pipeline", side_effect=pipeline)
+    increment_count(redis, KEY)
+    assert redis.get(KEY) is None
+
+    count = DatabaseCount(10 + MAX_INCREMENT_ATTEMPTS + 1)
+    assert get_count(redis, KEY, count) == count.value
+
+
+def test_verify_count_reconciles_counter(redis):
+    get_count(redis, KEY, DatabaseCount(10))
+    # some rows went into an error state, or were never committed
+    count = DatabaseCount(4)
+
+    assert verify_count(redis, KEY, count) == 4
+    assert get_count(redis, KEY, count) == 4
+    assert count.calls == 1
+
+    # the counter is trusted until it can be verified again
+    increment_count(redis, KEY)
+    assert verify_count(redis, KEY, count) == 5
+    assert count.calls == 1
+
+    redis.delete(f"{KEY}:verified")
+    assert verify_count(redis, KEY, count) == 4
+    assert count.calls == 2
+
+
+def test_verify_missing_counter(redis):
+    count = DatabaseCount(4)
+    assert verify_count(redis, KEY, count) == 4
+    redis.delete(KEY)
+    assert verify_count(redis, KEY, count) == 4
+    assert count.calls == 2
+
+
+def test_redis_errors_fall_back_to_database(redis, mocker):
+    for command in ("get", "set", "pipeline"):
+        mocker.patch.object(redis, command, side_effect=RedisError())
+    count = DatabaseCount(4)
+
+    assert get_count(redis, KEY, count) == 4
+    assert verify_count(redis, KEY, count) == 4
+    increment_count(redis, KEY)
+    assert count.calls == 2
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from unittest.mock import PropertyMock, patch
 
+import fakeredis
 from django.test import TestCase
 from django.utils import timezone
 from freezegun import freeze_time
@@ -14,6 +15,7 @@ from shared.django_apps.reports.tests.factories import (
 )
 from shared.django_apps.user_measurements.models import UserMeasurement
 from shared.plan.service import PlanService
+from shared.upload.counters import get_count, owner_measurements_key
 from shared.upload.utils import (
     bulk_insert_coverage_measurements,
     insert_coverage_measurement,
@@ -178,3 +180,46 @@ class CoverageMeasurement(TestCase):
             measurements=measurements
         )
         assert len(inserted_measurements) == 5
+
+    def test_insert_coverage_measurements_increment_counters(self):
+        redis = fakeredis.FakeRedis()
+        owner = OwnerFactory()
+        key = owner_measurements_key(owner.ownerid)
+        with patch("shared.upload.utils.get_redis_connection", return_value=redis):
+            plan_service = PlanService(current_org=owner)
+            assert (
+                get_count(
+                    redis,
+                    key,
+                    lambda: query_monthly_coverage_measurements(
+                        plan_service=plan_service
+                    ),
+                )
+                == 0
+            )
+
+            self.add_upload_measurements_records(owner=owner, quantity=2)
+            self.add_upload_measurements_records(owner=owner, quantity=1, private=False)
+            self.add_upload_measurements_records(
+                owner=owner, quantity=1, report_type="bundle_analysis"
+            )
+            repo = RepositoryFactory.create(author=owner, private=True)
+            commit = CommitFactory.create(repository=repo)
+            report = CommitReportFactory.create(commit=commit, report_type="coverage")
+            bulk_insert_coverage_measurements(
+                measurements=[
+                    UserMeasurement(
+                        owner_id=owner.ownerid,
+                        repo_id=repo.repoid,
+                        commit_id=commit.id,
+                        upload_id=UploadFactory.create(report=report).id,
+                        uploader_used="CLI",
+                        private_repo=True,
+                        report_type=report.report_type,
+                    )
+                    for _ in range(3)
+                ]
+            )
+
+        assert int(redis.get(key)) == 5
+        assert query_monthly_coverage_measurements(plan_service=plan_service) == 5
@@ -0,0 +1,54 @@
+import pytest
+
+from shared.utils.totals import commit_totals_columns
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "totals, res",
+    [
+        (
+            {"c": "85.50000", "h": 171, "m": 29, "p": 0, "n": 200, "C": 4, "N": 10},
+            {
+                "totals_coverage": 85.5,
+                "totals_hits": 171,
+                "totals_misses": 29,
+                "totals_partials": 0,
+                "totals_lines": 200,
+                "totals_complexity": 4.0,
+                "totals_complexity_total": 10.0,
+            },
+        ),
+        (
+            {"c": None, "h": 0, "n": 0},
+            {
+                "totals_coverage": None,
+                "totals_hits": 0,
+                "totals_misses": None,
+                "totals_partials": None,
+                "totals_lines": 0,
+                "totals_complexity": None,
+                "totals_complexity_total": None,
+            },
+        ),
+        (
+            {"c": "", "h": "invalid"},
+            {
+                "totals_coverage": None,
+                "totals_hits": None,
+                "totals_misses": None,
+                "totals_partials": None,
+                "totals_lines": None,
+                "totals_complexity": None,
+                "totals_complexity_total": None,
+            },
+        ),
+    ],
+)
+def test_commit_totals_columns(totals, res):
+    assert commit_totals_columns(totals) == res
+
+
+@pytest.mark.unit
+def test_commit_totals_columns_without_totals():
+    assert set(commit_totals_columns(None).values()) == {None}
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from shared.utils.match import *
@@ -45,3 +47,38 @@ def test_match(patterns, string, boolean):
 )
 def test_match_any(patterns, match_any_of_these, boolean):
     assert match_any(patterns, match_any_of_these) is boolean
+
+
+@pytest.mark.parametrize(
+    "patterns, num_combined",
+    [
+        ([], 0),
+        (["a"], 1),
+        (["a", "b.*", "(c|d)/e"], 1),
+        (["a", "b", "(?i)c"], 2),
+        (["a", "b", r"(c)\1"], 2),
+        (["(?P<x>a)", "(?P<x>b)"], 2),
+    ],
+)
+def test_combine_patterns(patterns, num_combined):
+    compiled = [re.compile(p) for p in patterns]
+    combined = combine_patterns(compiled)
+    assert len(combined) == num_combined
+
+    for string in ["a", "b", "bb", "c", "cc", "C", "d/e", "ab", "x", ""]:
+        assert any(p.match(string) for p in combined) == any(
+            p.match(string) for p in compiled
+        )
+
+
+def test_matcher_caches_results():
+    matcher = Matcher(["folder/.*", "!folder/ignored.*"])
+    assert matcher.match("folder/file") is True
+    assert matcher.match("folder/ignored/file") is False
+    assert matcher.match("other/file") is False
+    assert matcher._results == {
+        "folder/file": True,
+        "folder/ignored/file": False,
+        "other/file": False,
+    }
+    assert matcher.match("folder/file") is True
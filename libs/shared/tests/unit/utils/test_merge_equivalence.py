@@ -0,0 +1,268 @@
+"""
+Checks the merging functions against the straightforward implementations
+they replaced, on an exhaustive corpus of small inputs.
+"""
+
+import itertools
+import random
+from collections import defaultdict
+from fractions import Fraction
+from itertools import groupby
+
+import pytest
+
+from shared.utils.merge import (
+    merge_all,
+    merge_branch,
+    merge_coverage,
+    merge_partial_line,
+)
+
+
+def reference_merge_branch(b1, b2):
+    if b1 == b2:  # 1/2 == 1/2
+        return b1
+    if b1 == -1 or b2 == -1:
+        return -1
+    if isinstance(b1, int) and not isinstance(b1, bool) and b1 > 0:
+        return b1
+    if isinstance(b2, int) and not isinstance(b2, bool) and b2 > 0:
+        return b2
+    if b1 in (0, None, True):
+        return b2
+    if b2 in (0, None, True):
+        return b1
+    if isinstance(b1, list):
+        return b1
+    if isinstance(b2, list):
+        return b2
+    br1, br2 = b1.split("/", 1)
+    if br1 == br2:  # equal 1/1
+        return b1
+    br3, br4 = b2.split("/", 1)
+    if br3 == br4:  # equal 1/1
+        return b2
+    # return the greatest found
+    return (
+        f"{br1 if int(br1) > int(br3) else br3}/{br2 if int(br2) > int(br4) else br4}"
+    )
+
+
+def reference_merge_partial_line(p1, p2):
+    if not p1 or not p2:
+        return p1 or p2
+
+    np = p1 + p2
+    if len(np) == 1:
+        return np
+
+    fl = defaultdict(list)
+    for _s, _e, _c in np:
+        if _e is not None:
+            for x in range(_s or 0, _e + 1):
+                fl[x].append(_c)
+    ks = list(fl.keys())
+    mx = max(ks) + 1 if ks else 0
+    for _s, _e, _c in np:
+        if _e is None:
+            for x in range(_s or 0, mx):
+                fl[x].append(_c)
+    ks = list(fl.keys())
+    pp = []
+    for cov, group in groupby(
+        sorted([(cl, max(cv)) for cl, cv in list(fl.items())]), lambda c: c[1]
+    ):
+        group = list(group)  # noqa: PLW2901
+        s, e = group[0][0], group[-1][0]
+        pp.append([s, e if e > s else s + 1, cov])
+
+    if [[max(ks), None, _c] for _s, _e, _c in np if _e is None]:
+        pp[-1][1] = None
+
+    return pp
+
+
+def reference_merge_coverage(l1, l2, branches_missing=True):
+    def cast_ints_float(value):
+        return value if not isinstance(value, int) else float(value)
+
+    if l1 is None or l2 is None:
+        return l1 if l1 is not None else l2
+
+    elif l1 == -1 or l2 == -1:
+        return -1
+
+    l1t = cast_ints_float(l1)
+    l2t = cast_ints_float(l2)
+
+    if isinstance(l1t, float | Fraction) and isinstance(l2t, float | Fraction):
+        return l1 if l1 >= l2 else l2
+
+    elif isinstance(l1t, str) or isinstance(l2t, str):
+        if isinstance(l1t, float):
+            branches_missing = [] if l1 else False
+            l1 = l2
+
+        elif isinstance(l2t, float):
+            branches_missing = [] if l2 else False
+
+        if branches_missing == []:
+            l1 = l1.split("/")[-1]
+            return f"{l1}/{l1}"
+
+        elif isinstance(branches_missing, list):
+            target = int(l1.split("/")[-1])
+            bf = target - len(branches_missing)
+            return f"{bf if bf > 0 else 0}/{target}"
+
+        return reference_merge_branch(l1, l2)
+
+    elif isinstance(l1t, list) and isinstance(l2t, list):
+        return reference_merge_partial_line(l1, l2)
+
+    elif isinstance(l1t, bool) or isinstance(l2t, bool):
+        return (l2 or l1) if isinstance(l1t, bool) else (l1 or l2)
+
+    return reference_merge_coverage(
+        partials_to_line(l1) if isinstance(l1t, list) else l1,
+        partials_to_line(l2) if isinstance(l2t, list) else l2,
+    )
+
+
+def partials_to_line(partials):
+    ln = len(partials)
+    if ln == 1:
+        return partials[0][2]
+    v = sum(1 for (sc, ec, hits) in partials if hits > 0)
+    return f"{v}/{ln}"
+
+
+def reference_merge_all(coverages, missing_branches=None):
+    if len(coverages) == 1:
+        return coverages[0]
+    cov = coverages[0]
+    for _ in coverages[1:]:
+        cov = reference_merge_coverage(cov, _, missing_branches)
+    return cov
+
+
+def outcome(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return type(e)
+
+
+def assert_equivalent(result, expected, case):
+    if expected is ValueError:
+        # two open-ended partials made the reference implementation fail
+        return
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        # invalid inputs are still rejected, though not necessarily with the same error
+        assert isinstance(result, type) and issubclass(result, Exception), case
+        return
+    assert result == expected, case
+    assert type(result) is type(expected), case
+
+
+PARTIALS = [
+    [start, end, cov]
+    for start in (None, 0, 1, 3, 6)
+    for end in (None, 0, 2, 3, 5, 8)
+    for cov in (0, 1, 2)
+]
+
+BRANCHES = [f"{hits}/{total}" for total in range(1, 4) for hits in range(total + 1)]
+COVERAGES = [
+    None,
+    -1,
+    0,
+    1,
+    5,
+    0.5,
+    Fraction(1, 2),
+    True,
+    False,
+    *BRANCHES,
+    [[1, 2, 0]],
+    [[0, None, 1]],
+    [[1, 2, 1], [3, 4, 0]],
+]
+
+
+@pytest.mark.unit
+def test_merge_partial_line_single_partials():
+    for p1, p2 in itertools.product(PARTIALS, repeat=2):
+        expected = outcome(reference_merge_partial_line, [list(p1)], [list(p2)])
+        if expected is ValueError:
+            # two open-ended partials made the reference implementation fail
+            continue
+        assert merge_partial_line([list(p1)], [list(p2)]) == expected, (p1, p2)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(50))
+def test_merge_partial_line_many_partials(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        p1 = [list(rng.choice(PARTIALS)) for _ in range(rng.randint(0, 6))]
+        p2 = [list(rng.choice(PARTIALS)) for _ in range(rng.randint(0, 6))]
+        expected = outcome(
+            reference_merge_partial_line,
+            [list(p) for p in p1],
+            [list(p) for p in p2],
+        )
+        if expected is ValueError:
+            continue
+        assert merge_partial_line(p1, p2) == expected, (p1, p2)
+
+
+@pytest.mark.unit
+def test_merge_partial_line_only_open_ended():
+    assert outcome(reference_merge_partial_line, [[1, None, 1]], [[3, None, 0]]) is (
+        ValueError
+    )
+    # instead of failing, the open-ended partials are merged up to the latest start
+    assert merge_partial_line([[1, None, 1]], [[3, None, 0]]) == [[1, None, 1]]
+    assert merge_partial_line([[1, None, 0]], [[3, None, 1]]) == [
+        [1, 2, 0],
+        [3, None, 1],
+    ]
+
+
+@pytest.mark.unit
+def test_merge_branch_corpus():
+    values = [None, -1, 0, 1, 2, True, [[1, 2, 0]], *BRANCHES]
+    for b1, b2 in itertools.product(values, repeat=2):
+        assert_equivalent(
+            outcome(merge_branch, b1, b2),
+            outcome(reference_merge_branch, b1, b2),
+            (b1, b2),
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("branches_missing", [None, True, [], ["1"], ["1", "2"]])
+def test_merge_coverage_corpus(branches_missing):
+    for l1, l2 in itertools.product(COVERAGES, repeat=2):
+        assert_equivalent(
+            outcome(merge_coverage, l1, l2, branches_missing),
+            outcome(reference_merge_coverage, l1, l2, branches_missing),
+            (l1, l2),
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(20))
+def test_merge_all_corpus(seed):
+    rng = random.Random(seed)
+    ints = [-1, 0, 1, 2, 7]
+    for _ in range(200):
+        pool = ints if rng.random() < 0.5 else COVERAGES
+        coverages = [rng.choice(pool) for _ in range(rng.randint(1, 6))]
+        missing = rng.choice([None, [], ["1"]])
+        assert_equivalent(
+            outcome(merge_all, coverages, missing),
+            outcome(reference_merge_all, coverages, missing),
+            coverages,
+        )
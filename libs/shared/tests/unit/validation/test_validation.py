@@ -1,4 +1,5 @@
 import os
+from copy import deepcopy
 
 import pytest
 
@@ -6,7 +7,9 @@ from shared.config import ConfigHelper, get_config
 from shared.rollouts.features import BUNDLE_THRESHOLD_FLAG
 from shared.validation.exceptions import InvalidYamlException
 from shared.yaml.validation import (
+    UserGivenSecret,
     _calculate_error_location_and_message_from_error_dict,
+    clear_validation_cache,
     do_actual_validation,
     validate_yaml,
 )
@@ -1571,3 +1574,76 @@ def test_to_string_validation():
     expected_result = {}
     result = validate_yaml(user_input)
     assert result == expected_result
+
+
+class TestValidationCache:
+    def test_cached_result_is_a_copy(self):
+        user_input = {
+            "coverage": {"range": "70...100"},
+            "ignore": ["tests/**/*", "docs"],
+            "comment": {"require_changes": "coverage_drop or any_change"},
+        }
+        first = validate_yaml(deepcopy(user_input))
+        first["ignore"].append("modified")
+        first["comment"]["require_changes"].append(42)
+
+        second = validate_yaml(deepcopy(user_input))
+        assert second == {
+            "coverage": {"range": [70.0, 100.0]},
+            "ignore": ["(?s:tests/.*/[^\\/]*)\\Z", "^docs.*"],
+            "comment": {"require_changes": [3]},
+        }
+        assert second["ignore"] is not first["ignore"]
+
+    def test_show_secrets_for_is_part_of_the_key(self):
+        value = "some_password"
+        user_input = {
+            "coverage": {
+                "notify": {
+                    "irc": {
+                        "title": {
+                            "password": UserGivenSecret.encode(f"github/1/2/{value}")
+                        }
+                    }
+                }
+            }
+        }
+
+        def password(show_secrets_for):
+            result = validate_yaml(deepcopy(user_input), show_secrets_for)
+            return result["coverage"]["notify"]["irc"]["title"]["password"]
+
+        assert password(None).startswith("secret:")
+        assert password(("github", 1, 2)) == value
+        assert password(None).startswith("secret:")
+
+    def test_invalid_yaml_is_cached(self, mocker):
+        user_input = {"coverage": {"round": "sideways"}}
+        with pytest.raises(InvalidYamlException) as first:
+            validate_yaml(deepcopy(user_input))
+
+        validate = mocker.patch(
+            "shared.yaml.validation.do_actual_validation",
+            side_effect=do_actual_validation,
+        )
+        with pytest.raises(InvalidYamlException) as second:
+            validate_yaml(deepcopy(user_input))
+
+        assert not validate.called
+        assert second.value is not first.value
+        assert (
+            second.value.error_location
+            == first.value.error_location
+            == [
+                "coverage",
+                "round",
+            ]
+        )
+        assert second.value.error_dict == first.value.error_dict
+        second.value.error_location.append("modified")
+
+        clear_validation_cache()
+        with pytest.raises(InvalidYamlException) as third:
+            validate_yaml(deepcopy(user_input))
+        assert validate.called
+        assert third.value.error_location == ["coverage", "round"]